@@ -1,46 +1,197 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Depends, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from api.database.schema.DatabaseSchema import initDB
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from api.database.schema.DatabaseSchema import engine, initDB
+from api.clients.RandomDotOrgAPIClientRequest import RandomDotOrgAPIClientRequest
+from api.clients.RandomDigitEntropyPool import entropyPool
 from api.features.Users.Services.CreateNewPlayer.CreateNewPlayerService import CreateNewPlayerService
-from api.features.PlayerData.Services.PlayerDataManagement.PlayerDataManagementService import (
-    PlayerDataManagementService)
 from api.features.Users.Services.PlayerLogin.PlayerLoginService import PlayerLoginService
+from api.features.Users.Services.BulkProvisioning.BulkProvisioningService import BulkProvisioningService
+from api.features.Users.Services.PasswordHashing.PasswordHashingService import (
+    PasswordHashingBusyException, passwordHashingService)
 from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
-from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from api.features.PlayerStats.Database.PlayerStatsWriteBehindBuffer import playerStatsWriteBehindBuffer
+from api.features.PlayerStats.Database.PlayerStatsCache import playerStatsCache
+from api.features.GameSession.Configs import GameSessionConfig
+from api.features.GameHistory.Configs import GameHistoryConfig
+from api.features.GameHistory.Database.GameHistoryWriter import gameHistoryWriter
+from api.features.GameHistory.Services.GameHistoryService import GameHistoryService
+from api.features.Export.Services.ExportService import ExportService
+from api.features.Leaderboard.Configs import LeaderboardConfig
+from api.features.Leaderboard.Services.LeaderboardService import leaderboardService
+from api.features.LevelUser.Database.LevelUserDatabaseService import LevelUserDatabaseService
+from api.features.FeatureFlags.Services.FeatureFlagService import featureFlagService
+from api.features.DifficultyMode.Services.DifficultyModeRegistryService import difficultyModeRegistry
+from api.features.LevelUser.Configs import LevelingCurveConfig
+from api.features.LevelUser.Utils.LevelingCurve import LevelingCurve
+from api.features.GameSession.Services.GameSessionRegistryService import GameSession, GameSessionRegistryService
+from api.features.GameSession.Services.GameChannelService import GameChannelService
+from api.services.MastermindSolver.MastermindSolverService import mastermindSolverService
+from api.metrics.Configs import MetricsConfig
+from api.security.Configs import AdminConfig
+from api.metrics.DatabaseMetrics import instrumentEngine
+from api.logger.LoggingPipeline import loggingPipeline
+from api.metrics.MetricsMiddleware import MetricsMiddleware
+from api.metrics.MetricsRegistry import metricsRegistry
+import asyncio
 import logging
-import traceback
+import secrets
+
+logger = logging.getLogger(__name__)
 
 """
 This file contains the core API endpoints and database set up for the Mastermind game and the player's data. This file
 will need to be ran in order to start the backend server.
 """
 
-# Instantiate the FastAPI, a player instance, and an instance of the game.
+# Instantiate the FastAPI, the registry holding a separate player and game per session, and the WebSocket channel
+# playing those sessions' games.
 app = FastAPI()
-player = PlayerDataManagementService()
-game = Mastermind(player)
+gameSessionRegistry = GameSessionRegistryService()
+gameChannelService = GameChannelService(gameSessionRegistry)
 
 # Ensure that the API is accessed by only the frontend.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
+    allow_origins=GameSessionConfig.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[GameSessionConfig.SESSION_HEADER_NAME],
 )
 
-# Ensure logs are not suppressed by uvicorn and are turned to debug mode.
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-logging.getLogger("uvicorn").setLevel(logging.DEBUG)
-logging.getLogger("uvicorn.access").setLevel(logging.DEBUG)
+# Record every request and SQL statement, and expose the state owned by the registry and player stats services when
+# /metrics is scraped.
+app.add_middleware(MetricsMiddleware)
+if MetricsConfig.TIME_DATABASE_STATEMENTS:
+    instrumentEngine(engine)
+metricsRegistry.gauge("mastermind_game_sessions_active", "Sessions held in the game session registry.",
+                      function=lambda: len(gameSessionRegistry))
+metricsRegistry.gauge("mastermind_games_in_progress", "Sessions with a game in progress.",
+                      function=lambda: sum(session.game.status == "stillPlaying"
+                                           for session in gameSessionRegistry.sessions.values()))
+metricsRegistry.gauge("mastermind_player_stats_pending_writes", "Players with end-of-game stats waiting to be flushed.",
+                      function=lambda: len(playerStatsWriteBehindBuffer))
+metricsRegistry.counter("mastermind_player_stats_cache_hits_total", "Player stats cache hits.",
+                        function=lambda: playerStatsCache.hits)
+metricsRegistry.counter("mastermind_player_stats_cache_misses_total", "Player stats cache misses.",
+                        function=lambda: playerStatsCache.misses)
+metricsRegistry.counter("mastermind_player_stats_cache_evictions_total", "Player stats cache evictions.",
+                        function=lambda: playerStatsCache.evictions)
+metricsRegistry.gauge("mastermind_feature_flags_snapshot_age_seconds",
+                      "Seconds since this worker last confirmed its feature flags were current.",
+                      function=lambda: featureFlagService.snapshotAge or 0)
+metricsRegistry.counter("mastermind_log_records_dropped_total", "Log records dropped because the log queue was full.",
+                        function=lambda: loggingPipeline.droppedRecords)
 
 
-# Call the construction of the database tables.
+# Send every log record, uvicorn's included, through a queue to a background writer with per-module levels. Then call
+# the construction of the database tables, replay any buffered player stats left by a crash, start writing finished
+# games' history in the background, rebuild the leaderboards, load the feature flags and start polling them, load the
+# custom difficulty modes, start prefetching random digits for winning combinations, and build the solver's feedback
+# tables in the background.
 @app.on_event("startup")
 async def startup():
+    loggingPipeline.start()
     await initDB()
+    await playerStatsWriteBehindBuffer.start()
+    await gameHistoryWriter.start()
+    await leaderboardService.start()
+    await featureFlagService.start()
+    await difficultyModeRegistry.start()
+    await entropyPool.start()
+    await mastermindSolverService.start()
+
+
+# Drain buffered player stats and queued game history, stop polling feature flags and background refills, release the
+# pooled connections to external APIs and the password hashing workers, and write out any queued log records.
+@app.on_event("shutdown")
+async def shutdown():
+    await playerStatsWriteBehindBuffer.stop()
+    await gameHistoryWriter.stop()
+    await featureFlagService.stop()
+    await entropyPool.stop()
+    passwordHashingService.shutdown()
+    await RandomDotOrgAPIClientRequest.closeSharedHttpClient()
+    loggingPipeline.stop()
+
+
+def getRequestSessionId(request: Request) -> str:
+    """
+    :return: {String} The session ID in the request's header or cookie, or None.
+    """
+    return (request.headers.get(GameSessionConfig.SESSION_HEADER_NAME)
+            or request.cookies.get(GameSessionConfig.SESSION_COOKIE_NAME))
+
+
+async def getGameSession(request: Request) -> GameSession:
+    """
+    Resolves the player and game state for the request from the session ID in its header or cookie. Only /login,
+    /create-user, and /enter-game start new sessions, so anonymous requests elsewhere cannot evict players' sessions.
+    :param: {Request} request: The incoming request.
+    :return: {GameSession}: The session's player and game state.
+    :raise: {HTTPException}:
+        - 401: If the request carries no session ID.
+        - 404: If the session ID is unknown or the session has expired.
+    """
+    sessionId = getRequestSessionId(request)
+    if not sessionId:
+        raise HTTPException(status_code=401, detail="A session is required. Log in or enter a game to start one.")
+    session = gameSessionRegistry.getSession(sessionId)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired. Log in or enter a game again.")
+    return session
+
+
+async def getOrCreateGameSession(request: Request):
+    """
+    Resolves the player and game state for the request from the session ID in its header or cookie, or starts a new
+    session if the ID is missing, unknown, or expired. A session started for a request that then fails is removed
+    again, since its ID never reaches the client.
+    :param: {Request} request: The incoming request.
+    :return: {GameSession}: The session's player and game state.
+    """
+    session = gameSessionRegistry.getSession(getRequestSessionId(request))
+    if session is not None:
+        yield session
+        return
+
+    session = gameSessionRegistry.createSession()
+    try:
+        yield session
+    except Exception:
+        gameSessionRegistry.endSession(session.sessionId)
+        raise
+
+
+async def requireAdminToken(request: Request):
+    """
+    Rejects the request unless it carries the configured admin token.
+    :param: {Request} request: The incoming request.
+    :return: None.
+    :raise: {HTTPException}:
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+    """
+    if not AdminConfig.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled.")
+    token = request.headers.get(AdminConfig.ADMIN_TOKEN_HEADER_NAME, "")
+    if not secrets.compare_digest(token.encode("utf-8"), AdminConfig.ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+def requireOwnPlayer(session: GameSession, userId: str):
+    """
+    Rejects a request about a player other than the one logged in on the caller's session.
+    :param: {GameSession} session: The caller's player and game state.
+    :param: {String} userId: The player the request is about.
+    :return: None.
+    :raise: {HTTPException}:
+        - 403: If the userId is not the session's logged-in player.
+    """
+    if not userId or session.player.userId != userId:
+        raise HTTPException(status_code=403, detail="Players can only access their own data.")
 
 
 # FastAPI schema for Body requests in endpoints.
@@ -49,6 +200,22 @@ class Users(BaseModel):
     password: str
 
 
+class BulkUsers(BaseModel):
+    users: list[Users]
+
+
+class FeatureFlagRequest(BaseModel):
+    name: str
+    isActive: bool
+    description: str = None
+
+
+class PreviousLevelingCurve(BaseModel):
+    baseXp: int = Field(ge=1, le=LevelingCurveConfig.MAX_BASE_XP)
+    growthFactor: str = Field(pattern=LevelingCurveConfig.GROWTH_FACTOR_PATTERN)
+    maxLevel: int = Field(ge=1, le=LevelingCurveConfig.MAX_LEVEL_LIMIT)
+
+
 class PlayerStats(BaseModel):
     userId: str
 
@@ -60,135 +227,408 @@ class ModeRequest(BaseModel):
 class GuessRequest(BaseModel):
     guess: str
 
+
+class DifficultyModeRequest(BaseModel):
+    name: str
+    inputLength: int
+    minRandomDigit: int = 0
+    maxRandomDigit: int
+    totalRounds: int
+    multiplier: float = 1
+    description: str = None
+
 # API Endpoints
 @app.post("/create-user")
-async def createUser(user: Users) -> JSONResponse:
+async def createUser(user: Users, session: GameSession = Depends(getOrCreateGameSession)) -> JSONResponse:
     """
     Creates both a new user in the database with a hashed password and a player instance for immediate gameplay.
     :param: {Users} user: The user's username and password in the body of the request.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Confirmation of account creation.
     :raise: {HTTPException}:
         - 400: If there is an error creating the user, perhaps due to an invalid username or password.
+        - 429: If too many passwords are already waiting to be hashed.
     """
     try:
-        createNewPlayerService = CreateNewPlayerService(player)
+        createNewPlayerService = CreateNewPlayerService(session.player)
         response = await createNewPlayerService.createNewPlayer(user.username, user.password)
-        return response
+        return gameSessionRegistry.attachSessionId(response, session)
+    except PasswordHashingBusyException:
+        raise
     except Exception as e:
-        logging.error(f"Error creating user: {traceback.format_exc()}")
+        logger.exception("Error creating user.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/bulk-create-users", dependencies=[Depends(requireAdminToken)])
+async def bulkCreateUsers(request: BulkUsers) -> JSONResponse:
+    """
+    Creates many users with default stats at once, for events and load testing. Requires the admin token.
+    :param: {BulkUsers} request: The username and password of every user in the body of the request.
+    :return: {JSONResponse}: The userId of every created user and the error of every user that was not created.
+    :raise: {HTTPException}:
+        - 400: If no users or too many users are requested.
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+        - 500: If there is an error storing the users.
+    """
+    return await BulkProvisioningService().provisionAccounts([(user.username, user.password) for user in request.users])
+
+
+@app.post("/recompute-levels", dependencies=[Depends(requireAdminToken)])
+async def recomputeLevels(previousCurve: PreviousLevelingCurve) -> JSONResponse:
+    """
+    Moves every player to the level their total XP reaches on the configured leveling curve, after the curve has been
+    changed. Buffered player stats are written first so no pending update is recomputed from stale levels, and the
+    leaderboards are rebuilt afterwards. Requires the admin token.
+    :param: {PreviousLevelingCurve} previousCurve: The baseXp, growthFactor and maxLevel the stored levels were earned on.
+    :return: {JSONResponse}: The number of players whose leveling changed.
+    :raise: {HTTPException}:
+        - 400: If the previous curve is not valid.
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+        - 422: If baseXp, growthFactor or maxLevel is outside the limits in LevelingCurveConfig.
+    """
+    try:
+        # Precomputing up to MAX_LEVEL_LIMIT levels with exact fractions takes long enough to stall other requests.
+        curve = await asyncio.to_thread(LevelingCurve, previousCurve.baseXp, previousCurve.growthFactor,
+                                        previousCurve.maxLevel)
+    except (ValueError, ArithmeticError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await playerStatsWriteBehindBuffer.flush()
+    changedPlayers = await LevelUserDatabaseService().recomputeLevels(curve)
+    await leaderboardService.rebuild()
+    return JSONResponse(content={"changedPlayers": changedPlayers}, status_code=200)
+
+
+@app.get("/feature-flags", dependencies=[Depends(requireAdminToken)])
+async def getFeatureFlags() -> JSONResponse:
+    """
+    Returns every feature flag as stored and as served by the worker handling the request. Requires the admin token.
+    :return: {JSONResponse}: The worker's snapshot version and age, and each flag's name, isActive,
+    isActiveOnThisWorker, and description.
+    :raise: {HTTPException}:
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+    """
+    return await featureFlagService.listFlags()
+
+
+@app.post("/feature-flags", dependencies=[Depends(requireAdminToken)])
+async def setFeatureFlag(request: FeatureFlagRequest) -> JSONResponse:
+    """
+    Turns a feature flag on or off, creating it if needed. The worker handling the request serves the change
+    immediately and every other worker within the flag poll interval. Requires the admin token.
+    :param: {FeatureFlagRequest} request: The flag's name, isActive, and optional description in the request's body.
+    :return: {JSONResponse}: The stored flag and the propagationSeconds before every worker serves it.
+    :raise: {HTTPException}:
+        - 400: If the name is empty.
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+        - 500: If there is an error storing the flag.
+    """
+    return await featureFlagService.setFlag(request.name, request.isActive, request.description)
+
+
 @app.post("/login")
-async def login(user: Users) -> JSONResponse:
+async def login(user: Users, session: GameSession = Depends(getOrCreateGameSession)) -> JSONResponse:
     """
     Logs user in and loads their player stats and data for immediate gameplay.
     :param: {Users} user: The user's username and password in the body of the request.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Confirmation of login.
     :raise: {HTTPException}:
         - 400: If there is an error logging in the user, perhaps due to an invalid username or password.
+        - 429: If too many passwords are already waiting to be verified.
     """
     try:
-        playerLoginService = PlayerLoginService(player)
+        playerLoginService = PlayerLoginService(session.player)
         response = await playerLoginService.logPlayerIn(user.username, user.password)
-        return response
+        return gameSessionRegistry.attachSessionId(response, session)
+    except PasswordHashingBusyException:
+        raise
     except Exception as e:
-        logging.error(f"Error logging user into game: {traceback.format_exc()}")
+        logger.exception("Error logging user into game.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.put("/update-player-stats")
-async def updatePlayerData(stats: PlayerStats) -> JSONResponse:
+async def updatePlayerData(stats: PlayerStats, session: GameSession = Depends(getGameSession)) -> JSONResponse:
     """
-    Updates PlayerStats table with player's new stats acquired after finishing a game.
+    Writes the player's stats from finished games still waiting in the write-behind buffer to the PlayerStats table,
+    as the same atomic increments the buffer applies, and reloads the session's in-memory stats from the result.
     :param: {PlayerStats} stats: The user's userId in the body of the request.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Confirmation of player stats update.
     :raise: {HTTPException}:
         - 400: If there is an error updating player stats, perhaps due to an invalid userId.
+        - 403: If the userId is not the player logged in on the session.
     """
+    requireOwnPlayer(session, stats.userId)
     try:
-        playerStatsService = PlayerStatsManagementService(player)
-        response = await playerStatsService.updatePlayerStats(stats)
-        return response
+        playerStatsService = PlayerStatsManagementService(session.player)
+        response = await playerStatsService.updatePlayerStats(stats.userId)
+        return gameSessionRegistry.attachSessionId(response, session)
     except Exception as e:
-        logging.error(f"Error updating player's stats: {traceback.format_exc()}")
+        logger.exception("Error updating player's stats.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/enter-game")
-async def enterGame(mode: ModeRequest) -> JSONResponse:
+async def enterGame(mode: ModeRequest, session: GameSession = Depends(getOrCreateGameSession)) -> JSONResponse:
     """
     Enters user into the game by populating the game with the corresponding configurations based on the difficulty mode
     (defaults to Normal).
     :param: {ModeRequest} mode: The difficulty mode in the body of the request.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Confirmation of entering the game.
     :raise: {HTTPException}:
         - 400: If there is an error entering the game, perhaps due to an invalid mode.
     """
     try:
-        response = await game.enterGame(mode.mode)
-        return response
+        async with session.lock:
+            response = await session.game.enterGame(mode.mode)
+        return gameSessionRegistry.attachSessionId(response, session)
     except Exception as e:
-        logging.error(f"Error entering game: {traceback.format_exc()}")
+        logger.exception("Error entering game.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/difficulty-modes")
+async def getDifficultyModes() -> JSONResponse:
+    """
+    Returns every difficulty mode a game can be entered with.
+    :return: {JSONResponse}: Each mode's name, inputLength, minRandomDigit, maxRandomDigit, totalRounds, multiplier,
+    description, and whether it is custom.
+    """
+    return difficultyModeRegistry.listModes()
+
+
+@app.post("/difficulty-modes", dependencies=[Depends(requireAdminToken)])
+async def createDifficultyMode(request: DifficultyModeRequest) -> JSONResponse:
+    """
+    Creates a custom difficulty mode, playable through /enter-game on every worker. Requires the admin token.
+    :param: {DifficultyModeRequest} request: The mode's name, inputLength, digit range, totalRounds, multiplier, and
+    optional description in the body of the request.
+    :return: {JSONResponse}: The created mode.
+    :raise: {HTTPException}:
+        - 400: If the mode is outside the limits in DifficultyModeConfig.
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+        - 409: If a mode with the same name already exists.
+        - 500: If there is an error storing the mode.
+    """
+    return await difficultyModeRegistry.createMode(request.name, request.inputLength, request.minRandomDigit,
+                                                   request.maxRandomDigit, request.totalRounds, request.multiplier,
+                                                   request.description)
+
+
 @app.post("/submit-guess")
-async def submitGuess(guess: GuessRequest) -> JSONResponse:
+async def submitGuess(guess: GuessRequest, session: GameSession = Depends(getGameSession)) -> JSONResponse:
     """
     Submits a player's guess for validation and evaluation in order to generate a hint, win, or lose.
     :param: {GuessRequest} guess: The user's guess in the body of the request.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Round data including userId, status of the game, hint data, the guess made, current round,
     total rounds, whether the user is on the last round, and remaining guesses.
     :raise: {HTTPException}:
         - 400: If there is an error submitting the guess, perhaps due to an invalid guess.
     """
     try:
-        response = await game.submitGuess(guess.guess)
-        if game.status == "won" or game.status == "lost":
-            game.resetGame()
-        return response
+        async with session.lock:
+            response = await session.game.submitGuess(guess.guess)
+            if session.game.status == "won" or session.game.status == "lost":
+                session.game.resetGame()
+        return gameSessionRegistry.attachSessionId(response, session)
     except Exception as e:
-        logging.error(f"Error submitting guess: {traceback.format_exc()}")
+        logger.exception("Error submitting guess.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.websocket("/ws/game")
+async def gameChannel(websocket: WebSocket):
+    """
+    Plays the session's games over one connection: guesses are sent as messages, and each round's data, plus the
+    player's stats once a game ends, are pushed back. See GameChannelService for the messages.
+    :param: {WebSocket} websocket: The connection, carrying the session ID as the sessionId query parameter, the
+    session header, or the session cookie.
+    :return: None.
+    """
+    await gameChannelService.serve(websocket)
+
+
+@app.get("/suggest-guess")
+async def suggestGuess(session: GameSession = Depends(getGameSession)) -> JSONResponse:
+    """
+    Recommends the best next guess for the session's game in progress, based on the hints received so far.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
+    :return: {JSONResponse}: The suggestedGuess, the number of remainingCandidates, and the strategy used.
+    :raise: {HTTPException}:
+        - 400: If no game is in progress or the difficulty mode is too large to solve.
+        - 500: If there is an error computing the suggestion.
+    """
+    async with session.lock:
+        response = await mastermindSolverService.suggestGuessForGame(session.game)
+    return gameSessionRegistry.attachSessionId(response, session)
+
+
 @app.get("/get-player-stats")
-async def getPlayerStats(userId: str = Query(...)) -> JSONResponse:
+async def getPlayerStats(userId: str = Query(...), session: GameSession = Depends(getGameSession)) -> JSONResponse:
     """
     Returns player's stats directly from the database as validation to be displayed for the user on the frontend at
     the end of a game.
     :param: {Query} userId: The user's userId in the query parameters.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: The PlayerStatsTable entry for the specific userId provided.
     :raise: {HTTPException}:
         - 400: If there is an error fetching player data, perhaps due to an invalid userId.
     """
     try:
-        playerStatsService = PlayerStatsManagementService(player)
+        playerStatsService = PlayerStatsManagementService(session.player)
         response = await playerStatsService.getPlayerStatsForUserDisplay(userId)
-        return response
+        return gameSessionRegistry.attachSessionId(response, session)
     except Exception as e:
-        logging.error(f"Error fetching player data: {traceback.format_exc()}")
+        logger.exception("Error fetching player data.")
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/game-history")
+async def getGameHistory(userId: str = Query(...), limit: int = Query(GameHistoryConfig.DEFAULT_PAGE_SIZE),
+                         before: int = Query(None), session: GameSession = Depends(getGameSession)) -> JSONResponse:
+    """
+    Returns a page of the player's finished games, newest first, each with its guesses. Pass the nextCursor of a page
+    as before to get the next one.
+    :param: {Query} userId: The user's userId in the query parameters.
+    :param: {Query} limit: Maximum number of games on the page.
+    :param: {Query} before: The nextCursor of the previous page, if any.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
+    :return: {JSONResponse}: The games and the nextCursor, which is None on the last page.
+    :raise: {HTTPException}:
+        - 400: If the limit is out of range.
+        - 403: If the userId is not the player logged in on the session.
+        - 500: If there is an error reading the game history.
+    """
+    requireOwnPlayer(session, userId)
+    try:
+        response = await GameHistoryService().getGameHistory(userId, limit, before)
+        return gameSessionRegistry.attachSessionId(response, session)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error fetching game history.")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/leaderboard")
+async def getLeaderboard(board: str = Query("highestScore"), mode: str = Query(None),
+                         limit: int = Query(LeaderboardConfig.DEFAULT_LIMIT), offset: int = Query(0)) -> JSONResponse:
+    """
+    Returns a page of the top players by highestScore, currentLevel, or winRate, or by highest score within a mode.
+    :param: {Query} board: One of highestScore, currentLevel, or winRate.
+    :param: {Query} mode: A difficulty mode to rank highest scores within, if any.
+    :param: {Query} limit: Maximum number of entries on the page.
+    :param: {Query} offset: Entries to skip from the top.
+    :return: {JSONResponse}: The rank, userId, and value of each entry, and the number of ranked players.
+    :raise: {HTTPException}:
+        - 400: If the board, mode, limit, or offset is invalid.
+        - 500: If there is an error reading the leaderboard.
+    """
+    try:
+        return leaderboardService.getLeaderboard(board, mode, limit, offset)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error fetching leaderboard.")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/leaderboard-rank")
+async def getLeaderboardRank(userId: str = Query(...), board: str = Query("highestScore"),
+                             mode: str = Query(None)) -> JSONResponse:
+    """
+    Returns the player's rank on a leaderboard.
+    :param: {Query} userId: The user's userId in the query parameters.
+    :param: {Query} board: One of highestScore, currentLevel, or winRate.
+    :param: {Query} mode: A difficulty mode to rank highest scores within, if any.
+    :return: {JSONResponse}: The player's rank and value, and the number of ranked players.
+    :raise: {HTTPException}:
+        - 400: If the userId is missing or the board or mode is invalid.
+        - 404: If the player is not on the leaderboard.
+        - 500: If there is an error reading the rank.
+    """
+    try:
+        return leaderboardService.getPlayerRank(userId, board, mode)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error fetching leaderboard rank.")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/export", dependencies=[Depends(requireAdminToken)])
+async def exportRows(dataset: str = Query(...), format: str = Query("ndjson"),
+                     since: str = Query(None)) -> StreamingResponse:
+    """
+    Streams every row of a dataset as NDJSON or CSV, reading and sending one chunk of rows at a time. Requires the
+    admin token, as it exposes every player's stats and guesses and holds a database connection for the whole stream.
+    :param: {Query} dataset: playerStats, games, or guesses.
+    :param: {Query} format: ndjson or csv.
+    :param: {Query} since: An ISO 8601 time; only rows updated, ended, or guessed at or after it are exported.
+    :return: {StreamingResponse}: The rows in the requested format.
+    :raise: {HTTPException}:
+        - 400: If the dataset, format, or time is invalid.
+        - 401: If the admin token is missing or wrong.
+        - 403: If no admin token is configured.
+        - 500: If there is an error starting the export.
+    """
+    try:
+        return ExportService().exportRows(dataset, format, since)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error starting export.")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/player-stats-cache-metrics")
+async def getPlayerStatsCacheMetrics() -> JSONResponse:
+    """
+    Returns the hit, miss, and eviction counters of the player stats cache for scraping.
+    :return: {JSONResponse}: The cache's counters, current size, and capacity.
+    """
+    return JSONResponse(content=playerStatsCache.getMetrics(), status_code=200)
+
+
+@app.get("/metrics")
+async def getMetrics() -> PlainTextResponse:
+    """
+    Returns request, dependency, session, and cache metrics for a Prometheus scrape.
+    :return: {PlainTextResponse}: The metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(metricsRegistry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/reset")
-async def resetGameAndPlayer() -> JSONResponse:
+async def resetGameAndPlayer(session: GameSession = Depends(getGameSession)) -> JSONResponse:
     """
-    Resets both in-memory player instance and game instance for fresh login.
+    Resets both the session's in-memory player instance and game instance for fresh login.
+    :param: {GameSession} session: The caller's player and game state, resolved from their session ID.
     :return: {JSONResponse}: Confirmation of game and player reset.
     :raise: {HTTPException}:
         - 500: If there is an error resetting player and game.
     """
     try:
-        game.resetGame()
-        player.resetPlayerData()
-        return JSONResponse(content="Game and player have reset.", status_code=200)
+        async with session.lock:
+            session.game.resetGame()
+            session.player.resetPlayerData()
+        response = JSONResponse(content="Game and player have reset.", status_code=200)
+        return gameSessionRegistry.attachSessionId(response, session)
     except Exception as e:
-        logging.error(f"Error resetting player and game: {traceback.format_exc()}")
+        logger.exception("Error resetting player and game.")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=5000, log_level="debug")
+    # Logging is configured by the loggingPipeline on startup.
+    uvicorn.run(app, host="127.0.0.1", port=5000, log_config=None)
@@ -0,0 +1,70 @@
+from api.features.DifficultyMode.Configs import DifficultyModeConfig
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+import argparse
+import numpy as np
+import time
+
+"""
+Measures how many (guess, code) pairs per second the BatchHintEngine scores for every difficulty mode in the
+DifficultyModeConfig, next to the per-pair Mastermind.__getHint it replaces for bulk scoring.
+
+Run from the root directory with:
+    python -m api.benchmarks.BatchHintBenchmark [--guesses 256] [--codes 4096] [--baseline-pairs 20000]
+"""
+def randomCodes(randomGenerator, count: int, inputLength: int, maxRandomDigit: int) -> np.ndarray:
+    return randomGenerator.integers(MastermindGameMVPConfigs.MIN_RAND_DIGIT, maxRandomDigit + 1,
+                                    size=(count, inputLength), dtype=np.uint8)
+
+
+def benchmarkMode(mode: dict, guesses: int, codes: int, baselinePairs: int, randomGenerator) -> dict:
+    """
+    Scores random guesses against random codes of one difficulty mode with both implementations.
+    :param: {Dictionary} mode - The difficulty mode's configuration.
+    :param: {Int} guesses - Number of guesses in the batch.
+    :param: {Int} codes - Number of codes in the batch.
+    :param: {Int} baselinePairs - Number of pairs scored one at a time with __getHint.
+    :param: {np.random.Generator} randomGenerator - Source of the random codes.
+    :return: {Dictionary} Pairs per second for each implementation.
+    """
+    encodedGuesses = randomCodes(randomGenerator, guesses, mode["INPUT_LEN"], mode["MAX_RAND_DIGIT"])
+    encodedCodes = randomCodes(randomGenerator, codes, mode["INPUT_LEN"], mode["MAX_RAND_DIGIT"])
+
+    startedAt = time.perf_counter()
+    BatchHintEngine.scoreGuesses(encodedGuesses, encodedCodes)
+    batchSeconds = time.perf_counter() - startedAt
+
+    guessStrings = [BatchHintEngine.decodeCode(guess) for guess in encodedGuesses]
+    codeStrings = [BatchHintEngine.decodeCode(code) for code in encodedCodes]
+    startedAt = time.perf_counter()
+    for pairNumber in range(baselinePairs):
+        Mastermind._Mastermind__getHint(None, guessStrings[pairNumber % guesses], codeStrings[pairNumber % codes])
+    baselineSeconds = time.perf_counter() - startedAt
+
+    batchPairsPerSecond = guesses * codes / batchSeconds
+    baselinePairsPerSecond = baselinePairs / baselineSeconds
+    return {
+        "batchPairsPerSecond": batchPairsPerSecond,
+        "baselinePairsPerSecond": baselinePairsPerSecond,
+        "speedup": batchPairsPerSecond / baselinePairsPerSecond
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures batch hint throughput for every difficulty mode.")
+    parser.add_argument("--guesses", type=int, default=256)
+    parser.add_argument("--codes", type=int, default=4096)
+    parser.add_argument("--baseline-pairs", type=int, default=20000)
+    args = parser.parse_args()
+    randomGenerator = np.random.default_rng(0)
+
+    print(f"{'Mode':<12}{'batch pairs/s':>16}{'__getHint pairs/s':>20}{'speedup':>10}")
+    for name, mode in DifficultyModeConfig.difficulty_modes.items():
+        result = benchmarkMode(mode, args.guesses, args.codes, args.baseline_pairs, randomGenerator)
+        print(f"{name:<12}{result['batchPairsPerSecond']:>16,.0f}{result['baselinePairsPerSecond']:>20,.0f}"
+              f"{result['speedup']:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+"""
+Compares creating accounts through POST /create-user, one request per account, with POST /bulk-create-users, one
+request per batch, against the app in-process with a throwaway database.
+
+Both paths hash every password with bcrypt on the same worker pool, which dominates at the default cost on a machine
+with few cores. Pass --bcrypt-rounds 4 to make hashing cheap and compare the rest of the work: the requests, the
+duplicate checks, and the inserts.
+
+Run from the root directory with:
+    python -m api.benchmarks.BulkProvisioningBenchmark [--accounts 200] [--bcrypt-rounds 4]
+"""
+ADMIN_TOKEN = "benchmark-admin-token"
+
+
+async def runBenchmark(accounts: int, concurrency: int, batchSize: int) -> dict:
+    """
+    Creates the accounts both ways and times each.
+    :return: {Dictionary} Seconds and status codes of each path.
+    """
+    # Imported here so the environment set in main is read by the configs.
+    import httpx
+    from api.app import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            statusCodes = {}
+            remainingAccounts = iter(range(accounts))
+
+            async def createUsers():
+                for number in remainingAccounts:
+                    # No session header, so every request gets a fresh session like a new visitor.
+                    response = await client.post("/create-user", json={"username": f"single{number}",
+                                                                       "password": "secret"})
+                    statusCodes[response.status_code] = statusCodes.get(response.status_code, 0) + 1
+
+            startedAt = time.perf_counter()
+            await asyncio.gather(*(createUsers() for _ in range(concurrency)))
+            results["/create-user"] = (time.perf_counter() - startedAt, statusCodes)
+
+            statusCodes = {}
+            startedAt = time.perf_counter()
+            for start in range(0, accounts, batchSize):
+                users = [{"username": f"bulk{number}", "password": "secret"}
+                         for number in range(start, min(start + batchSize, accounts))]
+                response = await client.post("/bulk-create-users", json={"users": users},
+                                             headers={"X-Admin-Token": ADMIN_TOKEN})
+                statusCodes[response.status_code] = statusCodes.get(response.status_code, 0) + 1
+                if response.status_code == 200 and response.json()["failed"]:
+                    statusCodes["failedAccounts"] = statusCodes.get("failedAccounts", 0) + len(response.json()["failed"])
+            results["/bulk-create-users"] = (time.perf_counter() - startedAt, statusCodes)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares per-user and bulk account creation throughput.")
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="Concurrent /create-user requests, kept within the hashing queue to avoid 429s.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Accounts per /bulk-create-users request.")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="Overrides bcrypt's cost for both paths.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["MASTERMIND_DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'Provisioning.db')}"
+        os.environ["MASTERMIND_STATS_LOG_PATH"] = os.path.join(directory, "PlayerStatsWriteBehind.log")
+        os.environ["MASTERMIND_SOLVER_TABLE_DIRECTORY"] = os.path.join(directory, "FeedbackTables")
+        os.environ["MASTERMIND_ADMIN_TOKEN"] = ADMIN_TOKEN
+        os.environ.setdefault("MASTERMIND_MAX_SESSIONS", str(max(args.accounts * 2, 10000)))
+
+        import api.app
+        from api.features.Users.Services.PasswordHashing.PasswordHashingService import passwordContext
+        logging.getLogger().setLevel(logging.WARNING)
+        if args.bcrypt_rounds is not None:
+            passwordContext.update(bcrypt__rounds=args.bcrypt_rounds)
+        results = asyncio.run(runBenchmark(args.accounts, args.concurrency, args.batch_size))
+
+    print(f"{'Path':<22}{'seconds':>10}{'accounts/s':>12}  status codes")
+    for path, (seconds, statusCodes) in results.items():
+        print(f"{path:<22}{seconds:>10.2f}{args.accounts / seconds:>12.1f}  {statusCodes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from api.database.DatabaseEngine import createDatabaseEngine
+from api.database.schema.DatabaseSchema import Base, PlayerStatsTable
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+"""
+Measures end-of-game stat write throughput against a SQLite file database with SQLite's default settings and with the
+tuned pragmas from the DatabaseConfig, while readers query player stats concurrently.
+
+Run from the root directory with:
+    python -m api.benchmarks.DatabaseWriteBenchmark [--games 2000] [--players 200] [--writers 16] [--readers 4]
+"""
+async def runScenario(name: str, sqlitePragmas, games: int, players: int, writers: int, readers: int) -> dict:
+    """
+    Applies the given number of end-of-game updates from concurrent writers while readers loop over player stats.
+    :param: {String} name - Label of the scenario.
+    :param: {Dictionary} sqlitePragmas - Pragmas for the engine, or None for the configured ones.
+    :param: {Int} games - Number of end-of-game updates to apply.
+    :param: {Int} players - Number of players the updates are spread across.
+    :param: {Int} writers - Number of concurrent writer tasks.
+    :param: {Int} readers - Number of concurrent reader tasks.
+    :return: {Dictionary} Throughput and latency results.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = createDatabaseEngine(f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}", echo=False,
+                                      sqlitePragmas=sqlitePragmas)
+        sessionFactory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessionFactory() as session:
+            async with session.begin():
+                session.add_all([PlayerStatsTable(userId=f"player{i}") for i in range(players)])
+
+        endGameStats = {"gamesPlayed": 1, "gamesWon": 1, "highestScore": 100,
+                        "currentLevel": 1, "xpToNextLevel": 100, "currentXp": 50}
+        remainingGames = iter(range(games))
+        latencies = []
+        readCount = 0
+        writing = True
+
+        async def writer():
+            for gameNumber in remainingGames:
+                startedAt = time.perf_counter()
+                async with sessionFactory() as session:
+                    async with session.begin():
+                        await session.execute(
+                            EndGameStatsUtils.buildEndGameStatsUpdate(f"player{gameNumber % players}", endGameStats)
+                        )
+                latencies.append(time.perf_counter() - startedAt)
+
+        async def reader():
+            nonlocal readCount
+            while writing:
+                async with sessionFactory() as session:
+                    await session.execute(
+                        select(PlayerStatsTable).where(PlayerStatsTable.userId == f"player{readCount % players}")
+                    )
+                readCount += 1
+
+        readerTasks = [asyncio.create_task(reader()) for _ in range(readers)]
+        startedAt = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(writers)))
+        elapsed = time.perf_counter() - startedAt
+        writing = False
+        await asyncio.gather(*readerTasks)
+        await engine.dispose()
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "writesPerSecond": games / elapsed,
+        "readsPerSecond": readCount / elapsed,
+        "p50Ms": statistics.median(latencies) * 1000,
+        "p99Ms": latencies[int(len(latencies) * 0.99) - 1] * 1000
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compares stat write throughput with default and tuned SQLite.")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    results = [
+        await runScenario("SQLite defaults", {}, args.games, args.players, args.writers, args.readers),
+        await runScenario("Tuned (WAL)", None, args.games, args.players, args.writers, args.readers)
+    ]
+
+    print(f"{'Scenario':<18}{'writes/s':>12}{'reads/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        print(f"{result['scenario']:<18}{result['writesPerSecond']:>12.0f}{result['readsPerSecond']:>12.0f}"
+              f"{result['p50Ms']:>10.2f}{result['p99Ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
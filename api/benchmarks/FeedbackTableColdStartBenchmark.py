@@ -0,0 +1,95 @@
+from api.features.DifficultyMode.Configs import DifficultyModeConfig
+from api.services.MastermindSolver.MastermindSolverService import MastermindSolverService
+from api.services.MastermindSolver.Utils.FeedbackTableStore import FeedbackTableStore
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+"""
+Measures how long a fresh worker process takes to answer its first suggestion in every mode with a feedback table,
+building the tables in memory versus memory-mapping them from a FeedbackTableStore, and how much private memory the
+tables cost it. Mapped table pages are shared page cache, so they do not count as private memory (Linux only).
+
+Each scenario runs in its own process so nothing is warm, except the operating system's page cache for the saved
+tables, which is exactly what worker processes share.
+
+Run from the root directory with:
+    python -m api.benchmarks.FeedbackTableColdStartBenchmark [--runs 3]
+"""
+def getTableModes(solver: MastermindSolverService) -> list:
+    codeSpaceKeys = [(mode["INPUT_LEN"], MastermindGameMVPConfigs.MIN_RAND_DIGIT, mode["MAX_RAND_DIGIT"])
+                     for mode in DifficultyModeConfig.difficulty_modes.values()]
+    return [codeSpaceKey for codeSpaceKey in codeSpaceKeys if solver.hasFeedbackTable(*codeSpaceKey)]
+
+
+def getPrivateMemoryMb() -> float:
+    """
+    :return: {Float} The process's resident anonymous (unshared) memory in MB.
+    """
+    with open("/proc/self/status", encoding="utf-8") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def runWorker(tableDirectory: str):
+    """
+    Answers one suggestion per table mode and prints the elapsed time and private memory held as JSON.
+    :param: {String} tableDirectory - Directory of the saved tables, or "" to build them in memory.
+    :return: None.
+    """
+    baselineMb = getPrivateMemoryMb()
+    startedAt = time.perf_counter()
+    solver = MastermindSolverService(feedbackTableStore=FeedbackTableStore(tableDirectory) if tableDirectory else None)
+    for inputLength, minRandomDigit, maxRandomDigit in getTableModes(solver):
+        firstGuess = "".join(str(minRandomDigit + position % 2) for position in range(inputLength))
+        solver.suggestGuess(inputLength, minRandomDigit, maxRandomDigit, [(firstGuess, 1, 2)])
+    print(json.dumps({
+        "seconds": time.perf_counter() - startedAt,
+        "privateMb": getPrivateMemoryMb() - baselineMb
+    }))
+
+
+def runScenario(tableDirectory: str, runs: int) -> dict:
+    """
+    Runs the worker in fresh processes and keeps the fastest run.
+    :param: {String} tableDirectory - Directory of the saved tables, or "" to build them in memory.
+    :param: {Int} runs - Number of processes to start.
+    :return: {Dictionary} The fastest run's seconds and private memory.
+    """
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-m", "api.benchmarks.FeedbackTableColdStartBenchmark",
+                                 "--worker", tableDirectory], check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result["seconds"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares building feedback tables with memory-mapping them.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        runWorker(args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as tableDirectory:
+        store = FeedbackTableStore(tableDirectory)
+        for codeSpaceKey in getTableModes(MastermindSolverService()):
+            store.ensureSaved(*codeSpaceKey)
+
+        print(f"{'Scenario':<22}{'first suggestion s':>20}{'private MB held':>18}")
+        for name, directory in (("Build in memory", ""), ("Memory-mapped store", tableDirectory)):
+            result = runScenario(directory, args.runs)
+            print(f"{name:<22}{result['seconds']:>20.3f}{result['privateMb']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
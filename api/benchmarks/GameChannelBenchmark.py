@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from api.benchmarks.LoadTestBenchmark import StubRandomDigitSource, percentile
+
+"""
+Compares playing games over POST /submit-guess with playing them over the /ws/game channel.
+
+A logged-in player per transport plays seeded games over it, in alternating rounds:
+    - http: /enter-game, one /submit-guess per guess, then /get-player-stats once the game is over. With --preflight,
+      each /submit-guess is preceded by the CORS preflight a browser sends for it, since the frontend is on another
+      origin and sends the session header.
+    - websocket: one connection for all the games, sending an enterGame command and then each guess, and receiving the
+      round data and the end-of-game stats as pushed messages.
+
+Requests and messages are driven straight through the ASGI app with no client library and no network, so the process
+CPU time is the server's work, and the latency is the server's handling time. Parsing HTTP requests and WebSocket frames
+off a socket is left out, which favours HTTP, as every guess over HTTP pays for a full request's headers while a
+WebSocket message pays for a few bytes of framing. Each transport keeps its fastest round.
+
+Run from the root directory with:
+    python -m api.benchmarks.GameChannelBenchmark [--games 200] [--rounds 3] [--mode NORMAL] [--preflight]
+"""
+ORIGIN = b"http://localhost:3000"
+
+
+async def httpRequest(app, method: str, path: str, sessionId: str = None, body: dict = None, query: str = "",
+                      headers: list = ()) -> tuple:
+    """
+    Sends one request through the ASGI app.
+    :param: {ASGIApp} app - The application.
+    :param: {String} method - The HTTP method.
+    :param: {String} path - The route.
+    :param: {String} sessionId - Sent in the session header if given.
+    :param: {Dictionary} body - Sent as the JSON body if given.
+    :param: {String} query - The query string.
+    :param: {List} headers - Extra headers as pairs of bytes.
+    :return: {Tuple} The status code, the response headers, and the body.
+    """
+    from api.features.GameSession.Configs import GameSessionConfig
+
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    requestHeaders = [(b"host", b"benchmark"), (b"origin", ORIGIN), (b"content-type", b"application/json"),
+                      (b"content-length", str(len(payload)).encode("ascii")), *headers]
+    if sessionId:
+        requestHeaders.append((GameSessionConfig.SESSION_HEADER_NAME.lower().encode("ascii"),
+                               sessionId.encode("ascii")))
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+             "path": path, "raw_path": path.encode("ascii"), "query_string": query.encode("ascii"), "root_path": "",
+             "headers": requestHeaders, "client": ("127.0.0.1", 0), "server": ("benchmark", 80)}
+    bodySent = False
+    response = {"status": None, "headers": {}, "body": b""}
+
+    async def receive():
+        nonlocal bodySent
+        if not bodySent:
+            bodySent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode("latin-1"): value.decode("latin-1") for key, value in message["headers"]}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], response["body"]
+
+
+class WebSocketDriver:
+    def __init__(self, app, sessionId: str):
+        """
+        Opens a /ws/game connection through the ASGI app.
+        :param: {ASGIApp} app - The application.
+        :param: {String} sessionId - The session to play, sent as the sessionId query parameter.
+        """
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        scope = {"type": "websocket", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "ws",
+                 "path": "/ws/game", "raw_path": b"/ws/game", "query_string": f"sessionId={sessionId}".encode("ascii"),
+                 "root_path": "", "headers": [(b"host", b"benchmark"), (b"origin", ORIGIN)],
+                 "client": ("127.0.0.1", 0), "server": ("benchmark", 80), "subprotocols": []}
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self.outgoing.put))
+
+    def sendText(self, text: str):
+        self.incoming.put_nowait({"type": "websocket.receive", "text": text})
+
+    async def receiveJson(self) -> dict:
+        """
+        :return: {Dictionary} The next message the server sent.
+        :raise: {ConnectionError}: If the server closed the connection.
+        """
+        while True:
+            message = await self.outgoing.get()
+            if message["type"] == "websocket.send":
+                return json.loads(message["text"])
+            if message["type"] == "websocket.close":
+                raise ConnectionError(f"Closed with code {message.get('code')}.")
+
+    async def close(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+def randomGuess(generator: random.Random, mode: dict) -> str:
+    return "".join(str(generator.randint(mode["MIN_RAND_DIGIT"], mode["MAX_RAND_DIGIT"]))
+                   for _ in range(mode["INPUT_LEN"]))
+
+
+async def playOverHttp(app, sessionId: str, userId: str, games: int, modeName: str, mode: dict, seed: int,
+                       preflight: bool) -> dict:
+    """
+    Plays the games over HTTP, one request per guess.
+    :return: {Dictionary} Per-guess and per-stats-request latencies in seconds, and the number of guesses.
+    """
+    generator = random.Random(f"guesses-{seed}")
+    guessLatencies, statsLatencies = [], []
+    preflightHeaders = [(b"access-control-request-method", b"POST"),
+                        (b"access-control-request-headers", b"content-type,x-session-id")]
+    for _ in range(games):
+        await httpRequest(app, "POST", "/enter-game", sessionId, {"mode": modeName})
+        status = "stillPlaying"
+        while status == "stillPlaying":
+            startedAt = time.perf_counter()
+            if preflight:
+                await httpRequest(app, "OPTIONS", "/submit-guess", headers=preflightHeaders)
+            statusCode, _, body = await httpRequest(app, "POST", "/submit-guess", sessionId,
+                                                    {"guess": randomGuess(generator, mode)})
+            guessLatencies.append(time.perf_counter() - startedAt)
+            if statusCode != 200:
+                raise RuntimeError(f"/submit-guess answered {statusCode}: {body!r}")
+            status = json.loads(body)["status"]
+
+        startedAt = time.perf_counter()
+        await httpRequest(app, "GET", "/get-player-stats", sessionId, query=f"userId={userId}")
+        statsLatencies.append(time.perf_counter() - startedAt)
+    return {"guessLatencies": guessLatencies, "statsLatencies": statsLatencies}
+
+
+async def playOverWebSocket(app, sessionId: str, games: int, modeName: str, mode: dict, seed: int) -> dict:
+    """
+    Plays the games over one /ws/game connection, one message per guess.
+    :return: {Dictionary} Per-guess latencies in seconds, and the number of guesses.
+    """
+    generator = random.Random(f"guesses-{seed}")
+    guessLatencies = []
+    websocket = WebSocketDriver(app, sessionId)
+    await websocket.receiveJson()
+    for _ in range(games):
+        websocket.sendText(json.dumps({"type": "enterGame", "mode": modeName}))
+        await websocket.receiveJson()
+        status = "stillPlaying"
+        while status == "stillPlaying":
+            startedAt = time.perf_counter()
+            websocket.sendText(randomGuess(generator, mode))
+            reply = await websocket.receiveJson()
+            if reply["type"] != "round":
+                raise RuntimeError(f"/ws/game answered {reply}")
+            status = reply["status"]
+            if status != "stillPlaying":
+                await websocket.receiveJson()
+            guessLatencies.append(time.perf_counter() - startedAt)
+    await websocket.close()
+    return {"guessLatencies": guessLatencies, "statsLatencies": []}
+
+
+async def runBenchmark(games: int, rounds: int, modeName: str, seed: int, preflight: bool) -> dict:
+    """
+    Starts the app in-process, logs a player in on each transport, and plays the games over both in alternating rounds.
+    :return: {Dictionary} Each transport's fastest round.
+    """
+    # Imported here so the environment set in main is read by the configs.
+    from api.app import app, gameSessionRegistry
+    from api.clients.RandomDigitEntropyPool import entropyPool
+    from api.features.DifficultyMode.Services.DifficultyModeRegistryService import difficultyModeRegistry
+    from api.features.GameSession.Configs import GameSessionConfig
+
+    entropyPool.randomDotOrgAPIClientRequest = StubRandomDigitSource(seed)
+    results = {}
+    async with app.router.lifespan_context(app):
+        mode = await difficultyModeRegistry.getMode(modeName)
+        players = {}
+        for transport in ("http", "websocket"):
+            credentials = {"username": f"channel-benchmark-{transport}", "password": "channel-benchmark-password"}
+            await httpRequest(app, "POST", "/create-user", body=credentials)
+            _, headers, _ = await httpRequest(app, "POST", "/login", body=credentials)
+            sessionId = headers[GameSessionConfig.SESSION_HEADER_NAME.lower()]
+            players[transport] = (sessionId, gameSessionRegistry.resolveSession(sessionId).player.userId)
+
+        for _ in range(rounds):
+            for transport in ("http", "websocket"):
+                sessionId, userId = players[transport]
+                cpuStartedAt, startedAt = time.process_time(), time.perf_counter()
+                if transport == "http":
+                    result = await playOverHttp(app, sessionId, userId, games, modeName, mode, seed, preflight)
+                else:
+                    result = await playOverWebSocket(app, sessionId, games, modeName, mode, seed)
+                result["cpuSeconds"] = time.process_time() - cpuStartedAt
+                result["seconds"] = time.perf_counter() - startedAt
+                if transport not in results or result["cpuSeconds"] < results[transport]["cpuSeconds"]:
+                    results[transport] = result
+    return results
+
+
+def printResults(results: dict, games: int):
+    """
+    Prints each transport's per-guess latency and CPU time.
+    :param: {Dictionary} results - Each transport's fastest round.
+    :param: {Int} games - Games played per round.
+    :return: None.
+    """
+    print(f"{'Transport':<12}{'guesses':>9}{'p50 ms':>9}{'p95 ms':>9}{'stats p50 ms':>14}{'CPU us/guess':>14}"
+          f"{'CPU ms/game':>13}{'games/s':>10}")
+    for transport, result in results.items():
+        guessLatencies = sorted(result["guessLatencies"])
+        statsLatencies = sorted(result["statsLatencies"])
+        statsP50 = f"{percentile(statsLatencies, 0.50) * 1000:.3f}" if statsLatencies else "pushed"
+        print(f"{transport:<12}{len(guessLatencies):>9}{percentile(guessLatencies, 0.50) * 1000:>9.3f}"
+              f"{percentile(guessLatencies, 0.95) * 1000:>9.3f}{statsP50:>14}"
+              f"{result['cpuSeconds'] / len(guessLatencies) * 1e6:>14.1f}{result['cpuSeconds'] / games * 1000:>13.2f}"
+              f"{games / result['seconds']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares playing games over HTTP with playing them over /ws/game.")
+    parser.add_argument("--games", type=int, default=200, help="Games played per transport per round.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--mode", default="NORMAL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--preflight", action="store_true", help="Send a CORS preflight before every HTTP guess.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["MASTERMIND_DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'GameChannel.db')}"
+        os.environ["MASTERMIND_STATS_LOG_PATH"] = os.path.join(directory, "PlayerStatsWriteBehind.log")
+        os.environ["MASTERMIND_SOLVER_TABLE_DIRECTORY"] = os.path.join(directory, "FeedbackTables")
+
+        # The app's startup configures logging at this level.
+        os.environ["MASTERMIND_LOG_LEVEL"] = "WARNING"
+        results = asyncio.run(runBenchmark(args.games, args.rounds, args.mode, args.seed, args.preflight))
+    printResults(results, args.games)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from api.database.schema.DatabaseSchema import Base
+from api.features.Leaderboard.Database.LeaderboardDatabaseService import LeaderboardDatabaseService
+from api.features.Leaderboard.Services.LeaderboardService import LeaderboardService
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from types import SimpleNamespace
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+"""
+Compares serving the highestScore leaderboard from the LeaderboardService's in-memory indexes with querying the
+PlayerStats table for every request, with and without an index on highestScore.
+
+A temporary SQLite database is filled with players and a game per player, the service is rebuilt from it the way it is at
+startup, and then the top 10 and a random player's rank are read both ways, along with the cost of recording a
+finished game.
+
+Run from the root directory with:
+    python -m api.benchmarks.LeaderboardBenchmark [--players 1000000]
+"""
+def fillDatabase(path: str, players: int, seed: int):
+    """
+    Creates the tables and inserts the players' stats and one game each with scores spread like real ones, many
+    players sharing low scores and few reaching high ones.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def createTables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+    asyncio.run(createTables())
+
+    generator = random.Random(seed)
+    connection = sqlite3.connect(path)
+    scores = [int(generator.paretovariate(1.5) * 100) for _ in range(players)]
+    connection.executemany(
+        "INSERT INTO PlayerStats (userId, currentLevel, xpToNextLevel, currentXp, highestScore, gamesWon, gamesPlayed,"
+        " winRate) VALUES (?, ?, 100, 0, ?, 0, 1, ?)",
+        ((f"player{player}", 1 + score // 200, score, generator.randrange(101)) for player, score in enumerate(scores)))
+    connection.executemany(
+        "INSERT INTO Games (userId, mode, status, score) VALUES (?, ?, 'won', ?)",
+        ((f"player{player}", generator.choice(("EASY", "NORMAL", "HARD")), score)
+         for player, score in enumerate(scores)))
+    connection.commit()
+    connection.close()
+
+
+def timeCalls(function, calls: int) -> float:
+    """
+    :return: {Float} Median microseconds per call over the calls.
+    """
+    latencies = []
+    for call in range(calls):
+        startedAt = time.perf_counter()
+        function(call)
+        latencies.append((time.perf_counter() - startedAt) * 1e6)
+    return sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares in-memory leaderboards with SQL queries.")
+    parser.add_argument("--players", type=int, default=1000000)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.db")
+        startedAt = time.perf_counter()
+        fillDatabase(path, args.players, args.seed)
+        print(f"Filled {args.players} players in {time.perf_counter() - startedAt:.1f} s")
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        sessionFactory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        leaderboardService = LeaderboardService(LeaderboardDatabaseService(sessionFactory))
+        startedAt = time.perf_counter()
+        asyncio.run(leaderboardService.rebuild())
+        print(f"Rebuilt the leaderboards in {time.perf_counter() - startedAt:.1f} s")
+        asyncio.run(engine.dispose())
+
+        generator = random.Random(args.seed)
+        userIds = [f"player{generator.randrange(args.players)}" for _ in range(args.calls)]
+        newScores = [generator.randrange(20000) for _ in range(args.calls)]
+
+        def recordGame(call: int):
+            score = newScores[call]
+            player = SimpleNamespace(highestScore=score, currentLevel=1 + score // 200, winRate=50)
+            leaderboardService.recordGame(userIds[call], player, "HARD", score)
+
+        print(f"{'Operation':<12}{'Source':<22}{'median µs':>12}")
+        rows = [
+            ("top 10", "in-memory", timeCalls(lambda call: leaderboardService.getLeaderboard("highestScore"),
+                                              args.calls)),
+            ("rank", "in-memory", timeCalls(lambda call: leaderboardService.getPlayerRank(userIds[call]),
+                                            args.calls)),
+            ("record game", "in-memory", timeCalls(recordGame, args.calls)),
+        ]
+
+        connection = sqlite3.connect(path)
+
+        def topQuery(call: int):
+            connection.execute("SELECT userId, highestScore FROM PlayerStats WHERE gamesPlayed > 0"
+                               " ORDER BY highestScore DESC LIMIT 10").fetchall()
+
+        def rankQuery(call: int):
+            connection.execute("SELECT 1 + COUNT(*) FROM PlayerStats WHERE highestScore >"
+                               " (SELECT highestScore FROM PlayerStats WHERE userId = ?)", (userIds[call],)).fetchone()
+
+        sqlCalls = max(1, args.calls // 20)
+        rows.append(("top 10", "SQL, no index", timeCalls(topQuery, sqlCalls)))
+        rows.append(("rank", "SQL, no index", timeCalls(rankQuery, sqlCalls)))
+        connection.execute("CREATE INDEX ix_PlayerStats_highestScore ON PlayerStats (highestScore)")
+        rows.append(("top 10", "SQL, highestScore index", timeCalls(topQuery, args.calls)))
+        rows.append(("rank", "SQL, highestScore index", timeCalls(rankQuery, args.calls)))
+        connection.close()
+
+        for operation, source, microseconds in rows:
+            print(f"{operation:<12}{source:<22}{microseconds:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+"""
+Load-tests the API in-process with headless bot players.
+
+Each bot has its own session and plays the full flow against the ASGI app through httpx, with no network in between:
+/create-user -> /login -> /enter-game -> /submit-guess until the game is won or lost -> /get-player-stats. Random.org is
+replaced by a seeded local digit source, and the database, write-behind log and feedback tables live in a temporary
+directory. Throughput and p50/p95/p99 latency are reported per endpoint and saved as JSON, which a later run can be
+compared against with --compare.
+
+--logging blocking replaces the app's queued logging pipeline with a plain handler that formats and writes every record
+on the event loop, as the app used to, so the latency cost of logging can be compared at any --log-level.
+
+Run from the root directory with:
+    python -m api.benchmarks.LoadTestBenchmark [--players 50] [--concurrency 25] [--mode NORMAL]
+                                               [--log-level WARNING] [--logging pipeline]
+                                               [--output LoadTestResult.json] [--compare Baseline.json]
+"""
+class StubRandomDigitSource:
+    def __init__(self, seed: int):
+        """
+        Instantiates a seeded stand-in for RandomDotOrgAPIClientRequest.
+        :param: {Int} seed - Seed of the random digits.
+        """
+        self.random = random.Random(seed)
+
+    async def generateWinningCombo(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        return "".join(str(self.random.randint(minRandomDigit, maxRandomDigit)) for _ in range(inputLength))
+
+
+def percentile(sortedValues: list, fraction: float) -> float:
+    """
+    :param: {List} sortedValues - Values in ascending order.
+    :param: {Float} fraction - The percentile as a fraction, e.g. 0.95.
+    :return: {Float} The nearest-rank percentile.
+    """
+    return sortedValues[max(0, min(len(sortedValues) - 1, round(fraction * len(sortedValues)) - 1))]
+
+
+class BotPlayer:
+    def __init__(self, client, mode: str, inputLength: int, maxRandomDigit: int, latencies: dict, statusCodes: dict):
+        """
+        Instantiates a bot with its own session.
+        :param: {httpx.AsyncClient} client - The bot's client, which keeps its session cookie.
+        :param: {String} mode - Difficulty mode to play.
+        :param: {Int} inputLength - Length of a guess in the mode.
+        :param: {Int} maxRandomDigit - Largest digit in a guess in the mode.
+        :param: {Dictionary} latencies - Shared per-endpoint lists of latencies in seconds.
+        :param: {Dictionary} statusCodes - Shared per-endpoint counts of status codes.
+        """
+        self.client = client
+        self.mode = mode
+        self.inputLength = inputLength
+        self.maxRandomDigit = maxRandomDigit
+        self.latencies = latencies
+        self.statusCodes = statusCodes
+
+    async def request(self, method: str, endpoint: str, **kwargs):
+        """
+        Sends one timed request, retrying after the Retry-After delay while the server answers 429.
+        :return: {httpx.Response} The final response.
+        """
+        while True:
+            startedAt = time.perf_counter()
+            response = await self.client.request(method, endpoint, **kwargs)
+            self.latencies.setdefault(endpoint, []).append(time.perf_counter() - startedAt)
+            endpointStatusCodes = self.statusCodes.setdefault(endpoint, {})
+            endpointStatusCodes[response.status_code] = endpointStatusCodes.get(response.status_code, 0) + 1
+            if response.status_code != 429:
+                return response
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+    async def play(self):
+        """
+        Plays the full flow once.
+        :return: None.
+        """
+        credentials = {"username": f"bot-{uuid.uuid4().hex}", "password": "load-test-password"}
+        await self.request("POST", "/create-user", json=credentials)
+        await self.request("POST", "/login", json=credentials)
+        await self.request("POST", "/enter-game", json={"mode": self.mode})
+
+        status, userId = "stillPlaying", None
+        while status == "stillPlaying":
+            guess = "".join(str(random.randint(0, self.maxRandomDigit)) for _ in range(self.inputLength))
+            response = await self.request("POST", "/submit-guess", json={"guess": guess})
+            if response.status_code != 200:
+                break
+            roundData = response.json()
+            status, userId = roundData["status"], roundData["userId"]
+
+        if userId:
+            await self.request("GET", "/get-player-stats", params={"userId": userId})
+
+
+async def runLoadTest(players: int, concurrency: int, mode: str, seed: int, blockingLogging: bool = False) -> dict:
+    """
+    Starts the app in-process and lets the bots play.
+    :param: {Int} players - Number of bots, each playing one game.
+    :param: {Int} concurrency - Number of bots playing at the same time.
+    :param: {String} mode - Difficulty mode the bots play.
+    :param: {Int} seed - Seed of the winning combinations.
+    :param: {Boolean} blockingLogging - Replace the logging pipeline the app starts with a handler writing on the loop.
+    :return: {Dictionary} The run's configuration, totals, and per-endpoint results.
+    """
+    # Imported here so the environment above is read by the configs.
+    import httpx
+    from api.app import app
+    from api.clients.RandomDigitEntropyPool import entropyPool
+    from api.features.DifficultyMode.Configs import DifficultyModeConfig
+    from api.logger.LoggingPipeline import loggingPipeline
+
+    entropyPool.randomDotOrgAPIClientRequest = StubRandomDigitSource(seed)
+    difficulty = DifficultyModeConfig.difficulty_modes[mode]
+    latencies, statusCodes = {}, {}
+    remainingPlayers = iter(range(players))
+
+    async with app.router.lifespan_context(app):
+        if blockingLogging:
+            # The root level set by the pipeline is kept.
+            loggingPipeline.stop()
+            logging.basicConfig(stream=sys.stderr, force=True,
+                                format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        transport = httpx.ASGITransport(app=app)
+
+        async def runBots():
+            for _ in remainingPlayers:
+                async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                    await BotPlayer(client, mode, difficulty["INPUT_LEN"], difficulty["MAX_RAND_DIGIT"],
+                                    latencies, statusCodes).play()
+
+        startedAt = time.perf_counter()
+        await asyncio.gather(*(runBots() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - startedAt
+
+    endpoints = {}
+    for endpoint, endpointLatencies in latencies.items():
+        endpointLatencies.sort()
+        endpoints[endpoint] = {
+            "requests": len(endpointLatencies),
+            "requestsPerSecond": len(endpointLatencies) / elapsed,
+            "p50Ms": percentile(endpointLatencies, 0.50) * 1000,
+            "p95Ms": percentile(endpointLatencies, 0.95) * 1000,
+            "p99Ms": percentile(endpointLatencies, 0.99) * 1000,
+            "statusCodes": {str(code): count for code, count in sorted(statusCodes[endpoint].items())}
+        }
+
+    totalRequests = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "config": {"players": players, "concurrency": concurrency, "mode": mode, "seed": seed},
+        "totals": {"seconds": elapsed, "requests": totalRequests, "requestsPerSecond": totalRequests / elapsed,
+                   "gamesPerSecond": players / elapsed},
+        "endpoints": endpoints
+    }
+
+
+def printResult(result: dict, baseline: dict = None):
+    """
+    Prints the per-endpoint table, with the change from the baseline's p95 latency if one is given.
+    :param: {Dictionary} result - The run's result.
+    :param: {Dictionary} baseline - A previous run's result to compare against.
+    :return: None.
+    """
+    totals = result["totals"]
+    print(f"{totals['requests']} requests in {totals['seconds']:.2f}s: {totals['requestsPerSecond']:.1f} req/s, "
+          f"{totals['gamesPerSecond']:.2f} games/s")
+    print(f"{'Endpoint':<20}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'vs baseline p95':>18}  status codes")
+    for endpoint, stats in result["endpoints"].items():
+        comparison = ""
+        if baseline and endpoint in baseline["endpoints"]:
+            baselineP95 = baseline["endpoints"][endpoint]["p95Ms"]
+            comparison = f"{(stats['p95Ms'] - baselineP95) / baselineP95 * 100:+.1f}%" if baselineP95 else ""
+        print(f"{endpoint:<20}{stats['requests']:>10}{stats['requestsPerSecond']:>10.1f}{stats['p50Ms']:>10.1f}"
+              f"{stats['p95Ms']:>10.1f}{stats['p99Ms']:>10.1f}{comparison:>18}  {stats['statusCodes']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-tests the API in-process with bot players.")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--mode", default="NORMAL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING", help="Root log level while the test runs.")
+    parser.add_argument("--logging", choices=("pipeline", "blocking"), default="pipeline",
+                        help="Log through the app's background pipeline or write records on the event loop.")
+    parser.add_argument("--output", default="LoadTestResult.json", help="Where to save the JSON result.")
+    parser.add_argument("--compare", default=None, help="A previous JSON result to compare against.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["MASTERMIND_DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(directory, 'LoadTest.db')}"
+        os.environ["MASTERMIND_STATS_LOG_PATH"] = os.path.join(directory, "PlayerStatsWriteBehind.log")
+        os.environ["MASTERMIND_SOLVER_TABLE_DIRECTORY"] = os.path.join(directory, "FeedbackTables")
+        os.environ.setdefault("MASTERMIND_MAX_SESSIONS", str(max(args.players * 2, 10000)))
+        # The app's startup configures logging at this level.
+        os.environ["MASTERMIND_LOG_LEVEL"] = args.log_level.upper()
+
+        result = asyncio.run(runLoadTest(args.players, args.concurrency, args.mode, args.seed,
+                                         blockingLogging=args.logging == "blocking"))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baselineFile:
+            baseline = json.load(baselineFile)
+    printResult(result, baseline)
+
+    with open(args.output, "w", encoding="utf-8") as outputFile:
+        json.dump(result, outputFile, indent=2)
+    print(f"Saved result to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
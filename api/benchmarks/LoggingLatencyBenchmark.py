@@ -0,0 +1,93 @@
+from api.logger.LoggingPipeline import LoggingPipeline
+import argparse
+import logging
+import tempfile
+import time
+
+"""
+Measures how long a request waits on a log statement, with records written on the caller's thread like the app's old
+basicConfig handler versus handed to the background LoggingPipeline.
+
+Each scenario logs an INFO message and an error with its traceback, the pattern of every failing request, to a file and
+to a slow sink that stalls for a millisecond per write, like a busy terminal or log collector. Both setups use the same
+text format, so the difference is where the work happens.
+
+Run from the root directory with:
+    python -m api.benchmarks.LoggingLatencyBenchmark [--records 2000]
+"""
+class SlowStream:
+    def __init__(self, stream, delaySeconds: float):
+        self.stream = stream
+        self.delaySeconds = delaySeconds
+
+    def write(self, text: str):
+        time.sleep(self.delaySeconds)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def logRecords(logger: logging.Logger, records: int, withTraceback: bool) -> list:
+    """
+    Logs the records and times each call.
+    :return: {List} Sorted microseconds per call.
+    """
+    latencies = []
+    for record in range(records):
+        startedAt = time.perf_counter()
+        if withTraceback:
+            try:
+                raise ValueError(f"Guess {record} does not meet requirements.")
+            except ValueError:
+                logger.exception("Error submitting guess.")
+        else:
+            logger.info(f"Entered game {record}.")
+        latencies.append((time.perf_counter() - startedAt) * 1e6)
+    return sorted(latencies)
+
+
+def runScenario(setup: str, stream, records: int, withTraceback: bool) -> list:
+    """
+    Configures the root logger the given way, logs the records, and restores it.
+    :return: {List} Sorted microseconds per call.
+    """
+    rootLogger = logging.getLogger()
+    previousHandlers, previousLevel = list(rootLogger.handlers), rootLogger.level
+    pipeline = None
+    if setup == "blocking":
+        logging.basicConfig(level=logging.INFO, stream=stream, force=True,
+                            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    else:
+        # The benchmark logs from one line, so rate limiting is effectively disabled to time every record.
+        pipeline = LoggingPipeline(level="INFO", moduleLevels="", logFormat="text", queueSize=records * 2,
+                                   rateLimitBurst=records, stream=stream)
+        pipeline.start()
+    try:
+        return logRecords(logging.getLogger("api.benchmarks"), records, withTraceback)
+    finally:
+        if pipeline:
+            pipeline.stop()
+        rootLogger.handlers[:] = previousHandlers
+        rootLogger.setLevel(previousLevel)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the caller's latency of blocking and queued logging.")
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--slow-records", type=int, default=300, help="Records logged to the slow sink.")
+    args = parser.parse_args()
+
+    print(f"{'Sink':<8}{'Record':<12}{'Setup':<10}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}")
+    with tempfile.TemporaryFile("w") as logFile:
+        for sinkName, stream, records in (("file", logFile, args.records),
+                                          ("slow", SlowStream(logFile, 0.001), args.slow_records)):
+            for recordName, withTraceback in (("info", False), ("traceback", True)):
+                for setup in ("blocking", "pipeline"):
+                    latencies = runScenario(setup, stream, records, withTraceback)
+                    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+                    print(f"{sinkName:<8}{recordName:<12}{setup:<10}{p50:>10.1f}{p99:>10.1f}{latencies[-1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from api.metrics.DatabaseMetrics import instrumentEngine
+from api.metrics.MetricsMiddleware import MetricsMiddleware
+from api.metrics.MetricsRegistry import MetricsRegistry
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+import argparse
+import asyncio
+import time
+
+"""
+Measures what the metrics cost per request and per SQL statement.
+
+The middleware wraps a bare ASGI app that answers every request immediately, and the statement timers are attached to a
+synchronous in-memory SQLite engine, so the difference with and without them is the cost of the metrics alone rather
+than noise from the rest of the stack. A real FastAPI request is timed alongside for scale. Each scenario keeps the
+fastest of several rounds.
+
+Most of the statement overhead is SQLAlchemy's own event dispatch, which even an empty listener pays, rather than the
+timing itself.
+
+Run from the root directory with:
+    python -m api.benchmarks.MetricsOverheadBenchmark [--requests 20000] [--statements 20000]
+"""
+class BareRoute:
+    path = "/players/{userId}"
+
+
+async def bareApp(scope, receive, send):
+    """ Matches every request to one route and answers it with an empty 200 response. """
+    scope["route"] = BareRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def buildFastAPIApp():
+    app = FastAPI()
+
+    @app.get("/players/{userId}")
+    async def getPlayer(userId: str):
+        return {"userId": userId}
+
+    return app
+
+
+async def timeRequests(app, requests: int) -> float:
+    """
+    Sends GET /players/{userId} requests straight to the ASGI app.
+    :return: {Float} Microseconds per request.
+    """
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    startedAt = time.perf_counter()
+    for request in range(requests):
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+                 "path": f"/players/{request}", "raw_path": f"/players/{request}".encode(), "query_string": b"",
+                 "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("benchmark", 80)}
+        await app(scope, receive, send)
+    return (time.perf_counter() - startedAt) / requests * 1e6
+
+
+def timeStatements(engine, statements: int) -> float:
+    """
+    Runs SELECT statements on the engine.
+    :return: {Float} Microseconds per statement.
+    """
+    with engine.connect() as connection:
+        startedAt = time.perf_counter()
+        for statement in range(statements):
+            connection.execute(text("SELECT :value"), {"value": statement})
+        return (time.perf_counter() - startedAt) / statements * 1e6
+
+
+def runBenchmark(requests: int, statements: int, rounds: int) -> dict:
+    """
+    Times every scenario, interleaving them each round so that drift in machine load affects them alike.
+    :return: {Dictionary} Fastest microseconds per operation keyed by scenario.
+    """
+    instrumentedEngine = create_engine("sqlite://", poolclass=StaticPool)
+    instrumentEngine(instrumentedEngine, MetricsRegistry())
+    scenarios = {
+        "request without metrics": lambda: asyncio.run(timeRequests(bareApp, requests)),
+        "request with metrics": lambda: asyncio.run(timeRequests(MetricsMiddleware(bareApp, MetricsRegistry()),
+                                                                 requests)),
+        "FastAPI request": lambda: asyncio.run(timeRequests(buildFastAPIApp(), requests // 10)),
+        "statement without metrics": lambda: timeStatements(create_engine("sqlite://", poolclass=StaticPool),
+                                                            statements),
+        "statement with metrics": lambda: timeStatements(instrumentedEngine, statements)
+    }
+    results = {name: float("inf") for name in scenarios}
+    for _ in range(rounds):
+        for name, scenario in scenarios.items():
+            results[name] = min(results[name], scenario())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the per-request and per-statement cost of the metrics.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--statements", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = runBenchmark(args.requests, args.statements, args.rounds)
+    for name, microseconds in results.items():
+        print(f"{name:<28}{microseconds:>10.2f} µs")
+    print(f"{'request overhead':<28}{results['request with metrics'] - results['request without metrics']:>10.2f} µs")
+    print(f"{'statement overhead':<28}"
+          f"{results['statement with metrics'] - results['statement without metrics']:>10.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+from api.features.DifficultyMode.Configs import DifficultyModeConfig
+from api.features.LevelUser.Services.LevelUserService import LevelUserService
+from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from api.services.PlayMastermindGameMVP.Utils.MastermindGameUtils import MastermindGameUtils
+from types import SimpleNamespace
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+"""
+Micro-benchmarks the pure-CPU game functions for every built-in difficulty mode and a 20-digit custom one, and gates
+on regressions against stored baselines.
+
+Each benchmark times a fixed, seeded batch of calls in process CPU time with garbage collection paused, after one
+warm-up batch, several times, each right after a calibration loop. Costs are the median ratio of benchmark to
+calibration time, so baselines recorded on one machine stay meaningful on another and drift in machine load cancels out.
+A single process's costs still move by up to 20-50% from one process to the next (memory layout and hash seeds differ),
+so the benchmarks run in PROCESSES worker processes and each cost is the median across them, which keeps run-to-run
+spread under 10%. A run fails (exit code 1) if any benchmark is slower than its baseline by more than the threshold.
+
+Baselines carry a note saying why they were last recorded. Updating them requires one, and --only limits the update to
+the benchmarks whose names contain the given text, so moving one bar never silently moves the others.
+
+Run from the root directory with:
+    python -m api.benchmarks.MicroBenchmarks [--threshold 20] [--processes 5]
+                                             [--update-baselines --note "Why the costs changed" [--only handleLeveling]]
+"""
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "Baselines", "MicroBenchmarkBaselines.json")
+DEFAULT_THRESHOLD_PERCENT = float(os.getenv("MASTERMIND_BENCHMARK_REGRESSION_THRESHOLD", 20))
+CALLS_PER_REPEAT = 10000
+REPEATS = 7
+PROCESSES = 5
+# The built-in modes and a custom mode with the longest codes allowed, which the hint path must not slow down for.
+BENCHMARK_MODES = {
+    **DifficultyModeConfig.difficulty_modes,
+    "CUSTOM20": {"GUESS_COUNT": 10, "INPUT_LEN": DifficultyModeConfig.MAX_INPUT_LEN, "TOTAL_ROUNDS": 10,
+                 "MAX_RAND_DIGIT": 9, "MULTIPLIER": 4}
+}
+
+
+def timeBatch(batch) -> int:
+    """
+    Times one batch of calls.
+    :param: {Callable} batch - Runs CALLS_PER_REPEAT calls.
+    :return: {Int} Process CPU nanoseconds the batch took.
+    """
+    startedAt = time.process_time_ns()
+    batch()
+    return time.process_time_ns() - startedAt
+
+
+def calibrationBatch():
+    """ A fixed pure-Python workload the benchmarks are measured relative to. """
+    for call in range(CALLS_PER_REPEAT):
+        sum(digit * digit for digit in range(20))
+
+
+def measure(batch) -> dict:
+    """
+    Times a benchmark and the calibration workload back to back REPEATS times, with garbage collection paused.
+    :param: {Callable} batch - Runs CALLS_PER_REPEAT calls.
+    :return: {Dictionary} Nanoseconds per call of the fastest repeat and the median calibration-relative cost.
+    """
+    batch()
+    timings, relativeCosts = [], []
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            calibrationNs = timeBatch(calibrationBatch)
+            batchNs = timeBatch(batch)
+            timings.append(batchNs)
+            relativeCosts.append(batchNs / max(calibrationNs, 1))
+    finally:
+        gc.enable()
+    return {"nsPerCall": min(timings) / CALLS_PER_REPEAT, "relativeCost": statistics.median(relativeCosts)}
+
+
+def randomCodes(randomGenerator: random.Random, count: int, inputLength: int, maxRandomDigit: int) -> list:
+    return ["".join(str(randomGenerator.randint(MastermindGameMVPConfigs.MIN_RAND_DIGIT, maxRandomDigit))
+                    for _ in range(inputLength)) for _ in range(count)]
+
+
+def buildBenchmarks() -> dict:
+    """
+    Builds one benchmark per function and difficulty mode, each over seeded inputs.
+    :return: {Dictionary} Benchmark batches keyed by "function[MODE]".
+    """
+    benchmarks = {}
+    eventLoop = asyncio.new_event_loop()
+    for name, mode in BENCHMARK_MODES.items():
+        randomGenerator = random.Random(name)
+        guesses = randomCodes(randomGenerator, CALLS_PER_REPEAT, mode["INPUT_LEN"], mode["MAX_RAND_DIGIT"])
+        codes = randomCodes(randomGenerator, CALLS_PER_REPEAT, mode["INPUT_LEN"], mode["MAX_RAND_DIGIT"])
+        rounds = [randomGenerator.randint(1, mode["TOTAL_ROUNDS"]) for _ in range(CALLS_PER_REPEAT)]
+        statuses = [randomGenerator.choice(("won", "lost")) for _ in range(CALLS_PER_REPEAT)]
+        scores = [round(MastermindGameMVPConfigs.BASE_SCORE * mode["MULTIPLIER"]
+                        * MastermindGameMVPConfigs.ROUND_MULTIPLIER[roundNumber]) for roundNumber in rounds]
+
+        def getHint(guesses=guesses, codes=codes):
+            for guess, code in zip(guesses, codes):
+                Mastermind._Mastermind__getHint(None, guess, code)
+
+        def isPassingRequirements(guesses=guesses, mode=mode):
+            for guess in guesses:
+                MastermindGameUtils.isPassingRequirements(guess, mode["INPUT_LEN"],
+                                                          MastermindGameMVPConfigs.MIN_RAND_DIGIT, mode["MAX_RAND_DIGIT"])
+
+        player = SimpleNamespace(currentLevel=1, xpToNextLevel=100, currentXp=0)
+        levelingService = LevelUserService(player)
+
+        def handleLeveling(scores=scores, player=player, levelingService=levelingService):
+            for score in scores:
+                player.currentLevel, player.xpToNextLevel, player.currentXp = 1, 100, 50
+                levelingService.handleLeveling(score)
+
+        playerStatsService = PlayerStatsManagementService(SimpleNamespace(userId="benchmark"))
+
+        async def assignScoresBatch(statuses=statuses, rounds=rounds, mode=mode):
+            for status, roundNumber in zip(statuses, rounds):
+                await playerStatsService.assignScores(MastermindGameMVPConfigs.BASE_SCORE, status, mode["MULTIPLIER"],
+                                                      roundNumber)
+
+        def assignScores(assignScoresBatch=assignScoresBatch):
+            eventLoop.run_until_complete(assignScoresBatch())
+
+        benchmarks[f"Mastermind.__getHint[{name}]"] = getHint
+        benchmarks[f"MastermindGameUtils.isPassingRequirements[{name}]"] = isPassingRequirements
+        benchmarks[f"LevelUserService.handleLeveling[{name}]"] = handleLeveling
+        benchmarks[f"PlayerStatsManagementService.assignScores[{name}]"] = assignScores
+    return benchmarks
+
+
+def runBenchmarks() -> dict:
+    """
+    Runs every benchmark in this process.
+    :return: {Dictionary} Nanoseconds per call and calibration-relative cost keyed by benchmark name.
+    """
+    return {name: measure(batch) for name, batch in buildBenchmarks().items()}
+
+
+def runWorkers(processes: int) -> dict:
+    """
+    Runs every benchmark in separate worker processes, one after another, and combines their results.
+    :param: {Int} processes - Number of worker processes.
+    :return: {Dictionary} The fastest nanoseconds per call and the median calibration-relative cost across the
+    workers, keyed by benchmark name.
+    """
+    workerResults = []
+    for _ in range(processes):
+        worker = subprocess.run([sys.executable, "-m", "api.benchmarks.MicroBenchmarks", "--worker"],
+                                capture_output=True, text=True, check=True)
+        workerResults.append(json.loads(worker.stdout))
+    return {name: {"nsPerCall": min(result[name]["nsPerCall"] for result in workerResults),
+                   "relativeCost": statistics.median(result[name]["relativeCost"] for result in workerResults)}
+            for name in workerResults[0]}
+
+
+def updateBaselines(results: dict, baselines: dict, note: str, only: str = None) -> dict:
+    """
+    Records this run's costs as the baselines of the selected benchmarks, with the reason they changed.
+    :param: {Dictionary} results - This run's results.
+    :param: {Dictionary} baselines - Stored baselines, kept for every benchmark not selected.
+    :param: {String} note - Why the costs changed.
+    :param: {String} only - Selects the benchmarks whose names contain it; every benchmark if None.
+    :return: {Dictionary} The updated baselines.
+    """
+    updatedBaselines = dict(baselines)
+    for name, result in results.items():
+        if only is None or only in name:
+            updatedBaselines[name] = {"relativeCost": round(result["relativeCost"], 4), "note": note}
+    return updatedBaselines
+
+
+def findRegressions(results: dict, baselines: dict, thresholdPercent: float) -> list:
+    """
+    Compares results with the baselines.
+    :param: {Dictionary} results - This run's results.
+    :param: {Dictionary} baselines - Stored results.
+    :param: {Float} thresholdPercent - Allowed slowdown in percent.
+    :return: {List} (name, changePercent) of every benchmark slower than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baselines:
+            changePercent = (result["relativeCost"] / baselines[name]["relativeCost"] - 1) * 100
+            if changePercent > thresholdPercent:
+                regressions.append((name, changePercent))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks the game hot paths against stored baselines.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PERCENT,
+                        help="Allowed slowdown in percent before a benchmark fails.")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--processes", type=int, default=PROCESSES, help="Worker processes to take the median of.")
+    parser.add_argument("--update-baselines", action="store_true", help="Store this run as the new baselines.")
+    parser.add_argument("--note", default=None, help="Why the baselines are being updated. Required to update them.")
+    parser.add_argument("--only", default=None, help="Only update the baselines whose names contain this text.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(runBenchmarks()))
+        return
+    if args.update_baselines and not args.note:
+        parser.error("--update-baselines requires a --note saying why the costs changed.")
+
+    results = runWorkers(args.processes)
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines, encoding="utf-8") as baselinesFile:
+            baselines = json.load(baselinesFile)
+
+    print(f"{'Benchmark':<58}{'ns/call':>10}{'vs baseline':>14}")
+    for name, result in results.items():
+        change = ""
+        if name in baselines:
+            change = f"{(result['relativeCost'] / baselines[name]['relativeCost'] - 1) * 100:+.1f}%"
+        print(f"{name:<58}{result['nsPerCall']:>10.0f}{change:>14}")
+
+    if args.update_baselines:
+        os.makedirs(os.path.dirname(args.baselines), exist_ok=True)
+        with open(args.baselines, "w", encoding="utf-8") as baselinesFile:
+            json.dump(updateBaselines(results, baselines, args.note, args.only), baselinesFile, indent=2)
+            baselinesFile.write("\n")
+        print(f"Saved baselines to {args.baselines}")
+        return
+
+    regressions = findRegressions(results, baselines, args.threshold)
+    for name, changePercent in regressions:
+        print(f"REGRESSION: {name} is {changePercent:.1f}% slower than its baseline (threshold {args.threshold}%).")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
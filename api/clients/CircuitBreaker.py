@@ -0,0 +1,77 @@
+import time
+
+"""
+A minimal circuit breaker for calls to external APIs. After a run of consecutive failures the circuit opens and calls
+are short-circuited until the reset timeout passes, at which point a single trial call is let through (half-open).
+A successful trial closes the circuit again; a failed one re-opens it, and a cancelled one lets the next call be the
+trial.
+"""
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "halfOpen"
+
+    def __init__(self, failureThreshold: int, resetTimeout: float, clock=time.monotonic):
+        """
+        Instantiates a closed circuit.
+        :param: {Int} failureThreshold - Consecutive failures needed to open the circuit.
+        :param: {Float} resetTimeout - Seconds the circuit stays open before allowing a trial call.
+        :param: {Callable} clock - Monotonic clock, overridable for tests.
+        """
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.clock = clock
+        self.failureCount = 0
+        self.openedAt = None
+        self.trialInFlight = False
+
+    @property
+    def state(self) -> str:
+        """
+        :return: {String} The current state of the circuit: closed, open, or halfOpen.
+        """
+        if self.openedAt is None:
+            return self.CLOSED
+        if self.clock() - self.openedAt >= self.resetTimeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allowRequest(self) -> bool:
+        """
+        Determines whether a call may go to the upstream. While half-open only one trial call is allowed at a time.
+        :return: {Boolean} True if the call should be attempted, False if it should be short-circuited.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self.trialInFlight:
+            self.trialInFlight = True
+            return True
+        return False
+
+    def recordSuccess(self):
+        """
+        Closes the circuit after a successful call.
+        :return: None.
+        """
+        self.failureCount = 0
+        self.openedAt = None
+        self.trialInFlight = False
+
+    def releaseTrial(self):
+        """
+        Gives up the half-open trial slot of a call that ended without an outcome, e.g. because it was cancelled,
+        without counting a failure, so that the next call can be the trial.
+        :return: None.
+        """
+        self.trialInFlight = False
+
+    def recordFailure(self):
+        """
+        Counts a failed call, opening (or re-opening) the circuit once the threshold is reached.
+        :return: None.
+        """
+        self.failureCount += 1
+        self.trialInFlight = False
+        if self.failureCount >= self.failureThreshold or self.openedAt is not None:
+            self.openedAt = self.clock()
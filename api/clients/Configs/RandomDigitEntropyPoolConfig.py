@@ -0,0 +1,11 @@
+import os
+
+"""
+This file contains the configurations for the prefetched pool of random digits that winning combinations are drawn from.
+"""
+# A background refill starts once fewer than LOW_WATERMARK digits are buffered, and tops the buffer up to HIGH_WATERMARK.
+LOW_WATERMARK = int(os.getenv("MASTERMIND_ENTROPY_POOL_LOW_WATERMARK", 500))
+HIGH_WATERMARK = int(os.getenv("MASTERMIND_ENTROPY_POOL_HIGH_WATERMARK", 5000))
+
+# Random.org serves at most 10,000 integers per request.
+MAX_BATCH_SIZE = 10000
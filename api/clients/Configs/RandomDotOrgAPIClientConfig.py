@@ -0,0 +1,19 @@
+import os
+
+"""
+This file contains the configurations for the Random.org API client, its connection pool, and its circuit breaker.
+"""
+RANDOM_DOT_ORG_URL = os.getenv("MASTERMIND_RANDOM_DOT_ORG_URL", "https://www.random.org/integers/")
+
+# Per-request timeouts, in seconds. A slow upstream must never hold a game start for longer than this.
+CONNECT_TIMEOUT = float(os.getenv("MASTERMIND_RANDOM_DOT_ORG_CONNECT_TIMEOUT", 1.0))
+READ_TIMEOUT = float(os.getenv("MASTERMIND_RANDOM_DOT_ORG_READ_TIMEOUT", 2.0))
+
+# Shared connection pool limits. Keep-alive connections are reused across requests.
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30.0
+
+# Number of consecutive failures that opens the circuit, and how long it stays open before a trial request.
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 30.0
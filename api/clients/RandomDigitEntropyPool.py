@@ -0,0 +1,117 @@
+from api.clients.Configs import RandomDigitEntropyPoolConfig as Config
+from api.clients.RandomDotOrgAPIClientRequest import RandomDotOrgAPIClientRequest
+from collections import deque
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Buffers uniformly random digits (0-9) fetched from Random.org in large batches, so that starting a game is an in-memory
+pop instead of a network round trip.
+
+Winning combinations for any difficulty are carved out of the buffer by rejection sampling: digits outside the mode's
+range are discarded rather than folded into it (e.g. with a modulo), which keeps every allowed digit equally likely.
+When the buffer drops below the low watermark a background task tops it back up to the high watermark.
+"""
+class RandomDigitEntropyPool:
+    def __init__(self, randomDotOrgAPIClientRequest: RandomDotOrgAPIClientRequest = None,
+                 lowWatermark: int = Config.LOW_WATERMARK, highWatermark: int = Config.HIGH_WATERMARK,
+                 maxBatchSize: int = Config.MAX_BATCH_SIZE):
+        """
+        Instantiates an empty pool.
+        :param: {RandomDotOrgAPIClientRequest} randomDotOrgAPIClientRequest - The source of random digits.
+        :param: {Int} lowWatermark - Buffered digit count below which a background refill is started.
+        :param: {Int} highWatermark - Buffered digit count a refill tops the buffer up to.
+        :param: {Int} maxBatchSize - The most digits requested from the source at once.
+        """
+        if not 0 <= lowWatermark < highWatermark:
+            raise ValueError("lowWatermark must be non-negative and below highWatermark.")
+        self.randomDotOrgAPIClientRequest = randomDotOrgAPIClientRequest or RandomDotOrgAPIClientRequest()
+        self.lowWatermark = lowWatermark
+        self.highWatermark = highWatermark
+        self.maxBatchSize = maxBatchSize
+        self.digits = deque()
+        self.refillTask = None
+
+    def __len__(self) -> int:
+        return len(self.digits)
+
+    async def popCode(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        """
+        Pops a uniformly random combination out of the buffer, waiting on a refill only if the buffer runs dry.
+        :param: {Int} inputLength - Required length of the combination.
+        :param: {Int} minRandomDigit - The minimum valid digit in the combination.
+        :param: {Int} maxRandomDigit - The maximum valid digit in the combination.
+        :return: {String} Containing the combination.
+        :raise: {ValueError}: If the digit range is not within 0-9.
+        """
+        if not 0 <= minRandomDigit <= maxRandomDigit <= 9:
+            raise ValueError(f"Digit range {minRandomDigit}-{maxRandomDigit} is not within 0-9.")
+
+        # Single characters compare in the same order as the digits they hold.
+        minDigit, maxDigit = str(minRandomDigit), str(maxRandomDigit)
+        code = []
+        while len(code) < inputLength:
+            if not self.digits:
+                await self.refill()
+                continue
+            digit = self.digits.popleft()
+            if minDigit <= digit <= maxDigit:
+                code.append(digit)
+
+        if len(self.digits) < self.lowWatermark:
+            self.scheduleRefill()
+        return ''.join(code)
+
+    def scheduleRefill(self) -> asyncio.Task:
+        """
+        Starts a background refill unless one is already running on the current event loop.
+        :return: {asyncio.Task} The running refill task.
+        """
+        loop = asyncio.get_running_loop()
+        if self.refillTask is None or self.refillTask.done() or self.refillTask.get_loop() is not loop:
+            self.refillTask = loop.create_task(self.__fetchBatch())
+        return self.refillTask
+
+    async def refill(self):
+        """
+        Waits for a refill of the buffer, joining one that is already running.
+        :return: None.
+        """
+        await asyncio.shield(self.scheduleRefill())
+
+    async def start(self):
+        """
+        Starts priming the buffer in the background. Called on application startup.
+        :return: None.
+        """
+        self.scheduleRefill()
+
+    async def stop(self):
+        """
+        Cancels any running refill. Called on application shutdown.
+        :return: None.
+        """
+        if self.refillTask is not None and not self.refillTask.done():
+            self.refillTask.cancel()
+        self.refillTask = None
+
+    async def __fetchBatch(self):
+        """
+        Fetches enough digits in one request to bring the buffer up to the high watermark.
+        :return: None.
+        """
+        batchSize = min(max(self.highWatermark - len(self.digits), 1), self.maxBatchSize)
+        # The client falls back to a local CSPRNG on failure, so a batch is always returned.
+        batch = await self.randomDotOrgAPIClientRequest.generateWinningCombo(
+            inputLength=batchSize,
+            minRandomDigit=0,
+            maxRandomDigit=9
+        )
+        self.digits.extend(batch)
+        logger.debug(f"Entropy pool refilled with {len(batch)} digits, {len(self.digits)} buffered.")
+
+
+# Process-wide pool shared by every game instance.
+entropyPool = RandomDigitEntropyPool()
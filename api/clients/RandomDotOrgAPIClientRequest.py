@@ -1,15 +1,71 @@
-from fastapi import HTTPException
-import requests
+from api.clients.CircuitBreaker import CircuitBreaker
+from api.clients.Configs import RandomDotOrgAPIClientConfig as Config
+from api.metrics.MetricsRegistry import metricsRegistry
+import httpx
 import logging
-import traceback
+import secrets
+import time
+
+logger = logging.getLogger(__name__)
 
 """
 Handles requests to the Random.org API for generating random number combinations.
+
+All instances share one pooled, keep-alive HTTP client and one circuit breaker, so a slow or failing Random.org never
+blocks the event loop and is not hammered once it is known to be down. Whenever the upstream call is skipped, times out,
+or returns an unusable body, the combination is generated locally with the secrets CSPRNG instead.
 """
+randomDotOrgRequestDuration = metricsRegistry.histogram(
+    "mastermind_random_dot_org_request_duration_seconds", "Seconds spent on Random.org requests, by outcome.",
+    ("outcome",))
+localComboFallbacks = metricsRegistry.counter(
+    "mastermind_random_dot_org_fallbacks_total",
+    "Combinations generated locally because Random.org was skipped or failed.")
+
 class RandomDotOrgAPIClientRequest:
-    def __init__(self):
+    sharedHttpClient = None
+    sharedCircuitBreaker = CircuitBreaker(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_TIMEOUT)
+
+    def __init__(self, baseURL: str = None, httpClient: httpx.AsyncClient = None,
+                 circuitBreaker: CircuitBreaker = None):
+        """
+        Instantiates the client. Every argument defaults to the process-wide shared value and is only overridden in
+        tests, e.g. to point at a local stand-in server.
+        :param: {String} baseURL - URL of the Random.org integers endpoint.
+        :param: {httpx.AsyncClient} httpClient - The HTTP client used to make requests.
+        :param: {CircuitBreaker} circuitBreaker - The circuit breaker guarding the upstream.
+        """
         # Constructs the URL for fetching the randomized sequence
-        self.RandomDotOrgURL = "https://www.random.org/integers/"
+        self.RandomDotOrgURL = baseURL or Config.RANDOM_DOT_ORG_URL
+        self.httpClient = httpClient
+        self.circuitBreaker = circuitBreaker or RandomDotOrgAPIClientRequest.sharedCircuitBreaker
+
+    @classmethod
+    def getSharedHttpClient(cls) -> httpx.AsyncClient:
+        """
+        Lazily creates the process-wide pooled HTTP client.
+        :return: {httpx.AsyncClient} The shared HTTP client.
+        """
+        if cls.sharedHttpClient is None or cls.sharedHttpClient.is_closed:
+            cls.sharedHttpClient = httpx.AsyncClient(
+                timeout=httpx.Timeout(Config.READ_TIMEOUT, connect=Config.CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=Config.MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=Config.KEEPALIVE_EXPIRY
+                )
+            )
+        return cls.sharedHttpClient
+
+    @classmethod
+    async def closeSharedHttpClient(cls):
+        """
+        Closes the process-wide pooled HTTP client, releasing its connections. Called on application shutdown.
+        :return: None.
+        """
+        if cls.sharedHttpClient is not None:
+            await cls.sharedHttpClient.aclose()
+            cls.sharedHttpClient = None
 
     async def generateWinningCombo(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
         """
@@ -18,17 +74,59 @@ class RandomDotOrgAPIClientRequest:
         :param: {Int} minRandomDigit - The minimum valid digit in the combination.
         :param: {Int} maxRandomDigit - The maximum valid digit in the combination.
         :return: {String} Containing the winning combination.
-        :raise: {HTTPException}:
-            - 500: If an error occurs generating the combination.
-        """
-        try:
-            randomdotorgResponse = requests.get(self.RandomDotOrgURL,
-                                                params={'num': inputLength, 'min': minRandomDigit,
-                                                        'max': maxRandomDigit, 'col': 1, 'base': 10, 'format': 'plain',
-                                                        'rnd': 'new'})
-            winningValue = randomdotorgResponse.text
-            joinedWinningValue = ''.join(winningValue.split())
-        except Exception as e:
-            logging.error(f"Error generating winning combination: {traceback.format_exc()}")
-            raise HTTPException(status_code=500, detail=str(e))
-        return joinedWinningValue
+        """
+        if self.circuitBreaker.allowRequest():
+            startedAt = time.perf_counter()
+            try:
+                winningCombo = await self.__requestDigits(inputLength, minRandomDigit, maxRandomDigit)
+            except Exception as e:
+                randomDotOrgRequestDuration.observe(time.perf_counter() - startedAt, "failure")
+                self.circuitBreaker.recordFailure()
+                logger.warning(f"Random.org request failed, falling back to local CSPRNG: {e!r}")
+            except BaseException:
+                # A cancelled call says nothing about the upstream, but would otherwise hold the trial slot forever.
+                self.circuitBreaker.releaseTrial()
+                raise
+            else:
+                randomDotOrgRequestDuration.observe(time.perf_counter() - startedAt, "success")
+                self.circuitBreaker.recordSuccess()
+                return winningCombo
+
+        localComboFallbacks.inc()
+        return self.generateLocalCombo(inputLength, minRandomDigit, maxRandomDigit)
+
+    @staticmethod
+    def generateLocalCombo(inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        """
+        Generates a combination locally with the operating system's CSPRNG.
+        :param: {Int} inputLength - Required length of the combination.
+        :param: {Int} minRandomDigit - The minimum valid digit in the combination.
+        :param: {Int} maxRandomDigit - The maximum valid digit in the combination.
+        :return: {String} Containing the combination.
+        """
+        digitRange = maxRandomDigit - minRandomDigit + 1
+        return ''.join(str(minRandomDigit + secrets.randbelow(digitRange)) for _ in range(inputLength))
+
+    async def __requestDigits(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        """
+        Requests the combination from Random.org and validates the response body.
+        :param: {Int} inputLength - Required length of the combination.
+        :param: {Int} minRandomDigit - The minimum valid digit in the combination.
+        :param: {Int} maxRandomDigit - The maximum valid digit in the combination.
+        :return: {String} Containing the combination.
+        :raise: {httpx.HTTPError}: If the request fails or times out.
+        :raise: {ValueError}: If the response does not contain a valid combination.
+        """
+        httpClient = self.httpClient or self.getSharedHttpClient()
+        randomdotorgResponse = await httpClient.get(self.RandomDotOrgURL,
+                                                    params={'num': inputLength, 'min': minRandomDigit,
+                                                            'max': maxRandomDigit, 'col': 1, 'base': 10,
+                                                            'format': 'plain', 'rnd': 'new'})
+        randomdotorgResponse.raise_for_status()
+
+        winningValue = randomdotorgResponse.text.split()
+        if (len(winningValue) != inputLength
+                or not all(value.isdigit() and minRandomDigit <= int(value) <= maxRandomDigit
+                           for value in winningValue)):
+            raise ValueError(f"Unexpected Random.org response body: {randomdotorgResponse.text[:100]!r}")
+        return ''.join(winningValue)
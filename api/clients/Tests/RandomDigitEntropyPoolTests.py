@@ -0,0 +1,88 @@
+from api.clients.RandomDigitEntropyPool import RandomDigitEntropyPool
+from collections import Counter
+import asyncio
+import unittest
+
+"""
+Tests that the RandomDigitEntropyPool serves codes from memory, refills by watermark, and keeps codes in range.
+"""
+class FakeDigitSource:
+    def __init__(self, pattern: str = "0123456789"):
+        self.pattern = pattern
+        self.requestedBatchSizes = []
+
+    async def generateWinningCombo(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        self.requestedBatchSizes.append(inputLength)
+        repeats = inputLength // len(self.pattern) + 1
+        return (self.pattern * repeats)[:inputLength]
+
+
+class RandomDigitEntropyPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange a pool backed by a deterministic digit source. """
+        self.source = FakeDigitSource()
+        self.pool = RandomDigitEntropyPool(self.source, lowWatermark=20, highWatermark=100)
+
+    async def testOneBatchServesManyCodes(self):
+        """
+        Many codes are carved out of a single upstream batch.
+        """
+        # Act
+        await self.pool.refill()
+        codes = [await self.pool.popCode(4, 0, 9) for _ in range(10)]
+
+        # Assert
+        self.assertEqual(self.source.requestedBatchSizes, [100])
+        self.assertEqual(codes[0], "0123")
+        self.assertEqual(len(self.pool), 60)
+
+    async def testDigitsOutsideTheModeRangeAreRejected(self):
+        """
+        Out-of-range digits are discarded rather than mapped into range, so codes only hold allowed digits.
+        """
+        # Act
+        await self.pool.refill()
+        code = await self.pool.popCode(7, 0, 5)
+
+        # Assert
+        self.assertEqual(code, "0123450")
+        self.assertEqual(len(self.pool), 89)
+
+    async def testRejectionSamplingKeepsDigitsUniform(self):
+        """
+        A uniform source stays uniform over a narrower range.
+        """
+        # Act
+        codes = "".join([await self.pool.popCode(6, 0, 7) for _ in range(200)])
+
+        # Assert
+        self.assertEqual(Counter(codes), {str(digit): 150 for digit in range(8)})
+
+    async def testRefillStartsBelowLowWatermark(self):
+        """
+        Dropping below the low watermark starts a background refill up to the high watermark.
+        """
+        # Arrange
+        await self.pool.refill()
+
+        # Act
+        for _ in range(21):
+            await self.pool.popCode(4, 0, 9)
+        await asyncio.sleep(0)
+        await self.pool.refillTask
+
+        # Assert
+        self.assertEqual(self.source.requestedBatchSizes, [100, 84])
+        self.assertEqual(len(self.pool), 100)
+
+    async def testInvalidDigitRangeIsRejected(self):
+        """
+        Digit ranges outside 0-9 cannot be served from the pool.
+        """
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            await self.pool.popCode(4, 0, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
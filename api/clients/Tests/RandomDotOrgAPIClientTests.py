@@ -0,0 +1,146 @@
+from api.clients.CircuitBreaker import CircuitBreaker
+from api.clients.RandomDotOrgAPIClientRequest import RandomDotOrgAPIClientRequest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import httpx
+import threading
+import time
+import unittest
+
+"""
+Tests the RandomDotOrgAPIClientRequest against a local stand-in for the Random.org integers endpoint.
+"""
+class StandInRandomDotOrgHandler(BaseHTTPRequestHandler):
+    requestCount = 0
+
+    def do_GET(self):
+        """ Serves /integers/ like Random.org, /slow/ after a delay, and /broken/ with a server error. """
+        StandInRandomDotOrgHandler.requestCount += 1
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path.startswith("/slow/"):
+            time.sleep(0.5)
+        if url.path.startswith("/broken/"):
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        body = "\n".join(params["max"][0] for _ in range(int(params["num"][0]))) + "\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class RandomDotOrgAPIClientTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        """ Start the stand-in server on a free local port. """
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInRandomDotOrgHandler)
+        cls.baseURL = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        """ Arrange a pooled client with a short timeout and a private circuit breaker. """
+        self.httpClient = httpx.AsyncClient(timeout=httpx.Timeout(0.2))
+        self.circuitBreaker = CircuitBreaker(failureThreshold=2, resetTimeout=60)
+        StandInRandomDotOrgHandler.requestCount = 0
+
+    async def asyncTearDown(self):
+        await self.httpClient.aclose()
+
+    def makeClient(self, path: str) -> RandomDotOrgAPIClientRequest:
+        return RandomDotOrgAPIClientRequest(baseURL=self.baseURL + path, httpClient=self.httpClient,
+                                            circuitBreaker=self.circuitBreaker)
+
+    async def testReturnsUpstreamCombination(self):
+        """
+        A healthy upstream response is joined into the winning combination.
+        """
+        # Act
+        combo = await self.makeClient("/integers/").generateWinningCombo(4, 0, 7)
+
+        # Assert
+        self.assertEqual(combo, "7777")
+
+    async def testFallsBackOnTimeout(self):
+        """
+        A slow upstream is abandoned after the timeout and a local combination is returned.
+        """
+        # Act
+        startTime = time.perf_counter()
+        combo = await self.makeClient("/slow/").generateWinningCombo(6, 0, 9)
+        elapsed = time.perf_counter() - startTime
+
+        # Assert
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(len(combo), 6)
+        self.assertTrue(all(0 <= int(char) <= 9 for char in combo))
+
+    async def testCircuitOpensAfterRepeatedFailures(self):
+        """
+        Once the failure threshold is reached, the upstream is no longer called until the circuit resets.
+        """
+        # Arrange
+        client = self.makeClient("/broken/")
+
+        # Act
+        combos = [await client.generateWinningCombo(4, 0, 5) for _ in range(5)]
+
+        # Assert
+        self.assertEqual(StandInRandomDotOrgHandler.requestCount, 2)
+        self.assertEqual(self.circuitBreaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(all(len(combo) == 4 and all(0 <= int(char) <= 5 for char in combo) for combo in combos))
+
+    async def testHalfOpenCircuitClosesAfterSuccessfulTrial(self):
+        """
+        After the reset timeout a single trial request is let through, and a success closes the circuit.
+        """
+        # Arrange
+        now = [0.0]
+        self.circuitBreaker = CircuitBreaker(failureThreshold=1, resetTimeout=10, clock=lambda: now[0])
+        await self.makeClient("/broken/").generateWinningCombo(4, 0, 7)
+        now[0] = 11.0
+
+        # Act
+        combo = await self.makeClient("/integers/").generateWinningCombo(4, 0, 7)
+
+        # Assert
+        self.assertEqual(combo, "7777")
+        self.assertEqual(self.circuitBreaker.state, CircuitBreaker.CLOSED)
+
+    async def testCancelledTrialReleasesTheHalfOpenCircuit(self):
+        """
+        A trial request cancelled before it finishes does not keep every later request from being the next trial.
+        """
+        # Arrange
+        now = [0.0]
+        self.circuitBreaker = CircuitBreaker(failureThreshold=1, resetTimeout=10, clock=lambda: now[0])
+        await self.makeClient("/broken/").generateWinningCombo(4, 0, 7)
+        now[0] = 11.0
+        trial = asyncio.create_task(self.makeClient("/slow/").generateWinningCombo(4, 0, 7))
+        await asyncio.sleep(0.05)
+
+        # Act
+        trial.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await trial
+        combo = await self.makeClient("/integers/").generateWinningCombo(4, 0, 7)
+
+        # Assert
+        self.assertEqual(combo, "7777")
+        self.assertEqual(self.circuitBreaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+
+"""
+This file contains the configurations for the database engine.
+"""
+# SQLAlchemy async URL of the database, e.g. "sqlite+aiosqlite:///:memory:" for tests or a server database in production.
+DATABASE_URL = os.getenv("MASTERMIND_DATABASE_URL", "sqlite+aiosqlite:///./api/database/Mastermind.db")
+
+# Logs every SQL statement when enabled. Off by default since it dominates request time under load.
+ECHO = os.getenv("MASTERMIND_DATABASE_ECHO", "false").lower() == "true"
+
+# Connections kept open in the pool, extra connections allowed under bursts, and seconds to wait for a free connection.
+POOL_SIZE = int(os.getenv("MASTERMIND_DATABASE_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.getenv("MASTERMIND_DATABASE_MAX_OVERFLOW", 10))
+POOL_TIMEOUT_SECONDS = float(os.getenv("MASTERMIND_DATABASE_POOL_TIMEOUT_SECONDS", 30))
+
+# SQLite pragmas applied to every new connection. WAL lets readers run alongside the writer, and synchronous=NORMAL
+# only fsyncs at checkpoints, which is still crash-safe in WAL mode.
+SQLITE_JOURNAL_MODE = os.getenv("MASTERMIND_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("MASTERMIND_SQLITE_SYNCHRONOUS", "NORMAL")
+
+# Bytes of the database file to memory-map, and pages (or KiB if negative) of page cache per connection.
+SQLITE_MMAP_SIZE = int(os.getenv("MASTERMIND_SQLITE_MMAP_SIZE", 268435456))
+SQLITE_CACHE_SIZE = int(os.getenv("MASTERMIND_SQLITE_CACHE_SIZE", -65536))
+
+# Milliseconds a connection waits on a locked database before failing with "database is locked".
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("MASTERMIND_SQLITE_BUSY_TIMEOUT_MS", 5000))
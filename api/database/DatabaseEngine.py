@@ -0,0 +1,61 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from api.database.Configs import DatabaseConfig as Config
+
+"""
+Builds the application's async database engine from the DatabaseConfig.
+
+SQLite connections are tuned with pragmas as they are opened, so every pooled connection runs in WAL mode with the
+configured sync level, memory map, page cache and busy timeout. An in-memory SQLite database only exists for as long as
+its connection, so it is served from a single shared connection instead of a pool. Any other database gets a sized
+queue pool.
+"""
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": Config.SQLITE_JOURNAL_MODE,
+    "synchronous": Config.SQLITE_SYNCHRONOUS,
+    "mmap_size": Config.SQLITE_MMAP_SIZE,
+    "cache_size": Config.SQLITE_CACHE_SIZE,
+    "busy_timeout": Config.SQLITE_BUSY_TIMEOUT_MS
+}
+
+
+def createDatabaseEngine(databaseURL: str = Config.DATABASE_URL, echo: bool = Config.ECHO,
+                         sqlitePragmas: dict = None) -> AsyncEngine:
+    """
+    Creates an async engine for the database URL.
+    :param: {String} databaseURL - SQLAlchemy async database URL.
+    :param: {Boolean} echo - Whether to log every SQL statement.
+    :param: {Dictionary} sqlitePragmas - Pragmas to apply to every SQLite connection, defaulting to the configured ones.
+    Pass an empty dictionary to keep SQLite's defaults.
+    :return: {AsyncEngine} The configured engine.
+    """
+    url = make_url(databaseURL)
+
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, echo=echo, pool_size=Config.POOL_SIZE, max_overflow=Config.MAX_OVERFLOW,
+                                   pool_timeout=Config.POOL_TIMEOUT_SECONDS, pool_pre_ping=True)
+
+    isInMemory = url.database in (None, "", ":memory:")
+    if isInMemory:
+        engine = create_async_engine(url, echo=echo, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(url, echo=echo, pool_size=Config.POOL_SIZE, max_overflow=Config.MAX_OVERFLOW,
+                                     pool_timeout=Config.POOL_TIMEOUT_SECONDS)
+
+    pragmas = dict(DEFAULT_SQLITE_PRAGMAS if sqlitePragmas is None else sqlitePragmas)
+    if isInMemory:
+        # In-memory databases have no file to journal or map.
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+
+    if pragmas:
+        @event.listens_for(engine.sync_engine, "connect")
+        def applySQLitePragmas(dbapiConnection, connectionRecord):
+            cursor = dbapiConnection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
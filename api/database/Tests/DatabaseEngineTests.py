@@ -0,0 +1,77 @@
+from api.database.DatabaseEngine import createDatabaseEngine
+from sqlalchemy import text
+import os
+import tempfile
+import unittest
+
+"""
+Tests that createDatabaseEngine tunes SQLite connections and keeps in-memory databases alive across connections.
+"""
+class DatabaseEngineTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange a temporary directory for file databases. """
+        self.databaseDirectory = tempfile.TemporaryDirectory()
+        self.databaseURL = f"sqlite+aiosqlite:///{os.path.join(self.databaseDirectory.name, 'test.db')}"
+
+    async def asyncTearDown(self):
+        self.databaseDirectory.cleanup()
+
+    async def readPragma(self, engine, name: str):
+        async with engine.connect() as conn:
+            return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+    async def testFileDatabaseConnectionsAreTuned(self):
+        """
+        Every connection to a file database runs in WAL mode with the configured pragmas.
+        """
+        # Arrange
+        engine = createDatabaseEngine(self.databaseURL, echo=False,
+                                      sqlitePragmas={"journal_mode": "WAL", "synchronous": "NORMAL",
+                                                     "busy_timeout": 2500})
+
+        # Act
+        journalMode = await self.readPragma(engine, "journal_mode")
+        synchronous = await self.readPragma(engine, "synchronous")
+        busyTimeout = await self.readPragma(engine, "busy_timeout")
+        await engine.dispose()
+
+        # Assert
+        self.assertEqual(journalMode, "wal")
+        self.assertEqual(synchronous, 1)
+        self.assertEqual(busyTimeout, 2500)
+
+    async def testEmptyPragmasKeepSQLiteDefaults(self):
+        """
+        Passing no pragmas leaves the connection in SQLite's default rollback-journal mode.
+        """
+        # Arrange
+        engine = createDatabaseEngine(self.databaseURL, echo=False, sqlitePragmas={})
+
+        # Act
+        journalMode = await self.readPragma(engine, "journal_mode")
+        await engine.dispose()
+
+        # Assert
+        self.assertEqual(journalMode, "delete")
+
+    async def testInMemoryDatabaseIsSharedAcrossConnections(self):
+        """
+        Tables created on one connection to an in-memory database are visible to the next.
+        """
+        # Arrange
+        engine = createDatabaseEngine("sqlite+aiosqlite:///:memory:", echo=False)
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE Scores (score INTEGER)"))
+            await conn.execute(text("INSERT INTO Scores VALUES (42)"))
+
+        # Act
+        async with engine.connect() as conn:
+            score = (await conn.execute(text("SELECT score FROM Scores"))).scalar()
+        await engine.dispose()
+
+        # Assert
+        self.assertEqual(score, 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
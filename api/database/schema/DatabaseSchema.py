@@ -1,14 +1,15 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import Column, String, Text, Integer, Boolean
+from api.database.DatabaseEngine import createDatabaseEngine
+from sqlalchemy import Column, String, Text, Integer, Float, Boolean, Index, inspect
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import HTTPException
-import traceback
 import logging
 
-databaseURL = "sqlite+aiosqlite:///./api/database/Mastermind.db"
-engine = create_async_engine(databaseURL, echo=True)
+logger = logging.getLogger(__name__)
+
+engine = createDatabaseEngine()
 sessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
@@ -22,31 +23,90 @@ class UsersTable(Base):
     createdAt = Column(String, default=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
 
-# PlayerStats table schema, where userId is the primary key
+def getTimestamp() -> str:
+    """
+    :return: {String} The current UTC time in ISO 8601 with milliseconds, which sorts chronologically as text.
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+# PlayerStats table schema, where userId is the primary key. updatedAt is set on every insert and update, so exports
+# can select the players changed since a given time through its index
 class PlayerStatsTable(Base):
     __tablename__="PlayerStats"
     userId = Column(String, primary_key=True, index=True)
     currentLevel = Column(Integer, default=1)
     xpToNextLevel = Column(Integer, default=100)
-    currentXp = Column(Integer, default=0.0)
-    highestScore = Column(Integer, default=0.0)
+    currentXp = Column(Integer, default=0)
+    highestScore = Column(Integer, default=0)
     gamesWon = Column(Integer, default=0)
     gamesPlayed = Column(Integer, default=0)
-    winRate = Column(Integer, default=0.0)
+    winRate = Column(Integer, default=0)
+    updatedAt = Column(String, default=getTimestamp, onupdate=getTimestamp, index=True)
+
+# Games table schema, with one row per finished game. gameId increases with every game, so a player's games are paged
+# newest first by gameId through the (userId, gameId) index, and every player's best score per mode is read from the
+# (mode, userId, score) index alone when the leaderboards are rebuilt
+class GamesTable(Base):
+    __tablename__="Games"
+    gameId = Column(Integer, primary_key=True, autoincrement=True)
+    userId = Column(String, nullable=False)
+    mode = Column(String)
+    status = Column(String)
+    score = Column(Integer, default=0)
+    roundsPlayed = Column(Integer)
+    totalRounds = Column(Integer)
+    winningCombo = Column(String)
+    startedAt = Column(String)
+    endedAt = Column(String)
+    __table_args__ = (Index("ix_Games_userId_gameId", "userId", "gameId"),
+                      Index("ix_Games_mode_userId_score", "mode", "userId", "score"))
 
-# FeatureFlag table schema, where id is the primary key
+# Guesses table schema, with one row per guess of a finished game, where (gameId, roundNumber) is the primary key
+class GuessesTable(Base):
+    __tablename__="Guesses"
+    gameId = Column(Integer, primary_key=True)
+    roundNumber = Column(Integer, primary_key=True)
+    guess = Column(String)
+    correctPositionAndNumber = Column(Integer)
+    correctNumbers = Column(Integer)
+    guessedAt = Column(String)
+
+# DifficultyModes table schema, with one row per custom difficulty mode, where name is the primary key. Modes are never
+# changed once created, so games in progress and the history of finished games keep meaning the same thing
+class DifficultyModesTable(Base):
+    __tablename__="DifficultyModes"
+    name = Column(String, primary_key=True)
+    inputLength = Column(Integer, nullable=False)
+    minRandomDigit = Column(Integer, nullable=False, default=0)
+    maxRandomDigit = Column(Integer, nullable=False)
+    totalRounds = Column(Integer, nullable=False)
+    multiplier = Column(Float, nullable=False, default=1)
+    description = Column(String)
+    createdAt = Column(String, default=getTimestamp)
+
+# WriteBehindCheckpoints table schema, recording the last write-behind log segment each buffer has committed
+class WriteBehindCheckpointsTable(Base):
+    __tablename__="WriteBehindCheckpoints"
+    name = Column(String, primary_key=True)
+    segmentNumber = Column(Integer, default=0)
+
+# FeatureFlag table schema, where id is the primary key. Every write sets version to one above the highest in the table,
+# so workers can tell whether any flag changed from the row count and the highest version alone
 class FeatureFlag(Base):
     __tablename__="FeatureFlags"
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String)
+    name = Column(String, unique=True, index=True)
     isActive = Column(Boolean, default=0)
     createdDate = Column(String, default=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     description = Column(String)
+    version = Column(Integer, default=0)
 
 
 async def initDB():
     """
-    Creates the database tables if they don't already exist.
+    Creates the database tables if they don't already exist, and adds columns introduced since an existing table was
+    created.
     :return: None.
     :raise: {HTTPException}:
         - 500: If an error occurs creating the database tables.
@@ -54,6 +114,26 @@ async def initDB():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(addMissingColumns)
     except Exception as e:
-        logging.error(f"Error creating database tables: {traceback.format_exc()}")
+        logger.exception("Error creating database tables.")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def addMissingColumns(connection):
+    """
+    Adds every column of the schema that an existing table lacks, as a nullable column, along with its indexes.
+    :param: {Connection} connection - A synchronous connection inside a transaction.
+    :return: None.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existingColumns = {column["name"] for column in inspector.get_columns(table.name)}
+        missingColumns = [column for column in table.columns if column.name not in existingColumns]
+        for column in missingColumns:
+            logger.info("Adding column %s.%s.", table.name, column.name)
+            connection.exec_driver_sql(
+                f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(connection.dialect)}')
+        if missingColumns:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
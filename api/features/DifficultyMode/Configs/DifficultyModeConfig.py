@@ -1,6 +1,10 @@
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+import os
+
 """
 This file contains the configurations for the various difficulty modes.
 """
+# Built-in difficulty modes. Custom modes are stored in the DifficultyModes table and cannot reuse these names.
 difficulty_modes = {
     "EASY": {
         "GUESS_COUNT": 10,
@@ -30,4 +34,13 @@ difficulty_modes = {
         "MAX_RAND_DIGIT": 9,
         "MULTIPLIER": 4
     }
-}
\ No newline at end of file
+}
+
+# Limits on custom difficulty modes. Rounds are limited to those with a round multiplier.
+MODE_NAME_PATTERN = r"[A-Z][A-Z0-9_]{0,31}"
+MAX_INPUT_LEN = 20
+MAX_TOTAL_ROUNDS = max(MastermindGameMVPConfigs.ROUND_MULTIPLIER)
+MAX_MULTIPLIER = float(os.getenv("MASTERMIND_DIFFICULTY_MODE_MAX_MULTIPLIER", 10))
+
+# Fewest seconds between reloads of the custom modes triggered by a request for a mode this worker does not know yet.
+MISS_RELOAD_INTERVAL_SECONDS = float(os.getenv("MASTERMIND_DIFFICULTY_MODE_MISS_RELOAD_INTERVAL_SECONDS", 1))
@@ -1,3 +1,36 @@
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, DifficultyModesTable
+
 """
-This Database Service file is a skeleton for future development on the DifficultyModeService.
-"""
\ No newline at end of file
+Handles the database interactions for the custom difficulty modes.
+"""
+class DifficultyModeDatabaseService:
+    COLUMNS = ("name", "inputLength", "minRandomDigit", "maxRandomDigit", "totalRounds", "multiplier", "description")
+
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def getModes(self) -> list:
+        """
+        :return: {List} Every custom difficulty mode as a dictionary of its columns.
+        """
+        async with self.sessionFactory() as session:
+            result = await session.execute(
+                select(*(getattr(DifficultyModesTable, column) for column in self.COLUMNS)))
+            return [dict(row._mapping) for row in result.all()]
+
+    async def createMode(self, mode: dict):
+        """
+        Stores a new custom difficulty mode.
+        :param: {Dictionary} mode - The mode's columns.
+        :return: None.
+        :raise: {IntegrityError}: If a mode with the same name already exists.
+        """
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                await session.execute(insert(DifficultyModesTable).values(
+                    **{column: mode.get(column) for column in self.COLUMNS}))
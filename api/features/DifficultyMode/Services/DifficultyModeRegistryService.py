@@ -0,0 +1,175 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from api.features.DifficultyMode.Configs import DifficultyModeConfig as Config
+from api.features.DifficultyMode.Database.DifficultyModeDatabaseService import DifficultyModeDatabaseService
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+from api.services.PlayMastermindGameMVP.Utils.MastermindGameUtils import MastermindGameUtils
+from types import MappingProxyType
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+"""
+Keeps every difficulty mode, built-in and custom, in memory, each compiled once into its settings and a guess pattern,
+so entering a game and validating a guess never touch the database.
+
+Custom modes are loaded from the DifficultyModes table at startup. They are never changed once created, so a worker only
+needs to reload them when asked for a mode it does not know yet, which is how modes created through another worker reach
+this one. Those reloads happen at most once every missReloadInterval seconds, so requests for unknown modes cannot
+flood the database.
+"""
+class DifficultyModeRegistryService:
+    def __init__(self, difficultyModeDatabaseService: DifficultyModeDatabaseService = None,
+                 builtInModes: dict = Config.difficulty_modes,
+                 missReloadInterval: float = Config.MISS_RELOAD_INTERVAL_SECONDS):
+        """
+        Instantiates a registry holding the built-in modes until the custom modes are loaded.
+        :param: {DifficultyModeDatabaseService} difficultyModeDatabaseService - Reads and stores the custom modes.
+        :param: {Dictionary} builtInModes - The built-in modes, in the format of DifficultyModeConfig.difficulty_modes.
+        :param: {Float} missReloadInterval - Fewest seconds between reloads triggered by unknown modes.
+        """
+        self.difficultyModeDatabaseService = difficultyModeDatabaseService or DifficultyModeDatabaseService()
+        self.missReloadInterval = missReloadInterval
+        self.builtInModes = {name: self.compileMode(
+            name, settings["INPUT_LEN"], settings.get("MIN_RAND_DIGIT", MastermindGameMVPConfigs.MIN_RAND_DIGIT),
+            settings["MAX_RAND_DIGIT"], settings["TOTAL_ROUNDS"], settings["MULTIPLIER"]) for name, settings in
+            builtInModes.items()}
+        self.modes = MappingProxyType(dict(self.builtInModes))
+        self.missReloadedAt = None
+
+    @staticmethod
+    def compileMode(name: str, inputLength: int, minRandomDigit: int, maxRandomDigit: int, totalRounds: int,
+                    multiplier: float, description: str = None) -> MappingProxyType:
+        """
+        Validates a mode and compiles it into the settings a game is played with.
+        :param: {String} name - The mode's name.
+        :param: {Int} inputLength - Digits in the winning combination, up to DifficultyModeConfig.MAX_INPUT_LEN.
+        :param: {Int} minRandomDigit - Lowest digit in the winning combination.
+        :param: {Int} maxRandomDigit - Highest digit in the winning combination.
+        :param: {Int} totalRounds - Guesses allowed, up to DifficultyModeConfig.MAX_TOTAL_ROUNDS.
+        :param: {Float} multiplier - Score multiplier of a won game, up to DifficultyModeConfig.MAX_MULTIPLIER.
+        :param: {String} description - What the mode is like.
+        :return: {MappingProxyType} The mode's settings, keyed like DifficultyModeConfig.difficulty_modes, with the
+        MIN_RAND_DIGIT, GUESS_PATTERN and DESCRIPTION as well.
+        :raise: {ValueError}: If the mode is outside the limits in DifficultyModeConfig.
+        """
+        if not isinstance(name, str) or not re.fullmatch(Config.MODE_NAME_PATTERN, name):
+            raise ValueError("Mode names are 1-32 uppercase letters, digits or underscores, starting with a letter.")
+        if not 1 <= inputLength <= Config.MAX_INPUT_LEN:
+            raise ValueError(f"inputLength must be between 1 and {Config.MAX_INPUT_LEN}.")
+        if not 0 <= minRandomDigit <= maxRandomDigit <= 9:
+            raise ValueError("minRandomDigit and maxRandomDigit must be digits, minRandomDigit the lower.")
+        if not 1 <= totalRounds <= Config.MAX_TOTAL_ROUNDS:
+            raise ValueError(f"totalRounds must be between 1 and {Config.MAX_TOTAL_ROUNDS}.")
+        if not 0 < multiplier <= Config.MAX_MULTIPLIER:
+            raise ValueError(f"multiplier must be above 0 and at most {Config.MAX_MULTIPLIER}.")
+
+        return MappingProxyType({
+            "GUESS_COUNT": totalRounds,
+            "INPUT_LEN": inputLength,
+            "TOTAL_ROUNDS": totalRounds,
+            "MIN_RAND_DIGIT": minRandomDigit,
+            "MAX_RAND_DIGIT": maxRandomDigit,
+            "MULTIPLIER": multiplier,
+            "GUESS_PATTERN": MastermindGameUtils.getGuessPattern(inputLength, minRandomDigit, maxRandomDigit),
+            "DESCRIPTION": description
+        })
+
+    async def start(self):
+        """
+        Loads the custom modes. Called on application startup.
+        :return: None.
+        """
+        await self.refresh()
+
+    async def refresh(self):
+        """
+        Replaces the registry with the built-in modes and every valid custom mode stored.
+        :return: None.
+        """
+        modes = dict(self.builtInModes)
+        for row in await self.difficultyModeDatabaseService.getModes():
+            if row["name"] in self.builtInModes:
+                logger.warning("Ignoring custom difficulty mode %s, named like a built-in mode.", row["name"])
+                continue
+            try:
+                modes[row["name"]] = self.compileMode(**row)
+            except (TypeError, ValueError):
+                logger.warning("Ignoring invalid custom difficulty mode %s.", row["name"], exc_info=True)
+        self.modes = MappingProxyType(modes)
+
+    async def getMode(self, name: str):
+        """
+        Looks a mode up in memory, reloading the custom modes first if it is unknown and none were reloaded recently.
+        :param: {String} name - The mode's name.
+        :return: {MappingProxyType} The mode's settings, or None if there is no such mode.
+        """
+        mode = self.modes.get(name)
+        if mode is None and (self.missReloadedAt is None
+                             or time.monotonic() - self.missReloadedAt >= self.missReloadInterval):
+            self.missReloadedAt = time.monotonic()
+            await self.refresh()
+            mode = self.modes.get(name)
+        return mode
+
+    def listModes(self) -> JSONResponse:
+        """
+        Returns every difficulty mode this worker knows.
+        :return: {JSONResponse} Each mode's name, settings, and whether it is custom.
+        """
+        return JSONResponse(content={"modes": [
+            {**self.__describe(name, mode), "isCustom": name not in self.builtInModes}
+            for name, mode in self.modes.items()]}, status_code=200)
+
+    async def createMode(self, name: str, inputLength: int, minRandomDigit: int, maxRandomDigit: int,
+                         totalRounds: int, multiplier: float, description: str = None) -> JSONResponse:
+        """
+        Stores a new custom difficulty mode and makes it playable. Other workers load it the first time they are asked
+        for it.
+        :param: {String} name - The mode's name.
+        :param: {Int} inputLength - Digits in the winning combination.
+        :param: {Int} minRandomDigit - Lowest digit in the winning combination.
+        :param: {Int} maxRandomDigit - Highest digit in the winning combination.
+        :param: {Int} totalRounds - Guesses allowed.
+        :param: {Float} multiplier - Score multiplier of a won game.
+        :param: {String} description - What the mode is like.
+        :return: {JSONResponse} The created mode.
+        :raise: {HTTPException}:
+            - 400: If the mode is outside the limits in DifficultyModeConfig.
+            - 409: If a mode with the same name already exists.
+            - 500: If an error occurs storing the mode.
+        """
+        try:
+            mode = self.compileMode(name, inputLength, minRandomDigit, maxRandomDigit, totalRounds, multiplier,
+                                    description)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if name in self.builtInModes:
+            raise HTTPException(status_code=409, detail="That difficulty mode already exists.")
+
+        try:
+            await self.difficultyModeDatabaseService.createMode({
+                "name": name, "inputLength": inputLength, "minRandomDigit": minRandomDigit,
+                "maxRandomDigit": maxRandomDigit, "totalRounds": totalRounds, "multiplier": multiplier,
+                "description": description})
+        except IntegrityError:
+            raise HTTPException(status_code=409, detail="That difficulty mode already exists.")
+        except Exception as e:
+            logger.exception("Error storing difficulty mode.")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        self.modes = MappingProxyType({**self.modes, name: mode})
+        return JSONResponse(content={**self.__describe(name, mode), "isCustom": True}, status_code=200)
+
+    @staticmethod
+    def __describe(name: str, mode: MappingProxyType) -> dict:
+        return {"name": name, "inputLength": mode["INPUT_LEN"], "minRandomDigit": mode["MIN_RAND_DIGIT"],
+                "maxRandomDigit": mode["MAX_RAND_DIGIT"], "totalRounds": mode["TOTAL_ROUNDS"],
+                "multiplier": mode["MULTIPLIER"], "description": mode["DESCRIPTION"]}
+
+
+# Process-wide difficulty modes, shared by every game.
+difficultyModeRegistry = DifficultyModeRegistryService()
@@ -1,39 +1,46 @@
-from api.features.DifficultyMode.Configs import DifficultyModeConfig
+from api.features.DifficultyMode.Services.DifficultyModeRegistryService import (
+    DifficultyModeRegistryService, difficultyModeRegistry)
 import logging
-import traceback
 from fastapi import HTTPException
 
+logger = logging.getLogger(__name__)
+
 """
 This service class is responsible for setting the difficulty mode of the game.
 """
 class DifficultyModeService:
-    def __init__(self, MastermindGameInstance):
+    def __init__(self, MastermindGameInstance, registry: DifficultyModeRegistryService = difficultyModeRegistry):
         """
         Instantiates an instance of the game in order to manipulate the game's difficulty mode.
         :param {PlayMastermindGameService} MastermindGameInstance: Instance of the game.
+        :param {DifficultyModeRegistryService} registry: The built-in and custom difficulty modes.
         """
         self.mastermind = MastermindGameInstance
+        self.registry = registry
 
     async def setDifficulty(self, mode: str):
         """
-        Depending on the mode indicated, sets the game's difficulty based on the configurations in DifficultyModeConfig.
-        :param: {String} mode: The difficulty mode to set, choices are limited to the keys in DifficultyModeConfig.difficulty_modes.
+        Depending on the mode indicated, sets the game's difficulty based on the mode's settings in the registry, which
+        holds the modes in DifficultyModeConfig.difficulty_modes and the custom modes stored in the database.
+        :param: {String} mode: The difficulty mode to set.
         :return: None.
         :raise: {HTTPException}:
-            - 404: If the mode is not found in the difficulty_modes.
+            - 404: If the mode is not found in the registry.
             - 500: If there is an error setting the difficulty mode.
         """
-        if mode:
-            try:
-                self.mastermind.guessCount = DifficultyModeConfig.difficulty_modes[mode]["GUESS_COUNT"]
-                self.mastermind.inputLength = DifficultyModeConfig.difficulty_modes[mode]["INPUT_LEN"]
-                self.mastermind.totalRounds = DifficultyModeConfig.difficulty_modes[mode]["TOTAL_ROUNDS"]
-                self.mastermind.remainingGuesses = DifficultyModeConfig.difficulty_modes[mode]["TOTAL_ROUNDS"]
-                self.mastermind.maxRandomDigit = DifficultyModeConfig.difficulty_modes[mode]["MAX_RAND_DIGIT"]
-                self.mastermind.multiplier = DifficultyModeConfig.difficulty_modes[mode]["MULTIPLIER"]
-            except Exception as e:
-                logging.error(f"Error setting difficulty modes: {traceback.format_exc()}")
-                raise HTTPException(status_code=500, detail=str(e))
-        else:
+        settings = await self.registry.getMode(mode) if mode else None
+        if settings is None:
             raise HTTPException(status_code=404, detail="Difficulty mode not found.")
 
+        try:
+            self.mastermind.guessCount = settings["GUESS_COUNT"]
+            self.mastermind.inputLength = settings["INPUT_LEN"]
+            self.mastermind.totalRounds = settings["TOTAL_ROUNDS"]
+            self.mastermind.remainingGuesses = settings["TOTAL_ROUNDS"]
+            self.mastermind.minRandomDigit = settings["MIN_RAND_DIGIT"]
+            self.mastermind.maxRandomDigit = settings["MAX_RAND_DIGIT"]
+            self.mastermind.multiplier = settings["MULTIPLIER"]
+            self.mastermind.guessPattern = settings["GUESS_PATTERN"]
+        except Exception as e:
+            logger.exception("Error setting difficulty modes.")
+            raise HTTPException(status_code=500, detail=str(e))
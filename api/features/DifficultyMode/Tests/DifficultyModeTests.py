@@ -1,3 +1,117 @@
-"""
-This Tests file is a skeleton for future testing on the DifficultyModeService.
-"""
\ No newline at end of file
+from api.database.schema.DatabaseSchema import Base
+from api.features.DifficultyMode.Database.DifficultyModeDatabaseService import DifficultyModeDatabaseService
+from api.features.DifficultyMode.Services.DifficultyModeRegistryService import DifficultyModeRegistryService
+from api.features.DifficultyMode.Services.DifficultyModeService import DifficultyModeService
+from api.services.PlayMastermindGameMVP.Utils.MastermindGameUtils import MastermindGameUtils
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from types import SimpleNamespace
+import json
+import unittest
+
+""" Testing that difficulty modes are validated, compiled once, and served from memory on every worker. """
+class DifficultyModeServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database and two workers' registries over it. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.registries = [DifficultyModeRegistryService(DifficultyModeDatabaseService(self.sessionFactory),
+                                                         missReloadInterval=60) for _ in range(2)]
+        for registry in self.registries:
+            await registry.start()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def createLongMode(self, registry: DifficultyModeRegistryService):
+        return await registry.createMode("LONG", 20, 1, 8, 10, 3, "Twenty digits from 1 to 8.")
+
+    def testGuessValidationRejectsWhatIntAccepted(self):
+        """
+        Only guesses of exactly the right length made of ASCII digits in range pass.
+        """
+        # Assert
+        self.assertTrue(MastermindGameUtils.isPassingRequirements("0127", 4, 0, 7))
+        for guess in ("0128", "012", "01234", "01 7", "-127", "٠١٢٣", "0127\n", ""):
+            self.assertFalse(MastermindGameUtils.isPassingRequirements(guess, 4, 0, 7), guess)
+        self.assertIs(MastermindGameUtils.getGuessPattern(4, 0, 7), MastermindGameUtils.getGuessPattern(4, 0, 7))
+
+    async def testCustomModeIsPlayedWithItsSettings(self):
+        """
+        A created mode sets every setting of a game, including its lowest digit.
+        """
+        # Arrange
+        game = SimpleNamespace()
+        await self.createLongMode(self.registries[0])
+
+        # Act
+        await DifficultyModeService(game, self.registries[0]).setDifficulty("LONG")
+
+        # Assert
+        self.assertEqual((game.inputLength, game.minRandomDigit, game.maxRandomDigit, game.totalRounds,
+                          game.remainingGuesses, game.multiplier), (20, 1, 8, 10, 10, 3))
+        self.assertIsNotNone(game.guessPattern.fullmatch("1" * 20))
+        self.assertIsNone(game.guessPattern.fullmatch("0" * 20))
+
+    async def testModeCreatedOnAnotherWorkerIsLoadedOnFirstUse(self):
+        """
+        A worker asked for a mode it does not know reloads the custom modes once, and not again within the interval.
+        """
+        # Arrange
+        await self.createLongMode(self.registries[0])
+        statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda connection, cursor, statement, *args: statements.append(statement))
+
+        # Act
+        longMode = await self.registries[1].getMode("LONG")
+        missingMode = await self.registries[1].getMode("MISSING")
+        normalMode = await self.registries[1].getMode("NORMAL")
+
+        # Assert
+        self.assertEqual(longMode["INPUT_LEN"], 20)
+        self.assertIsNone(missingMode)
+        self.assertEqual(normalMode["MAX_RAND_DIGIT"], 7)
+        self.assertEqual(len(statements), 1)
+
+    async def testInvalidAndDuplicateModesAreRejected(self):
+        """
+        Modes outside the limits are rejected with a 400, and names already taken with a 409.
+        """
+        # Arrange
+        await self.createLongMode(self.registries[0])
+        invalidModes = [("LONGER", 21, 0, 9, 10, 1), ("RANGE", 4, 5, 4, 10, 1), ("ROUNDS", 4, 0, 9, 11, 1),
+                        ("free", 4, 0, 9, 10, 1), ("FREE", 4, 0, 9, 10, 0)]
+
+        # Act & Assert
+        for mode in invalidModes:
+            with self.assertRaises(HTTPException) as context:
+                await self.registries[0].createMode(*mode)
+            self.assertEqual(context.exception.status_code, 400, mode)
+        for registry, name in ((self.registries[1], "LONG"), (self.registries[0], "NORMAL")):
+            with self.assertRaises(HTTPException) as context:
+                await registry.createMode(name, 4, 0, 9, 10, 1)
+            self.assertEqual(context.exception.status_code, 409)
+
+        response = self.registries[0].listModes()
+        modes = {mode["name"]: mode for mode in json.loads(response.body.decode("utf-8"))["modes"]}
+        self.assertEqual(set(modes), {"EASY", "NORMAL", "HARD", "IMPOSSIBLE", "LONG"})
+        self.assertTrue(modes["LONG"]["isCustom"])
+
+    async def testUnknownModeIsNotFound(self):
+        """
+        Entering an unknown mode fails with a 404.
+        """
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await DifficultyModeService(SimpleNamespace(), self.registries[0]).setDifficulty("MISSING")
+        self.assertEqual(context.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
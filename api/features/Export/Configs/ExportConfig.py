@@ -0,0 +1,8 @@
+import os
+
+"""
+This file contains the configurations for the streaming exports.
+"""
+# Rows read from the database and encoded per chunk of the response. Memory use depends on this, not on the number of
+# rows exported.
+CHUNK_SIZE = int(os.getenv("MASTERMIND_EXPORT_CHUNK_SIZE", 1000))
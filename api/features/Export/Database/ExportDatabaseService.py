@@ -0,0 +1,51 @@
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, PlayerStatsTable, GamesTable, GuessesTable
+from api.features.Export.Configs import ExportConfig as Config
+
+"""
+Handles the database interactions for the ExportService, reading whole tables through a streaming cursor one chunk at a
+time so an export never holds more than a chunk of rows in memory.
+"""
+class ExportDatabaseService:
+    # The table, the timestamp column "since" filters on, and the order of each dataset. Each order follows an index.
+    DATASETS = {
+        "playerStats": (PlayerStatsTable.__table__, "updatedAt", ("updatedAt",)),
+        "games": (GamesTable.__table__, "endedAt", ("gameId",)),
+        "guesses": (GuessesTable.__table__, "guessedAt", ("gameId", "roundNumber"))
+    }
+
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    @classmethod
+    def getColumns(cls, dataset: str) -> list:
+        """
+        :param: {String} dataset - One of the DATASETS.
+        :return: {List} The names of the dataset's columns, in the order rows are yielded.
+        """
+        table = cls.DATASETS[dataset][0]
+        return [column.name for column in table.columns]
+
+    async def streamRows(self, dataset: str, since: str = None, chunkSize: int = Config.CHUNK_SIZE):
+        """
+        Yields every row of the dataset, optionally only those stamped at or after a time.
+        :param: {String} dataset - One of the DATASETS.
+        :param: {String} since - A UTC timestamp in the stored ISO 8601 format, or None for every row.
+        :param: {Int} chunkSize - Rows per chunk.
+        :return: {AsyncGenerator} Lists of rows, with the values in getColumns order.
+        """
+        table, timestampColumn, orderColumns = self.DATASETS[dataset]
+        query = select(*table.columns)
+        if since is not None:
+            query = query.where(table.c[timestampColumn] >= since)
+        query = query.order_by(*(table.c[column] for column in orderColumns)).execution_options(yield_per=chunkSize)
+
+        async with self.sessionFactory() as session:
+            # Streams through the session's Core connection, skipping the ORM's per-row processing.
+            connection = await session.connection()
+            result = await connection.stream(query)
+            async for partition in result.partitions(chunkSize):
+                yield partition
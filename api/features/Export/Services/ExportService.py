@@ -0,0 +1,71 @@
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from api.features.Export.Database.ExportDatabaseService import ExportDatabaseService
+from api.features.Export.Utils.ExportEncodingUtils import ExportEncodingUtils
+from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Streams whole datasets, player stats, games, or guesses, as NDJSON or CSV. Rows are read through a streaming cursor and
+encoded one chunk at a time while the response is sent, so an export uses the same memory however many rows it has.
+"""
+class ExportService:
+    def __init__(self, exportDatabaseService: ExportDatabaseService = None):
+        """
+        :param: {ExportDatabaseService} exportDatabaseService - Reads the exported rows, overridable for tests.
+        """
+        self.exportDBService = exportDatabaseService or ExportDatabaseService()
+
+    def exportRows(self, dataset: str, exportFormat: str = "ndjson", since: str = None) -> StreamingResponse:
+        """
+        Starts streaming the dataset's rows.
+        :param: {String} dataset - playerStats, games, or guesses.
+        :param: {String} exportFormat - ndjson or csv.
+        :param: {String} since - An ISO 8601 time; only player stats updated, games ended, or guesses made at or after it
+        are exported. Times without a timezone are taken as UTC.
+        :return: {StreamingResponse} The rows in the requested format.
+        :raise: {HTTPException}:
+            - 400: If the dataset, format, or time is invalid.
+        """
+        if dataset not in ExportDatabaseService.DATASETS:
+            raise HTTPException(status_code=400,
+                                detail=f"Dataset must be one of {', '.join(ExportDatabaseService.DATASETS)}.")
+        if exportFormat not in ExportEncodingUtils.MEDIA_TYPES:
+            raise HTTPException(status_code=400,
+                                detail=f"Format must be one of {', '.join(ExportEncodingUtils.MEDIA_TYPES)}.")
+
+        return StreamingResponse(
+            self.__encodeChunks(dataset, exportFormat, self.__normalizeTimestamp(since)),
+            media_type=ExportEncodingUtils.MEDIA_TYPES[exportFormat],
+            headers={"Content-Disposition": f'attachment; filename="{dataset}.{exportFormat}"'}
+        )
+
+    async def __encodeChunks(self, dataset: str, exportFormat: str, since: str):
+        columns = ExportDatabaseService.getColumns(dataset)
+        header = ExportEncodingUtils.encodeHeader(columns, exportFormat)
+        if header:
+            yield header
+        try:
+            async for rows in self.exportDBService.streamRows(dataset, since):
+                yield ExportEncodingUtils.encodeRows(columns, rows, exportFormat)
+        except Exception:
+            # The status line has already been sent, so the client only sees the response end early.
+            logger.exception("Error exporting %s.", dataset)
+            raise
+
+    @staticmethod
+    def __normalizeTimestamp(since: str):
+        """
+        :return: {String} The time in the format timestamps are stored in, so they compare as text, or None.
+        """
+        if since is None:
+            return None
+        try:
+            sinceTime = datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Since must be an ISO 8601 time.")
+        if sinceTime.tzinfo is None:
+            sinceTime = sinceTime.replace(tzinfo=timezone.utc)
+        return sinceTime.astimezone(timezone.utc).isoformat(timespec="milliseconds")
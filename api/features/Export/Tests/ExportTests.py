@@ -0,0 +1,160 @@
+from api.database.schema.DatabaseSchema import Base, PlayerStatsTable, addMissingColumns
+from api.features.Export.Configs import ExportConfig
+from api.features.Export.Database.ExportDatabaseService import ExportDatabaseService
+from api.features.Export.Services.ExportService import ExportService
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import asyncio
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+""" Testing that exports stream every matching row as NDJSON or CSV in constant memory. """
+class ExportTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database and an export service over it. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.exportService = ExportService(ExportDatabaseService(self.sessionFactory))
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def insertPlayerStats(self, rows: list):
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                await session.execute(insert(PlayerStatsTable), rows)
+
+    @staticmethod
+    def fillPlayerStats(path: str, rowCount: int):
+        connection = sqlite3.connect(path)
+        connection.executemany(
+            'INSERT INTO "PlayerStats" VALUES (?, 1, 100, 0, ?, 0, 0, 0, "2026-01-01T00:00:00.000+00:00")',
+            ((f"player{number:07d}", number) for number in range(rowCount)))
+        connection.commit()
+        connection.close()
+
+    @staticmethod
+    async def readBody(response) -> str:
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    async def testNdjsonAndCsvContainEveryRow(self):
+        """
+        Both formats carry every row and column, CSV under a header row.
+        """
+        # Arrange
+        await self.insertPlayerStats([{"userId": f"player{number}", "highestScore": number * 10}
+                                      for number in range(3)])
+
+        # Act
+        ndjson = await self.readBody(self.exportService.exportRows("playerStats", "ndjson"))
+        csvRows = list(csv.DictReader(io.StringIO(await self.readBody(self.exportService.exportRows("playerStats",
+                                                                                                    "csv")))))
+
+        # Assert
+        entries = [json.loads(line) for line in ndjson.splitlines()]
+        self.assertEqual(sorted((entry["userId"], entry["highestScore"]) for entry in entries),
+                         [("player0", 0), ("player1", 10), ("player2", 20)])
+        self.assertEqual(set(entries[0]), set(ExportDatabaseService.getColumns("playerStats")))
+        self.assertEqual(sorted(row["userId"] for row in csvRows), ["player0", "player1", "player2"])
+
+    async def testSinceSelectsRowsUpdatedSinceThen(self):
+        """
+        Every write stamps updatedAt, and since, with or without a timezone, selects the rows written from then on.
+        """
+        # Arrange
+        await self.insertPlayerStats([
+            {"userId": "player1", "gamesPlayed": 0, "gamesWon": 0, "updatedAt": "2026-01-01T00:00:00.000+00:00"},
+            {"userId": "player2", "gamesPlayed": 0, "gamesWon": 0, "updatedAt": "2026-01-02T00:00:00.000+00:00"}])
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                await session.execute(EndGameStatsUtils.buildEndGameStatsUpdate("player1", {
+                    "gamesPlayed": 1, "gamesWon": 1, "highestScore": 50, "currentLevel": 1, "xpToNextLevel": 100,
+                    "currentXp": 50}))
+
+        # Act
+        async def exportedUserIds(since: str) -> list:
+            body = await self.readBody(self.exportService.exportRows("playerStats", "ndjson", since))
+            return [json.loads(line)["userId"] for line in body.splitlines()]
+
+        # Assert
+        self.assertEqual(await exportedUserIds("2026-01-01T12:00:00"), ["player2", "player1"])
+        self.assertEqual(await exportedUserIds("2026-01-02T01:00:00+02:00"), ["player2", "player1"])
+        self.assertEqual(await exportedUserIds("2099-01-01"), [])
+
+    async def testInvalidRequestsAreRejected(self):
+        """
+        Unknown datasets and formats and unparseable times are rejected before streaming starts.
+        """
+        # Act & Assert
+        for dataset, exportFormat, since in (("users", "ndjson", None), ("games", "xml", None),
+                                             ("games", "csv", "yesterday")):
+            with self.assertRaises(HTTPException) as context:
+                self.exportService.exportRows(dataset, exportFormat, since)
+            self.assertEqual(context.exception.status_code, 400)
+
+    def testMissingColumnsAreAddedToExistingTables(self):
+        """
+        A PlayerStats table created before updatedAt existed gains the column and its index.
+        """
+        # Arrange
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE "PlayerStats" ("userId" VARCHAR PRIMARY KEY, "currentLevel" '
+                                       'INTEGER, "xpToNextLevel" INTEGER, "currentXp" INTEGER, "highestScore" '
+                                       'INTEGER, "gamesWon" INTEGER, "gamesPlayed" INTEGER, "winRate" INTEGER)')
+            Base.metadata.create_all(connection)
+
+            # Act
+            addMissingColumns(connection)
+
+            # Assert
+            inspector = inspect(connection)
+            self.assertIn("updatedAt", {column["name"] for column in inspector.get_columns("PlayerStats")})
+            self.assertIn("ix_PlayerStats_updatedAt", {index["name"] for index in inspector.get_indexes("PlayerStats")})
+
+    @unittest.skipUnless(os.path.exists("/proc/self/statm"), "Reads the resident set size from /proc.")
+    async def testMemoryStaysFlatWhileStreaming(self):
+        """
+        Resident memory stops growing once streaming is under way, however many rows follow. Set
+        MASTERMIND_EXPORT_TEST_ROWS=1000000 to run it on a million rows.
+        """
+        # Arrange
+        rowCount = int(os.getenv("MASTERMIND_EXPORT_TEST_ROWS", 200000))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.db")
+            fileEngine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            async with fileEngine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            await asyncio.to_thread(self.fillPlayerStats, path, rowCount)
+            exportService = ExportService(ExportDatabaseService(sessionmaker(bind=fileEngine, class_=AsyncSession)))
+            pageSize = os.sysconf("SC_PAGE_SIZE")
+
+            # Act
+            residentSizes, exportedLines = [], 0
+            async for chunk in exportService.exportRows("playerStats", "ndjson").body_iterator:
+                exportedLines += chunk.count("\n")
+                with open("/proc/self/statm") as statm:
+                    residentSizes.append(int(statm.read().split()[1]) * pageSize)
+            await fileEngine.dispose()
+
+        # Assert
+        self.assertEqual(exportedLines, rowCount)
+        warmedUp = residentSizes[len(residentSizes) // 10:]
+        # Holding every row would take well over 100 bytes each, over 100 MB for a million rows.
+        self.assertLess(max(warmedUp) - warmedUp[0], 8 * 1024 * 1024,
+                        f"RSS grew from {warmedUp[0]} to {max(warmedUp)} bytes in chunks of {ExportConfig.CHUNK_SIZE}.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+
+"""
+Utility class for encoding exported rows as NDJSON, one JSON object per line, or as CSV with a header row. Rows are
+encoded a chunk at a time, so each chunk becomes one write to the response.
+"""
+class ExportEncodingUtils:
+    MEDIA_TYPES = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv"
+    }
+
+    @staticmethod
+    def encodeHeader(columns: list, exportFormat: str) -> str:
+        """
+        :param: {List} columns - The names of the exported columns.
+        :param: {String} exportFormat - ndjson or csv.
+        :return: {String} The CSV header row, or nothing for NDJSON.
+        """
+        if exportFormat == "csv":
+            return ExportEncodingUtils.encodeRows(columns, [columns], exportFormat)
+        return ""
+
+    @staticmethod
+    def encodeRows(columns: list, rows: list, exportFormat: str) -> str:
+        """
+        :param: {List} columns - The names of the exported columns.
+        :param: {List} rows - The rows, with their values in the order of the columns.
+        :param: {String} exportFormat - ndjson or csv.
+        :return: {String} The rows, each ending with a newline.
+        """
+        if exportFormat == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(rows)
+            return buffer.getvalue()
+        return "".join(json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n" for row in rows)
@@ -0,0 +1,16 @@
+import os
+
+"""
+This file contains the configurations for the feature flags.
+"""
+# Seconds between checks for changed flags. A flag changed on one worker reaches every other worker within this delay.
+POLL_INTERVAL_SECONDS = float(os.getenv("MASTERMIND_FEATURE_FLAG_POLL_INTERVAL_SECONDS", 5))
+
+# Reports remainingCandidates and informationGainedBits after every guess. Turning it off skips pruning the candidate
+# space, the costliest part of a guess in HARD mode.
+CANDIDATE_TRACKING = "candidateTracking"
+
+# State of every flag the code checks until it is stored in the FeatureFlags table.
+DEFAULTS = {
+    CANDIDATE_TRACKING: True,
+}
@@ -0,0 +1,75 @@
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, FeatureFlag
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Handles the database interactions for the FeatureFlagService. Every write gives the flag a version one above the highest
+in the table, so (row count, highest version) changes with every insert, update and delete and is all a worker polls.
+"""
+class FeatureFlagDatabaseService:
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def getVersion(self) -> tuple:
+        """
+        :return: {Tuple} The number of flags and their highest version.
+        """
+        async with self.sessionFactory() as session:
+            result = await session.execute(
+                select(func.count(), func.coalesce(func.max(FeatureFlag.version), 0)).select_from(FeatureFlag))
+            return tuple(result.one())
+
+    async def getFlags(self) -> tuple:
+        """
+        Reads every flag, and the version of the table they were read at.
+        :return: {Tuple} A dictionary of every flag's name to its state and description, and the table's version.
+        """
+        async with self.sessionFactory() as session:
+            result = await session.execute(
+                select(FeatureFlag.name, FeatureFlag.isActive, FeatureFlag.description,
+                       func.coalesce(FeatureFlag.version, 0)))
+            rows = result.all()
+        flags = {name: {"isActive": bool(isActive), "description": description}
+                 for name, isActive, description, _ in rows}
+        return flags, (len(rows), max((version for *_, version in rows), default=0))
+
+    async def setFlag(self, name: str, isActive: bool, description: str = None) -> dict:
+        """
+        Turns a flag on or off, creating it if it does not exist yet, and moves it to the next version of the table.
+        :param: {String} name - The flag's name.
+        :param: {Boolean} isActive - Whether the flag is on.
+        :param: {String} description - What the flag controls, left unchanged when None.
+        :return: {Dictionary} The flag's name, state, description, and version.
+        """
+        nextVersion = select(func.coalesce(func.max(FeatureFlag.version), 0) + 1).scalar_subquery()
+        values = {"isActive": isActive, "version": nextVersion}
+        if description is not None:
+            values["description"] = description
+
+        # A flag created by another worker between the update and the insert is updated on the second attempt.
+        for attempt in range(2):
+            try:
+                async with self.sessionFactory() as session:
+                    async with session.begin():
+                        result = await session.execute(
+                            update(FeatureFlag).where(FeatureFlag.name == name).values(**values))
+                        if result.rowcount == 0:
+                            await session.execute(insert(FeatureFlag).values(name=name, **values))
+                        flag = (await session.execute(
+                            select(FeatureFlag.name, FeatureFlag.isActive, FeatureFlag.description, FeatureFlag.version)
+                            .where(FeatureFlag.name == name))).one()
+                break
+            except IntegrityError:
+                if attempt:
+                    raise
+                logger.info("Feature flag %s was created concurrently, updating it instead.", name)
+
+        return {"name": flag.name, "isActive": bool(flag.isActive), "description": flag.description,
+                "version": flag.version}
@@ -0,0 +1,141 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from api.features.FeatureFlags.Configs import FeatureFlagConfig as Config
+from api.features.FeatureFlags.Database.FeatureFlagDatabaseService import FeatureFlagDatabaseService
+from types import MappingProxyType
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+"""
+Serves feature flags from an immutable in-memory snapshot, so checking a flag on a hot path is a dictionary lookup that
+never touches the database.
+
+The snapshot is loaded at startup and replaced as a whole whenever the FeatureFlags table changes, so a reader sees
+either every flag before a change or every flag after it. Each worker polls the table's version every pollInterval
+seconds and only reads the flags when it has moved, so a flag toggled through any worker reaches all of them within
+pollInterval seconds. If a poll fails the current snapshot keeps being served.
+"""
+class FeatureFlagService:
+    def __init__(self, featureFlagDatabaseService: FeatureFlagDatabaseService = None,
+                 pollInterval: float = Config.POLL_INTERVAL_SECONDS, defaults: dict = Config.DEFAULTS):
+        """
+        Instantiates a snapshot holding the default flags until the first refresh.
+        :param: {FeatureFlagDatabaseService} featureFlagDatabaseService - Reads and writes the stored flags.
+        :param: {Float} pollInterval - Seconds between checks for changed flags.
+        :param: {Dictionary} defaults - State of every flag the code checks until it is stored.
+        """
+        self.featureFlagDatabaseService = featureFlagDatabaseService or FeatureFlagDatabaseService()
+        self.pollInterval = pollInterval
+        self.defaults = dict(defaults)
+        self.flags = MappingProxyType(dict(self.defaults))
+        self.version = None
+        self.refreshedAt = None
+        self.pollTask = None
+
+    def isEnabled(self, name: str) -> bool:
+        """
+        :param: {String} name - The flag's name.
+        :return: {Boolean} Whether the flag is on in the current snapshot, False for unknown flags.
+        """
+        return self.flags.get(name, False)
+
+    @property
+    def snapshotAge(self) -> float:
+        """
+        :return: {Float} Seconds since the snapshot was last confirmed current, or None before the first refresh.
+        """
+        return None if self.refreshedAt is None else time.monotonic() - self.refreshedAt
+
+    async def start(self):
+        """
+        Loads the snapshot and starts polling for changes. Called on application startup.
+        :return: None.
+        """
+        await self.refresh()
+        self.pollTask = asyncio.create_task(self.__pollPeriodically())
+
+    async def stop(self):
+        """
+        Stops polling. Called on application shutdown.
+        :return: None.
+        """
+        if self.pollTask is not None:
+            self.pollTask.cancel()
+            self.pollTask = None
+
+    async def refresh(self) -> bool:
+        """
+        Replaces the snapshot if the stored flags changed since it was loaded.
+        :return: {Boolean} Whether the snapshot was replaced.
+        """
+        if self.version is not None and await self.featureFlagDatabaseService.getVersion() == self.version:
+            self.refreshedAt = time.monotonic()
+            return False
+
+        storedFlags, version = await self.featureFlagDatabaseService.getFlags()
+        self.flags = MappingProxyType({**self.defaults,
+                                       **{name: flag["isActive"] for name, flag in storedFlags.items()}})
+        self.version = version
+        self.refreshedAt = time.monotonic()
+        logger.info("Loaded feature flags at version %s.", version)
+        return True
+
+    async def listFlags(self) -> JSONResponse:
+        """
+        Returns every stored flag along with the state this worker is serving for it, including defaults not stored.
+        :return: {JSONResponse} The snapshot's version and age, and each flag's name, state, and description.
+        """
+        storedFlags, _ = await self.featureFlagDatabaseService.getFlags()
+        names = sorted(set(self.flags) | set(storedFlags))
+        return JSONResponse(content={
+            "version": list(self.version) if self.version is not None else None,
+            "snapshotAgeSeconds": self.snapshotAge,
+            "flags": [{"name": name,
+                       "isActive": storedFlags.get(name, {}).get("isActive", self.defaults.get(name, False)),
+                       "isActiveOnThisWorker": self.isEnabled(name),
+                       "description": storedFlags.get(name, {}).get("description")} for name in names]
+        }, status_code=200)
+
+    async def setFlag(self, name: str, isActive: bool, description: str = None) -> JSONResponse:
+        """
+        Turns a flag on or off for every worker. This worker serves the change immediately, and the others within
+        pollInterval seconds.
+        :param: {String} name - The flag's name.
+        :param: {Boolean} isActive - Whether the flag is on.
+        :param: {String} description - What the flag controls, left unchanged when None.
+        :return: {JSONResponse} The flag's name, state, description, and version, and the delay before every worker
+        serves it.
+        :raise: {HTTPException}:
+            - 400: If the name is empty.
+            - 500: If an error occurs storing the flag.
+        """
+        name = name.strip() if name else ""
+        if not name:
+            raise HTTPException(status_code=400, detail="A feature flag needs a name.")
+
+        try:
+            flag = await self.featureFlagDatabaseService.setFlag(name, isActive, description)
+        except Exception as e:
+            logger.exception("Error storing feature flag.")
+            raise HTTPException(status_code=500, detail=str(e))
+        await self.refresh()
+        return JSONResponse(content={**flag, "propagationSeconds": self.pollInterval}, status_code=200)
+
+    async def __pollPeriodically(self):
+        """
+        Refreshes the snapshot every pollInterval seconds until cancelled.
+        :return: None.
+        """
+        while True:
+            await asyncio.sleep(self.pollInterval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.warning("Error polling feature flags, serving the last snapshot.", exc_info=True)
+
+
+# Process-wide feature flags, checked on hot paths without touching the database.
+featureFlagService = FeatureFlagService()
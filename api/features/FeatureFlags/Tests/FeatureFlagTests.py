@@ -0,0 +1,113 @@
+from api.database.schema.DatabaseSchema import Base
+from api.features.FeatureFlags.Database.FeatureFlagDatabaseService import FeatureFlagDatabaseService
+from api.features.FeatureFlags.Services.FeatureFlagService import FeatureFlagService
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import asyncio
+import json
+import time
+import unittest
+
+""" Testing that feature flags are served from a snapshot that follows changes made through any worker. """
+class FeatureFlagServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database and two workers' flag services over it. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.workers = [FeatureFlagService(FeatureFlagDatabaseService(self.sessionFactory), pollInterval=0.05,
+                                           defaults={"defaultOn": True}) for _ in range(2)]
+        for worker in self.workers:
+            await worker.start()
+
+    async def asyncTearDown(self):
+        for worker in self.workers:
+            await worker.stop()
+        await self.engine.dispose()
+
+    async def testFlagsAreCheckedWithoutQueries(self):
+        """
+        Checking flags reads the snapshot only, and the snapshot cannot be changed in place.
+        """
+        # Arrange
+        statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda connection, cursor, statement, *args: statements.append(statement))
+        await self.workers[0].stop()
+
+        # Act
+        isEnabled = [self.workers[0].isEnabled(name) for name in ("defaultOn", "unknown") * 1000]
+
+        # Assert
+        self.assertEqual(isEnabled[:2], [True, False])
+        self.assertEqual(statements, [])
+        with self.assertRaises(TypeError):
+            self.workers[0].flags["defaultOn"] = False
+
+    async def testToggleReachesEveryWorkerWithinThePollInterval(self):
+        """
+        A flag set through one worker is served by it at once and by the other worker after its next poll.
+        """
+        # Act
+        await self.workers[0].setFlag("newFeature", True, "A feature being rolled out.")
+        startedAt = time.monotonic()
+        self.assertTrue(self.workers[0].isEnabled("newFeature"))
+        while not self.workers[1].isEnabled("newFeature") and time.monotonic() - startedAt < 1:
+            await asyncio.sleep(0.01)
+
+        # Assert
+        self.assertTrue(self.workers[1].isEnabled("newFeature"))
+        # One poll interval, with slack for a busy machine.
+        self.assertLess(time.monotonic() - startedAt, 0.5)
+
+        # Act
+        await self.workers[1].setFlag("defaultOn", False)
+        await asyncio.sleep(0.5)
+
+        # Assert
+        self.assertFalse(self.workers[0].isEnabled("defaultOn"))
+        self.assertTrue(self.workers[0].isEnabled("newFeature"))
+
+    async def testUnchangedFlagsAreNotReloaded(self):
+        """
+        Polls that find the same version keep the current snapshot instead of reading every flag again.
+        """
+        # Arrange
+        await self.workers[0].setFlag("newFeature", True)
+        await self.workers[1].refresh()
+        snapshot = self.workers[1].flags
+
+        # Act
+        isReloaded = await self.workers[1].refresh()
+
+        # Assert
+        self.assertFalse(isReloaded)
+        self.assertIs(self.workers[1].flags, snapshot)
+
+    async def testListingShowsStoredAndDefaultFlags(self):
+        """
+        The listing includes stored flags with their descriptions and defaults that are not stored yet.
+        """
+        # Arrange
+        await self.workers[0].setFlag("newFeature", True, "A feature being rolled out.")
+        await self.workers[0].setFlag("newFeature", False)
+
+        # Act
+        response = await self.workers[0].listFlags()
+
+        # Assert
+        self.assertEqual(json.loads(response.body.decode("utf-8"))["flags"], [
+            {"name": "defaultOn", "isActive": True, "isActiveOnThisWorker": True, "description": None},
+            {"name": "newFeature", "isActive": False, "isActiveOnThisWorker": False,
+             "description": "A feature being rolled out."}])
+        with self.assertRaises(HTTPException) as context:
+            await self.workers[0].setFlag(" ", True)
+        self.assertEqual(context.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
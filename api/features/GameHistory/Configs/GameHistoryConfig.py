@@ -0,0 +1,14 @@
+import os
+
+"""
+This file contains the configurations for the game history.
+"""
+# Games returned per page of a player's history when no limit is requested, and the largest limit accepted.
+DEFAULT_PAGE_SIZE = int(os.getenv("MASTERMIND_GAME_HISTORY_DEFAULT_PAGE_SIZE", 20))
+MAX_PAGE_SIZE = int(os.getenv("MASTERMIND_GAME_HISTORY_MAX_PAGE_SIZE", 100))
+
+# Finished games are queued and written in the background, at most WRITE_BATCH_SIZE games per transaction. Once
+# MAX_QUEUED_GAMES are waiting, further games are dropped from the history (never from the player's stats) until the
+# writer catches up.
+MAX_QUEUED_GAMES = int(os.getenv("MASTERMIND_GAME_HISTORY_MAX_QUEUED_GAMES", 10000))
+WRITE_BATCH_SIZE = int(os.getenv("MASTERMIND_GAME_HISTORY_WRITE_BATCH_SIZE", 100))
@@ -0,0 +1,65 @@
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, GamesTable, GuessesTable
+
+"""
+Handles the database interactions for the GameHistoryService: storing finished games with all of their guesses, and
+reading a player's games back one keyset page at a time.
+"""
+class GameHistoryDatabaseService:
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def insertGames(self, games: list) -> list:
+        """
+        Stores several games and their guesses in one transaction, inserting the guesses of every game with a single
+        batched statement.
+        :param: {List} games - (game, rounds) pairs of GamesTable and GuessesTable column values, without gameIds.
+        :return: {List} The new games' gameIds, in order.
+        """
+        gameIds = []
+        guesses = []
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                for game, rounds in games:
+                    result = await session.execute(insert(GamesTable).values(**game).returning(GamesTable.gameId))
+                    gameId = result.scalar_one()
+                    gameIds.append(gameId)
+                    guesses.extend(dict(roundData, gameId=gameId) for roundData in rounds)
+                if guesses:
+                    await session.execute(insert(GuessesTable), guesses)
+        return gameIds
+
+    async def getGames(self, userId: str, limit: int, beforeGameId: int = None) -> tuple:
+        """
+        Reads a page of the player's games, newest first, with their guesses. The page starts right after the cursor
+        through the (userId, gameId) index, so every page costs the same however deep it is.
+        :param: {String} userId - UserId of the player.
+        :param: {Int} limit - Maximum number of games to return.
+        :param: {Int} beforeGameId - Only games older than this gameId are returned, or the newest games if None.
+        :return: {Tuple} The page's GamesTable rows, their GuessesTable rows keyed by gameId, and whether older games
+        remain.
+        """
+        query = select(GamesTable).where(GamesTable.userId == userId)
+        if beforeGameId is not None:
+            query = query.where(GamesTable.gameId < beforeGameId)
+        query = query.order_by(GamesTable.gameId.desc()).limit(limit + 1)
+
+        async with self.sessionFactory() as session:
+            games = list((await session.execute(query)).scalars())
+            hasMore = len(games) > limit
+            games = games[:limit]
+
+            guessesByGame = {game.gameId: [] for game in games}
+            if games:
+                guesses = await session.execute(
+                    select(GuessesTable)
+                    .where(GuessesTable.gameId.in_(guessesByGame))
+                    .order_by(GuessesTable.gameId, GuessesTable.roundNumber)
+                )
+                for guess in guesses.scalars():
+                    guessesByGame[guess.gameId].append(guess)
+        return games, guessesByGame, hasMore
@@ -0,0 +1,94 @@
+from api.features.GameHistory.Configs import GameHistoryConfig as Config
+from api.features.GameHistory.Database.GameHistoryDatabaseService import GameHistoryDatabaseService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Writes finished games and their guesses to the database in the background, off the critical path of the final guess.
+
+Games are queued as they end and a single task writes everything queued, up to batchSize games per transaction. The
+queue is bounded: if the database falls behind, games beyond maxQueuedGames are dropped from the history with a
+warning. Games still queued are written when the writer is stopped on shutdown, and lost if the process crashes, as the
+history is not part of the player's stats.
+"""
+class GameHistoryWriter:
+    def __init__(self, gameHistoryDatabaseService: GameHistoryDatabaseService = None,
+                 maxQueuedGames: int = Config.MAX_QUEUED_GAMES, batchSize: int = Config.WRITE_BATCH_SIZE):
+        """
+        Instantiates a writer with an empty queue.
+        :param: {GameHistoryDatabaseService} gameHistoryDatabaseService - Stores the games, overridable for tests.
+        :param: {Int} maxQueuedGames - Games that can wait to be written before further games are dropped.
+        :param: {Int} batchSize - Most games written per transaction.
+        """
+        self.gameHistoryDBService = gameHistoryDatabaseService or GameHistoryDatabaseService()
+        self.maxQueuedGames = maxQueuedGames
+        self.batchSize = batchSize
+        self.queue = asyncio.Queue(maxQueuedGames)
+        self.writerTask = None
+        self.droppedGames = 0
+
+    async def start(self):
+        """
+        Starts writing queued games. Called on application startup.
+        :return: None.
+        """
+        # A queue waits on the event loop it was first used in, so a fresh one takes over anything queued before.
+        queued, self.queue = self.queue, asyncio.Queue(self.maxQueuedGames)
+        while not queued.empty():
+            self.queue.put_nowait(queued.get_nowait())
+        self.writerTask = asyncio.create_task(self.__writeQueuedGames())
+
+    async def stop(self):
+        """
+        Writes every queued game, then stops the writer. Called on application shutdown.
+        :return: None.
+        """
+        if self.writerTask is None:
+            return
+        await self.drain()
+        self.writerTask.cancel()
+        await asyncio.gather(self.writerTask, return_exceptions=True)
+        self.writerTask = None
+
+    def enqueue(self, game: dict, rounds: list):
+        """
+        Queues a finished game to be written, without waiting for the database.
+        :param: {Dictionary} game - The GamesTable column values of the game, without its gameId.
+        :param: {List} rounds - The GuessesTable column values of each guess, without their gameId.
+        :return: None.
+        """
+        try:
+            self.queue.put_nowait((game, rounds))
+        except asyncio.QueueFull:
+            self.droppedGames += 1
+            logger.warning(f"Game history queue is full; dropping the game of {game.get('userId')}.")
+
+    async def drain(self):
+        """
+        Waits until every game queued so far has been written, or has failed to be.
+        :return: None.
+        """
+        await self.queue.join()
+
+    async def __writeQueuedGames(self):
+        """
+        Writes queued games in batches until cancelled. A batch that fails is logged and dropped.
+        :return: None.
+        """
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batchSize and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self.gameHistoryDBService.insertGames(batch)
+            except Exception:
+                logger.exception(f"Error recording the history of {len(batch)} games.")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+# Process-wide writer shared by every game instance.
+gameHistoryWriter = GameHistoryWriter()
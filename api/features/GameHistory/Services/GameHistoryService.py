@@ -0,0 +1,71 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from api.features.GameHistory.Configs import GameHistoryConfig as Config
+from api.features.GameHistory.Database.GameHistoryDatabaseService import GameHistoryDatabaseService
+from api.features.GameHistory.Database.GameHistoryWriter import GameHistoryWriter, gameHistoryWriter
+
+"""
+Records finished games with their guesses in the background, and serves each player's game history newest first, one
+page at a time.
+"""
+class GameHistoryService:
+    def __init__(self, gameHistoryDatabaseService: GameHistoryDatabaseService = None,
+                 writer: GameHistoryWriter = gameHistoryWriter):
+        """
+        :param: {GameHistoryDatabaseService} gameHistoryDatabaseService - Reads the games, overridable for tests.
+        :param: {GameHistoryWriter} writer - Writes finished games in the background, overridable for tests.
+        """
+        self.gameHistoryDBService = gameHistoryDatabaseService or GameHistoryDatabaseService()
+        self.writer = writer
+
+    def recordGame(self, game: dict, rounds: list):
+        """
+        Queues a finished game and every guess buffered during it to be stored with one batched write in the
+        background, so the player's last guess never waits for the database.
+        :param: {Dictionary} game - userId, mode, status, score, roundsPlayed, totalRounds, winningCombo, startedAt, and
+        endedAt of the game.
+        :param: {List} rounds - roundNumber, guess, correctPositionAndNumber, correctNumbers, and guessedAt of each guess.
+        :return: None.
+        """
+        self.writer.enqueue(game, rounds)
+
+    async def getGameHistory(self, userId: str, limit: int = Config.DEFAULT_PAGE_SIZE,
+                             before: int = None) -> JSONResponse:
+        """
+        Returns a page of the player's finished games, newest first, each with its guesses.
+        :param: {String} userId - UserId of the player.
+        :param: {Int} limit - Maximum number of games on the page.
+        :param: {Int} before - The nextCursor of the previous page, or None for the newest games.
+        :return: {JSONResponse} The games and the nextCursor to request the following page with, which is None on the
+        last page.
+        :raise: {HTTPException}:
+            - 400: If the userId is missing or the limit is out of range.
+        """
+        if not userId:
+            raise HTTPException(status_code=400, detail="UserId is required to retrieve game history.")
+        if not 1 <= limit <= Config.MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {Config.MAX_PAGE_SIZE}.")
+
+        games, guessesByGame, hasMore = await self.gameHistoryDBService.getGames(userId, limit, before)
+        return JSONResponse(content={
+            "userId": userId,
+            "games": [{
+                "gameId": game.gameId,
+                "mode": game.mode,
+                "status": game.status,
+                "score": game.score,
+                "roundsPlayed": game.roundsPlayed,
+                "totalRounds": game.totalRounds,
+                "winningCombo": game.winningCombo,
+                "startedAt": game.startedAt,
+                "endedAt": game.endedAt,
+                "guesses": [{
+                    "roundNumber": guess.roundNumber,
+                    "guess": guess.guess,
+                    "correctPositionAndNumber": guess.correctPositionAndNumber,
+                    "correctNumbers": guess.correctNumbers,
+                    "guessedAt": guess.guessedAt
+                } for guess in guessesByGame[game.gameId]]
+            } for game in games],
+            "nextCursor": games[-1].gameId if hasMore else None
+        }, status_code=200)
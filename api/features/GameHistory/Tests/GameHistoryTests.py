@@ -0,0 +1,113 @@
+from api.database.schema.DatabaseSchema import Base
+from api.features.GameHistory.Database.GameHistoryDatabaseService import GameHistoryDatabaseService
+from api.features.GameHistory.Database.GameHistoryWriter import GameHistoryWriter
+from api.features.GameHistory.Services.GameHistoryService import GameHistoryService
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import json
+import unittest
+
+"""
+Testing that finished games are stored in the background with their guesses and paged back newest first by keyset.
+"""
+class GameHistoryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database, and a service and a started writer over it. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.writer = GameHistoryWriter(GameHistoryDatabaseService(sessionFactory), maxQueuedGames=4)
+        await self.writer.start()
+        self.gameHistoryService = GameHistoryService(GameHistoryDatabaseService(sessionFactory), self.writer)
+
+    async def asyncTearDown(self):
+        await self.writer.stop()
+        await self.engine.dispose()
+
+    def recordGame(self, userId: str, score: int, guesses: list):
+        game = {"userId": userId, "mode": "NORMAL", "status": "lost", "score": score, "roundsPlayed": len(guesses),
+                "totalRounds": 10, "winningCombo": "0115", "startedAt": "2026-01-01T00:00:00.000+00:00",
+                "endedAt": "2026-01-01T00:01:00.000+00:00"}
+        rounds = [{"roundNumber": roundNumber, "guess": guess, "correctPositionAndNumber": 0, "correctNumbers": 1,
+                   "guessedAt": "2026-01-01T00:00:30.000+00:00"} for roundNumber, guess in enumerate(guesses, 1)]
+        self.gameHistoryService.recordGame(game, rounds)
+
+    async def getPage(self, userId: str, limit: int, before: int = None) -> dict:
+        response = await self.gameHistoryService.getGameHistory(userId, limit, before)
+        return json.loads(response.body.decode("utf-8"))
+
+    async def testGuessesAreInsertedInOneStatement(self):
+        """
+        A game and all of its guesses take one statement each, not one per guess.
+        """
+        # Arrange
+        statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda connection, cursor, statement, *args: statements.append(statement.split()[0]))
+
+        # Act
+        self.recordGame("player1", 100, ["1234", "5670", "0115"])
+        await self.writer.drain()
+        page = await self.getPage("player1", 10)
+
+        # Assert
+        self.assertEqual(statements.count("INSERT"), 2)
+        self.assertEqual([guess["guess"] for guess in page["games"][0]["guesses"]], ["1234", "5670", "0115"])
+
+    async def testHistoryIsPagedNewestFirst(self):
+        """
+        Following nextCursor walks through every game of the player exactly once, newest first.
+        """
+        # Arrange
+        for score in range(5):
+            self.recordGame("player1", score, ["1234"])
+            await self.writer.drain()
+        self.recordGame("player2", 999, ["1234"])
+        await self.writer.drain()
+
+        # Act
+        firstPage = await self.getPage("player1", 2)
+        secondPage = await self.getPage("player1", 2, firstPage["nextCursor"])
+        lastPage = await self.getPage("player1", 2, secondPage["nextCursor"])
+
+        # Assert
+        pagedScores = [game["score"] for page in (firstPage, secondPage, lastPage) for game in page["games"]]
+        self.assertEqual(pagedScores, [4, 3, 2, 1, 0])
+        self.assertIsNone(lastPage["nextCursor"])
+
+    async def testQueuedGamesAreWrittenInBatchesAndOverflowIsDropped(self):
+        """
+        Games queued while the writer is busy are written together in one transaction, and games beyond the queue's
+        capacity are dropped instead of making the player wait.
+        """
+        # Arrange
+        transactions = []
+        event.listen(self.engine.sync_engine, "commit", lambda connection: transactions.append(connection))
+
+        # Act
+        for score in range(6):
+            self.recordGame("player1", score, ["1234"])
+        await self.writer.drain()
+        page = await self.getPage("player1", 10)
+
+        # Assert
+        self.assertEqual([game["score"] for game in page["games"]], [3, 2, 1, 0])
+        self.assertEqual(self.writer.droppedGames, 2)
+        self.assertEqual(len(transactions), 1)
+
+    async def testLimitOutOfRangeIsRejected(self):
+        """
+        Page sizes outside 1 to MAX_PAGE_SIZE are rejected.
+        """
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await self.getPage("player1", 0)
+        self.assertEqual(context.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
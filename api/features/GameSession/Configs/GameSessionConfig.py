@@ -0,0 +1,22 @@
+import os
+
+"""
+This file contains the configurations for the per-session game registry.
+"""
+# Name of the request header and cookie used to carry the session ID between the frontend and the API.
+SESSION_HEADER_NAME = "X-Session-Id"
+SESSION_COOKIE_NAME = "mastermindSessionId"
+
+# Origins the frontend is served from, as a comma-separated list. Both the CORS middleware and the /ws/game handshake,
+# which browsers do not subject to CORS, only accept these origins.
+ALLOWED_ORIGINS = os.getenv("MASTERMIND_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+
+# Sessions that have not been accessed for this many seconds are evicted.
+SESSION_TTL_SECONDS = int(os.getenv("MASTERMIND_SESSION_TTL_SECONDS", 1800))
+
+# Hard cap on the number of sessions held in memory. The least recently used session is evicted once it is reached.
+MAX_SESSIONS = int(os.getenv("MASTERMIND_MAX_SESSIONS", 10000))
+
+# Largest message accepted on the /ws/game channel. Guesses and commands are a few dozen bytes, so anything larger closes
+# the connection.
+CHANNEL_MAX_MESSAGE_BYTES = int(os.getenv("MASTERMIND_GAME_CHANNEL_MAX_MESSAGE_BYTES", 1024))
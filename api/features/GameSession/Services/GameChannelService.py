@@ -0,0 +1,153 @@
+from fastapi import HTTPException, WebSocket
+from api.features.GameSession.Configs import GameSessionConfig as Config
+from api.features.GameSession.Services.GameSessionRegistryService import GameSession, GameSessionRegistryService
+from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Plays a session's games over one WebSocket connection (/ws/game) instead of one HTTP request per guess.
+
+Browsers do not apply CORS to WebSocket handshakes, so a handshake whose Origin is not one of the allowed origins is
+closed with 1008 before it is accepted. The session is resolved once from the handshake's sessionId query parameter,
+session header, or cookie, and its ID is sent as the first message. The channel never starts a session: a handshake
+without a live one, started by /login, /create-user, or /enter-game, is closed with 1008 as well, as is a connection
+whose session is evicted. After that every message is a command and every reply a JSON object with a type:
+    - A bare guess such as 1234, or {"type": "guess", "guess": "1234"}, plays a round through Mastermind.playRound and
+      is answered with {"type": "round", ...} holding the same round data as POST /submit-guess.
+    - When that round ends the game, {"type": "gameOver", ...} follows with the game's status and score and the
+      player's stats as GET /get-player-stats returns them, and the game is reset as after the HTTP path.
+    - {"type": "enterGame", "mode": "HARD"} enters a game like POST /enter-game and is answered with
+      {"type": "gameEntered", ...}.
+    - A failed command is answered with {"type": "error", "status": ..., "detail": ...} and the connection stays open.
+"""
+class GameChannelService:
+    def __init__(self, gameSessionRegistry: GameSessionRegistryService,
+                 maxMessageBytes: int = Config.CHANNEL_MAX_MESSAGE_BYTES,
+                 allowedOrigins: list = Config.ALLOWED_ORIGINS):
+        """
+        :param: {GameSessionRegistryService} gameSessionRegistry - The registry the connections' sessions are held in.
+        :param: {Int} maxMessageBytes - Largest message accepted before the connection is closed.
+        :param: {List} allowedOrigins - Origins whose handshakes are accepted.
+        """
+        self.gameSessionRegistry = gameSessionRegistry
+        self.maxMessageBytes = maxMessageBytes
+        self.allowedOrigins = set(allowedOrigins)
+
+    async def serve(self, websocket: WebSocket):
+        """
+        Accepts the connection and answers its commands until the client disconnects. A handshake from an origin that
+        is not allowed, or without a live session, is closed with 1008 without being accepted.
+        :param: {WebSocket} websocket - The connection.
+        :return: None.
+        """
+        if websocket.headers.get("origin") not in self.allowedOrigins:
+            await websocket.close(code=1008)
+            return
+
+        sessionId = (websocket.query_params.get("sessionId")
+                     or websocket.headers.get(Config.SESSION_HEADER_NAME)
+                     or websocket.cookies.get(Config.SESSION_COOKIE_NAME))
+        session = self.gameSessionRegistry.getSession(sessionId)
+        if session is None:
+            await websocket.close(code=1008)
+            return
+        await websocket.accept()
+        await self.__send(websocket, {"type": "session", "sessionId": session.sessionId})
+
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("bytes") or message.get("text", "").encode("utf-8")
+            if len(data) > self.maxMessageBytes:
+                await websocket.close(code=1009)
+                return
+
+            # Every message counts as an access, so an open connection keeps its session from expiring. A session that
+            # was evicted anyway ends the connection, and the client has to log in or enter a game again.
+            if self.gameSessionRegistry.getSession(session.sessionId) is not session:
+                await websocket.close(code=1008)
+                return
+
+            for reply in await self.handleMessage(session, data.decode("utf-8", errors="replace")):
+                await self.__send(websocket, reply)
+
+    async def handleMessage(self, session: GameSession, text: str) -> list:
+        """
+        Runs one command against the session's game.
+        :param: {GameSession} session - The connection's session.
+        :param: {String} text - The message: a bare guess or a JSON command.
+        :return: {List} The replies to send, in order.
+        """
+        try:
+            command = json.loads(text) if text.startswith("{") else {"type": "guess", "guess": text}
+            if not isinstance(command, dict):
+                raise ValueError("Commands are JSON objects.")
+
+            async with session.lock:
+                if command.get("type") == "guess":
+                    return await self.__playRound(session, command.get("guess"))
+                if command.get("type") == "enterGame":
+                    return await self.__enterGame(session, command.get("mode") or "NORMAL")
+            raise ValueError(f"Unknown command type: {command.get('type')}.")
+        except HTTPException as e:
+            if e.status_code >= 500:
+                logger.exception("Error handling game channel message.")
+            else:
+                logger.warning(f"Rejected game channel message: {e.detail}")
+            return [{"type": "error", "status": e.status_code, "detail": str(e.detail)}]
+        except ValueError as e:
+            # Invalid guesses and malformed commands are the client's error, like a 400 from POST /submit-guess.
+            logger.warning(f"Rejected game channel message: {e}")
+            return [{"type": "error", "status": 400, "detail": str(e)}]
+        except Exception as e:
+            logger.exception("Error handling game channel message.")
+            return [{"type": "error", "status": 400, "detail": str(e)}]
+
+    async def __playRound(self, session: GameSession, guess: str) -> list:
+        """
+        Plays a guess, and once the game is over resets it and adds the player's updated stats.
+        :param: {GameSession} session - The connection's session, whose lock is held.
+        :param: {String} guess - The player's guess.
+        :return: {List} The round's reply, followed by the gameOver reply if the game ended.
+        """
+        if not isinstance(guess, str):
+            raise ValueError("A guess is a string of digits.")
+        replies = [{"type": "round", **await session.game.playRound(guess)}]
+
+        game = session.game
+        if game.status == "won" or game.status == "lost":
+            status, gameScore, mode = game.status, game.gameScore, game.mode
+            game.resetGame()
+            playerStats = None
+            if session.player.userId is not None:
+                try:
+                    playerStats = await PlayerStatsManagementService(session.player).getPlayerStatsSummary(
+                        session.player.userId)
+                except Exception:
+                    # The round was played and recorded either way; the client can still fetch the stats over HTTP.
+                    logger.exception("Error getting player stats for the game channel.")
+            replies.append({"type": "gameOver", "status": status, "score": gameScore, "mode": mode,
+                            "playerStats": playerStats})
+        return replies
+
+    @staticmethod
+    async def __enterGame(session: GameSession, mode: str) -> list:
+        """
+        Enters a game in the given difficulty mode.
+        :param: {GameSession} session - The connection's session, whose lock is held.
+        :param: {String} mode - The difficulty mode.
+        :return: {List} The gameEntered reply with the settings a guess has to meet.
+        """
+        await session.game.enterGame(mode)
+        game = session.game
+        return [{"type": "gameEntered", "mode": game.mode, "inputLength": game.inputLength,
+                 "minRandomDigit": game.minRandomDigit, "maxRandomDigit": game.maxRandomDigit,
+                 "totalRounds": game.totalRounds}]
+
+    @staticmethod
+    async def __send(websocket: WebSocket, reply: dict):
+        await websocket.send_text(json.dumps(reply, separators=(",", ":")))
@@ -0,0 +1,132 @@
+from fastapi.responses import Response
+from api.features.GameSession.Configs import GameSessionConfig
+from api.features.PlayerData.Services.PlayerDataManagement.PlayerDataManagementService import (
+    PlayerDataManagementService)
+from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from collections import OrderedDict
+import asyncio
+import secrets
+import time
+
+"""
+Holds the in-memory state of a single browser session: the player's data and their game instance.
+"""
+class GameSession:
+    def __init__(self, sessionId: str):
+        """
+        Instantiates a fresh player and game for the session.
+        :param: {String} sessionId - The unique ID of the session.
+        """
+        self.sessionId = sessionId
+        self.player = PlayerDataManagementService()
+        self.game = Mastermind(self.player)
+        self.lock = asyncio.Lock()
+        self.lastAccessed = time.monotonic()
+
+
+"""
+Keeps a separate GameSession per session ID so that concurrent players never share a game. Sessions are kept in
+least-recently-used order and evicted once they are idle for longer than the TTL or once the registry is at its cap.
+"""
+class GameSessionRegistryService:
+    def __init__(self, ttlSeconds: float = GameSessionConfig.SESSION_TTL_SECONDS,
+                 maxSessions: int = GameSessionConfig.MAX_SESSIONS, clock=time.monotonic):
+        """
+        Instantiates an empty registry.
+        :param: {Float} ttlSeconds - Number of idle seconds after which a session is evicted.
+        :param: {Int} maxSessions - Maximum number of sessions held in memory at once.
+        :param: {Callable} clock - Monotonic clock used for idle tracking, overridable for tests.
+        """
+        if maxSessions < 1:
+            raise ValueError("maxSessions must be at least 1.")
+        self.ttlSeconds = ttlSeconds
+        self.maxSessions = maxSessions
+        self.clock = clock
+        self.sessions = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def getSession(self, sessionId: str = None):
+        """
+        Returns the session for the given ID, marking it as recently used. Client-supplied IDs that are not already
+        registered are never adopted, so a session ID is always one issued by this registry.
+        :param: {String} sessionId - The session ID sent by the client, if any.
+        :return: {GameSession} The session's player and game state, or None if the ID is missing, unknown, or expired.
+        """
+        now = self.clock()
+        self.__evictExpired(now)
+
+        session = self.sessions.get(sessionId) if sessionId else None
+        if session is not None:
+            self.sessions.move_to_end(sessionId)
+            session.lastAccessed = now
+        return session
+
+    def createSession(self) -> GameSession:
+        """
+        Creates and registers a new session under a freshly issued ID, evicting the least recently used session if the
+        registry is at its cap.
+        :return: {GameSession} The new session's player and game state.
+        """
+        now = self.clock()
+        self.__evictExpired(now)
+
+        session = GameSession(secrets.token_urlsafe(32))
+        session.lastAccessed = now
+        self.sessions[session.sessionId] = session
+        self.__evictOverflow()
+        return session
+
+    def resolveSession(self, sessionId: str = None) -> GameSession:
+        """
+        Returns the session for the given ID, or creates a new session if the ID is missing, unknown, or expired.
+        :param: {String} sessionId - The session ID sent by the client, if any.
+        :return: {GameSession} The session's player and game state.
+        """
+        return self.getSession(sessionId) or self.createSession()
+
+    def endSession(self, sessionId: str):
+        """
+        Removes the session from the registry, if present.
+        :param: {String} sessionId - The session ID to remove.
+        :return: None.
+        """
+        self.sessions.pop(sessionId, None)
+
+    def attachSessionId(self, response: Response, session: GameSession) -> Response:
+        """
+        Attaches the session ID to an outgoing response as both a header and a cookie so the client can send it back.
+        :param: {Response} response - The response returned by an endpoint.
+        :param: {GameSession} session - The session the request was served from.
+        :return: {Response} The same response with the session ID attached.
+        """
+        response.headers[GameSessionConfig.SESSION_HEADER_NAME] = session.sessionId
+        response.set_cookie(
+            GameSessionConfig.SESSION_COOKIE_NAME,
+            session.sessionId,
+            max_age=int(self.ttlSeconds),
+            httponly=True,
+            samesite="lax"
+        )
+        return response
+
+    def __evictExpired(self, now: float):
+        """
+        Evicts idle sessions. Sessions are ordered by last access, so expired sessions are always at the front.
+        :param: {Float} now - The current clock reading.
+        :return: None.
+        """
+        while self.sessions:
+            oldestSession = next(iter(self.sessions.values()))
+            if now - oldestSession.lastAccessed < self.ttlSeconds:
+                break
+            self.sessions.popitem(last=False)
+
+    def __evictOverflow(self):
+        """
+        Evicts the least recently used sessions until the registry is within its cap.
+        :return: None.
+        """
+        while len(self.sessions) > self.maxSessions:
+            self.sessions.popitem(last=False)
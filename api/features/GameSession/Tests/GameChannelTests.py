@@ -0,0 +1,131 @@
+from api.features.GameSession.Services.GameChannelService import GameChannelService
+from api.features.GameSession.Services.GameSessionRegistryService import GameSessionRegistryService
+from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+"""
+Tests that the /ws/game channel plays rounds like POST /submit-guess, pushes the player's stats when a game ends, and
+keeps the connection open on invalid commands, and only accepts handshakes from the allowed origins.
+"""
+class GameChannelTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """ Arrange a channel over a registry, and a session whose game is in progress. """
+        self.registry = GameSessionRegistryService()
+        self.channel = GameChannelService(self.registry, maxMessageBytes=64, allowedOrigins=["http://localhost:3000"])
+        self.session = self.registry.resolveSession()
+        self.session.player.userId = "testUserId1234"
+        self.session.game.playerStatsService = AsyncMock()
+        self.session.game.gameHistoryService = MagicMock()
+        self.session.game.winningCombo = "0115"
+
+    async def testRoundsArePlayedAndGameOverPushesStats(self):
+        """
+        Each guess is answered with its round, and the winning one also with the player's stats, after which the game
+        is reset for the next one.
+        """
+        # Arrange
+        playerStats = {"userId": "testUserId1234", "gamesWon": 1}
+
+        # Act
+        with patch.object(PlayerStatsManagementService, "getPlayerStatsSummary", AsyncMock(return_value=playerStats)):
+            firstReplies = await self.channel.handleMessage(self.session, "1234")
+            secondReplies = await self.channel.handleMessage(self.session, '{"type": "guess", "guess": "0115"}')
+
+        # Assert
+        self.assertEqual([reply["type"] for reply in firstReplies], ["round"])
+        self.assertEqual((firstReplies[0]["status"], firstReplies[0]["correctNumbers"]), ("stillPlaying", "1"))
+        self.assertEqual([reply["type"] for reply in secondReplies], ["round", "gameOver"])
+        self.assertEqual((secondReplies[0]["status"], secondReplies[0]["currentRound"]), ("won", 2))
+        self.assertEqual((secondReplies[1]["status"], secondReplies[1]["playerStats"]), ("won", playerStats))
+        self.assertIsNone(self.session.game.status)
+        self.assertIsNone(self.session.game.winningCombo)
+
+    async def testInvalidCommandsAreAnsweredWithErrors(self):
+        """
+        Invalid guesses and unknown commands are answered with an error and leave the game untouched.
+        """
+        # Act
+        replies = [await self.channel.handleMessage(self.session, message)
+                   for message in ("12", '{"type": "guess", "guess": 115}', '{"type": "forfeit"}', "[1]", "{")]
+
+        # Assert
+        for reply in replies:
+            self.assertEqual((reply[0]["type"], reply[0]["status"]), ("error", 400))
+        self.assertEqual(self.session.game.roundCounter, 0)
+
+    def testConnectionKeepsItsSessionUntilAnOversizedMessage(self):
+        """
+        A connection plays the session it was opened with, stays open after an error, and is closed with 1009 once a
+        message is over the size limit.
+        """
+        # Arrange
+        app = FastAPI()
+        app.add_api_websocket_route("/ws/game", self.channel.serve)
+
+        # Act
+        with TestClient(app).websocket_connect(f"/ws/game?sessionId={self.session.sessionId}",
+                                               headers={"origin": "http://localhost:3000"}) as websocket:
+            sessionMessage = websocket.receive_json()
+            websocket.send_text("12")
+            errorMessage = websocket.receive_json()
+            websocket.send_text("1234")
+            roundMessage = websocket.receive_json()
+            websocket.send_text("1" * 65)
+            with self.assertRaises(WebSocketDisconnect) as context:
+                websocket.receive_json()
+
+        # Assert
+        self.assertEqual(sessionMessage, {"type": "session", "sessionId": self.session.sessionId})
+        self.assertEqual(errorMessage["type"], "error")
+        self.assertEqual((roundMessage["type"], roundMessage["userId"]), ("round", "testUserId1234"))
+        self.assertEqual(context.exception.code, 1009)
+        self.assertEqual(self.session.game.roundCounter, 1)
+
+    def testHandshakeWithoutALiveSessionIsRefused(self):
+        """
+        A handshake without a session ID, or with one the registry does not hold, is closed with 1008 and never starts
+        a session.
+        """
+        # Arrange
+        client = TestClient(FastAPI())
+        client.app.add_api_websocket_route("/ws/game", self.channel.serve)
+
+        # Act
+        closeCodes = []
+        for query in ("", "?sessionId=madeUpSessionId"):
+            with self.assertRaises(WebSocketDisconnect) as context:
+                with client.websocket_connect(f"/ws/game{query}", headers={"origin": "http://localhost:3000"}):
+                    pass
+            closeCodes.append(context.exception.code)
+
+        # Assert
+        self.assertEqual(closeCodes, [1008, 1008])
+        self.assertEqual(len(self.registry), 1)
+
+    def testHandshakeFromAnotherOriginIsRefused(self):
+        """
+        A handshake with no Origin, or one that is not allowed, is closed with 1008 and never reaches the session.
+        """
+        # Arrange
+        client = TestClient(FastAPI())
+        client.app.add_api_websocket_route("/ws/game", self.channel.serve)
+
+        # Act
+        closeCodes = []
+        for headers in ({"origin": "http://evil.example"}, {}):
+            with self.assertRaises(WebSocketDisconnect) as context:
+                with client.websocket_connect(f"/ws/game?sessionId={self.session.sessionId}", headers=headers):
+                    pass
+            closeCodes.append(context.exception.code)
+
+        # Assert
+        self.assertEqual(closeCodes, [1008, 1008])
+        self.assertEqual(self.session.game.roundCounter, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from api.features.GameSession.Services.GameSessionRegistryService import GameSessionRegistryService
+import unittest
+
+"""
+Tests that the GameSessionRegistryService isolates sessions and keeps its memory bounded by TTL and LRU eviction.
+"""
+class GameSessionRegistryTest(unittest.TestCase):
+    def setUp(self):
+        """ Arrange a registry driven by a fake clock. """
+        self.now = 0.0
+        self.registry = GameSessionRegistryService(ttlSeconds=60, maxSessions=3, clock=lambda: self.now)
+
+    def testNewSessionsAreIsolated(self):
+        """
+        Two clients without a session ID must never share a player or game.
+        """
+        # Act
+        firstSession = self.registry.resolveSession()
+        secondSession = self.registry.resolveSession()
+
+        # Assert
+        self.assertNotEqual(firstSession.sessionId, secondSession.sessionId)
+        self.assertIsNot(firstSession.game, secondSession.game)
+        self.assertIsNot(firstSession.player, secondSession.player)
+        self.assertIs(firstSession.game.player, firstSession.player)
+
+    def testKnownSessionIdResolvesSameSession(self):
+        """
+        A session ID issued by the registry resolves back to the same session.
+        """
+        # Arrange
+        session = self.registry.resolveSession()
+
+        # Act
+        resolvedSession = self.registry.resolveSession(session.sessionId)
+
+        # Assert
+        self.assertIs(resolvedSession, session)
+        self.assertEqual(len(self.registry), 1)
+
+    def testUnknownSessionIdIsNotAdopted(self):
+        """
+        A client-supplied session ID that the registry never issued gets a fresh session with a new ID.
+        """
+        # Act
+        session = self.registry.resolveSession("madeUpSessionId")
+
+        # Assert
+        self.assertNotEqual(session.sessionId, "madeUpSessionId")
+
+    def testLookingUpAnUnknownSessionDoesNotCreateOne(self):
+        """
+        Looking up a missing or unknown session ID finds nothing and leaves the registered sessions in place.
+        """
+        # Arrange
+        sessions = [self.registry.createSession() for _ in range(3)]
+
+        # Act
+        foundSessions = [self.registry.getSession(sessionId) for sessionId in (None, "madeUpSessionId")]
+
+        # Assert
+        self.assertEqual(foundSessions, [None, None])
+        self.assertEqual(list(self.registry.sessions.values()), sessions)
+
+    def testIdleSessionsExpire(self):
+        """
+        Sessions idle for longer than the TTL are evicted on the next access.
+        """
+        # Arrange
+        session = self.registry.resolveSession()
+        self.now += 61
+
+        # Act
+        resolvedSession = self.registry.resolveSession(session.sessionId)
+
+        # Assert
+        self.assertIsNot(resolvedSession, session)
+        self.assertEqual(len(self.registry), 1)
+
+    def testLeastRecentlyUsedSessionIsEvictedAtCap(self):
+        """
+        Once the cap is reached, the least recently used session is evicted rather than the most recent ones.
+        """
+        # Arrange
+        firstSession = self.registry.resolveSession()
+        secondSession = self.registry.resolveSession()
+        thirdSession = self.registry.resolveSession()
+        self.registry.resolveSession(firstSession.sessionId)
+
+        # Act
+        self.registry.resolveSession()
+
+        # Assert
+        self.assertEqual(len(self.registry), 3)
+        self.assertIn(firstSession.sessionId, self.registry.sessions)
+        self.assertNotIn(secondSession.sessionId, self.registry.sessions)
+        self.assertIn(thirdSession.sessionId, self.registry.sessions)
+
+
+if __name__ == "__main__":
+    unittest.main()
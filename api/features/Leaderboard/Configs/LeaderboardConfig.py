@@ -0,0 +1,14 @@
+import os
+
+"""
+This file contains the configurations for the leaderboards.
+"""
+# Entries each leaderboard keeps sorted in memory. Pages are served from them, so it bounds the deepest page as well.
+TOP_CAPACITY = int(os.getenv("MASTERMIND_LEADERBOARD_TOP_CAPACITY", 1000))
+
+# Entries returned when no limit is requested, and the largest limit accepted.
+DEFAULT_LIMIT = int(os.getenv("MASTERMIND_LEADERBOARD_DEFAULT_LIMIT", 10))
+MAX_LIMIT = int(os.getenv("MASTERMIND_LEADERBOARD_MAX_LIMIT", 100))
+
+# Rows read per batch while the leaderboards are rebuilt from the database at startup.
+REBUILD_BATCH_SIZE = int(os.getenv("MASTERMIND_LEADERBOARD_REBUILD_BATCH_SIZE", 10000))
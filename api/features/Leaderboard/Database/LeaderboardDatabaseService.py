@@ -0,0 +1,56 @@
+from sqlalchemy import func
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, PlayerStatsTable, GamesTable
+from api.features.Leaderboard.Configs import LeaderboardConfig as Config
+
+"""
+Handles the database interactions for the LeaderboardService, streaming the values every leaderboard is rebuilt from in
+batches so a rebuild never holds more than one batch of rows at a time.
+"""
+class LeaderboardDatabaseService:
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def streamPlayerStats(self, batchSize: int = Config.REBUILD_BATCH_SIZE):
+        """
+        Yields the userId, highestScore, currentLevel, and winRate of every player that has finished a game.
+        :param: {Int} batchSize - Rows per batch.
+        :return: {AsyncGenerator} Lists of (userId, highestScore, currentLevel, winRate) rows.
+        """
+        query = (
+            select(PlayerStatsTable.userId,
+                   func.coalesce(PlayerStatsTable.highestScore, 0),
+                   func.coalesce(PlayerStatsTable.currentLevel, 1),
+                   func.coalesce(PlayerStatsTable.winRate, 0))
+            .where(PlayerStatsTable.gamesPlayed > 0)
+            .execution_options(yield_per=batchSize)
+        )
+        async for batch in self.__stream(query, batchSize):
+            yield batch
+
+    async def streamModeHighScores(self, batchSize: int = Config.REBUILD_BATCH_SIZE):
+        """
+        Yields every player's highest score in each mode they have finished a game in, grouped through the
+        (mode, userId, score) index without reading the games themselves.
+        :param: {Int} batchSize - Rows per batch.
+        :return: {AsyncGenerator} Lists of (mode, userId, highestScore) rows, grouped by mode.
+        """
+        query = (
+            select(GamesTable.mode, GamesTable.userId, func.coalesce(func.max(GamesTable.score), 0))
+            .where(GamesTable.mode.is_not(None))
+            .group_by(GamesTable.mode, GamesTable.userId)
+            .execution_options(yield_per=batchSize)
+        )
+        async for batch in self.__stream(query, batchSize):
+            yield batch
+
+    async def __stream(self, query, batchSize: int):
+        async with self.sessionFactory() as session:
+            # Streams through the session's Core connection, as the ORM's per-row processing would double the read time.
+            connection = await session.connection()
+            result = await connection.stream(query)
+            async for partition in result.partitions(batchSize):
+                yield partition
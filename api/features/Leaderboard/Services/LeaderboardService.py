@@ -0,0 +1,231 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from api.features.Leaderboard.Configs import LeaderboardConfig as Config
+from api.features.Leaderboard.Database.LeaderboardDatabaseService import LeaderboardDatabaseService
+from api.features.Leaderboard.Utils.RankIndex import RankIndex
+from array import array
+from contextlib import contextmanager
+import numpy as np
+import gc
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Serves the leaderboards by highestScore, currentLevel, and winRate, and by highest score within each difficulty mode,
+from in-memory RankIndexes instead of sorting the PlayerStats table on every request. The indexes are rebuilt from the
+database once at startup and then kept current by every finished game, so a page of the top players or any player's
+rank costs microseconds however many players there are.
+"""
+class LeaderboardService:
+    BOARDS = ("highestScore", "currentLevel", "winRate")
+
+    def __init__(self, leaderboardDatabaseService: LeaderboardDatabaseService = None,
+                 topCapacity: int = Config.TOP_CAPACITY):
+        """
+        Instantiates empty leaderboards.
+        :param: {LeaderboardDatabaseService} leaderboardDatabaseService - Reads the values the leaderboards are rebuilt
+        from, overridable for tests.
+        :param: {Int} topCapacity - Entries each leaderboard keeps sorted in memory.
+        """
+        self.leaderboardDBService = leaderboardDatabaseService or LeaderboardDatabaseService()
+        self.topCapacity = topCapacity
+        # Every RankIndex identifies players by the same slot, handed out in the order players are first seen.
+        self.slots = {}
+        self.userIds = []
+        self.boards = {board: RankIndex(topCapacity) for board in self.BOARDS}
+        self.modeBoards = {}
+        self.isRebuilding = False
+        self.gamesDuringRebuild = []
+
+    async def start(self):
+        """
+        Rebuilds the leaderboards from the database. Called once at startup.
+        :return: None.
+        """
+        await self.rebuild()
+
+    async def rebuild(self):
+        """
+        Replaces every leaderboard with one built from the database in O(n), reading the rows in batches. Games
+        finished while the rebuild is running are applied once it completes.
+        :return: None.
+        """
+        self.isRebuilding = True
+        try:
+            slots, userIds = {}, []
+            columns = {board: array("i") for board in self.BOARDS}
+            async for batch in self.leaderboardDBService.streamPlayerStats():
+                with self.__pausedGarbageCollection():
+                    batchUserIds, highestScores, currentLevels, winRates = zip(*batch)
+                    slots.update(zip(batchUserIds, range(len(userIds), len(userIds) + len(batchUserIds))))
+                    userIds.extend(batchUserIds)
+                    columns["highestScore"].extend(highestScores)
+                    columns["currentLevel"].extend(currentLevels)
+                    columns["winRate"].extend(winRates)
+
+            modeColumns = {}
+            async for batch in self.leaderboardDBService.streamModeHighScores():
+                with self.__pausedGarbageCollection():
+                    batchModes, batchUserIds, batchScores = zip(*batch)
+                    batchSlots = list(map(slots.get, batchUserIds))
+                    if None in batchSlots:
+                        # Players without a stats row still rank within the modes they played.
+                        for position, userId in enumerate(batchUserIds):
+                            if batchSlots[position] is None:
+                                if userId not in slots:
+                                    slots[userId] = len(userIds)
+                                    userIds.append(userId)
+                                batchSlots[position] = slots[userId]
+                    batchModes = np.array(batchModes, dtype=object)
+                    batchSlots = np.array(batchSlots, dtype=np.int32)
+                    batchScores = np.array(batchScores, dtype=np.int32)
+                    # Rows arrive grouped by mode, so a batch spans one or two modes.
+                    for mode in dict.fromkeys(batchModes.tolist()):
+                        isMode = batchModes == mode
+                        modeSlots, modeScores = modeColumns.setdefault(mode, (array("i"), array("i")))
+                        modeSlots.extend(batchSlots[isMode].tolist())
+                        modeScores.extend(batchScores[isMode].tolist())
+
+            with self.__pausedGarbageCollection():
+                boards = {}
+                for board, column in columns.items():
+                    values = np.full(len(userIds), RankIndex.MISSING, dtype=np.int32)
+                    values[:len(column)] = np.frombuffer(column, dtype=np.int32) if column else 0
+                    boards[board] = RankIndex(self.topCapacity)
+                    boards[board].load(values)
+                modeBoards = {}
+                for mode, (modeSlots, modeScores) in modeColumns.items():
+                    values = np.full(len(userIds), RankIndex.MISSING, dtype=np.int32)
+                    values[np.frombuffer(modeSlots, dtype=np.int32)] = np.frombuffer(modeScores, dtype=np.int32)
+                    modeBoards[mode] = RankIndex(self.topCapacity)
+                    modeBoards[mode].load(values)
+
+            self.slots, self.userIds, self.boards, self.modeBoards = slots, userIds, boards, modeBoards
+            logger.info("Rebuilt the leaderboards for %s players.", len(userIds))
+        finally:
+            self.isRebuilding = False
+            gamesDuringRebuild, self.gamesDuringRebuild = self.gamesDuringRebuild, []
+            for game in gamesDuringRebuild:
+                self.__applyGame(*game)
+
+    def recordGame(self, userId: str, playerStats, mode: str, gameScore: int):
+        """
+        Updates the player's position on every leaderboard after a finished game, in O(log n) per leaderboard. A
+        highestScore below the one already ranked, e.g. from a session that has not seen a better game finished in
+        another, never lowers the player's entry.
+        :param: {String} userId - UserId of the player.
+        :param: {PlayerStatsTable} playerStats - The player's stats after the game, as returned by the database, or the
+        in-memory player when the update is buffered.
+        :param: {String} mode - The difficulty mode the game was played in, or None.
+        :param: {Int} gameScore - The score of the game.
+        :return: None.
+        """
+        game = (userId, playerStats.highestScore, playerStats.currentLevel, playerStats.winRate, mode, gameScore)
+        if self.isRebuilding:
+            self.gamesDuringRebuild.append(game)
+            return
+        self.__applyGame(*game)
+
+    def getLeaderboard(self, board: str = "highestScore", mode: str = None, limit: int = Config.DEFAULT_LIMIT,
+                       offset: int = 0) -> JSONResponse:
+        """
+        Returns a page of a leaderboard, best first. Players with equal values share a rank.
+        :param: {String} board - One of highestScore, currentLevel, or winRate.
+        :param: {String} mode - A difficulty mode to rank highest scores within, or None to rank across all modes.
+        :param: {Int} limit - Maximum number of entries on the page.
+        :param: {Int} offset - Entries to skip from the top.
+        :return: {JSONResponse} The board, mode, totalPlayers, and the rank, userId, and value of each entry.
+        :raise: {HTTPException}:
+            - 400: If the board, mode, limit, or offset is invalid.
+        """
+        index = self.__getIndex(board, mode)
+        if not 1 <= limit <= Config.MAX_LIMIT:
+            raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {Config.MAX_LIMIT}.")
+        if not 0 <= offset < self.topCapacity:
+            raise HTTPException(status_code=400, detail=f"Offset must be between 0 and {self.topCapacity - 1}.")
+
+        entries = index.top(limit, offset) if index else []
+        return JSONResponse(content={
+            "board": board,
+            "mode": mode,
+            "totalPlayers": index.count if index else 0,
+            "entries": [{"rank": rank, "userId": self.userIds[slot], "value": value} for rank, slot, value in entries]
+        }, status_code=200)
+
+    def getPlayerRank(self, userId: str, board: str = "highestScore", mode: str = None) -> JSONResponse:
+        """
+        Returns the player's rank on a leaderboard.
+        :param: {String} userId - UserId of the player.
+        :param: {String} board - One of highestScore, currentLevel, or winRate.
+        :param: {String} mode - A difficulty mode to rank highest scores within, or None to rank across all modes.
+        :return: {JSONResponse} The userId, board, mode, rank, value, and totalPlayers.
+        :raise: {HTTPException}:
+            - 400: If the userId is missing or the board or mode is invalid.
+            - 404: If the player is not on the leaderboard.
+        """
+        if not userId:
+            raise HTTPException(status_code=400, detail="UserId is required to retrieve a leaderboard rank.")
+        index = self.__getIndex(board, mode)
+        slot = self.slots.get(userId)
+        rank = index.rank(slot) if index and slot is not None else None
+        if rank is None:
+            raise HTTPException(status_code=404, detail="Player is not on this leaderboard.")
+
+        return JSONResponse(content={
+            "userId": userId,
+            "board": board,
+            "mode": mode,
+            "rank": rank,
+            "value": index.get(slot),
+            "totalPlayers": index.count
+        }, status_code=200)
+
+    def __getIndex(self, board: str, mode: str):
+        """
+        :return: {RankIndex} The leaderboard's index, or None for a mode no game has been finished in yet.
+        """
+        if board not in self.BOARDS:
+            raise HTTPException(status_code=400, detail=f"Board must be one of {', '.join(self.BOARDS)}.")
+        if mode is None:
+            return self.boards[board]
+        if board != "highestScore":
+            raise HTTPException(status_code=400, detail="Only the highestScore board can be ranked by mode.")
+        return self.modeBoards.get(mode)
+
+    @contextmanager
+    def __pausedGarbageCollection(self):
+        """
+        Pauses the cyclic garbage collector for a synchronous step of the rebuild. The rows read are freed by reference
+        counting as each batch is consumed, but allocating millions of them would otherwise set off repeated full
+        collections that take longer than the rebuild itself. Never held across an await, so other requests, and any
+        overlapping rebuild, always run with the collector as they found it.
+        """
+        wasGcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            yield
+        finally:
+            if wasGcEnabled:
+                gc.enable()
+
+    def __applyGame(self, userId: str, highestScore: int, currentLevel: int, winRate: int, mode: str, gameScore: int):
+        slot = self.slots.get(userId)
+        if slot is None:
+            slot = self.slots[userId] = len(self.userIds)
+            self.userIds.append(userId)
+
+        rankedHighScore = self.boards["highestScore"].get(slot)
+        if rankedHighScore is None or highestScore > rankedHighScore:
+            self.boards["highestScore"].set(slot, highestScore)
+        self.boards["currentLevel"].set(slot, currentLevel)
+        self.boards["winRate"].set(slot, winRate)
+        if mode is not None:
+            modeBoard = self.modeBoards.setdefault(mode, RankIndex(self.topCapacity))
+            modeHighScore = modeBoard.get(slot)
+            if modeHighScore is None or gameScore > modeHighScore:
+                modeBoard.set(slot, gameScore)
+
+
+# Process-wide leaderboards, kept current by every PlayerStatsManagementService.
+leaderboardService = LeaderboardService()
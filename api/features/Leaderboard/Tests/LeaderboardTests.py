@@ -0,0 +1,174 @@
+from api.database.schema.DatabaseSchema import Base, GamesTable, PlayerStatsTable
+from api.features.Leaderboard.Database.LeaderboardDatabaseService import LeaderboardDatabaseService
+from api.features.Leaderboard.Services.LeaderboardService import LeaderboardService
+from api.features.Leaderboard.Utils.RankIndex import RankIndex
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from types import SimpleNamespace
+import gc
+import json
+import numpy as np
+import random
+import unittest
+
+""" Testing the rank index against a full sort, and the leaderboards kept from finished games and rebuilt from the database. """
+class LeaderboardTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database and leaderboards over it. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.leaderboardService = LeaderboardService(LeaderboardDatabaseService(self.sessionFactory), topCapacity=3)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    @staticmethod
+    def expectedRanks(values: dict) -> dict:
+        return {slot: 1 + sum(other > value for other in values.values()) for slot, value in values.items()}
+
+    @staticmethod
+    def readBody(response) -> dict:
+        return json.loads(response.body.decode("utf-8"))
+
+    def testRanksMatchAFullSortThroughRandomUpdates(self):
+        """
+        After any sequence of updates, ranks and the top list agree with sorting every value, ties included.
+        """
+        # Arrange
+        generator = random.Random(7)
+        rankIndex = RankIndex(topCapacity=5)
+        rankIndex.load(np.array([3, RankIndex.MISSING, 3, 8], dtype=np.int32))
+        values = {0: 3, 2: 3, 3: 8}
+
+        for _ in range(2000):
+            # Act
+            slot = generator.randrange(40)
+            values[slot] = generator.choice([generator.randrange(10), generator.randrange(5000)])
+            rankIndex.set(slot, values[slot])
+
+            # Assert
+            expectedRanks = self.expectedRanks(values)
+            self.assertEqual(rankIndex.rank(slot), expectedRanks[slot])
+            expectedTop = sorted(values, key=lambda other: (-values[other], other))[:5]
+            self.assertEqual([(rank, slot, value) for rank, slot, value in rankIndex.top(5)],
+                             [(expectedRanks[other], other, values[other]) for other in expectedTop])
+
+    async def testFinishedGamesUpdateEveryBoard(self):
+        """
+        A finished game moves the player on the overall boards and on its mode's board, where only a better score
+        counts.
+        """
+        # Arrange
+        def player(highestScore, currentLevel, winRate):
+            return SimpleNamespace(highestScore=highestScore, currentLevel=currentLevel, winRate=winRate)
+
+        # Act
+        self.leaderboardService.recordGame("player1", player(100, 2, 50), "NORMAL", 100)
+        self.leaderboardService.recordGame("player2", player(300, 1, 100), "HARD", 300)
+        self.leaderboardService.recordGame("player1", player(100, 3, 33), "NORMAL", 40)
+        topScores = self.readBody(self.leaderboardService.getLeaderboard("highestScore"))
+        topLevels = self.readBody(self.leaderboardService.getLeaderboard("currentLevel"))
+        normalRank = self.readBody(self.leaderboardService.getPlayerRank("player1", "highestScore", "NORMAL"))
+
+        # Assert
+        self.assertEqual([(entry["rank"], entry["userId"]) for entry in topScores["entries"]],
+                         [(1, "player2"), (2, "player1")])
+        self.assertEqual(topLevels["entries"][0], {"rank": 1, "userId": "player1", "value": 3})
+        self.assertEqual((normalRank["rank"], normalRank["value"], normalRank["totalPlayers"]), (1, 100, 1))
+        with self.assertRaises(HTTPException) as context:
+            self.leaderboardService.getPlayerRank("player2", "highestScore", "NORMAL")
+        self.assertEqual(context.exception.status_code, 404)
+
+    async def testStaleHighestScoreDoesNotLowerTheRanking(self):
+        """
+        A game recorded from a session that has not seen the player's better game elsewhere keeps the better score.
+        """
+        # Arrange
+        self.leaderboardService.recordGame("player1", SimpleNamespace(highestScore=500, currentLevel=4, winRate=50),
+                                           "HARD", 500)
+
+        # Act
+        self.leaderboardService.recordGame("player1", SimpleNamespace(highestScore=80, currentLevel=5, winRate=40),
+                                           "EASY", 80)
+        highestScore = self.readBody(self.leaderboardService.getPlayerRank("player1"))
+        currentLevel = self.readBody(self.leaderboardService.getPlayerRank("player1", "currentLevel"))
+
+        # Assert
+        self.assertEqual(highestScore["value"], 500)
+        self.assertEqual(currentLevel["value"], 5)
+
+    async def testRebuildReadsStatsAndModeHighScores(self):
+        """
+        A rebuild ranks players that have finished a game by their stats, and within each mode by their best game.
+        """
+        # Arrange
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                await session.execute(insert(PlayerStatsTable), [
+                    {"userId": f"player{number}", "highestScore": number * 10, "currentLevel": 1, "winRate": 0,
+                     "gamesPlayed": 1 if number else 0} for number in range(5)])
+                await session.execute(insert(GamesTable), [
+                    {"userId": "player4", "mode": "EASY", "score": 40},
+                    {"userId": "player4", "mode": "EASY", "score": 15},
+                    {"userId": "player3", "mode": "EASY", "score": 30},
+                    {"userId": "player2", "mode": "HARD", "score": 20}])
+
+        # Act
+        await self.leaderboardService.rebuild()
+        topScores = self.readBody(self.leaderboardService.getLeaderboard("highestScore", limit=2, offset=1))
+        easyScores = self.readBody(self.leaderboardService.getLeaderboard("highestScore", "EASY"))
+
+        # Assert
+        self.assertEqual(topScores["totalPlayers"], 4)
+        self.assertEqual([entry["userId"] for entry in topScores["entries"]], ["player3", "player2"])
+        self.assertEqual([(entry["userId"], entry["value"]) for entry in easyScores["entries"]],
+                         [("player4", 40), ("player3", 30)])
+
+    async def testRebuildLeavesGarbageCollectionOnAcrossAwaits(self):
+        """
+        A rebuild only pauses the garbage collector around its synchronous steps, never while other requests run.
+        """
+        # Arrange
+        gcEnabledAtAwaits = []
+
+        async def streamPlayerStats():
+            for number in range(3):
+                gcEnabledAtAwaits.append(gc.isenabled())
+                yield [(f"player{number}", number, 1, 0)]
+            gcEnabledAtAwaits.append(gc.isenabled())
+
+        async def streamModeHighScores():
+            gcEnabledAtAwaits.append(gc.isenabled())
+            yield [("EASY", "player1", 10)]
+            gcEnabledAtAwaits.append(gc.isenabled())
+
+        databaseService = SimpleNamespace(streamPlayerStats=streamPlayerStats,
+                                          streamModeHighScores=streamModeHighScores)
+        leaderboardService = LeaderboardService(databaseService, topCapacity=3)
+
+        # Act
+        await leaderboardService.rebuild()
+
+        # Assert
+        self.assertEqual(gcEnabledAtAwaits, [True] * 6)
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(self.readBody(leaderboardService.getPlayerRank("player2"))["rank"], 1)
+
+    async def testInvalidRequestsAreRejected(self):
+        """
+        Unknown boards, modes on boards other than highestScore, and limits out of range are rejected.
+        """
+        # Act & Assert
+        for board, mode, limit in (("gamesWon", None, 10), ("winRate", "EASY", 10), ("highestScore", None, 0)):
+            with self.assertRaises(HTTPException) as context:
+                self.leaderboardService.getLeaderboard(board, mode, limit)
+            self.assertEqual(context.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+from api.features.Leaderboard.Configs import LeaderboardConfig as Config
+from array import array
+from bisect import bisect_left, insort
+import numpy as np
+
+"""
+Ranks players by one non-negative integer value, such as their highestScore, with O(log n) updates and rank lookups.
+
+Players are identified by slots, small integers handed out by the LeaderboardService, and each slot's value is kept in a
+compact array, 4 bytes per player, so a million players take 4 MB per leaderboard. A Fenwick tree counts the players
+holding each value, which gives the number of players above any value, and so a player's rank, in O(log m) for m
+distinct values. The best entries are kept in a sorted list of at most TOP_CAPACITY entries that every update adjusts in
+place; only when a listed player drops out with no known replacement is the list refilled from the value array.
+
+Ties share a rank, as in "1, 2, 2, 4", and are listed in slot order.
+"""
+class RankIndex:
+    MISSING = -1
+
+    def __init__(self, topCapacity: int = Config.TOP_CAPACITY):
+        """
+        Instantiates an empty index.
+        :param: {Int} topCapacity - Entries kept in the sorted top list.
+        """
+        self.topCapacity = topCapacity
+        self.values = array("i")
+        self.count = 0
+        self.fenwickTree = [0] * 2
+        # (-value, slot) of the best entries, best first.
+        self.topEntries = []
+        self.isTopStale = False
+
+    def load(self, values: np.ndarray):
+        """
+        Replaces the index's contents in O(n + m).
+        :param: {np.ndarray} values - The value of every slot, or MISSING for slots without one.
+        :return: None.
+        """
+        values = np.asarray(values, dtype=np.int32)
+        self.values = array("i", values.tobytes())
+        present = values[values != self.MISSING]
+        self.count = int(present.size)
+        self.__rebuildFenwickTree(int(present.max()) if present.size else 0)
+        self.__refillTop()
+
+    def set(self, slot: int, value: int):
+        """
+        Sets the slot's value.
+        :param: {Int} slot - The player's slot.
+        :param: {Int} value - The player's new value, at least 0.
+        :return: None.
+        """
+        value = max(0, int(value))
+        if slot >= len(self.values):
+            self.values.extend([self.MISSING] * (slot + 1 - len(self.values)))
+        oldValue = self.values[slot]
+        if oldValue == value:
+            return
+
+        if oldValue == self.MISSING:
+            self.count += 1
+        else:
+            self.__addToFenwickTree(oldValue, -1)
+        if value >= len(self.fenwickTree) - 1:
+            self.values[slot] = value
+            self.__rebuildFenwickTree(value)
+        else:
+            self.values[slot] = value
+            self.__addToFenwickTree(value, 1)
+        self.__updateTop(slot, oldValue, value)
+
+    def get(self, slot: int):
+        """
+        :param: {Int} slot - The player's slot.
+        :return: {Int} The slot's value, or None if it has none.
+        """
+        if slot >= len(self.values) or self.values[slot] == self.MISSING:
+            return None
+        return self.values[slot]
+
+    def rank(self, slot: int):
+        """
+        :param: {Int} slot - The player's slot.
+        :return: {Int} 1 plus the number of players with a higher value, or None if the slot has no value.
+        """
+        value = self.get(slot)
+        if value is None:
+            return None
+        return 1 + self.count - self.__countAtMost(value)
+
+    def top(self, limit: int, offset: int = 0) -> list:
+        """
+        :param: {Int} limit - Maximum number of entries.
+        :param: {Int} offset - Entries to skip from the top.
+        :return: {List} (rank, slot, value) of the entries, best first. Offsets beyond topCapacity return nothing.
+        """
+        if self.isTopStale:
+            self.__refillTop()
+        entries = []
+        for negativeValue, slot in self.topEntries[offset:offset + limit]:
+            entries.append((1 + self.count - self.__countAtMost(-negativeValue), slot, -negativeValue))
+        return entries
+
+    def __updateTop(self, slot: int, oldValue: int, value: int):
+        """
+        Moves the slot within the top list, or in or out of it, keeping it sorted and at most topCapacity long.
+        """
+        if oldValue != self.MISSING:
+            oldEntry = (-oldValue, slot)
+            position = bisect_left(self.topEntries, oldEntry)
+            if position < len(self.topEntries) and self.topEntries[position] == oldEntry:
+                del self.topEntries[position]
+
+        entry = (-value, slot)
+        if len(self.topEntries) < self.topCapacity and len(self.topEntries) == self.count - 1:
+            # Every other player is listed, so this one belongs in the list wherever it sorts.
+            insort(self.topEntries, entry)
+        elif self.topEntries and entry < self.topEntries[-1]:
+            insort(self.topEntries, entry)
+            if len(self.topEntries) > self.topCapacity:
+                self.topEntries.pop()
+        # A listed player that dropped below the last entry leaves a gap only a full scan can fill.
+        self.isTopStale = len(self.topEntries) < min(self.topCapacity, self.count)
+
+    def __refillTop(self):
+        """
+        Recomputes the top list from the value array in O(n).
+        """
+        values = np.frombuffer(self.values, dtype=np.int32) if len(self.values) else np.empty(0, dtype=np.int32)
+        slots = np.flatnonzero(values != self.MISSING)
+        # One int64 key orders by value descending, then slot ascending.
+        keys = -values[slots].astype(np.int64) * (len(values) + 1) + slots
+        if keys.size > self.topCapacity:
+            keys = keys[np.argpartition(keys, self.topCapacity - 1)[:self.topCapacity]]
+        keys.sort()
+        topSlots = keys % (len(values) + 1)
+        self.topEntries = [(-int(values[slot]), int(slot)) for slot in topSlots]
+        self.isTopStale = False
+
+    def __rebuildFenwickTree(self, maxValue: int):
+        """
+        Sizes the tree to the next power of two above maxValue, with headroom, and refills it from the value array.
+        """
+        size = 1
+        while size <= maxValue * 2 + 1:
+            size *= 2
+        values = np.frombuffer(self.values, dtype=np.int32) if len(self.values) else np.empty(0, dtype=np.int32)
+        counts = np.bincount(values[values != self.MISSING], minlength=size).astype(np.int64)
+        # Building from cumulative sums is O(m): node i covers the (i & -i) values ending at value i - 1.
+        cumulative = np.concatenate(([0], np.cumsum(counts)))
+        nodes = np.arange(1, size + 1)
+        tree = np.zeros(size + 1, dtype=np.int64)
+        tree[1:] = cumulative[nodes] - cumulative[nodes - (nodes & -nodes)]
+        self.fenwickTree = tree.tolist()
+
+    def __addToFenwickTree(self, value: int, delta: int):
+        node = value + 1
+        tree = self.fenwickTree
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+
+    def __countAtMost(self, value: int) -> int:
+        node = min(value + 1, len(self.fenwickTree) - 1)
+        total = 0
+        tree = self.fenwickTree
+        while node > 0:
+            total += tree[node]
+            node -= node & -node
+        return total
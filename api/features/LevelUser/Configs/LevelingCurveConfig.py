@@ -0,0 +1,22 @@
+import os
+
+"""
+This file contains the configurations for the leveling curve.
+"""
+# XP needed to complete level 1, and the factor each following level's requirement grows by. Level n needs
+# BASE_XP * GROWTH_FACTOR ** (n - 1) XP, rounded to a whole number. The factor is kept as text so it is applied as an
+# exact fraction.
+BASE_XP = int(os.getenv("MASTERMIND_LEVELING_BASE_XP", 100))
+GROWTH_FACTOR = os.getenv("MASTERMIND_LEVELING_GROWTH_FACTOR", "1.5")
+
+# Highest reachable level. The curve also stops before its total XP would overflow a 64-bit integer.
+MAX_LEVEL = int(os.getenv("MASTERMIND_LEVELING_MAX_LEVEL", 1000))
+
+# Limits on the previous curve sent to /recompute-levels. Building a curve costs a step per level, and each decimal
+# place of the growth factor makes those steps slower, so both are bounded.
+MAX_BASE_XP = 1_000_000_000
+GROWTH_FACTOR_PATTERN = r"^[0-9]{1,2}(\.[0-9]{1,4})?$"
+MAX_LEVEL_LIMIT = 10000
+
+# Players read and updated per batch when every player's level is recomputed for a new curve.
+RECOMPUTE_BATCH_SIZE = int(os.getenv("MASTERMIND_LEVELING_RECOMPUTE_BATCH_SIZE", 10000))
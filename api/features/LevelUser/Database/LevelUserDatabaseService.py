@@ -1,3 +1,75 @@
+from api.database.schema.DatabaseSchema import sessionLocal, PlayerStatsTable
+from api.features.LevelUser.Configs import LevelingCurveConfig as Config
+from api.features.LevelUser.Utils.LevelingCurve import LevelingCurve, levelingCurve
+from api.features.PlayerStats.Database.PlayerStatsCache import playerStatsCache
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.future import select
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
 """
-This Database Service file is a skeleton for future development on PlayerDataManagement.
-"""
\ No newline at end of file
+Handles the database interactions for leveling, recomputing every player's level when the leveling curve changes.
+"""
+class LevelUserDatabaseService:
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def recomputeLevels(self, previousCurve: LevelingCurve, curve: LevelingCurve = levelingCurve,
+                              batchSize: int = Config.RECOMPUTE_BATCH_SIZE) -> int:
+        """
+        Moves every player to the level their total XP reaches on the new curve. Each batch of players is read by
+        keyset on userId, converted to total XP on the previous curve and back to levels on the new one as arrays, and
+        written with one batched UPDATE of the players whose leveling changed. Run it while no games are finishing, as
+        games in progress still level on the curve they loaded.
+        :param: {LevelingCurve} previousCurve - The curve the stored levels were earned on.
+        :param: {LevelingCurve} curve - The new curve.
+        :param: {Int} batchSize - Players per batch.
+        :return: {Int} The number of players whose level, currentXp, or xpToNextLevel changed.
+        """
+        playerStats = PlayerStatsTable.__table__.c
+        updateLeveling = (
+            update(PlayerStatsTable.__table__)
+            .where(playerStats.userId == bindparam("targetUserId"))
+            .values(currentLevel=bindparam("newLevel"), currentXp=bindparam("newXp"),
+                    xpToNextLevel=bindparam("newXpToNextLevel"))
+        )
+        changedCount, lastUserId = 0, None
+
+        while True:
+            query = select(playerStats.userId, func.coalesce(playerStats.currentLevel, 1),
+                           func.coalesce(playerStats.currentXp, 0), func.coalesce(playerStats.xpToNextLevel, 0))
+            if lastUserId is not None:
+                query = query.where(playerStats.userId > lastUserId)
+            query = query.order_by(playerStats.userId).limit(batchSize)
+
+            async with self.sessionFactory() as session:
+                async with session.begin():
+                    rows = (await session.execute(query)).all()
+                    if not rows:
+                        break
+                    userIds, levels, currentXps, xpToNextLevels = zip(*rows)
+                    newLevels, newXps, newXpToNextLevels = curve.getLevels(previousCurve.getTotalXps(
+                        np.array(levels, dtype=np.int64), np.array(currentXps, dtype=np.int64)))
+                    # Stored values may be fractional from the previous leveling loop, so they compare as floats.
+                    isChanged = ((newLevels != np.array(levels, dtype=np.float64))
+                                 | (newXps != np.array(currentXps, dtype=np.float64))
+                                 | (newXpToNextLevels != np.array(xpToNextLevels, dtype=np.float64)))
+                    changedIndexes = np.flatnonzero(isChanged)
+                    if changedIndexes.size:
+                        await session.execute(updateLeveling, [
+                            {"targetUserId": userIds[index], "newLevel": int(newLevels[index]),
+                             "newXp": int(newXps[index]), "newXpToNextLevel": int(newXpToNextLevels[index])}
+                            for index in changedIndexes.tolist()])
+
+            for index in changedIndexes.tolist():
+                playerStatsCache.invalidate(userIds[index])
+            changedCount += int(changedIndexes.size)
+            lastUserId = userIds[-1]
+
+        logger.info("Recomputed levels, %s players changed.", changedCount)
+        return changedCount
@@ -1,3 +1,134 @@
-"""
-This Tests file is a skeleton for future testing on the LevelUserService.
-"""
\ No newline at end of file
+from api.database.schema.DatabaseSchema import Base, PlayerStatsTable, UsersTable
+from api.features.LevelUser.Database.LevelUserDatabaseService import LevelUserDatabaseService
+from api.features.LevelUser.Services.LevelUserService import LevelUserService
+from api.features.LevelUser.Utils.LevelingCurve import LevelingCurve
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from types import SimpleNamespace
+import numpy as np
+import unittest
+
+
+""" Testing that levels follow from total XP on the leveling curve without stepping or drift. """
+class LevelUserServiceTest(unittest.TestCase):
+    def setUp(self):
+        """ Arrange the default curve: 100 XP for level 1, growing by 1.5 per level. """
+        self.curve = LevelingCurve(100, "1.5", 1000)
+
+    def level(self, currentLevel: int, currentXp: int, gameScore: int) -> SimpleNamespace:
+        player = SimpleNamespace(currentLevel=currentLevel, currentXp=currentXp, xpToNextLevel=None)
+        LevelUserService(player, self.curve).handleLeveling(gameScore)
+        return player
+
+    def testLevelingMatchesSteppingThroughEachLevel(self):
+        """
+        Every total XP lands on the level reached by spending XP one level at a time.
+        """
+        for totalXp in range(0, 5000, 7):
+            # Arrange
+            level, remainingXp = 1, totalXp
+            while remainingXp >= self.curve.xpPerLevel[level - 1]:
+                remainingXp -= self.curve.xpPerLevel[level - 1]
+                level += 1
+
+            # Act
+            player = self.level(1, 0, totalXp)
+
+            # Assert
+            self.assertEqual((player.currentLevel, player.currentXp, player.xpToNextLevel),
+                             (level, remainingXp, self.curve.xpPerLevel[level - 1]))
+
+    def testRequirementsAreWholeNumbersWithoutDrift(self):
+        """
+        Every level's requirement is an integer rounded once from the exact closed form.
+        """
+        # Assert
+        for level in (1, 2, 10, 50):
+            self.assertIsInstance(self.curve.xpPerLevel[level - 1], int)
+            self.assertEqual(self.curve.xpPerLevel[level - 1], round(100 * (self.curve.growthFactor ** (level - 1))))
+
+    def testLargeAwardIsCappedBelowTheLastLevel(self):
+        """
+        An award far beyond the top of the curve leaves the player at the last level, which is never completed.
+        """
+        # Act
+        player = self.level(3, 10, 2 ** 80)
+
+        # Assert
+        self.assertEqual(player.currentLevel, self.curve.maxLevel)
+        self.assertEqual(player.currentXp, player.xpToNextLevel - 1)
+        self.assertLess(self.curve.getTotalXp(player.currentLevel, player.currentXp), 2 ** 63)
+
+    def testVectorizedLevelsMatchScalarLevels(self):
+        """
+        The bulk conversions give the same levels as the per-player ones.
+        """
+        # Arrange
+        totalXps = np.random.default_rng(7).integers(0, 10 ** 12, 1000)
+
+        # Act
+        levels, currentXps, xpToNextLevels = self.curve.getLevels(totalXps)
+
+        # Assert
+        self.assertEqual(list(zip(levels.tolist(), currentXps.tolist(), xpToNextLevels.tolist())),
+                         [self.curve.getLevel(totalXp) for totalXp in totalXps.tolist()])
+        self.assertEqual(self.curve.getTotalXps(levels, currentXps).tolist(), totalXps.tolist())
+
+
+""" Testing that every stored player is moved onto a new leveling curve in batches. """
+class LevelUserDatabaseServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database with players leveled on the default curve. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.previousCurve = LevelingCurve(100, "1.5", 1000)
+        self.totalXps = {f"player{number:02}": number * 997 for number in range(25)}
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                for userId, totalXp in self.totalXps.items():
+                    level, currentXp, xpToNextLevel = self.previousCurve.getLevel(totalXp)
+                    await session.execute(insert(UsersTable).values(userId=userId, username=userId, password="hashed"))
+                    await session.execute(insert(PlayerStatsTable).values(
+                        userId=userId, currentLevel=level, currentXp=currentXp, xpToNextLevel=xpToNextLevel))
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def testEveryPlayerKeepsTheirTotalXpOnTheNewCurve(self):
+        """
+        Each player's level is recomputed from the total XP they had on the previous curve, across several batches.
+        """
+        # Arrange
+        curve = LevelingCurve(50, "1.25", 1000)
+
+        # Act
+        changedCount = await LevelUserDatabaseService(self.sessionFactory).recomputeLevels(
+            self.previousCurve, curve, batchSize=4)
+
+        # Assert
+        async with self.sessionFactory() as session:
+            rows = (await session.execute(select(PlayerStatsTable.userId, PlayerStatsTable.currentLevel,
+                                                 PlayerStatsTable.currentXp, PlayerStatsTable.xpToNextLevel))).all()
+        self.assertEqual({userId: (level, currentXp, xpToNextLevel) for userId, level, currentXp, xpToNextLevel in rows},
+                         {userId: curve.getLevel(totalXp) for userId, totalXp in self.totalXps.items()})
+        self.assertEqual(changedCount, len(self.totalXps))
+
+    async def testUnchangedCurveWritesNothing(self):
+        """
+        Recomputing with the curve the levels were earned on leaves every row as it was.
+        """
+        # Act
+        changedCount = await LevelUserDatabaseService(self.sessionFactory).recomputeLevels(
+            self.previousCurve, self.previousCurve)
+
+        # Assert
+        self.assertEqual(changedCount, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
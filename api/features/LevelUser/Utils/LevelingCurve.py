@@ -0,0 +1,94 @@
+from api.features.LevelUser.Configs import LevelingCurveConfig as Config
+from bisect import bisect_right
+from fractions import Fraction
+import numpy as np
+
+"""
+A leveling curve with its cumulative XP table precomputed, so a player's level and the XP into it follow from their
+total XP with one binary search instead of stepping through every level gained.
+
+Each level's requirement is computed from the closed form with exact fractions and rounded once, so requirements never
+drift however high the level, and are always whole numbers. Level n starts at cumulativeXp[n - 1] total XP. The last
+level in the table is never completed.
+"""
+class LevelingCurve:
+    MAX_TOTAL_XP = 2 ** 62
+
+    def __init__(self, baseXp: int = Config.BASE_XP, growthFactor: str = Config.GROWTH_FACTOR,
+                 maxLevel: int = Config.MAX_LEVEL):
+        """
+        Precomputes the XP needed for each level and the total XP each level starts at.
+        :param: {Int} baseXp - XP needed to complete level 1.
+        :param: {String} growthFactor - Factor each following level's requirement grows by, at least 1.
+        :param: {Int} maxLevel - Highest reachable level.
+        """
+        growthFactor = Fraction(str(growthFactor))
+        if baseXp < 1 or growthFactor < 1 or maxLevel < 1:
+            raise ValueError("baseXp and maxLevel must be at least 1, and growthFactor at least 1.")
+        self.baseXp = baseXp
+        self.growthFactor = growthFactor
+
+        self.xpPerLevel = [baseXp]
+        self.cumulativeXp = [0]
+        requirement = Fraction(baseXp)
+        while len(self.xpPerLevel) < maxLevel:
+            nextStart = self.cumulativeXp[-1] + self.xpPerLevel[-1]
+            requirement *= growthFactor
+            if nextStart + round(requirement) > self.MAX_TOTAL_XP:
+                break
+            self.cumulativeXp.append(nextStart)
+            self.xpPerLevel.append(round(requirement))
+        self.maxTotalXp = self.cumulativeXp[-1] + self.xpPerLevel[-1] - 1
+        self.cumulativeXpArray = np.array(self.cumulativeXp, dtype=np.int64)
+        self.xpPerLevelArray = np.array(self.xpPerLevel, dtype=np.int64)
+
+    @property
+    def maxLevel(self) -> int:
+        return len(self.xpPerLevel)
+
+    def getTotalXp(self, level: int, currentXp: int) -> int:
+        """
+        :param: {Int} level - The player's level.
+        :param: {Int} currentXp - The player's XP into that level.
+        :return: {Int} The player's total XP.
+        """
+        level = int(level)
+        if not 1 <= level <= len(self.cumulativeXp):
+            level = min(max(level, 1), len(self.cumulativeXp))
+        return self.cumulativeXp[level - 1] + int(currentXp)
+
+    def getLevel(self, totalXp: int) -> tuple:
+        """
+        Finds the level for a total XP with a binary search over the cumulative table.
+        :param: {Int} totalXp - The player's total XP.
+        :return: {Tuple} The level, the XP into it, and the XP needed to complete it.
+        """
+        totalXp = int(totalXp)
+        if not 0 <= totalXp <= self.maxTotalXp:
+            totalXp = min(max(totalXp, 0), self.maxTotalXp)
+        level = bisect_right(self.cumulativeXp, totalXp)
+        return level, totalXp - self.cumulativeXp[level - 1], self.xpPerLevel[level - 1]
+
+    def getTotalXps(self, levels: np.ndarray, currentXps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized getTotalXp for many players.
+        :param: {np.ndarray} levels - The players' levels.
+        :param: {np.ndarray} currentXps - The players' XP into their levels.
+        :return: {np.ndarray} The players' total XP.
+        """
+        levels = np.clip(np.asarray(levels, dtype=np.int64), 1, self.maxLevel)
+        return self.cumulativeXpArray[levels - 1] + np.asarray(currentXps, dtype=np.int64)
+
+    def getLevels(self, totalXps: np.ndarray) -> tuple:
+        """
+        Vectorized getLevel for many players.
+        :param: {np.ndarray} totalXps - The players' total XP.
+        :return: {Tuple} Arrays of the levels, the XP into them, and the XP needed to complete them.
+        """
+        totalXps = np.clip(np.asarray(totalXps, dtype=np.int64), 0, self.maxTotalXp)
+        levels = np.searchsorted(self.cumulativeXpArray, totalXps, side="right")
+        return levels, totalXps - self.cumulativeXpArray[levels - 1], self.xpPerLevelArray[levels - 1]
+
+
+# Process-wide curve built from the LevelingCurveConfig.
+levelingCurve = LevelingCurve()
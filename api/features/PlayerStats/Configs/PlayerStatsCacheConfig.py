@@ -0,0 +1,10 @@
+import os
+
+"""
+This file contains the configurations for the read-through cache in front of the PlayerStatsTable.
+"""
+# Maximum number of players whose stats are cached. The least recently used entry is evicted once it is reached.
+MAX_ENTRIES = int(os.getenv("MASTERMIND_STATS_CACHE_MAX_ENTRIES", 10000))
+
+# Cached stats older than this many seconds are re-read from the database.
+TTL_SECONDS = float(os.getenv("MASTERMIND_STATS_CACHE_TTL_SECONDS", 60))
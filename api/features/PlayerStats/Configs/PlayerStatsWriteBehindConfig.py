@@ -0,0 +1,24 @@
+import os
+
+"""
+This file contains the configurations for the write-behind buffer that end-of-game player stats are written through.
+"""
+# When disabled, end-of-game stats are written to the database before the final guess response is sent.
+WRITE_BEHIND_ENABLED = os.getenv("MASTERMIND_STATS_WRITE_BEHIND", "true").lower() == "true"
+
+# Buffered stats are flushed in one transaction every FLUSH_INTERVAL_SECONDS, or as soon as this many players have
+# pending stats, whichever comes first.
+FLUSH_INTERVAL_SECONDS = float(os.getenv("MASTERMIND_STATS_FLUSH_INTERVAL_SECONDS", 1.0))
+FLUSH_SIZE_THRESHOLD = int(os.getenv("MASTERMIND_STATS_FLUSH_SIZE_THRESHOLD", 256))
+
+# How buffered stats survive a crash before they are flushed:
+#   "fsync" - every update is appended to the log and fsync'd before the game's response is sent.
+#   "log"   - every update is appended to the log without fsync; survives a process crash but not a power loss.
+#   "none"  - no log; updates still buffered when the process dies are lost.
+DURABILITY = os.getenv("MASTERMIND_STATS_DURABILITY", "fsync")
+LOG_PATH = os.getenv("MASTERMIND_STATS_LOG_PATH", "./api/database/PlayerStatsWriteBehind.log")
+
+# Each worker process claims its own log and checkpoint with a lock file, taking the lowest free of this many slots.
+# The first slot uses LOG_PATH itself, and slot n uses LOG_PATH with -n before its extension. A restarted worker claims
+# a slot freed by a dead one and replays that slot's log.
+WORKER_SLOTS = int(os.getenv("MASTERMIND_STATS_WORKER_SLOTS", 64))
@@ -0,0 +1,129 @@
+from api.features.PlayerStats.Configs import PlayerStatsCacheConfig as Config
+from collections import OrderedDict
+import time
+
+"""
+A bounded read-through cache of PlayerStatsTable rows keyed by userId, with least-recently-used eviction and a TTL.
+Entries hold plain column values so callers can never mutate a cached row, and every write through the database
+service refreshes the entry so reads never see stats older than the last write.
+
+Every write is numbered with a generation. A read-through fills the cache with putIfUnchanged and the generation taken
+before its SELECT, and is skipped if the player was written since, so a row read before a write never replaces the row
+the write cached. The generations of the last maxEntries players written are kept; a read older than the oldest
+forgotten write is skipped as well.
+"""
+class PlayerStatsCache:
+    def __init__(self, maxEntries: int = Config.MAX_ENTRIES, ttlSeconds: float = Config.TTL_SECONDS,
+                 clock=time.monotonic):
+        """
+        Instantiates an empty cache.
+        :param: {Int} maxEntries - Maximum number of cached players.
+        :param: {Float} ttlSeconds - Seconds after which a cached entry is treated as a miss.
+        :param: {Callable} clock - Monotonic clock, overridable for tests.
+        """
+        if maxEntries < 1:
+            raise ValueError("maxEntries must be at least 1.")
+        self.maxEntries = maxEntries
+        self.ttlSeconds = ttlSeconds
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.generation = 0
+        self.writeGenerations = OrderedDict()
+        self.forgottenGeneration = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, userId: str):
+        """
+        Returns the cached stats for the player, counting a hit or a miss.
+        :param: {String} userId - UserId of the player.
+        :return: {Dictionary} The cached PlayerStatsTable column values, or None on a miss.
+        """
+        entry = self.entries.get(userId)
+        if entry is not None:
+            playerStats, cachedAt = entry
+            if self.clock() - cachedAt < self.ttlSeconds:
+                self.entries.move_to_end(userId)
+                self.hits += 1
+                return playerStats
+            del self.entries[userId]
+        self.misses += 1
+        return None
+
+    def getGeneration(self) -> int:
+        """
+        :return: {Int} The generation of the latest write, to pass to putIfUnchanged once a row has been read.
+        """
+        return self.generation
+
+    def put(self, userId: str, playerStats: dict):
+        """
+        Caches the player's stats as written, evicting the least recently used entry if the cache is full.
+        :param: {String} userId - UserId of the player.
+        :param: {Dictionary} playerStats - The player's PlayerStatsTable column values.
+        :return: None.
+        """
+        self.__recordWrite(userId)
+        self.__store(userId, playerStats)
+
+    def putIfUnchanged(self, userId: str, playerStats: dict, generation: int) -> bool:
+        """
+        Caches stats read from the database, unless the player was written after the read started.
+        :param: {String} userId - UserId of the player.
+        :param: {Dictionary} playerStats - The player's PlayerStatsTable column values as read.
+        :param: {Int} generation - The generation returned by getGeneration before the read.
+        :return: {Boolean} Whether the stats were cached.
+        """
+        if generation < self.forgottenGeneration or self.writeGenerations.get(userId, 0) > generation:
+            return False
+        self.__store(userId, playerStats)
+        return True
+
+    def invalidate(self, userId: str):
+        """
+        Removes the player's cached stats, if any.
+        :param: {String} userId - UserId of the player.
+        :return: None.
+        """
+        self.__recordWrite(userId)
+        if self.entries.pop(userId, None) is not None:
+            self.invalidations += 1
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the cache's counters for scraping.
+        :return: {Dictionary} Hits, misses, hit ratio, evictions, invalidations, current size, and capacity.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+            "maxEntries": self.maxEntries
+        }
+
+    def __store(self, userId: str, playerStats: dict):
+        self.entries[userId] = (dict(playerStats), self.clock())
+        self.entries.move_to_end(userId)
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __recordWrite(self, userId: str):
+        self.generation += 1
+        self.writeGenerations[userId] = self.generation
+        self.writeGenerations.move_to_end(userId)
+        while len(self.writeGenerations) > self.maxEntries:
+            _, self.forgottenGeneration = self.writeGenerations.popitem(last=False)
+
+
+# Process-wide cache shared by every PlayerStatsManagementDatabaseService.
+playerStatsCache = PlayerStatsCache()
@@ -1,75 +1,173 @@
 from fastapi import HTTPException
-from sqlalchemy import update
-from fastapi.responses import JSONResponse
 from sqlalchemy.future import select
 from api.database.schema.DatabaseSchema import sessionLocal, PlayerStatsTable
-import traceback
+from api.features.PlayerStats.Database.PlayerStatsWriteBehindBuffer import (
+    PlayerStatsWriteBehindBuffer, playerStatsWriteBehindBuffer)
+from api.features.PlayerStats.Database.PlayerStatsCache import PlayerStatsCache, playerStatsCache
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
 import logging
 
+logger = logging.getLogger(__name__)
+
 """
 Handles the database interactions for the PlayerStatsManagementService, including getting and updating player stats.
 """
 class PlayerStatsManagementDatabaseService:
-    def __init__(self, PlayerStatsManagementService):
+    def __init__(self, PlayerStatsManagementService, sessionFactory=sessionLocal,
+                 cache: PlayerStatsCache = playerStatsCache,
+                 writeBehindBuffer: PlayerStatsWriteBehindBuffer = playerStatsWriteBehindBuffer):
         """
         Instantiates the PlayerStatsManagementService to have access to player stats data.
         :param: {PlayerStatsManagementService} PlayerStatsManagementService - Contains player stats data.
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        :param: {PlayerStatsCache} cache - The player stats cache, overridable for tests.
+        :param: {PlayerStatsWriteBehindBuffer} writeBehindBuffer - Holds the stats not yet written, overridable for
+        tests.
         """
         self.playerStatsManagementService = PlayerStatsManagementService
+        self.sessionFactory = sessionFactory
+        self.cache = cache
+        self.writeBehindBuffer = writeBehindBuffer
 
     async def getPlayerStats(self, userId: str):
         """
-        Retrieves the player stats data using the userId from the PlayerStatsTable in the database.
+        Retrieves the player stats data using the userId from the PlayerStatsTable in the database, reading through the
+        player stats cache. End-of-game stats still waiting in the write-behind buffer are applied on top, so a player
+        always sees the result of their last game.
         :param: {String} userId - UserId of the current player.
         :return: The player stats data as a PlayerStatsTable object.
         :raise: {HTTPException}:
             - 404: If the player stats data is not found.
         """
         if not userId:
-            logging.error(f"Player not found: {traceback.format_exc()}")
+            logger.warning("Player not found.")
             raise HTTPException(status_code=404, detail="Player not found. UserId is required to retrieve player stats.")
 
-        async with sessionLocal() as session:
-            result = await session.execute(select(PlayerStatsTable).where(PlayerStatsTable.userId == userId))
-            return result.scalars().first()
+        playerStats = self.cache.get(userId)
+        while playerStats is None:
+            # A row read while a flush writes the player's stats may or may not include them, so the read waits for the
+            # flush. If the player is written during the read, the row may be older than the write, so the written row
+            # is taken from the cache instead, or read again if the write only invalidated it.
+            await self.writeBehindBuffer.waitForFlush(userId)
+            generation = self.cache.getGeneration()
+            async with self.sessionFactory() as session:
+                result = await session.execute(select(PlayerStatsTable).where(PlayerStatsTable.userId == userId))
+                storedStats = result.scalars().first()
+            if storedStats is None:
+                return None
+            playerStats = self.__acceptStoredStats(userId, storedStats, generation)
+
+        return self.__applyPendingStats(userId, playerStats)
+
+    def getGeneration(self) -> int:
+        """
+        :return: {Int} The player stats cache's generation, to take before reading a stats row alongside other data
+        and pass to getPlayerStatsFromRow.
+        """
+        return self.cache.getGeneration()
+
+    async def getPlayerStatsFromRow(self, userId: str, storedStats: PlayerStatsTable, generation: int):
+        """
+        Resolves the player's stats from a row already read alongside other data, such as the user on login, with the
+        same read-your-writes guarantees as getPlayerStats. The row is used if no write to the player's stats raced
+        the read; otherwise the stats are read again through the cache. Stats still waiting in the write-behind buffer
+        are applied on top either way.
+        :param: {String} userId - UserId of the current player.
+        :param: {PlayerStatsTable} storedStats - The player's stats row as read, or None if they have none.
+        :param: {Int} generation - The generation returned by getGeneration before the row was read.
+        :return: The player stats data as a PlayerStatsTable object, or None if they have no stats row.
+        """
+        if storedStats is None:
+            return None
+        playerStats = self.__acceptStoredStats(userId, storedStats, generation)
+        if playerStats is None:
+            return await self.getPlayerStats(userId)
+        return self.__applyPendingStats(userId, playerStats)
 
-    async def putPlayerStats(self, userId: str):
+    async def putPlayerStats(self, userId: str) -> PlayerStatsTable:
         """
-        Updates the player stats data from memory to the PlayerStatsTable in the database.
+        Writes the player's pending end-of-game stats to the PlayerStatsTable by flushing the write-behind buffer, whose
+        atomic increments count each game exactly once, and reads the player's stats back. The in-memory totals are
+        never written over the row, as they may already include games the buffer has yet to apply, or miss games
+        finished in other sessions.
         :param: {String} userId - UserId of the current player.
-        :return: {JSONResponse} - Success message if the player's stats are updated successfully.
+        :return: {PlayerStatsTable} The player's stored stats.
         :raise: {HTTPException}:
+            - 400: If the userId is missing.
             - 404: If the player stats data is not found.
+            - 500: If the player's pending stats could not be written.
+        """
+        if not userId:
+            logger.warning("Error with updating player stats.")
+            raise HTTPException(status_code=400, detail='UserId required to update player data.')
+
+        await self.writeBehindBuffer.flush()
+        if userId in self.writeBehindBuffer.pending:
+            raise HTTPException(status_code=500, detail="The player's pending stats could not be written.")
+
+        playerStats = await self.getPlayerStats(userId)
+        if playerStats is None:
+            raise HTTPException(status_code=404, detail="Player stats not found.")
+        return playerStats
+
+    async def applyEndGameStats(self, userId: str, endGameStats: dict) -> dict:
+        """
+        Applies end-of-game stats to the player's row in one atomic statement: gamesPlayed and gamesWon are incremented
+        and highestScore and winRate are derived in the database, so concurrent games never lose updates.
+        :param: {String} userId - UserId of the current player.
+        :param: {Dictionary} endGameStats - The end-of-game stats, as described in EndGameStatsUtils.
+        :return: {Dictionary} The player's updated PlayerStatsTable column values.
+        :raise: {HTTPException}:
             - 400: If the userId is missing.
+            - 404: If the player stats data is not found.
         """
         if not userId:
-            logging.error(f"Error with updating player stats: {traceback.format_exc()}")
             raise HTTPException(status_code=400, detail='UserId required to update player data.')
 
-        async with sessionLocal() as session:
+        async with self.sessionFactory() as session:
             async with session.begin():
-                result = await session.execute(select(PlayerStatsTable).where(PlayerStatsTable.userId == userId))
-                playerStats = result.scalars().first()
-
-                if not playerStats:
-                    logging.error(f"Player stats missing: {traceback.format_exc()}")
-                    raise HTTPException(status_code=404, detail="Player stats not found.")
-
-                updateRequest = (
-                    update(PlayerStatsTable)
-                    .where(PlayerStatsTable.userId == userId).values(
-                        currentLevel=self.playerStatsManagementService.player.currentLevel,
-                        xpToNextLevel=self.playerStatsManagementService.player.xpToNextLevel,
-                        currentXp=self.playerStatsManagementService.player.currentXp,
-                        highestScore=self.playerStatsManagementService.player.highestScore,
-                        gamesWon=self.playerStatsManagementService.player.gamesWon,
-                        gamesPlayed=self.playerStatsManagementService.player.gamesPlayed,
-                        winRate=self.playerStatsManagementService.player.winRate
-                    )
-                )
-                await session.execute(updateRequest)
-                await session.commit()
-
-            return JSONResponse(
-                content="Player data updated successfully.", status_code=200
-            )
+                result = await session.execute(EndGameStatsUtils.buildEndGameStatsUpdate(userId, endGameStats))
+                updatedRow = result.first()
+
+        if updatedRow is None:
+            raise HTTPException(status_code=404, detail="Player stats not found.")
+
+        updatedStats = dict(updatedRow._mapping)
+        self.cache.put(userId, updatedStats)
+        return updatedStats
+
+    def __acceptStoredStats(self, userId: str, storedStats: PlayerStatsTable, generation: int):
+        """
+        Caches a row read from the database unless a flush was writing the player's stats or the player was written
+        after the read started, in which case the row may be older than the stats already written.
+        :param: {String} userId - UserId of the current player.
+        :param: {PlayerStatsTable} storedStats - The player's stats row as read.
+        :param: {Int} generation - The cache generation taken before the read.
+        :return: {Dictionary} The row's column values, the cached stats written since, or None if the write only
+        invalidated them.
+        """
+        storedStats = self.toColumnValues(storedStats)
+        if not self.writeBehindBuffer.isInFlight(userId) and self.cache.putIfUnchanged(userId, storedStats, generation):
+            return storedStats
+        return self.cache.get(userId)
+
+    def __applyPendingStats(self, userId: str, playerStats: dict) -> PlayerStatsTable:
+        """
+        Applies the end-of-game stats still waiting in the write-behind buffer on top of the stored stats.
+        :param: {String} userId - UserId of the current player.
+        :param: {Dictionary} playerStats - The player's stored PlayerStatsTable column values.
+        :return: {PlayerStatsTable} The player's stats including every game they have finished.
+        """
+        pendingStats = self.writeBehindBuffer.getPending(userId)
+        if pendingStats:
+            playerStats = EndGameStatsUtils.applyEndGameStats(playerStats, pendingStats)
+        return PlayerStatsTable(**playerStats)
+
+    @staticmethod
+    def toColumnValues(playerStats: PlayerStatsTable) -> dict:
+        """
+        Copies a PlayerStatsTable row into a plain dictionary of its column values.
+        :param: {PlayerStatsTable} playerStats - The player stats row.
+        :return: {Dictionary} The row's column values, keyed by column name.
+        """
+        return {column.name: getattr(playerStats, column.name) for column in PlayerStatsTable.__table__.columns}
@@ -0,0 +1,360 @@
+from sqlalchemy.future import select
+from api.database.schema.DatabaseSchema import sessionLocal, WriteBehindCheckpointsTable
+from api.features.PlayerStats.Configs import PlayerStatsWriteBehindConfig as Config
+from api.features.PlayerStats.Database.PlayerStatsCache import PlayerStatsCache, playerStatsCache
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
+import asyncio
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+"""
+Takes end-of-game player stat updates in memory and writes them to the PlayerStatsTable in batched transactions, off
+the critical path of the final guess response.
+
+Updates are end-of-game stats (see EndGameStatsUtils), and repeated updates for the same userId are coalesced into one
+so each player costs a single atomic increment per flush. Pending updates are flushed on a timer or once enough players
+have pending stats, and drained on shutdown. A batch being flushed stays readable through getPending until its
+transaction has committed and the cache holds the rows it wrote, so no read falls between the two. With durability
+enabled, every update is first appended to a log; each flush rotates the log into a numbered segment and records that
+segment number in the WriteBehindCheckpointsTable in the same transaction as the stats. Segments are deleted once the
+flush commits, and on startup only segments newer than the checkpoint are replayed, so a crash between committing and
+deleting never applies the same games twice.
+
+Every worker process has its own log and checkpoint: the first update logged, or startup, claims the lowest worker slot
+whose lock file no other process holds, and the lock is held until the buffer is closed. Workers therefore never rotate
+or replay each other's logs, and a worker started after a crash replays the slot the dead process left behind.
+"""
+class PlayerStatsWriteBehindBuffer:
+    CHECKPOINT_NAME = "playerStats"
+
+    def __init__(self, sessionFactory=sessionLocal, flushInterval: float = Config.FLUSH_INTERVAL_SECONDS,
+                 flushSizeThreshold: int = Config.FLUSH_SIZE_THRESHOLD, durability: str = Config.DURABILITY,
+                 logPath: str = Config.LOG_PATH, cache: PlayerStatsCache = playerStatsCache,
+                 workerSlots: int = Config.WORKER_SLOTS):
+        """
+        Instantiates an empty buffer.
+        :param: {sessionmaker} sessionFactory - Creates the database sessions used for flushing.
+        :param: {Float} flushInterval - Seconds between timed flushes.
+        :param: {Int} flushSizeThreshold - Number of players with pending stats that triggers an immediate flush.
+        :param: {String} durability - "fsync", "log", or "none".
+        :param: {String} logPath - Path of the first worker slot's append log.
+        :param: {PlayerStatsCache} cache - The player stats cache refreshed with every committed flush.
+        :param: {Int} workerSlots - Number of worker processes that can log at once.
+        """
+        if durability not in ("fsync", "log", "none"):
+            raise ValueError(f"Invalid durability: {durability}. Expected 'fsync', 'log', or 'none'.")
+        self.sessionFactory = sessionFactory
+        self.flushInterval = flushInterval
+        self.flushSizeThreshold = flushSizeThreshold
+        self.durability = durability
+        self.baseLogPath = logPath
+        self.workerSlots = workerSlots
+        self.logPath = None
+        self.checkpointName = self.CHECKPOINT_NAME
+        self.slotLockFile = None
+        self.cache = cache
+        self.pending = {}
+        self.inFlight = {}
+        self.logFile = None
+        self.logLock = threading.Lock()
+        self.segmentNumber = 0
+        self.flushLock = None
+        self.flushTask = None
+        self.timerTask = None
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    async def start(self):
+        """
+        Replays any updates logged before a crash and not yet committed, then starts the flush timer. Called on
+        application startup.
+        :return: None.
+        """
+        self.flushLock = asyncio.Lock()
+        if self.durability != "none":
+            await asyncio.to_thread(self.__claimWorkerSlotOnce)
+            checkpoint = await self.__getCheckpoint()
+            await asyncio.to_thread(self.__replayLog, checkpoint)
+            if self.pending:
+                logger.info(f"Replayed buffered stats for {len(self.pending)} players from the write-behind log.")
+                await self.flush()
+        self.timerTask = asyncio.create_task(self.__flushPeriodically())
+
+    async def stop(self):
+        """
+        Stops the flush timer and drains every pending update to the database. Called on application shutdown.
+        :return: None.
+        """
+        if self.timerTask is not None:
+            self.timerTask.cancel()
+            self.timerTask = None
+        if self.flushTask is not None:
+            await asyncio.gather(self.flushTask, return_exceptions=True)
+        await self.flush()
+        await asyncio.to_thread(self.close)
+
+    def close(self):
+        """
+        Closes the log and releases the worker slot without flushing, leaving anything pending to be replayed by the
+        next worker to claim the slot, as after a crash. Called by stop once everything is flushed.
+        :return: None.
+        """
+        with self.logLock:
+            if self.logFile is not None:
+                self.logFile.close()
+                self.logFile = None
+            if self.slotLockFile is not None:
+                self.slotLockFile.close()
+                self.slotLockFile = None
+
+    async def enqueue(self, userId: str, endGameStats: dict):
+        """
+        Buffers the player's end-of-game stats, coalescing them with any that are still pending for them. Reads apply
+        the pending stats on top of the stored ones until they are flushed.
+        :param: {String} userId - UserId of the player.
+        :param: {Dictionary} endGameStats - The end-of-game stats, as described in EndGameStatsUtils.
+        :return: None.
+        """
+        entry = {"userId": userId, **endGameStats}
+        if self.durability != "none":
+            await asyncio.to_thread(self.__appendToLog, entry)
+        self.__merge(entry)
+
+        if len(self.pending) >= self.flushSizeThreshold and (self.flushTask is None or self.flushTask.done()):
+            self.flushTask = asyncio.create_task(self.flush())
+
+    def getPending(self, userId: str):
+        """
+        Returns the end-of-game stats still waiting to be flushed for the player, including any in the batch being
+        flushed, so reads can see their own writes.
+        :param: {String} userId - UserId of the player.
+        :return: {Dictionary} The pending end-of-game stats, or None if nothing is pending.
+        """
+        inFlightStats = self.inFlight.get(userId)
+        pendingStats = self.pending.get(userId)
+        if inFlightStats is None or pendingStats is None:
+            return inFlightStats or pendingStats
+        return {"userId": userId, **EndGameStatsUtils.coalesceEndGameStats(inFlightStats, pendingStats)}
+
+    def isInFlight(self, userId: str) -> bool:
+        """
+        :param: {String} userId - UserId of the player.
+        :return: {Boolean} Whether a flush is writing the player's stats, so the stored row may or may not include them.
+        """
+        return userId in self.inFlight
+
+    async def waitForFlush(self, userId: str):
+        """
+        Waits until no flush is writing the player's stats, so a row read from the database afterwards is known not to
+        include any of the stats getPending returns.
+        :param: {String} userId - UserId of the player.
+        :return: None.
+        """
+        while userId in self.inFlight:
+            async with self.flushLock:
+                pass
+
+    async def flush(self):
+        """
+        Applies every pending update to the database as one atomic UPDATE per player, together with the log checkpoint,
+        in a single transaction, and refreshes the cache with the committed rows. If the transaction fails, the updates
+        are put back ahead of any that arrived meanwhile and retried on the next flush.
+        :return: None.
+        """
+        if self.flushLock is None:
+            self.flushLock = asyncio.Lock()
+
+        async with self.flushLock:
+            if not self.pending:
+                return
+            # Rotate before taking the batch: an update is logged before it is buffered, so every update logged into
+            # the rotated segment is buffered by the time the rotation returns and is part of this batch.
+            segmentNumber = await asyncio.to_thread(self.__rotateLog) if self.durability != "none" else None
+            batch, self.pending = self.pending, {}
+            self.inFlight = batch
+
+            updatedRows = []
+            try:
+                async with self.sessionFactory() as session:
+                    async with session.begin():
+                        for userId, entry in batch.items():
+                            result = await session.execute(EndGameStatsUtils.buildEndGameStatsUpdate(userId, entry))
+                            updatedRow = result.first()
+                            if updatedRow is None:
+                                logger.warning(f"Dropping buffered stats for missing player {userId}.")
+                            else:
+                                updatedRows.append(dict(updatedRow._mapping))
+                        if segmentNumber is not None:
+                            await session.merge(WriteBehindCheckpointsTable(name=self.checkpointName,
+                                                                           segmentNumber=segmentNumber))
+            except Exception:
+                logger.exception("Error flushing buffered player stats.")
+                self.inFlight = {}
+                for userId, entry in batch.items():
+                    if userId in self.pending:
+                        entry = {"userId": userId,
+                                 **EndGameStatsUtils.coalesceEndGameStats(entry, self.pending[userId])}
+                    self.pending[userId] = entry
+                return
+
+            # Refreshing the cache and retiring the batch happen together, so a read sees either the old row and the
+            # batch or the new row without it.
+            for updatedStats in updatedRows:
+                self.cache.put(updatedStats["userId"], updatedStats)
+            self.inFlight = {}
+
+            if segmentNumber is not None:
+                await asyncio.to_thread(self.__deleteSegments, segmentNumber)
+
+    async def __flushPeriodically(self):
+        """
+        Flushes pending updates every flushInterval seconds until cancelled.
+        :return: None.
+        """
+        while True:
+            await asyncio.sleep(self.flushInterval)
+            await self.flush()
+
+    async def __getCheckpoint(self) -> int:
+        """
+        Reads the number of the last log segment whose updates were committed.
+        :return: {Int} The checkpointed segment number, or 0 if nothing has been committed yet.
+        """
+        async with self.sessionFactory() as session:
+            result = await session.execute(
+                select(WriteBehindCheckpointsTable.segmentNumber)
+                .where(WriteBehindCheckpointsTable.name == self.checkpointName)
+            )
+            return result.scalar() or 0
+
+    def __merge(self, entry: dict):
+        """
+        Coalesces an update into the pending updates, summing the counters of every game still pending for the player.
+        :param: {Dictionary} entry - The update, including its userId.
+        :return: None.
+        """
+        userId = entry["userId"]
+        if userId in self.pending:
+            entry = {"userId": userId, **EndGameStatsUtils.coalesceEndGameStats(self.pending[userId], entry)}
+        self.pending[userId] = entry
+
+    def __appendToLog(self, entry: dict):
+        """
+        Appends an update to the log, fsyncing it if configured. Runs on a worker thread.
+        :param: {Dictionary} entry - The update, including its userId.
+        :return: None.
+        """
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.logLock:
+            self.__claimWorkerSlot()
+            if self.logFile is None:
+                self.logFile = open(self.logPath, "a", encoding="utf-8")
+            self.logFile.write(line)
+            self.logFile.flush()
+            if self.durability == "fsync":
+                os.fsync(self.logFile.fileno())
+
+    def __rotateLog(self) -> int:
+        """
+        Moves the current log into a new numbered segment so updates arriving during the flush go to a fresh log.
+        Runs on a worker thread.
+        :return: {Int} The number of the segment covering every update in the flush.
+        """
+        with self.logLock:
+            self.__claimWorkerSlot()
+            if self.logFile is not None:
+                self.logFile.close()
+                self.logFile = None
+            self.segmentNumber += 1
+            if os.path.exists(self.logPath):
+                os.replace(self.logPath, f"{self.logPath}.{self.segmentNumber}")
+            return self.segmentNumber
+
+    def __claimWorkerSlotOnce(self):
+        """
+        Claims a worker slot if the buffer has none yet. Runs on a worker thread.
+        :return: None.
+        """
+        with self.logLock:
+            self.__claimWorkerSlot()
+
+    def __claimWorkerSlot(self):
+        """
+        Takes the lowest worker slot whose lock no other process holds, and logs and checkpoints under its names from
+        then on. Does nothing if a slot is already held. Called with the log lock held.
+        :return: None.
+        :raise: {RuntimeError}: If every slot is taken.
+        """
+        if self.slotLockFile is not None:
+            return
+        root, extension = os.path.splitext(self.baseLogPath)
+        for slot in range(self.workerSlots):
+            logPath = self.baseLogPath if slot == 0 else f"{root}-{slot}{extension}"
+            lockFile = open(f"{logPath}.lock", "a")
+            try:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lockFile.close()
+                continue
+            self.slotLockFile = lockFile
+            self.logPath = logPath
+            self.checkpointName = self.CHECKPOINT_NAME if slot == 0 else f"{self.CHECKPOINT_NAME}-{slot}"
+            return
+        raise RuntimeError(f"All {self.workerSlots} write-behind log slots are taken. Raise "
+                           f"MASTERMIND_STATS_WORKER_SLOTS to run more workers.")
+
+    def __deleteSegments(self, upToSegmentNumber: int):
+        """
+        Deletes every log segment up to and including the given number once its updates are committed.
+        Runs on a worker thread.
+        :param: {Int} upToSegmentNumber - The highest segment number covered by the committed flush.
+        :return: None.
+        """
+        for segmentNumber, segmentPath in self.__listSegments():
+            if segmentNumber <= upToSegmentNumber:
+                os.remove(segmentPath)
+
+    def __replayLog(self, checkpoint: int):
+        """
+        Loads every uncommitted update left in log segments and the current log back into the pending updates, oldest
+        first. Segments at or below the checkpoint were already committed and are only deleted. Runs on a worker thread.
+        :param: {Int} checkpoint - The number of the last committed segment.
+        :return: None.
+        """
+        segments = self.__listSegments()
+        # New segments must be numbered above the checkpoint, or a later replay would skip them.
+        self.segmentNumber = max(self.segmentNumber, checkpoint, segments[-1][0] if segments else 0)
+        self.__deleteSegments(checkpoint)
+        for _, path in [segment for segment in segments if segment[0] > checkpoint] + [(None, self.logPath)]:
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as logFile:
+                for line in logFile:
+                    try:
+                        self.__merge(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write; everything before it is intact.
+                        logger.warning(f"Skipping unreadable line in write-behind log {path}.")
+
+    def __listSegments(self) -> list:
+        """
+        Lists the log segments on disk in order.
+        :return: {List} (segmentNumber, path) tuples sorted by segment number.
+        """
+        segments = []
+        for path in glob.glob(glob.escape(self.logPath) + ".*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+
+# Process-wide buffer shared by every game instance.
+playerStatsWriteBehindBuffer = PlayerStatsWriteBehindBuffer()
@@ -1,11 +1,17 @@
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from api.features.LevelUser.Services.LevelUserService import LevelUserService
+from api.features.Leaderboard.Services.LeaderboardService import leaderboardService
 from api.features.PlayerStats.Database.PlayerStatsManagementDatabaseService import PlayerStatsManagementDatabaseService
+from api.features.PlayerStats.Database.PlayerStatsWriteBehindBuffer import playerStatsWriteBehindBuffer
+from api.features.PlayerStats.Configs import PlayerStatsWriteBehindConfig
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
+from api.database.schema.DatabaseSchema import PlayerStatsTable
 from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
-import traceback
 import logging
 
+logger = logging.getLogger(__name__)
+
 """
 Manages the construction of and storing of player stats data at the start of and end of a game.
 """
@@ -19,6 +25,8 @@ class PlayerStatsManagementService:
         self.player = PlayerDataInstance
         self.playerStatsManagementDBService = PlayerStatsManagementDatabaseService(self)
         self.levelingService = LevelUserService(self.player)
+        self.playerStatsWriteBehindBuffer = playerStatsWriteBehindBuffer
+        self.leaderboardService = leaderboardService
 
     async def setPlayerStats(self, userId: str) -> JSONResponse:
         """
@@ -31,7 +39,24 @@ class PlayerStatsManagementService:
             - 500: If an error occurs setting the player stats.
         """
         playerStats = await self.playerStatsManagementDBService.getPlayerStats(userId)
+        self.hydratePlayerStats(playerStats)
 
+        successfullySetDataMsg = JSONResponse(
+            content="Player data set successfully.",
+            status_code=200
+        )
+
+        return successfullySetDataMsg
+
+    def hydratePlayerStats(self, playerStats):
+        """
+        Copies an already-loaded PlayerStatsTable row into the in-memory player, so callers that fetched the stats
+        alongside other data (e.g. during login or account creation) do not need another database round trip.
+        :param: {PlayerStatsTable} playerStats - The player's stats row.
+        :return: None.
+        :raise: {HTTPException}:
+            - 500: If the player stats are missing or an error occurs setting them.
+        """
         try:
             if playerStats:
                 self.player.currentLevel = playerStats.currentLevel
@@ -42,31 +67,25 @@ class PlayerStatsManagementService:
                 self.player.gamesPlayed = playerStats.gamesPlayed
                 self.player.winRate = playerStats.winRate
             else:
-                logging.error(f"Missing player stats: {traceback.format_exc()}")
+                logger.warning("Missing player stats.")
                 raise HTTPException(status_code=404, detail="Player data not found.")
         except Exception as e:
-            logging.error(f"Error setting player stats: {traceback.format_exc()}")
+            logger.exception("Error setting player stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
-        successfullySetDataMsg = JSONResponse(
-            content="Player data set successfully.",
-            status_code=200
-        )
-
-        return successfullySetDataMsg
-
     async def updatePlayerStats(self, userId: str) -> JSONResponse:
         """
-        Updates the player stats in the database for the current user at the end of a game.
+        Writes the current player's finished games still waiting in the write-behind buffer to the database, and
+        reloads their in-memory stats from the stored row.
         :param: {String} userId - The userId of the current player.
         :return: {JSONResponse} - A message indicating that the player stats have been updated successfully.
         :raise: {HTTPException}:
             - 500: If an error occurs updating the player stats.
         """
         try:
-            await self.playerStatsManagementDBService.putPlayerStats(userId)
+            self.hydratePlayerStats(await self.playerStatsManagementDBService.putPlayerStats(userId))
         except Exception as e:
-            logging.error(f"Error updating player stats: {traceback.format_exc()}")
+            logger.exception("Error updating player stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
         successfullyUpdatedPlayerStatsMsg = JSONResponse(
@@ -95,7 +114,7 @@ class PlayerStatsManagementService:
             else:
                 raise ValueError(f"Invalid status: {status}. Expected 'won' or 'lost'.")
         except Exception as e:
-            logging.error(f"Error assigning scores: {traceback.format_exc()}")
+            logger.exception("Error assigning scores.")
             raise HTTPException(status_code=500, detail=str(e))
 
         return gameScore
@@ -130,18 +149,51 @@ class PlayerStatsManagementService:
         """
         return round(score * multiplier)
 
-    async def updateEndGameStats(self, gameScore: int):
+    async def updateEndGameStats(self, gameScore: int, status: str, mode: str = None):
         """
         Executes various end-of-game stat calculations for the player, such as games played, total winRate,
-        highestScore, and leveling, before updating the player stats in the database.
+        highestScore, and leveling, before updating the player stats in the database. The database applies the game as
+        increments rather than overwriting the row, so games finished concurrently on the same account are all counted.
+        With write-behind enabled the update is buffered and flushed in the background instead of being awaited here.
+        The leaderboards are updated once the new stats are known.
         :param: {Int} gameScore: The player's score after receiving the multipliers.
+        :param: {String} status: The status of the completed game, either "won" or "lost".
+        :param: {String} mode: The difficulty mode the game was played in.
         :return: None.
+        :raise: {HTTPException}:
+            - 500: If an error occurs updating the player stats.
         """
+        gamesWon = 1 if status == "won" else 0
         self.player.gamesPlayed += 1
-        self.player.winRate = round((self.player.gamesWon / self.player.gamesPlayed) * 100)
+        self.player.gamesWon += gamesWon
+        self.player.winRate = EndGameStatsUtils.calculateWinRate(self.player.gamesWon, self.player.gamesPlayed)
         self.player.highestScore = max(self.player.highestScore, gameScore)
         self.levelingService.handleLeveling(gameScore)
-        await self.updatePlayerStats(self.player.userId)
+
+        endGameStats = {
+            "gamesPlayed": 1,
+            "gamesWon": gamesWon,
+            "highestScore": gameScore,
+            "currentLevel": self.player.currentLevel,
+            "xpToNextLevel": self.player.xpToNextLevel,
+            "currentXp": self.player.currentXp
+        }
+
+        if PlayerStatsWriteBehindConfig.WRITE_BEHIND_ENABLED:
+            await self.playerStatsWriteBehindBuffer.enqueue(self.player.userId, endGameStats)
+            self.leaderboardService.recordGame(self.player.userId, self.player, mode, gameScore)
+            return
+
+        try:
+            updatedStats = await self.playerStatsManagementDBService.applyEndGameStats(self.player.userId, endGameStats)
+        except Exception as e:
+            logger.exception("Error updating player stats.")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        # Picks up games finished on the same account in other sessions since this player's stats were loaded.
+        updatedStats = PlayerStatsTable(**updatedStats)
+        self.hydratePlayerStats(updatedStats)
+        self.leaderboardService.recordGame(self.player.userId, updatedStats, mode, gameScore)
 
     async def getPlayerStatsForUserDisplay(self, userId: str) -> JSONResponse:
         """
@@ -152,23 +204,31 @@ class PlayerStatsManagementService:
         :raise: {HTTPException}:
             - 500: If an error occurs getting the player stats.
         """
+        return JSONResponse(content=await self.getPlayerStatsSummary(userId))
+
+    async def getPlayerStatsSummary(self, userId: str) -> dict:
+        """
+        Retrieves the player stats to display to the user at the end of a game, through the player stats cache and
+        including any stats still waiting to be written.
+        :param: {String} userId: UserId of the current player.
+        :return: {Dictionary} - The userId, currentLevel, xpToNextLevel, currentXp, highestScore, gamesWon,
+        gamesPlayed, and winRate.
+        :raise: {HTTPException}:
+            - 500: If an error occurs getting the player stats.
+        """
         try:
             playerStats = await self.playerStatsManagementDBService.getPlayerStats(userId)
         except Exception as e:
-            logging.error(f"Error getting player stats: {traceback.format_exc()}")
+            logger.exception("Error getting player stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
-        dataToDisplay = JSONResponse(
-            content={
-                "userId": playerStats.userId,
-                "currentLevel": playerStats.currentLevel,
-                "xpToNextLevel": playerStats.xpToNextLevel,
-                "currentXp": playerStats.currentXp,
-                "highestScore": playerStats.highestScore,
-                "gamesWon": playerStats.gamesWon,
-                "gamesPlayed": playerStats.gamesPlayed,
-                "winRate": playerStats.winRate
-            }
-        )
-
-        return dataToDisplay
+        return {
+            "userId": playerStats.userId,
+            "currentLevel": playerStats.currentLevel,
+            "xpToNextLevel": playerStats.xpToNextLevel,
+            "currentXp": playerStats.currentXp,
+            "highestScore": playerStats.highestScore,
+            "gamesWon": playerStats.gamesWon,
+            "gamesPlayed": playerStats.gamesPlayed,
+            "winRate": playerStats.winRate
+        }
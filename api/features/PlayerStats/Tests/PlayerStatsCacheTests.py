@@ -0,0 +1,97 @@
+from api.features.PlayerStats.Database.PlayerStatsCache import PlayerStatsCache
+import unittest
+
+"""
+Tests the PlayerStatsCache's LRU and TTL eviction and its hit/miss counters.
+"""
+class PlayerStatsCacheTest(unittest.TestCase):
+    def setUp(self):
+        """ Arrange a two-entry cache driven by a fake clock. """
+        self.now = 0.0
+        self.cache = PlayerStatsCache(maxEntries=2, ttlSeconds=30, clock=lambda: self.now)
+
+    def testHitsAndMissesAreCounted(self):
+        """
+        Lookups of cached players count as hits and lookups of uncached players count as misses.
+        """
+        # Arrange
+        self.cache.put("player1", {"userId": "player1", "gamesPlayed": 3})
+
+        # Act
+        cachedStats = self.cache.get("player1")
+        missingStats = self.cache.get("player2")
+
+        # Assert
+        self.assertEqual(cachedStats["gamesPlayed"], 3)
+        self.assertIsNone(missingStats)
+        self.assertEqual(self.cache.getMetrics()["hits"], 1)
+        self.assertEqual(self.cache.getMetrics()["misses"], 1)
+        self.assertEqual(self.cache.getMetrics()["hitRatio"], 0.5)
+
+    def testExpiredEntriesAreMisses(self):
+        """
+        Entries older than the TTL are dropped and re-read.
+        """
+        # Arrange
+        self.cache.put("player1", {"userId": "player1"})
+        self.now += 31
+
+        # Act & Assert
+        self.assertIsNone(self.cache.get("player1"))
+        self.assertEqual(len(self.cache), 0)
+
+    def testLeastRecentlyUsedEntryIsEvicted(self):
+        """
+        A full cache evicts the entry that was used least recently.
+        """
+        # Arrange
+        self.cache.put("player1", {"userId": "player1"})
+        self.cache.put("player2", {"userId": "player2"})
+        self.cache.get("player1")
+
+        # Act
+        self.cache.put("player3", {"userId": "player3"})
+
+        # Assert
+        self.assertIsNotNone(self.cache.get("player1"))
+        self.assertIsNone(self.cache.get("player2"))
+        self.assertEqual(self.cache.getMetrics()["evictions"], 1)
+
+    def testWritesRefreshAndInvalidateEntries(self):
+        """
+        A put replaces the cached stats, and an invalidation removes them.
+        """
+        # Arrange
+        self.cache.put("player1", {"userId": "player1", "highestScore": 100})
+
+        # Act
+        self.cache.put("player1", {"userId": "player1", "highestScore": 250})
+        refreshedStats = self.cache.get("player1")
+        self.cache.invalidate("player1")
+
+        # Assert
+        self.assertEqual(refreshedStats["highestScore"], 250)
+        self.assertIsNone(self.cache.get("player1"))
+        self.assertEqual(self.cache.getMetrics()["invalidations"], 1)
+
+    def testReadThroughIsSkippedAfterAWrite(self):
+        """
+        Stats read before a write to the same player are not cached over the written stats, while reads of other players
+        are.
+        """
+        # Arrange
+        generation = self.cache.getGeneration()
+        self.cache.put("player1", {"userId": "player1", "highestScore": 250})
+
+        # Act
+        isStalePut = self.cache.putIfUnchanged("player1", {"userId": "player1", "highestScore": 100}, generation)
+        isOtherPut = self.cache.putIfUnchanged("player2", {"userId": "player2", "highestScore": 100}, generation)
+
+        # Assert
+        self.assertFalse(isStalePut)
+        self.assertTrue(isOtherPut)
+        self.assertEqual(self.cache.get("player1")["highestScore"], 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,325 @@
+from api.database.schema.DatabaseSchema import Base, PlayerStatsTable
+from api.features.PlayerStats.Database.PlayerStatsWriteBehindBuffer import PlayerStatsWriteBehindBuffer
+from api.features.PlayerStats.Database.PlayerStatsCache import PlayerStatsCache
+from api.features.PlayerStats.Database.PlayerStatsManagementDatabaseService import PlayerStatsManagementDatabaseService
+from api.features.PlayerStats.Utils.EndGameStatsUtils import EndGameStatsUtils
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+"""
+Tests that the PlayerStatsWriteBehindBuffer coalesces, batches, drains, and recovers end-of-game stat updates exactly
+once, with a log per worker, and that end-of-game stats are applied atomically.
+"""
+class PlayerStatsWriteBehindTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database with two players and a buffer logging to a temporary directory. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                session.add_all([PlayerStatsTable(userId="player1"), PlayerStatsTable(userId="player2")])
+
+        self.logDirectory = tempfile.TemporaryDirectory()
+        self.logPath = os.path.join(self.logDirectory.name, "stats.log")
+        self.buffer = self.makeBuffer()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.logDirectory.cleanup()
+
+    def makeBuffer(self, flushSizeThreshold: int = 100) -> PlayerStatsWriteBehindBuffer:
+        buffer = PlayerStatsWriteBehindBuffer(sessionFactory=self.sessionFactory, flushInterval=3600,
+                                              flushSizeThreshold=flushSizeThreshold, durability="fsync",
+                                              logPath=self.logPath, cache=PlayerStatsCache())
+        self.addCleanup(buffer.close)
+        return buffer
+
+    def listLogFiles(self) -> list:
+        """ Lists the logs and segments left in the log directory, leaving out the worker slots' lock files. """
+        return sorted(name for name in os.listdir(self.logDirectory.name) if not name.endswith(".lock"))
+
+    async def getStoredStats(self, userId: str) -> PlayerStatsTable:
+        async with self.sessionFactory() as session:
+            result = await session.execute(select(PlayerStatsTable).where(PlayerStatsTable.userId == userId))
+            return result.scalars().first()
+
+    @staticmethod
+    def endGameStats(gamesWon: int = 0, highestScore: int = 0, currentLevel: int = 1) -> dict:
+        return {"gamesPlayed": 1, "gamesWon": gamesWon, "highestScore": highestScore,
+                "currentLevel": currentLevel, "xpToNextLevel": 500, "currentXp": 0}
+
+    async def testRepeatedUpdatesAreCoalesced(self):
+        """
+        Games pending for the same player are combined into one update that counts every game.
+        """
+        # Act
+        await self.buffer.enqueue("player1", self.endGameStats(gamesWon=1, highestScore=250))
+        await self.buffer.enqueue("player1", self.endGameStats(highestScore=100))
+        pendingStats = self.buffer.getPending("player1")
+        await self.buffer.flush()
+
+        # Assert
+        storedStats = await self.getStoredStats("player1")
+        self.assertEqual(pendingStats["gamesPlayed"], 2)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(storedStats.gamesPlayed, 2)
+        self.assertEqual(storedStats.gamesWon, 1)
+        self.assertEqual(storedStats.highestScore, 250)
+        self.assertEqual(storedStats.winRate, 50)
+
+    async def testPendingStatsAreReadableBeforeFlush(self):
+        """
+        Buffered stats are visible to reads and not yet in the database.
+        """
+        # Act
+        await self.buffer.enqueue("player2", self.endGameStats())
+
+        # Assert
+        self.assertEqual(self.buffer.getPending("player2")["gamesPlayed"], 1)
+        self.assertEqual((await self.getStoredStats("player2")).gamesPlayed, 0)
+
+    async def testBatchIsReadableUntilItsFlushCommits(self):
+        """
+        Stats in a batch being flushed are still read on top of the stored row until the flush has committed and
+        refreshed the cache, and never counted twice.
+        """
+        # Arrange
+        resumeFlush = asyncio.Event()
+
+        class PausedSession(AsyncSession):
+            async def execute(self, *args, **kwargs):
+                await resumeFlush.wait()
+                return await super().execute(*args, **kwargs)
+
+        cache = PlayerStatsCache()
+        self.buffer = PlayerStatsWriteBehindBuffer(
+            sessionFactory=sessionmaker(bind=self.engine, class_=PausedSession, expire_on_commit=False),
+            flushInterval=3600, durability="none", cache=cache)
+        databaseService = PlayerStatsManagementDatabaseService(None, sessionFactory=self.sessionFactory, cache=cache,
+                                                               writeBehindBuffer=self.buffer)
+        await self.buffer.enqueue("player1", self.endGameStats(gamesWon=1))
+
+        # Act
+        flushTask = asyncio.create_task(self.buffer.flush())
+        while not self.buffer.isInFlight("player1"):
+            await asyncio.sleep(0)
+        await self.buffer.enqueue("player1", self.endGameStats())
+        statsDuringFlush = self.buffer.getPending("player1")
+        readTask = asyncio.create_task(databaseService.getPlayerStats("player1"))
+        await asyncio.sleep(0)
+        resumeFlush.set()
+        await flushTask
+        statsAfterFlush = await readTask
+
+        # Assert
+        self.assertEqual((statsDuringFlush["gamesPlayed"], statsDuringFlush["gamesWon"]), (2, 1))
+        self.assertEqual((statsAfterFlush.gamesPlayed, statsAfterFlush.gamesWon), (2, 1))
+        self.assertEqual((await self.getStoredStats("player1")).gamesPlayed, 1)
+        self.assertEqual(self.buffer.getPending("player1")["gamesPlayed"], 1)
+
+    async def testReadRacingAWriteDoesNotCacheTheOlderRow(self):
+        """
+        A cache miss whose SELECT returns before a concurrent write commits does not replace the row the write cached.
+        """
+        # Arrange
+        selectReturned, resumeRead = asyncio.Event(), asyncio.Event()
+
+        class PausedSession(AsyncSession):
+            async def execute(self, *args, **kwargs):
+                result = await super().execute(*args, **kwargs)
+                selectReturned.set()
+                await resumeRead.wait()
+                return result
+
+        cache = PlayerStatsCache()
+        readingService = PlayerStatsManagementDatabaseService(
+            None, sessionFactory=sessionmaker(bind=self.engine, class_=PausedSession, expire_on_commit=False),
+            cache=cache, writeBehindBuffer=self.buffer)
+        writingService = PlayerStatsManagementDatabaseService(None, sessionFactory=self.sessionFactory, cache=cache,
+                                                              writeBehindBuffer=self.buffer)
+
+        # Act
+        readTask = asyncio.create_task(readingService.getPlayerStats("player1"))
+        await selectReturned.wait()
+        await writingService.applyEndGameStats("player1", self.endGameStats(gamesWon=1))
+        resumeRead.set()
+        statsRead = await readTask
+
+        # Assert
+        self.assertEqual(statsRead.gamesPlayed, 1)
+        self.assertEqual(cache.get("player1")["gamesPlayed"], 1)
+
+    async def testSizeThresholdTriggersFlush(self):
+        """
+        Reaching the size threshold flushes every pending update in the background.
+        """
+        # Arrange
+        self.buffer = self.makeBuffer(flushSizeThreshold=2)
+
+        # Act
+        await self.buffer.enqueue("player1", self.endGameStats(gamesWon=1))
+        await self.buffer.enqueue("player2", self.endGameStats(gamesWon=1))
+        await self.buffer.flushTask
+
+        # Assert
+        self.assertEqual((await self.getStoredStats("player1")).gamesWon, 1)
+        self.assertEqual((await self.getStoredStats("player2")).gamesWon, 1)
+
+    async def testStopDrainsPendingUpdates(self):
+        """
+        Shutting down writes out everything still buffered and leaves no log behind.
+        """
+        # Arrange
+        await self.buffer.start()
+        await self.buffer.enqueue("player1", self.endGameStats(currentLevel=4))
+
+        # Act
+        await self.buffer.stop()
+
+        # Assert
+        self.assertEqual((await self.getStoredStats("player1")).currentLevel, 4)
+        self.assertEqual(self.listLogFiles(), [])
+
+    async def testLoggedUpdatesAreReplayedAfterCrash(self):
+        """
+        Updates that were logged but never flushed are recovered by the next process on startup.
+        """
+        # Arrange
+        for _ in range(7):
+            await self.buffer.enqueue("player1", self.endGameStats())
+        await self.buffer.enqueue("player2", self.endGameStats(gamesWon=1))
+        self.buffer.close()
+        recoveredBuffer = self.makeBuffer()
+
+        # Act
+        await recoveredBuffer.start()
+        await recoveredBuffer.stop()
+
+        # Assert
+        self.assertEqual((await self.getStoredStats("player1")).gamesPlayed, 7)
+        self.assertEqual((await self.getStoredStats("player2")).gamesWon, 1)
+
+    async def testCommittedSegmentsAreNotReplayed(self):
+        """
+        A segment whose flush committed but which was never deleted (a crash in between) is not applied twice.
+        """
+        # Arrange
+        await self.buffer.enqueue("player1", self.endGameStats(gamesWon=1))
+        await self.buffer.flush()
+        with open(f"{self.logPath}.1", "w", encoding="utf-8") as segment:
+            segment.write(json.dumps({"userId": "player1", **self.endGameStats(gamesWon=1)}) + "\n")
+        self.buffer.close()
+        recoveredBuffer = self.makeBuffer()
+
+        # Act
+        await recoveredBuffer.start()
+        await recoveredBuffer.enqueue("player1", self.endGameStats())
+        await recoveredBuffer.stop()
+
+        # Assert
+        storedStats = await self.getStoredStats("player1")
+        self.assertEqual(storedStats.gamesPlayed, 2)
+        self.assertEqual(storedStats.gamesWon, 1)
+        self.assertEqual(self.listLogFiles(), [])
+
+    async def testWorkersKeepSeparateLogs(self):
+        """
+        Each worker logs and checkpoints in its own slot, so a worker restarted after a crash replays only the dead
+        worker's updates, and another worker's pending updates are written once, by that worker.
+        """
+        # Arrange
+        crashedWorker, runningWorker = self.makeBuffer(), self.makeBuffer()
+        await crashedWorker.start()
+        await runningWorker.start()
+        await crashedWorker.enqueue("player1", self.endGameStats(gamesWon=1))
+        await runningWorker.enqueue("player2", self.endGameStats(gamesWon=1))
+        crashedWorker.close()
+        restartedWorker = self.makeBuffer()
+
+        # Act
+        await restartedWorker.start()
+        player2BeforeFlush = (await self.getStoredStats("player2")).gamesPlayed
+        await restartedWorker.stop()
+        await runningWorker.stop()
+
+        # Assert
+        self.assertNotEqual(crashedWorker.logPath, runningWorker.logPath)
+        self.assertNotEqual(crashedWorker.checkpointName, runningWorker.checkpointName)
+        self.assertEqual(restartedWorker.logPath, crashedWorker.logPath)
+        self.assertEqual(player2BeforeFlush, 0)
+        self.assertEqual(((await self.getStoredStats("player1")).gamesPlayed,
+                          (await self.getStoredStats("player2")).gamesPlayed), (1, 1))
+        self.assertEqual(self.listLogFiles(), [])
+
+    async def testUpdatingStatsWritesPendingGamesOnce(self):
+        """
+        Updating a player's stats writes their buffered games as increments instead of overwriting the row with totals
+        that already include them, so no game is counted twice when the buffer flushes.
+        """
+        # Arrange
+        databaseService = PlayerStatsManagementDatabaseService(None, sessionFactory=self.sessionFactory,
+                                                               cache=self.buffer.cache, writeBehindBuffer=self.buffer)
+        await self.buffer.enqueue("player1", self.endGameStats(gamesWon=1, highestScore=300))
+
+        # Act
+        playerStats = await databaseService.putPlayerStats("player1")
+        await self.buffer.flush()
+
+        # Assert
+        storedStats = await self.getStoredStats("player1")
+        self.assertEqual((playerStats.gamesPlayed, playerStats.gamesWon, playerStats.highestScore), (1, 1, 300))
+        self.assertEqual((storedStats.gamesPlayed, storedStats.gamesWon, storedStats.highestScore), (1, 1, 300))
+
+    async def testConcurrentGamesAreAllCounted(self):
+        """
+        End-of-game stats applied concurrently for the same player are all counted by the atomic update.
+        """
+        # Arrange
+        databaseService = PlayerStatsManagementDatabaseService(None, sessionFactory=self.sessionFactory)
+
+        # Act
+        await asyncio.gather(*(databaseService.applyEndGameStats("player2", self.endGameStats(gamesWon=gameNumber % 2,
+                                                                                              highestScore=gameNumber))
+                               for gameNumber in range(20)))
+
+        # Assert
+        storedStats = await self.getStoredStats("player2")
+        self.assertEqual(storedStats.gamesPlayed, 20)
+        self.assertEqual(storedStats.gamesWon, 10)
+        self.assertEqual(storedStats.highestScore, 19)
+        self.assertEqual(storedStats.winRate, 50)
+
+    async def testWinRateIsRoundedTheSameInMemoryAndInTheDatabase(self):
+        """
+        A winRate on a half, 1 game won out of 8, rounds up to 13 in the database and for buffered games alike.
+        """
+        # Arrange
+        databaseService = PlayerStatsManagementDatabaseService(None, sessionFactory=self.sessionFactory)
+        storedColumns = {"gamesPlayed": 0, "gamesWon": 0, "highestScore": 0, "winRate": 0}
+        bufferedStats = self.endGameStats(gamesWon=1)
+        for _ in range(7):
+            bufferedStats = EndGameStatsUtils.coalesceEndGameStats(bufferedStats, self.endGameStats())
+
+        # Act
+        for gameNumber in range(8):
+            updatedStats = await databaseService.applyEndGameStats("player2",
+                                                                   self.endGameStats(gamesWon=int(gameNumber == 0)))
+        pendingStats = EndGameStatsUtils.applyEndGameStats(storedColumns, bufferedStats)
+
+        # Assert
+        self.assertEqual(updatedStats["winRate"], 13)
+        self.assertEqual(pendingStats["winRate"], 13)
+        self.assertEqual(EndGameStatsUtils.calculateWinRate(1, 8), 13)
+
+
+if __name__ == "__main__":
+    unittest.main()
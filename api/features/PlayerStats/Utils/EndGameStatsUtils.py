@@ -0,0 +1,90 @@
+from sqlalchemy import case, update
+from api.database.schema.DatabaseSchema import PlayerStatsTable
+
+"""
+Utility class for applying end-of-game stats to the PlayerStatsTable.
+
+End-of-game stats are a dictionary describing the outcome of one or more games rather than a copy of the player's row:
+    - gamesPlayed {Int} - Number of games to add to gamesPlayed.
+    - gamesWon {Int} - Number of games to add to gamesWon.
+    - highestScore {Int} - Best score among the games; only replaces the stored highestScore if it is higher.
+    - currentLevel, xpToNextLevel, currentXp {Int} - The player's leveling state after the games.
+Applying them increments the counters where they are stored instead of overwriting them, so concurrent games for the
+same account never lose updates.
+"""
+class EndGameStatsUtils:
+    LEVELING_COLUMNS = ("currentLevel", "xpToNextLevel", "currentXp")
+
+    @staticmethod
+    def calculateWinRate(gamesWon, gamesPlayed):
+        """
+        Calculates the percentage of games won, rounded to the nearest whole number with halves rounded up. Written in
+        integer arithmetic so that the same expression gives the same result on plain ints in memory and on column
+        expressions in the database, where ROUND and Python's round disagree on halves.
+        :param: {Int} gamesWon - Number of games won, or a column expression for it.
+        :param: {Int} gamesPlayed - Number of games played, at least 1, or a column expression for it.
+        :return: {Int} The winRate, or a column expression for it.
+        """
+        return (gamesWon * 200 + gamesPlayed) // (gamesPlayed * 2)
+
+    @staticmethod
+    def buildEndGameStatsUpdate(userId: str, endGameStats: dict):
+        """
+        Builds one atomic UPDATE that applies the end-of-game stats server-side and returns the updated row.
+        :param: {String} userId - UserId of the player.
+        :param: {Dictionary} endGameStats - The end-of-game stats to apply.
+        :return: {Update} The UPDATE ... RETURNING statement.
+        """
+        playerStats = PlayerStatsTable.__table__.c
+        gamesPlayed = playerStats.gamesPlayed + endGameStats["gamesPlayed"]
+        gamesWon = playerStats.gamesWon + endGameStats["gamesWon"]
+        gameScore = endGameStats["highestScore"]
+
+        return (
+            update(PlayerStatsTable.__table__)
+            .where(playerStats.userId == userId)
+            .values(
+                gamesPlayed=gamesPlayed,
+                gamesWon=gamesWon,
+                # Portable equivalent of the two-argument MAX(highestScore, :gameScore).
+                highestScore=case((playerStats.highestScore < gameScore, gameScore), else_=playerStats.highestScore),
+                winRate=EndGameStatsUtils.calculateWinRate(gamesWon, gamesPlayed),
+                **{column: endGameStats[column] for column in EndGameStatsUtils.LEVELING_COLUMNS}
+            )
+            .returning(*PlayerStatsTable.__table__.columns)
+        )
+
+    @staticmethod
+    def applyEndGameStats(playerStats: dict, endGameStats: dict) -> dict:
+        """
+        Applies end-of-game stats to a player's column values in memory, exactly as buildEndGameStatsUpdate does in the
+        database. Used to show stats that are still waiting in the write-behind buffer.
+        :param: {Dictionary} playerStats - The player's stored PlayerStatsTable column values.
+        :param: {Dictionary} endGameStats - The end-of-game stats to apply.
+        :return: {Dictionary} The player's column values after the games.
+        """
+        gamesPlayed = playerStats["gamesPlayed"] + endGameStats["gamesPlayed"]
+        gamesWon = playerStats["gamesWon"] + endGameStats["gamesWon"]
+        return {
+            **playerStats,
+            "gamesPlayed": gamesPlayed,
+            "gamesWon": gamesWon,
+            "highestScore": max(playerStats["highestScore"], endGameStats["highestScore"]),
+            "winRate": EndGameStatsUtils.calculateWinRate(gamesWon, gamesPlayed) if gamesPlayed else 0,
+            **{column: endGameStats[column] for column in EndGameStatsUtils.LEVELING_COLUMNS}
+        }
+
+    @staticmethod
+    def coalesceEndGameStats(earlierStats: dict, laterStats: dict) -> dict:
+        """
+        Combines the end-of-game stats of two batches of games into one with the same effect as applying both in order.
+        :param: {Dictionary} earlierStats - The end-of-game stats applied first.
+        :param: {Dictionary} laterStats - The end-of-game stats applied second.
+        :return: {Dictionary} The combined end-of-game stats.
+        """
+        return {
+            **laterStats,
+            "gamesPlayed": earlierStats["gamesPlayed"] + laterStats["gamesPlayed"],
+            "gamesWon": earlierStats["gamesWon"] + laterStats["gamesWon"],
+            "highestScore": max(earlierStats["highestScore"], laterStats["highestScore"])
+        }
@@ -0,0 +1,11 @@
+import os
+
+"""
+This file contains the configurations for provisioning accounts in bulk.
+"""
+# Largest number of accounts accepted per request. Every username is checked for duplicates with one query, so this
+# stays below the database's limit on bound parameters.
+MAX_ACCOUNTS = int(os.getenv("MASTERMIND_BULK_PROVISIONING_MAX_ACCOUNTS", 10000))
+
+# Accounts inserted per batched INSERT.
+CHUNK_SIZE = int(os.getenv("MASTERMIND_BULK_PROVISIONING_CHUNK_SIZE", 500))
@@ -0,0 +1,14 @@
+import os
+
+"""
+This file contains the configurations for the worker pool that bcrypt password hashing and verification run on.
+"""
+# "thread" or "process". bcrypt releases the GIL while hashing, so threads already use every core; a process pool
+# additionally isolates the hashing CPU from the event loop's process.
+EXECUTOR_TYPE = os.getenv("MASTERMIND_PASSWORD_HASHING_EXECUTOR", "thread")
+
+# Number of workers hashing concurrently.
+MAX_WORKERS = int(os.getenv("MASTERMIND_PASSWORD_HASHING_WORKERS", os.cpu_count() or 1))
+
+# Maximum number of hashing jobs either running or waiting for a worker. Requests beyond this are rejected with a 429.
+MAX_PENDING = int(os.getenv("MASTERMIND_PASSWORD_HASHING_MAX_PENDING", MAX_WORKERS * 8))
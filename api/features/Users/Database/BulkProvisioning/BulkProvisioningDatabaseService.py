@@ -0,0 +1,50 @@
+from api.database.schema.DatabaseSchema import sessionLocal, UsersTable, PlayerStatsTable
+from api.features.Users.Configs import BulkProvisioningConfig as Config
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from datetime import datetime
+import uuid
+
+"""
+Handles database interactions for the BulkProvisioningService: finding which of many usernames are taken with one query,
+and storing many accounts with their default stats in one transaction of batched inserts.
+"""
+class BulkProvisioningDatabaseService:
+    def __init__(self, sessionFactory=sessionLocal):
+        """
+        :param: {sessionmaker} sessionFactory - Creates the database sessions, overridable for tests.
+        """
+        self.sessionFactory = sessionFactory
+
+    async def getExistingUsernames(self, usernames: list) -> set:
+        """
+        :param: {List} usernames - The usernames to look up.
+        :return: {Set} Those of the usernames that already belong to an account.
+        """
+        if not usernames:
+            return set()
+        async with self.sessionFactory() as session:
+            result = await session.execute(select(UsersTable.username).where(UsersTable.username.in_(usernames)))
+            return set(result.scalars())
+
+    async def insertAccounts(self, accounts: list, chunkSize: int = Config.CHUNK_SIZE) -> list:
+        """
+        Inserts the accounts into the UsersTable and their default stats into the PlayerStatsTable, one executemany per
+        table and chunk, all in one transaction.
+        :param: {List} accounts - (username, hashedPassword) of each account.
+        :param: {Int} chunkSize - Accounts per batched insert.
+        :return: {List} The new userIds, in the order of the accounts.
+        :raise: {IntegrityError}: If a username was taken since it was checked, in which case nothing is inserted.
+        """
+        createdAt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        userIds = [str(uuid.uuid4()) for _ in accounts]
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                for start in range(0, len(accounts), chunkSize):
+                    chunkUserIds = userIds[start:start + chunkSize]
+                    await session.execute(insert(UsersTable), [
+                        {"userId": userId, "username": username, "password": hashedPassword, "createdAt": createdAt}
+                        for userId, (username, hashedPassword) in zip(chunkUserIds, accounts[start:start + chunkSize])
+                    ])
+                    await session.execute(insert(PlayerStatsTable), [{"userId": userId} for userId in chunkUserIds])
+        return userIds
@@ -2,7 +2,8 @@ from api.database.schema.DatabaseSchema import sessionLocal, UsersTable, PlayerS
 from fastapi import HTTPException
 from sqlalchemy.future import select
 import logging
-import traceback
+
+logger = logging.getLogger(__name__)
 
 """
 Handles database interactions for the CreateNewPlayerService by confirming the username does not yet exist and 
@@ -26,7 +27,7 @@ class CreateNewPlayerDatabaseService:
             - 400: If the username or password is not provided or if the username already exists in the database.
         """
         if not username or not password:
-            logging.error(f"Invalid username or password provided: {traceback.format_exc()}")
+            logger.warning("Invalid username or password provided.")
             raise HTTPException(status_code=400, detail='Not a valid username or password.')
 
         async with sessionLocal() as session:
@@ -42,10 +43,11 @@ class CreateNewPlayerDatabaseService:
     async def addNewUserWithStats(self, username: str, hashedPassword: str):
         """
         Makes two new entries in the database by adding a new user to the UsersTable and also adding default stats for
-        them in the PlayerStatsTable.
+        them in the PlayerStatsTable. Column defaults are applied on flush, so the returned stats are complete without
+        reading them back.
         :param {String} username: User-provided username when creating an account.
         :param {String} hashedPassword: Hashed version of the user-provided password for creating an account.
-        :return: None.
+        :return: {PlayerStatsTable} The new player's default stats.
         :raise: {HTTPException}:
             - 500: If an error occurs either adding the new player to the UsersTable or PlayerStatsTable.
         """
@@ -60,7 +62,6 @@ class CreateNewPlayerDatabaseService:
                         detail=f'Error adding username and password to the UsersTable: {e}'
                     )
                 await session.flush()
-                await session.refresh(newUser)
 
                 self.createNewPlayerService.player.userId = newUser.userId
                 self.createNewPlayerService.player.username = username
@@ -73,4 +74,7 @@ class CreateNewPlayerDatabaseService:
                         status_code=500,
                         detail=f'Error adding new user to the PlayerStatsTable: {e}'
                     )
+                await session.flush()
+
+        return newPlayer
 
@@ -1,8 +1,9 @@
 from fastapi import HTTPException
 from sqlalchemy.future import select
-from api.database.schema.DatabaseSchema import sessionLocal, UsersTable
+from api.database.schema.DatabaseSchema import sessionLocal, UsersTable, PlayerStatsTable
 import logging
-import traceback
+
+logger = logging.getLogger(__name__)
 
 """
 Handles database interactions for the PlayerLoginService by verifying the provided username and password exists and matches
@@ -19,21 +20,28 @@ class PlayerLoginDatabaseService:
     async def validateUserSignIn(self, username: str, password: str):
         """
         Validates the user's attempt to sign in by looking for the indicated username in the database and comparing the
-        provided password with the hashed password for that specific username.
+        provided password with the hashed password for that specific username. The user's stats are loaded in the same
+        query so that logging in takes a single database round trip.
         :param {String} username - User-provided username in an attempt to sign in.
         :param {String} password - User-provided password in an attempt to sign in.
-        :return: None.
+        :return: {PlayerStatsTable} The signed-in player's stats, or None if they have no stats row.
         :raise: {HTTPException}:
             - 400: If an error occurs finding the user or verifying the password.
         """
         async with sessionLocal() as session:
-            async with session.begin():
-                result = await session.execute(select(UsersTable).where(UsersTable.username == username))
-                user = result.scalars().first()
+            result = await session.execute(
+                select(UsersTable, PlayerStatsTable)
+                .outerjoin(PlayerStatsTable, PlayerStatsTable.userId == UsersTable.userId)
+                .where(UsersTable.username == username)
+            )
+            row = result.first()
 
-                if not user or not await self.playerLoginService.verifyPassword(password, user.password):
-                    logging.error(f"Error validating user: {traceback.format_exc()}")
-                    raise HTTPException(status_code=400, detail='Invalid username or password.')
+        # The password is verified after the session is released so no connection is held while bcrypt runs.
+        user, playerStats = row if row else (None, None)
+        if not user or not await self.playerLoginService.verifyPassword(password, user.password):
+            logger.warning("Error validating user.")
+            raise HTTPException(status_code=400, detail='Invalid username or password.')
 
-                self.playerLoginService.player.userId = user.userId
-                self.playerLoginService.player.username = username
+        self.playerLoginService.player.userId = user.userId
+        self.playerLoginService.player.username = username
+        return playerStats
@@ -0,0 +1,92 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from api.features.Users.Configs import BulkProvisioningConfig as Config
+from api.features.Users.Database.BulkProvisioning.BulkProvisioningDatabaseService import (
+    BulkProvisioningDatabaseService)
+from api.features.Users.Services.PasswordHashing.PasswordHashingService import passwordHashingService
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+Creates many player accounts at once for events and load testing. Unlike creating accounts one by one, usernames are
+checked for duplicates with one query, passwords are hashed in parallel across the hashing workers, and the accounts
+are stored with batched inserts in one transaction. Accounts that cannot be created are reported individually without
+failing the others.
+"""
+class BulkProvisioningService:
+    def __init__(self, bulkProvisioningDatabaseService: BulkProvisioningDatabaseService = None,
+                 hashingService=passwordHashingService):
+        """
+        :param: {BulkProvisioningDatabaseService} bulkProvisioningDatabaseService - Stores the accounts, overridable for
+        tests.
+        :param: {PasswordHashingService} hashingService - Hashes the passwords, overridable for tests.
+        """
+        self.bulkProvisioningDBService = bulkProvisioningDatabaseService or BulkProvisioningDatabaseService()
+        self.hashingService = hashingService
+
+    async def provisionAccounts(self, accounts: list) -> JSONResponse:
+        """
+        Creates an account with default stats for every valid (username, password) pair.
+        :param: {List} accounts - (username, password) of each account to create.
+        :return: {JSONResponse} The index, username, and userId of every created account, and the index, username, and
+        error of every account that was not created.
+        :raise: {HTTPException}:
+            - 400: If no accounts or more than MAX_ACCOUNTS are requested.
+            - 500: If an error occurs checking, hashing, or storing the accounts.
+        """
+        if not 1 <= len(accounts) <= Config.MAX_ACCOUNTS:
+            raise HTTPException(status_code=400,
+                                detail=f"Between 1 and {Config.MAX_ACCOUNTS} accounts can be provisioned at once.")
+
+        errors = {}
+        requestedUsernames = set()
+        for index, (username, password) in enumerate(accounts):
+            if not username or not password:
+                errors[index] = "Not a valid username or password."
+            elif username in requestedUsernames:
+                errors[index] = "Duplicate username in this request."
+            else:
+                requestedUsernames.add(username)
+
+        try:
+            pending = [index for index in range(len(accounts)) if index not in errors]
+            pending = await self.__dropExistingUsernames(accounts, pending, errors)
+            hashedPasswords = dict(zip(pending, await self.hashingService.hashPasswords(
+                [accounts[index][1] for index in pending])))
+
+            # A username taken by another request since the check fails the whole transaction; the check is repeated
+            # once so only the taken usernames are reported.
+            for attempt in range(2):
+                try:
+                    userIds = await self.bulkProvisioningDBService.insertAccounts(
+                        [(accounts[index][0], hashedPasswords[index]) for index in pending])
+                    break
+                except IntegrityError:
+                    if attempt:
+                        raise
+                    pending = await self.__dropExistingUsernames(accounts, pending, errors)
+        except Exception as e:
+            logger.exception("Error provisioning accounts.")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        logger.info("Provisioned %s accounts, %s failed.", len(userIds), len(errors))
+        return JSONResponse(content={
+            "created": [{"index": index, "username": accounts[index][0], "userId": userId}
+                        for index, userId in zip(pending, userIds)],
+            "failed": [{"index": index, "username": accounts[index][0], "error": errors[index]}
+                       for index in sorted(errors)]
+        }, status_code=200)
+
+    async def __dropExistingUsernames(self, accounts: list, pending: list, errors: dict) -> list:
+        """
+        Records an error for every pending account whose username is already taken, with one query.
+        :return: {List} The indexes of the accounts still pending.
+        """
+        existingUsernames = await self.bulkProvisioningDBService.getExistingUsernames(
+            [accounts[index][0] for index in pending])
+        for index in pending:
+            if accounts[index][0] in existingUsernames:
+                errors[index] = "That username already exists."
+        return [index for index in pending if index not in errors]
@@ -2,9 +2,10 @@ from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from api.features.Users.Database.CreateNewPlayer.CreateNewPlayerDatabaseService import CreateNewPlayerDatabaseService
 from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
-from passlib.context import CryptContext
+from api.features.Users.Services.PasswordHashing.PasswordHashingService import passwordHashingService
 import logging
-import traceback
+
+logger = logging.getLogger(__name__)
 
 """
 Handles the creation of new player accounts, including validation, password hashing, and initializing player stats.
@@ -16,7 +17,6 @@ class CreateNewPlayerService:
         :param: {PlayerDataManagementService} PlayerDataInstance - Instance of player's data.
         """
         self.player = PlayerDataInstance
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self.createNewPlayerDBService = CreateNewPlayerDatabaseService(self)
         self.playerStatsService = PlayerStatsManagementService(self.player)
 
@@ -29,12 +29,13 @@ class CreateNewPlayerService:
         :return: {JSONResponse} A success message confirming account creation and providing the new userId.
         :raise: {HTTPException}
             - 400: If the username already exists in the database.
+            - 429: If the password hashing queue is full.
             - 500: If any error occurs during user validation, account creation, or initializing player stats.
         """
         try:
             existingUser = await self.createNewPlayerDBService.validateUniqueUser(username, password)
         except Exception as e:
-            logging.error(f"Error checking for existing users: {traceback.format_exc()}")
+            logger.exception("Error checking for existing users.")
             raise HTTPException(status_code=500, detail=str(e))
 
         if existingUser:
@@ -43,18 +44,18 @@ class CreateNewPlayerService:
                 detail='That username already exists! Please try another username or log in.'
             )
 
-        hashedPassword = self.__hashPassword(password)
+        hashedPassword = await self.__hashPassword(password)
 
         try:
-            await self.createNewPlayerDBService.addNewUserWithStats(username, hashedPassword)
+            newPlayerStats = await self.createNewPlayerDBService.addNewUserWithStats(username, hashedPassword)
         except Exception as e:
-            logging.error(f"Error adding new user and stats: {traceback.format_exc()}")
+            logger.exception("Error adding new user and stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
         try:
-            await self.playerStatsService.setPlayerStats(self.player.userId)
+            self.playerStatsService.hydratePlayerStats(newPlayerStats)
         except Exception as e:
-            logging.error(f"Error setting player stats: {traceback.format_exc()}")
+            logger.exception("Error setting player stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
         return JSONResponse(
@@ -62,11 +63,12 @@ class CreateNewPlayerService:
             status_code=200
         )
 
-    def __hashPassword(self, password: str) -> str:
+    async def __hashPassword(self, password: str) -> str:
         """
-        Hashes the user's provided password for secure storage.
+        Hashes the user's provided password for secure storage on the shared password hashing worker pool.
         :param: {String} password - Desired password for the user's account.
         :return: {String} Securely hashed password for storing.
+        :raise: {PasswordHashingBusyException}: If the password hashing queue is full.
         """
-        return self.pwd_context.hash(password)
+        return await passwordHashingService.hashPassword(password)
 
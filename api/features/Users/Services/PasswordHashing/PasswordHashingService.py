@@ -0,0 +1,158 @@
+from fastapi import HTTPException
+from api.features.Users.Configs import PasswordHashingConfig as Config
+from api.metrics.MetricsRegistry import metricsRegistry
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+import asyncio
+
+"""
+Runs bcrypt password hashing and verification on a bounded worker pool so that their CPU cost never blocks the event
+loop. One CryptContext is shared by the whole process.
+"""
+passwordContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
+passwordHashingDuration = metricsRegistry.histogram(
+    "mastermind_password_hashing_duration_seconds",
+    "Seconds from submitting a bcrypt job to its result, including time queued for a worker.", ("operation",))
+passwordHashingRejections = metricsRegistry.counter(
+    "mastermind_password_hashing_rejections_total", "bcrypt jobs rejected because the queue was full.", ("operation",))
+
+
+def hashPasswordInWorker(password: str) -> str:
+    """
+    Hashes a password. Defined at module level so it can also be sent to a process pool.
+    :param: {String} password - The plain password.
+    :return: {String} The bcrypt hash.
+    """
+    return passwordContext.hash(password)
+
+
+def verifyPasswordInWorker(plainPassword: str, hashedPassword: str) -> bool:
+    """
+    Verifies a password against its hash. Defined at module level so it can also be sent to a process pool.
+    :param: {String} plainPassword - The user-provided password.
+    :param: {String} hashedPassword - The stored bcrypt hash.
+    :return: {Bool} True if the passwords match, False otherwise.
+    """
+    return passwordContext.verify(plainPassword, hashedPassword)
+
+
+class PasswordHashingBusyException(HTTPException):
+    def __init__(self):
+        """
+        Raised when the hashing queue is full, so the endpoint fails fast instead of piling up behind it.
+        """
+        super().__init__(
+            status_code=429,
+            detail="The server is busy processing other sign-ins. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+
+class PasswordHashingService:
+    def __init__(self, executorType: str = Config.EXECUTOR_TYPE, maxWorkers: int = Config.MAX_WORKERS,
+                 maxPending: int = Config.MAX_PENDING):
+        """
+        Instantiates the service. The worker pool itself is created on first use.
+        :param: {String} executorType - "thread" or "process".
+        :param: {Int} maxWorkers - Number of workers hashing concurrently.
+        :param: {Int} maxPending - Maximum number of jobs running or queued before new jobs are rejected.
+        """
+        if executorType not in ("thread", "process"):
+            raise ValueError(f"Invalid executorType: {executorType}. Expected 'thread' or 'process'.")
+        self.executorType = executorType
+        self.maxWorkers = maxWorkers
+        self.maxPending = maxPending
+        self.pendingCount = 0
+        self.executor = None
+
+    def getExecutor(self) -> Executor:
+        """
+        Lazily creates the worker pool.
+        :return: {Executor} The worker pool.
+        """
+        if self.executor is None:
+            if self.executorType == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.maxWorkers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers,
+                                                   thread_name_prefix="password-hashing")
+        return self.executor
+
+    async def hashPassword(self, password: str) -> str:
+        """
+        Hashes the user's provided password for secure storage.
+        :param: {String} password - Desired password for the user's account.
+        :return: {String} Securely hashed password for storing.
+        :raise: {PasswordHashingBusyException}: If the hashing queue is full.
+        """
+        return await self.__runBounded("hash", hashPasswordInWorker, password)
+
+    async def hashPasswords(self, passwords: list) -> list:
+        """
+        Hashes many passwords in parallel across the workers, for provisioning accounts in bulk. Instead of being
+        rejected when the queue is full, the batch keeps at most maxWorkers of its hashes queued at a time, so sign-ins
+        submitted meanwhile wait behind one round of hashes rather than the whole batch.
+        :param: {List} passwords - The plain passwords.
+        :return: {List} Their bcrypt hashes, in the same order.
+        """
+        hashedPasswords = [None] * len(passwords)
+        remainingIndexes = iter(range(len(passwords)))
+
+        async def hashRemaining():
+            for index in remainingIndexes:
+                hashedPasswords[index] = await self.__run("hash", hashPasswordInWorker, passwords[index])
+
+        await asyncio.gather(*(hashRemaining() for _ in range(min(self.maxWorkers, len(passwords)))))
+        return hashedPasswords
+
+    async def verifyPassword(self, plainPassword: str, hashedPassword: str) -> bool:
+        """
+        Verifies the entered password matches the stored hashed password.
+        :param: {String} plainPassword - The user-provided password.
+        :param: {String} hashedPassword - The hashed password stored for the specific username.
+        :return: {Bool} True if the passwords match, False otherwise.
+        :raise: {PasswordHashingBusyException}: If the hashing queue is full.
+        """
+        return await self.__runBounded("verify", verifyPasswordInWorker, plainPassword, hashedPassword)
+
+    def shutdown(self):
+        """
+        Shuts the worker pool down. Called on application shutdown.
+        :return: None.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def __runBounded(self, operation: str, function, *args):
+        """
+        Runs the function on the worker pool, rejecting it immediately if the queue is already full.
+        :param: {String} operation - "hash" or "verify", used to label its metrics.
+        :param: {Callable} function - The module-level worker function to run.
+        :param: {Any} args - Arguments for the function.
+        :return: {Any} The function's result.
+        :raise: {PasswordHashingBusyException}: If the hashing queue is full.
+        """
+        if self.pendingCount >= self.maxPending:
+            passwordHashingRejections.inc(operation)
+            raise PasswordHashingBusyException()
+        return await self.__run(operation, function, *args)
+
+    async def __run(self, operation: str, function, *args):
+        """
+        Runs the function on the worker pool, counting it as pending until it completes.
+        :param: {String} operation - "hash" or "verify", used to label its metrics.
+        :param: {Callable} function - The module-level worker function to run.
+        :param: {Any} args - Arguments for the function.
+        :return: {Any} The function's result.
+        """
+        self.pendingCount += 1
+        try:
+            with passwordHashingDuration.time(operation):
+                return await asyncio.get_running_loop().run_in_executor(self.getExecutor(), function, *args)
+        finally:
+            self.pendingCount -= 1
+
+
+# Process-wide service shared by account creation and login.
+passwordHashingService = PasswordHashingService()
@@ -2,9 +2,11 @@ from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 from api.features.Users.Database.PlayerLogin.PlayerLoginDatabaseService import PlayerLoginDatabaseService
 from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
-from passlib.context import CryptContext
+from api.features.Users.Services.PasswordHashing.PasswordHashingService import (
+    PasswordHashingBusyException, passwordHashingService)
 import logging
-import traceback
+
+logger = logging.getLogger(__name__)
 
 """
 Handles logging the player into the game, including validation, password verification, and initializing player stats.
@@ -16,29 +18,38 @@ class PlayerLoginService:
         :param {PlayerDataManagementService} PlayerDataInstance - Instance of player's data
         """
         self.player = PlayerDataInstance
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self.playerLoginDBService = PlayerLoginDatabaseService(self)
         self.playerStatsService = PlayerStatsManagementService(self.player)
 
     async def logPlayerIn(self, username: str, password: str) -> JSONResponse:
         """
-        Logs the player in by validating their username and password and, if validated, sets their player stats from stored data.
+        Logs the player in by validating their username and password and, if validated, sets their player stats from
+        the data loaded alongside the user, together with any of their games not yet written.
         :param {String} username - User-provided username in attempt to sign in.
         :param {String} password - User-provided password in attempt to sign in.
         :return: {HTTPException}:
             - 400: If an error occurs validating the user's sign in.
+            - 429: If the password hashing queue is full.
             - 500: If an error occurs while attempting to set the player's stats for the game.
         """
+        # Taken before the sign-in query, so a stats row that raced a write to the player's stats can be detected.
+        generation = self.playerStatsService.playerStatsManagementDBService.getGeneration()
         try:
-            await self.playerLoginDBService.validateUserSignIn(username, password)
+            playerStats = await self.playerLoginDBService.validateUserSignIn(username, password)
+        except PasswordHashingBusyException:
+            raise
         except Exception as e:
-            logging.error(f"Error validating user's sign in: {traceback.format_exc()}")
+            logger.exception("Error validating user's sign in.")
             raise HTTPException(status_code=400, detail=str(e))
 
         try:
-            await self.playerStatsService.setPlayerStats(self.player.userId)
+            # Games still waiting to be written are applied on top of the stored row, so a player logging in again
+            # before they are flushed does not start from, and later write back, stale XP.
+            playerStats = await self.playerStatsService.playerStatsManagementDBService.getPlayerStatsFromRow(
+                self.player.userId, playerStats, generation)
+            self.playerStatsService.hydratePlayerStats(playerStats)
         except Exception as e:
-            logging.error(f"Error setting player's stats: {traceback.format_exc()}")
+            logger.exception("Error setting player's stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
         successfulLoginMsg = JSONResponse(
@@ -50,9 +61,10 @@ class PlayerLoginService:
 
     async def verifyPassword(self, plainPassword: str, hashedPassword: str) -> bool:
         """
-        Verifies the entered password matches the stored hashed password.
+        Verifies the entered password matches the stored hashed password on the shared password hashing worker pool.
         :param {String} plainPassword - The user-provided password.
         :param {String} hashedPassword - The hashed password stored for the specific username.
         :return: {Bool} True if the passwords match, False otherwise.
+        :raise: {PasswordHashingBusyException}: If the password hashing queue is full.
         """
-        return self.pwd_context.verify(plainPassword, hashedPassword)
+        return await passwordHashingService.verifyPassword(plainPassword, hashedPassword)
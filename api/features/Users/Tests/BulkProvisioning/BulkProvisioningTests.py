@@ -0,0 +1,119 @@
+from api.database.schema.DatabaseSchema import Base, PlayerStatsTable, UsersTable
+from api.features.Users.Database.BulkProvisioning.BulkProvisioningDatabaseService import (
+    BulkProvisioningDatabaseService)
+from api.features.Users.Services.BulkProvisioning.BulkProvisioningService import BulkProvisioningService
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import json
+import unittest
+
+
+class FakeHashingService:
+    def __init__(self, whileHashing=None):
+        """
+        Hashes instantly, optionally running a coroutine function first to act while the passwords are being hashed.
+        """
+        self.whileHashing = whileHashing
+
+    async def hashPasswords(self, passwords: list) -> list:
+        if self.whileHashing:
+            await self.whileHashing()
+        return [f"hashed-{password}" for password in passwords]
+
+
+""" Testing that accounts are provisioned in bulk with batched statements and per-account errors. """
+class BulkProvisioningTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange an in-memory database with one existing user. """
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessionFactory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        await self.insertUser("existing")
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def insertUser(self, username: str):
+        async with self.sessionFactory() as session:
+            async with session.begin():
+                await session.execute(insert(UsersTable).values(userId=f"id-{username}", username=username,
+                                                                password="hashed"))
+
+    async def provision(self, accounts: list, hashingService=None) -> dict:
+        service = BulkProvisioningService(BulkProvisioningDatabaseService(self.sessionFactory),
+                                          hashingService or FakeHashingService())
+        response = await service.provisionAccounts(accounts)
+        return json.loads(response.body.decode("utf-8"))
+
+    async def countRows(self, table) -> int:
+        async with self.sessionFactory() as session:
+            return (await session.execute(select(func.count()).select_from(table))).scalar_one()
+
+    async def testAccountsAreInsertedWithBatchedStatements(self):
+        """
+        Every account and its default stats are stored with one statement per table, after one duplicate check.
+        """
+        # Arrange
+        statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda connection, cursor, statement, *args: statements.append(statement.split()[0]))
+
+        # Act
+        result = await self.provision([(f"player{number}", "secret") for number in range(50)])
+
+        # Assert
+        self.assertEqual(len(result["created"]), 50)
+        self.assertEqual(result["failed"], [])
+        self.assertEqual((statements.count("SELECT"), statements.count("INSERT")), (1, 2))
+        self.assertEqual(await self.countRows(PlayerStatsTable), 50)
+        async with self.sessionFactory() as session:
+            password = (await session.execute(select(UsersTable.password).where(
+                UsersTable.userId == result["created"][0]["userId"]))).scalar_one()
+        self.assertEqual(password, "hashed-secret")
+
+    async def testInvalidAndDuplicateAccountsAreReportedIndividually(self):
+        """
+        Empty credentials, usernames repeated within the request, and taken usernames fail alone.
+        """
+        # Act
+        result = await self.provision([("player1", "secret"), ("player2", ""), ("player1", "other"),
+                                       ("existing", "secret"), ("player3", "secret")])
+
+        # Assert
+        self.assertEqual([account["username"] for account in result["created"]], ["player1", "player3"])
+        self.assertEqual([(failure["index"], failure["error"]) for failure in result["failed"]], [
+            (1, "Not a valid username or password."),
+            (2, "Duplicate username in this request."),
+            (3, "That username already exists.")])
+
+    async def testUsernameTakenWhileHashingIsReported(self):
+        """
+        A username registered by someone else after the duplicate check only fails that account.
+        """
+        # Act
+        result = await self.provision([("player1", "secret"), ("player2", "secret")],
+                                      FakeHashingService(lambda: self.insertUser("player2")))
+
+        # Assert
+        self.assertEqual([account["username"] for account in result["created"]], ["player1"])
+        self.assertEqual(result["failed"], [{"index": 1, "username": "player2",
+                                             "error": "That username already exists."}])
+        self.assertEqual(await self.countRows(PlayerStatsTable), 1)
+
+    async def testEmptyRequestIsRejected(self):
+        """
+        A request without accounts is rejected.
+        """
+        # Act & Assert
+        with self.assertRaises(HTTPException) as context:
+            await self.provision([])
+        self.assertEqual(context.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from api.features.Users.Services.PasswordHashing.PasswordHashingService import (
+    PasswordHashingBusyException, PasswordHashingService)
+import asyncio
+import unittest
+
+"""
+Tests that the PasswordHashingService hashes off the event loop and rejects work once its queue is full.
+"""
+class PasswordHashingServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Arrange a single-worker service that holds at most one job. """
+        self.passwordHashingService = PasswordHashingService(executorType="thread", maxWorkers=1, maxPending=1)
+
+    async def asyncTearDown(self):
+        self.passwordHashingService.shutdown()
+
+    async def testHashAndVerifyRoundTrip(self):
+        """
+        A hashed password verifies against the original and not against anything else.
+        """
+        # Act
+        hashedPassword = await self.passwordHashingService.hashPassword("correct horse")
+
+        # Assert
+        self.assertTrue(await self.passwordHashingService.verifyPassword("correct horse", hashedPassword))
+        self.assertFalse(await self.passwordHashingService.verifyPassword("wrong horse", hashedPassword))
+
+    async def testEventLoopStaysResponsiveWhileHashing(self):
+        """
+        Other coroutines keep running while a hash is being computed.
+        """
+        # Arrange
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tickerTask = asyncio.create_task(ticker())
+
+        # Act
+        await self.passwordHashingService.hashPassword("correct horse")
+        tickerTask.cancel()
+
+        # Assert
+        self.assertGreater(ticks, 1)
+
+    async def testFullQueueIsRejectedWith429(self):
+        """
+        A job submitted while the queue is full fails fast with a 429 instead of waiting.
+        """
+        # Arrange
+        runningHash = asyncio.create_task(self.passwordHashingService.hashPassword("correct horse"))
+        await asyncio.sleep(0)
+
+        # Act & Assert
+        with self.assertRaises(PasswordHashingBusyException) as context:
+            await self.passwordHashingService.hashPassword("another horse")
+        self.assertEqual(context.exception.status_code, 429)
+
+        await runningHash
+        self.assertEqual(self.passwordHashingService.pendingCount, 0)
+
+    async def testBatchIsHashedInOrderWithoutRejection(self):
+        """
+        A batch larger than the queue is hashed in full, each hash matching the password at its position.
+        """
+        # Act
+        hashedPasswords = await self.passwordHashingService.hashPasswords(["horse 1", "horse 2", "horse 3"])
+
+        # Assert
+        for number, hashedPassword in enumerate(hashedPasswords, 1):
+            self.assertTrue(await self.passwordHashingService.verifyPassword(f"horse {number}", hashedPassword))
+        self.assertEqual(self.passwordHashingService.pendingCount, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,102 @@
+from api.database.schema.DatabaseSchema import PlayerStatsTable
+from api.features.Users.Services.PlayerLogin.PlayerLoginService import PlayerLoginService
+from api.features.PlayerData.Services.PlayerDataManagement.PlayerDataManagementService import (
+    PlayerDataManagementService)
+from api.features.PlayerStats.Database.PlayerStatsCache import PlayerStatsCache
+from api.features.PlayerStats.Database.PlayerStatsWriteBehindBuffer import PlayerStatsWriteBehindBuffer
+import unittest
+from unittest.mock import AsyncMock
+
 """
-This Tests file is a skeleton for future testing on the PlayerLoginService.
-"""
\ No newline at end of file
+Tests that the PlayerLoginService loads the player's stats from the sign-in query without a second database read, and
+includes the games still waiting in the write-behind buffer.
+"""
+class PlayerLoginServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """ Mock the login database service so that sign-in returns the player's stats row. """
+        self.player = PlayerDataManagementService()
+        self.playerLoginService = PlayerLoginService(self.player)
+        self.playerStats = PlayerStatsTable(userId="testUserId1234", currentLevel=3, xpToNextLevel=225, currentXp=40,
+                                            highestScore=380, gamesWon=4, gamesPlayed=9, winRate=44)
+
+        async def validateUserSignIn(username, password):
+            self.player.userId = "testUserId1234"
+            return self.playerStats
+
+        self.playerLoginService.playerLoginDBService.validateUserSignIn = validateUserSignIn
+        self.playerStatsDBService = self.playerLoginService.playerStatsService.playerStatsManagementDBService
+        self.playerStatsDBService.cache = PlayerStatsCache()
+        self.playerStatsDBService.writeBehindBuffer = PlayerStatsWriteBehindBuffer(durability="none")
+        self.playerStatsDBService.getPlayerStats = AsyncMock()
+
+    async def testLoginHydratesStatsFromSignInQuery(self):
+        """
+        The stats returned by the sign-in query are copied into memory and the stats table is not queried again.
+        """
+        # Act
+        response = await self.playerLoginService.logPlayerIn("player", "password123")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.player.currentLevel, 3)
+        self.assertEqual(self.player.xpToNextLevel, 225)
+        self.assertEqual(self.player.highestScore, 380)
+        self.assertEqual(self.player.winRate, 44)
+        self.playerStatsDBService.getPlayerStats.assert_not_awaited()
+
+    async def testLoginIncludesGamesNotYetWritten(self):
+        """
+        A player logging in again before their last game is flushed starts from the stats and XP that game left them
+        with, not from the stored row.
+        """
+        # Arrange
+        await self.playerStatsDBService.writeBehindBuffer.enqueue("testUserId1234", {
+            "gamesPlayed": 1, "gamesWon": 1, "highestScore": 500,
+            "currentLevel": 4, "xpToNextLevel": 340, "currentXp": 15
+        })
+
+        # Act
+        await self.playerLoginService.logPlayerIn("player", "password123")
+
+        # Assert
+        self.assertEqual((self.player.gamesPlayed, self.player.gamesWon, self.player.winRate), (10, 5, 50))
+        self.assertEqual((self.player.currentLevel, self.player.xpToNextLevel, self.player.currentXp), (4, 340, 15))
+        self.assertEqual(self.player.highestScore, 500)
+
+    async def testLoginRereadsStatsWrittenDuringSignIn(self):
+        """
+        A stats row read while the player's stats were being written is not trusted, and the stats are read again.
+        """
+        # Arrange
+        async def validateUserSignIn(username, password):
+            self.player.userId = "testUserId1234"
+            self.playerStatsDBService.cache.invalidate("testUserId1234")
+            return self.playerStats
+
+        self.playerLoginService.playerLoginDBService.validateUserSignIn = validateUserSignIn
+        self.playerStatsDBService.getPlayerStats.return_value = PlayerStatsTable(
+            userId="testUserId1234", currentLevel=4, xpToNextLevel=340, currentXp=15, highestScore=500, gamesWon=5,
+            gamesPlayed=10, winRate=50)
+
+        # Act
+        await self.playerLoginService.logPlayerIn("player", "password123")
+
+        # Assert
+        self.playerStatsDBService.getPlayerStats.assert_awaited_once_with("testUserId1234")
+        self.assertEqual((self.player.gamesPlayed, self.player.currentLevel), (10, 4))
+
+    async def testLoginFailsWhenStatsAreMissing(self):
+        """
+        A user without a stats row cannot start playing.
+        """
+        # Arrange
+        self.playerLoginService.playerLoginDBService.validateUserSignIn = AsyncMock(return_value=None)
+
+        # Act & Assert
+        with self.assertRaises(Exception) as context:
+            await self.playerLoginService.logPlayerIn("player", "password123")
+        self.assertEqual(context.exception.status_code, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import os
+
+"""
+This file contains the configurations for the application's logging.
+"""
+# Level of every logger without a level of its own.
+LEVEL = os.getenv("MASTERMIND_LOG_LEVEL", "INFO").upper()
+
+# Comma-separated "logger=LEVEL" pairs overriding the level of single modules and everything below them, e.g.
+# "api.features.PlayerStats=DEBUG,sqlalchemy.engine=INFO".
+MODULE_LEVELS = os.getenv("MASTERMIND_LOG_MODULE_LEVELS", "uvicorn.access=WARNING,passlib=ERROR")
+
+# "json" for one JSON object per line, or "text" for human-readable lines.
+FORMAT = os.getenv("MASTERMIND_LOG_FORMAT", "json").lower()
+
+# Records waiting for the background writer. Once it is full, new records are dropped rather than blocking requests.
+QUEUE_SIZE = int(os.getenv("MASTERMIND_LOG_QUEUE_SIZE", 10000))
+
+# Each log statement may emit this many WARNING or higher records per window. The rest are counted and reported with
+# the first record of the next window.
+RATE_LIMIT_BURST = int(os.getenv("MASTERMIND_LOG_RATE_LIMIT_BURST", 10))
+RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("MASTERMIND_LOG_RATE_LIMIT_WINDOW_SECONDS", 60))
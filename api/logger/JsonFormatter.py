@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+import json
+import logging
+
+"""
+Formats log records as one JSON object per line so they can be shipped and queried without parsing free text.
+"""
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        :param: {LogRecord} record - The record to format.
+        :return: {String} The record's timestamp, level, logger, location, and message as JSON, plus its traceback if it
+        was logged with an exception and its count of suppressed repeats if it was rate-limited.
+        """
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if getattr(record, "suppressedRepeats", 0):
+            entry["suppressedRepeats"] = record.suppressedRepeats
+        return json.dumps(entry, default=str)
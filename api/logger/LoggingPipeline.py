@@ -0,0 +1,133 @@
+from api.logger.Configs import LoggingConfig as Config
+from api.logger.JsonFormatter import JsonFormatter
+from api.logger.RateLimitFilter import RateLimitFilter
+from logging.handlers import QueueHandler, QueueListener
+import copy
+import logging
+import queue
+import sys
+
+"""
+Moves log output off the event loop.
+
+Loggers only hand records to a bounded queue, and a background thread formats them, tracebacks included, and writes
+them out. A request therefore never waits on stderr or a slow log collector, and formatting a traceback costs nothing
+on the request path. When the queue is full, records are dropped and counted instead of blocking the caller.
+"""
+class BackgroundQueueHandler(QueueHandler):
+    def __init__(self, recordQueue: queue.Queue):
+        super().__init__(recordQueue)
+        self.droppedRecords = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the message's arguments but, unlike QueueHandler, leaves formatting and the exception to the listener.
+        :param: {LogRecord} record - The record being logged.
+        :return: {LogRecord} A copy safe to hand to the listener thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.droppedRecords += 1
+
+
+class LoggingPipeline:
+    def __init__(self, level: str = Config.LEVEL, moduleLevels: str = Config.MODULE_LEVELS,
+                 logFormat: str = Config.FORMAT, queueSize: int = Config.QUEUE_SIZE,
+                 rateLimitBurst: int = Config.RATE_LIMIT_BURST,
+                 rateLimitWindowSeconds: float = Config.RATE_LIMIT_WINDOW_SECONDS, stream=None):
+        """
+        Instantiates the pipeline. Nothing changes until it is started.
+        :param: {String} level - Level of every logger without a level of its own.
+        :param: {String} moduleLevels - Comma-separated "logger=LEVEL" overrides.
+        :param: {String} logFormat - "json" or "text".
+        :param: {Int} queueSize - Records that may wait for the background writer.
+        :param: {Int} rateLimitBurst - WARNING or higher records each log statement may emit per window.
+        :param: {Float} rateLimitWindowSeconds - Length of a rate limiting window in seconds.
+        :param: {TextIO} stream - Where records are written, defaulting to stderr.
+        """
+        if logFormat not in ("json", "text"):
+            raise ValueError(f"Invalid logFormat: {logFormat}. Expected 'json' or 'text'.")
+        self.level = level
+        self.moduleLevels = self.parseModuleLevels(moduleLevels)
+        self.logFormat = logFormat
+        self.queueSize = queueSize
+        self.rateLimitBurst = rateLimitBurst
+        self.rateLimitWindowSeconds = rateLimitWindowSeconds
+        self.stream = stream
+        self.queueHandler = None
+        self.queueListener = None
+
+    @property
+    def droppedRecords(self) -> int:
+        return self.queueHandler.droppedRecords if self.queueHandler else 0
+
+    @staticmethod
+    def parseModuleLevels(moduleLevels: str) -> dict:
+        """
+        :param: {String} moduleLevels - Comma-separated "logger=LEVEL" pairs.
+        :return: {Dictionary} Level names keyed by logger name.
+        :raise: {ValueError}: If a pair is malformed or names an unknown level.
+        """
+        levels = {}
+        for pair in filter(None, (pair.strip() for pair in moduleLevels.split(","))):
+            name, separator, level = pair.partition("=")
+            level = level.strip().upper()
+            if not separator or not name.strip() or not isinstance(logging.getLevelName(level), int):
+                raise ValueError(f"Invalid module log level: {pair!r}. Expected 'logger=LEVEL'.")
+            levels[name.strip()] = level
+        return levels
+
+    def start(self):
+        """
+        Routes the root logger, and uvicorn's loggers, through the queue and starts the background writer.
+        :return: None.
+        """
+        if self.queueListener is not None:
+            return
+
+        outputHandler = logging.StreamHandler(self.stream or sys.stderr)
+        outputHandler.setFormatter(JsonFormatter() if self.logFormat == "json" else logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+        recordQueue = queue.Queue(maxsize=self.queueSize)
+        self.queueHandler = BackgroundQueueHandler(recordQueue)
+        self.queueHandler.addFilter(RateLimitFilter(self.rateLimitBurst, self.rateLimitWindowSeconds))
+        self.queueListener = QueueListener(recordQueue, outputHandler)
+
+        rootLogger = logging.getLogger()
+        for handler in list(rootLogger.handlers):
+            rootLogger.removeHandler(handler)
+        rootLogger.addHandler(self.queueHandler)
+        rootLogger.setLevel(self.level)
+
+        # uvicorn writes through handlers of its own, so they are removed to send its records through the queue too.
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicornLogger = logging.getLogger(name)
+            uvicornLogger.handlers.clear()
+            uvicornLogger.propagate = True
+        for name, level in self.moduleLevels.items():
+            logging.getLogger(name).setLevel(level)
+
+        self.queueListener.start()
+
+    def stop(self):
+        """
+        Writes out every queued record and stops the background writer. Called on application shutdown.
+        :return: None.
+        """
+        if self.queueListener is None:
+            return
+        self.queueListener.stop()
+        logging.getLogger().removeHandler(self.queueHandler)
+        self.queueListener = None
+
+
+# Process-wide pipeline started by the app.
+loggingPipeline = LoggingPipeline()
@@ -0,0 +1,49 @@
+import logging
+import time
+
+"""
+Limits how often a single log statement can emit warnings and errors, so a failure repeated on every request, such as a
+database outage, is reported without flooding the output or the queue behind it.
+
+Records are grouped by the file and line that logged them. Each group may emit a burst of records per window; the rest
+are dropped and counted, and the first record of the next window carries that count as suppressedRepeats. Records below
+WARNING are never limited.
+"""
+class RateLimitFilter(logging.Filter):
+    def __init__(self, burst: int, windowSeconds: float, clock=time.monotonic):
+        """
+        Instantiates the filter.
+        :param: {Int} burst - Records each log statement may emit per window.
+        :param: {Float} windowSeconds - Length of a window in seconds.
+        :param: {Callable} clock - Monotonic clock, overridable for tests.
+        """
+        super().__init__()
+        self.burst = burst
+        self.windowSeconds = windowSeconds
+        self.clock = clock
+        # [windowStartedAt, emitted, suppressed] per (pathname, lineno).
+        self.windows = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        :param: {LogRecord} record - The record being logged.
+        :return: {Bool} True if the record should be emitted.
+        """
+        if record.levelno < logging.WARNING:
+            return True
+
+        now = self.clock()
+        key = (record.pathname, record.lineno)
+        window = self.windows.get(key)
+        if window is None or now - window[0] >= self.windowSeconds:
+            suppressed = window[2] if window else 0
+            self.windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressedRepeats = suppressed
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
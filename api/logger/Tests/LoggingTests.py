@@ -0,0 +1,103 @@
+from api.logger.JsonFormatter import JsonFormatter
+from api.logger.LoggingPipeline import LoggingPipeline
+from api.logger.RateLimitFilter import RateLimitFilter
+import io
+import json
+import logging
+import unittest
+
+""" Testing the JSON formatter, the rate limiter, and the background logging pipeline. """
+class LoggingTest(unittest.TestCase):
+    def setUp(self):
+        """ Remember the root logger's handlers and level. """
+        self.rootLogger = logging.getLogger()
+        self.previousHandlers, self.previousLevel = list(self.rootLogger.handlers), self.rootLogger.level
+
+    def tearDown(self):
+        self.rootLogger.handlers[:] = self.previousHandlers
+        self.rootLogger.setLevel(self.previousLevel)
+        logging.getLogger("api.logger.tests.quiet").setLevel(logging.NOTSET)
+
+    @staticmethod
+    def makeRecord(level: int = logging.ERROR, lineno: int = 10, excInfo=None) -> logging.LogRecord:
+        return logging.LogRecord("api.logger.tests", level, "LoggingTests.py", lineno, "Something failed.", None,
+                                 excInfo)
+
+    def testTracebackIsOnlyFormattedForExceptions(self):
+        """
+        A record carries a traceback only when it was logged with an exception.
+        """
+        # Arrange
+        formatter = JsonFormatter()
+        try:
+            raise ValueError("Broken.")
+        except ValueError as e:
+            exceptionRecord = self.makeRecord(excInfo=(type(e), e, e.__traceback__))
+
+        # Act
+        plainEntry = json.loads(formatter.format(self.makeRecord()))
+        exceptionEntry = json.loads(formatter.format(exceptionRecord))
+
+        # Assert
+        self.assertEqual(plainEntry["message"], "Something failed.")
+        self.assertEqual(plainEntry["level"], "ERROR")
+        self.assertNotIn("exception", plainEntry)
+        self.assertIn("ValueError: Broken.", exceptionEntry["exception"])
+
+    def testRepeatedErrorsAreRateLimited(self):
+        """
+        A log statement emits a burst per window, and the next window reports how many records were suppressed.
+        """
+        # Arrange
+        now = [0.0]
+        rateLimitFilter = RateLimitFilter(burst=2, windowSeconds=60, clock=lambda: now[0])
+
+        # Act
+        firstWindow = [rateLimitFilter.filter(self.makeRecord()) for _ in range(5)]
+        otherStatement = rateLimitFilter.filter(self.makeRecord(lineno=20))
+        debugRecord = rateLimitFilter.filter(self.makeRecord(level=logging.DEBUG))
+        now[0] = 61.0
+        nextWindowRecord = self.makeRecord()
+        nextWindow = rateLimitFilter.filter(nextWindowRecord)
+
+        # Assert
+        self.assertEqual(firstWindow, [True, True, False, False, False])
+        self.assertTrue(otherStatement)
+        self.assertTrue(debugRecord)
+        self.assertTrue(nextWindow)
+        self.assertEqual(nextWindowRecord.suppressedRepeats, 3)
+
+    def testPipelineWritesRecordsInTheBackground(self):
+        """
+        Records are written by the background writer as JSON, with per-module levels applied.
+        """
+        # Arrange
+        stream = io.StringIO()
+        pipeline = LoggingPipeline(level="INFO", moduleLevels="api.logger.tests.quiet=ERROR", logFormat="json",
+                                   stream=stream)
+
+        # Act
+        pipeline.start()
+        logging.getLogger("api.logger.tests").info("Game %s entered.", 7)
+        logging.getLogger("api.logger.tests.quiet").warning("Not written.")
+        logging.getLogger("api.logger.tests").debug("Not written either.")
+        pipeline.stop()
+        entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        # Assert
+        self.assertEqual([entry["message"] for entry in entries], ["Game 7 entered."])
+        self.assertEqual(entries[0]["logger"], "api.logger.tests")
+
+    def testInvalidModuleLevelsAreRejected(self):
+        """
+        Module level overrides must name a logger and a known level.
+        """
+        # Act & Assert
+        self.assertEqual(LoggingPipeline.parseModuleLevels(" sqlalchemy.engine=info, ,uvicorn=WARNING"),
+                         {"sqlalchemy.engine": "INFO", "uvicorn": "WARNING"})
+        with self.assertRaises(ValueError):
+            LoggingPipeline.parseModuleLevels("sqlalchemy.engine=LOUD")
+
+
+if __name__ == "__main__":
+    unittest.main()
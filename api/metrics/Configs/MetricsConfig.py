@@ -0,0 +1,14 @@
+import os
+
+"""
+This file contains the configurations for the Prometheus metrics.
+"""
+# Upper bounds in seconds of the latency histogram buckets, shared by requests and their dependencies. Requests range
+# from sub-millisecond cache hits to bcrypt and Random.org calls of a few hundred milliseconds.
+LATENCY_BUCKETS = tuple(float(bound) for bound in os.getenv(
+    "MASTERMIND_METRICS_LATENCY_BUCKETS",
+    "0.0005,0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10").split(","))
+
+# Times every SQL statement. Any statement listener moves SQLAlchemy off its fastest execution path, which costs about
+# 10-20 µs per statement (see api/benchmarks/MetricsOverheadBenchmark.py), so it can be switched off on hot databases.
+TIME_DATABASE_STATEMENTS = os.getenv("MASTERMIND_METRICS_TIME_DATABASE_STATEMENTS", "true").lower() == "true"
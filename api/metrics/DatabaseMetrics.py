@@ -0,0 +1,44 @@
+from api.metrics.MetricsRegistry import MetricsRegistry, metricsRegistry
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+import time
+
+"""
+Times every SQL statement an engine executes, labelled by the statement's operation (SELECT, INSERT, UPDATE, ...).
+"""
+def instrumentEngine(engine: AsyncEngine | Engine, registry: MetricsRegistry = metricsRegistry):
+    """
+    Attaches statement timers to the engine.
+    :param: {AsyncEngine | Engine} engine - The engine to time.
+    :param: {MetricsRegistry} registry - The registry the statement durations are recorded in.
+    :return: None.
+    """
+    statementDuration = registry.histogram("mastermind_db_statement_duration_seconds",
+                                           "Seconds spent executing SQL statements, by operation.", ("operation",))
+    statementErrors = registry.counter("mastermind_db_statement_errors_total",
+                                       "SQL statements that raised an error, by operation.", ("operation",))
+
+    # Async engines run their statements through the sync engine they wrap, so that is where the events fire.
+    syncEngine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(syncEngine, "before_cursor_execute")
+    def startStatementTimer(connection, cursor, statement, parameters, context, executemany):
+        context.metricsStartedAt = time.perf_counter()
+
+    @event.listens_for(syncEngine, "after_cursor_execute")
+    def observeStatement(connection, cursor, statement, parameters, context, executemany):
+        statementDuration.observe(time.perf_counter() - context.metricsStartedAt, getOperation(statement))
+
+    @event.listens_for(syncEngine, "handle_error")
+    def countStatementError(exceptionContext):
+        statementErrors.inc(getOperation(exceptionContext.statement or ""))
+
+
+def getOperation(statement: str) -> str:
+    """
+    :param: {String} statement - The SQL statement.
+    :return: {String} Its leading keyword in upper case, e.g. "SELECT", or "OTHER" if it has none.
+    """
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "OTHER"
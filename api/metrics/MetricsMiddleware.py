@@ -0,0 +1,51 @@
+from api.metrics.MetricsRegistry import MetricsRegistry, metricsRegistry
+import time
+
+"""
+Pure ASGI middleware recording the count, status codes, and latency of every HTTP request.
+
+Requests are labelled with the route's path template, e.g. "/get-player-stats", rather than the raw path, so the number
+of series stays fixed no matter what clients request. Requests that match no route share the "unmatched" label.
+Unlike BaseHTTPMiddleware, it does not wrap the request and response in extra tasks and streams, so the cost per
+request is a couple of dictionary updates.
+"""
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = metricsRegistry):
+        """
+        Wraps the ASGI app.
+        :param: {ASGIApp} app - The wrapped application.
+        :param: {MetricsRegistry} registry - The registry the request metrics are recorded in.
+        """
+        self.app = app
+        self.requestsTotal = registry.counter("mastermind_http_requests_total", "HTTP requests by route and status.",
+                                              ("method", "route", "status"))
+        self.requestDuration = registry.histogram("mastermind_http_request_duration_seconds",
+                                                  "Seconds from receiving an HTTP request to sending its response.",
+                                                  ("method", "route"))
+        self.requestsInProgress = registry.gauge("mastermind_http_requests_in_progress",
+                                                 "HTTP requests currently being handled.")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Anything that fails before a response is started reaches the client as a 500.
+        statusCode = 500
+
+        async def sendWithStatus(message):
+            nonlocal statusCode
+            if message["type"] == "http.response.start":
+                statusCode = message["status"]
+            await send(message)
+
+        startedAt = time.perf_counter()
+        self.requestsInProgress.inc()
+        try:
+            await self.app(scope, receive, sendWithStatus)
+        finally:
+            self.requestsInProgress.dec()
+            route = scope.get("route")
+            routePath = getattr(route, "path", "unmatched")
+            self.requestDuration.observe(time.perf_counter() - startedAt, scope["method"], routePath)
+            self.requestsTotal.inc(scope["method"], routePath, statusCode)
@@ -0,0 +1,180 @@
+from api.metrics.Configs import MetricsConfig as Config
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+
+"""
+A minimal, dependency-free set of Prometheus metrics rendered in the Prometheus text exposition format.
+
+Metrics keep one value per combination of label values, keyed by the tuple of those values, so recording is a dictionary
+lookup and an addition. Histograms only count into their own bucket when recording and add the buckets up when
+rendered. Metrics are updated from the event loop, so they take no locks.
+"""
+def escapeLabelValue(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def formatValue(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    metricType = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelNames: tuple = (), function=None):
+        """
+        Instantiates a metric without any recorded values.
+        :param: {String} name - Prometheus name of the metric.
+        :param: {String} documentation - Help text shown with the metric.
+        :param: {Tuple} labelNames - Names of the metric's labels, in the order their values are passed when recording.
+        :param: {Callable} function - Optional callable returning the metric's unlabelled value whenever it is scraped,
+        for values that are owned elsewhere.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelNames = tuple(labelNames)
+        self.function = function
+        self.values = {}
+
+    def formatLabels(self, labelValues: tuple, extraLabels: str = "") -> str:
+        labels = [f'{name}="{escapeLabelValue(value)}"' for name, value in zip(self.labelNames, labelValues)]
+        if extraLabels:
+            labels.append(extraLabels)
+        return "{" + ",".join(labels) + "}" if labels else ""
+
+    def collect(self) -> list:
+        """
+        :return: {List} (name, labels, value) of every sample of the metric.
+        """
+        if self.function is not None:
+            return [(self.name, "", self.function())]
+        return [(self.name, self.formatLabels(labelValues), value) for labelValues, value in self.values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metricType}"]
+        lines.extend(f"{name}{labels} {formatValue(value)}" for name, labels, value in self.collect())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    metricType = "counter"
+
+    def inc(self, *labelValues, amount: float = 1):
+        """
+        Increases the counter of the label values.
+        :param: {Any} labelValues - One value per label name.
+        :param: {Float} amount - The non-negative amount to add.
+        :return: None.
+        """
+        self.values[labelValues] = self.values.get(labelValues, 0) + amount
+
+
+class Gauge(Metric):
+    metricType = "gauge"
+
+    def set(self, value: float, *labelValues):
+        self.values[labelValues] = value
+
+    def inc(self, *labelValues, amount: float = 1):
+        self.values[labelValues] = self.values.get(labelValues, 0) + amount
+
+    def dec(self, *labelValues, amount: float = 1):
+        self.values[labelValues] = self.values.get(labelValues, 0) - amount
+
+
+class Histogram(Metric):
+    metricType = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelNames: tuple = (), buckets: tuple = Config.LATENCY_BUCKETS):
+        """
+        Instantiates a histogram without any observations.
+        :param: {String} name - Prometheus name of the metric.
+        :param: {String} documentation - Help text shown with the metric.
+        :param: {Tuple} labelNames - Names of the metric's labels, in the order their values are passed when observing.
+        :param: {Tuple} buckets - Ascending upper bounds of the buckets. A +Inf bucket is always added.
+        """
+        super().__init__(name, documentation, labelNames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != float("inf")))
+
+    def observe(self, value: float, *labelValues):
+        """
+        Records one observation for the label values.
+        :param: {Float} value - The observed value, e.g. a duration in seconds.
+        :param: {Any} labelValues - One value per label name.
+        :return: None.
+        """
+        series = self.values.get(labelValues)
+        if series is None:
+            # Per-bucket counts (the last one being +Inf), then the sum of the observations.
+            series = self.values[labelValues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *labelValues):
+        """
+        Observes the seconds spent in the with block, including when it raises.
+        :param: {Any} labelValues - One value per label name.
+        """
+        startedAt = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - startedAt, *labelValues)
+
+    def collect(self) -> list:
+        samples = []
+        for labelValues, series in self.values.items():
+            cumulativeCount = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulativeCount += count
+                samples.append((f"{self.name}_bucket", self.formatLabels(labelValues, f'le="{formatValue(bound)}"'),
+                                cumulativeCount))
+            samples.append((f"{self.name}_sum", self.formatLabels(labelValues), series[-1]))
+            samples.append((f"{self.name}_count", self.formatLabels(labelValues), cumulativeCount))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Instantiates a registry without any metrics.
+        """
+        self.metrics = {}
+
+    def counter(self, name: str, documentation: str, labelNames: tuple = (), function=None) -> Counter:
+        return self.__register(Counter, name, documentation, labelNames, function=function)
+
+    def gauge(self, name: str, documentation: str, labelNames: tuple = (), function=None) -> Gauge:
+        return self.__register(Gauge, name, documentation, labelNames, function=function)
+
+    def histogram(self, name: str, documentation: str, labelNames: tuple = (),
+                  buckets: tuple = Config.LATENCY_BUCKETS) -> Histogram:
+        return self.__register(Histogram, name, documentation, labelNames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Renders every metric for a Prometheus scrape.
+        :return: {String} The metrics in the Prometheus text exposition format.
+        """
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+    def __register(self, metricClass, name: str, documentation: str, labelNames: tuple, **kwargs) -> Metric:
+        """
+        Creates the metric, or returns the already registered one of the same name, type, and labels so that modules
+        can declare the metrics they record without coordinating.
+        :return: {Metric} The registered metric.
+        :raise: {ValueError}: If a different metric is already registered under the name.
+        """
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = metricClass(name, documentation, labelNames, **kwargs)
+        elif type(metric) is not metricClass or metric.labelNames != tuple(labelNames):
+            raise ValueError(f"A different metric is already registered as {name}.")
+        return metric
+
+
+# Process-wide registry exposed on /metrics.
+metricsRegistry = MetricsRegistry()
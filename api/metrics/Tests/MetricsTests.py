@@ -0,0 +1,111 @@
+from api.database.DatabaseEngine import createDatabaseEngine
+from api.metrics.DatabaseMetrics import instrumentEngine
+from api.metrics.MetricsMiddleware import MetricsMiddleware
+from api.metrics.MetricsRegistry import MetricsRegistry
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import text
+import httpx
+import unittest
+
+""" Testing the metrics registry's text format, the request middleware, and the SQL statement timers. """
+class MetricsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """ Arrange a private registry and a small app wrapped in the metrics middleware. """
+        self.registry = MetricsRegistry()
+        self.app = FastAPI()
+
+        @self.app.get("/players/{userId}")
+        async def getPlayer(userId: str):
+            if userId == "missing":
+                raise HTTPException(status_code=404, detail="Player not found.")
+            return {"userId": userId}
+
+        @self.app.get("/crash")
+        async def crash():
+            raise RuntimeError("Unhandled.")
+
+        self.app.add_middleware(MetricsMiddleware, registry=self.registry)
+
+    async def request(self, path: str) -> int:
+        transport = httpx.ASGITransport(app=self.app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://metrics") as client:
+            return (await client.get(path)).status_code
+
+    def testHistogramRendersCumulativeBuckets(self):
+        """
+        Histogram buckets are rendered cumulatively with a +Inf bucket, a sum, and a count.
+        """
+        # Arrange
+        histogram = self.registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+
+        # Act
+        for seconds in (0.05, 0.5, 0.5, 5):
+            histogram.observe(seconds, "/a")
+        rendered = self.registry.render()
+
+        # Assert
+        self.assertIn("# TYPE latency_seconds histogram", rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1.0"} 3', rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 4', rendered)
+        self.assertIn('latency_seconds_sum{route="/a"} 6.05', rendered)
+        self.assertIn('latency_seconds_count{route="/a"} 4', rendered)
+
+    def testConflictingRegistrationIsRejected(self):
+        """
+        Registering the same metric twice returns it, while reusing its name for a different metric fails.
+        """
+        # Arrange
+        counter = self.registry.counter("events_total", "Events.", ("kind",))
+
+        # Act & Assert
+        self.assertIs(self.registry.counter("events_total", "Events.", ("kind",)), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("events_total", "Events.", ("kind",))
+
+    async def testRequestsAreLabelledByRouteTemplate(self):
+        """
+        Requests are counted per route template and status code, including handled and unhandled errors.
+        """
+        # Act
+        statusCodes = [await self.request(path) for path in ("/players/a", "/players/b", "/players/missing",
+                                                             "/crash", "/unknown")]
+        rendered = self.registry.render()
+
+        # Assert
+        self.assertEqual(statusCodes, [200, 200, 404, 500, 404])
+        self.assertIn('mastermind_http_requests_total{method="GET",route="/players/{userId}",status="200"} 2', rendered)
+        self.assertIn('mastermind_http_requests_total{method="GET",route="/players/{userId}",status="404"} 1', rendered)
+        self.assertIn('mastermind_http_requests_total{method="GET",route="/crash",status="500"} 1', rendered)
+        self.assertIn('mastermind_http_requests_total{method="GET",route="unmatched",status="404"} 1', rendered)
+        self.assertIn('mastermind_http_request_duration_seconds_count{method="GET",route="/players/{userId}"} 3',
+                      rendered)
+        self.assertIn("mastermind_http_requests_in_progress 0", rendered)
+
+    async def testStatementsAreTimedByOperation(self):
+        """
+        Every SQL statement is timed under its operation, and failing statements are counted.
+        """
+        # Arrange
+        engine = createDatabaseEngine("sqlite+aiosqlite:///:memory:", echo=False, sqlitePragmas={})
+        instrumentEngine(engine, self.registry)
+
+        # Act
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE Scores (score INTEGER)"))
+            await connection.execute(text("INSERT INTO Scores VALUES (1)"))
+            await connection.execute(text("SELECT score FROM Scores"))
+            with self.assertRaises(Exception):
+                await connection.execute(text("SELECT missing FROM Scores"))
+        await engine.dispose()
+        rendered = self.registry.render()
+
+        # Assert
+        self.assertIn('mastermind_db_statement_duration_seconds_count{operation="CREATE"} 1', rendered)
+        self.assertIn('mastermind_db_statement_duration_seconds_count{operation="INSERT"} 1', rendered)
+        self.assertIn('mastermind_db_statement_duration_seconds_count{operation="SELECT"} 1', rendered)
+        self.assertIn('mastermind_db_statement_errors_total{operation="SELECT"} 1', rendered)
+
+
+if __name__ == "__main__":
+    unittest.main()
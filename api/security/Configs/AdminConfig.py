@@ -0,0 +1,10 @@
+import os
+
+"""
+This file contains the configurations for the admin endpoints: bulk provisioning, level recomputation, feature flags,
+custom difficulty modes, and exports.
+"""
+# Token that must be sent in the X-Admin-Token header to call an admin endpoint. Every admin endpoint is disabled when
+# unset.
+ADMIN_TOKEN = os.getenv("MASTERMIND_ADMIN_TOKEN", "")
+ADMIN_TOKEN_HEADER_NAME = "X-Admin-Token"
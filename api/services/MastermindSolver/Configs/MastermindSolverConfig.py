@@ -0,0 +1,20 @@
+import os
+
+"""
+This file contains the configurations for the solver that suggests a player's next guess.
+"""
+# "entropy" picks the guess whose hints are expected to reveal the most information, "minimax" (Knuth) the guess whose
+# worst-case hint leaves the fewest candidate codes.
+STRATEGY = os.getenv("MASTERMIND_SOLVER_STRATEGY", "entropy")
+
+# Difficulty modes with at most this many possible codes get a full guess x code feedback table (one byte per pair
+# for codes of up to 15 digits, so 4096 codes take 16 MiB, and two bytes for longer codes). Larger modes are solved
+# from samples instead.
+MAX_TABLE_CODE_SPACE = int(os.getenv("MASTERMIND_SOLVER_MAX_TABLE_CODE_SPACE", 4096))
+
+# Without a table, at most this many guesses are scored against at most this many candidate codes per suggestion, so a
+# suggestion needs at most SAMPLE_SIZE ** 2 feedback values.
+SAMPLE_SIZE = int(os.getenv("MASTERMIND_SOLVER_SAMPLE_SIZE", 1000))
+
+# Directory the feedback tables are saved to once and memory-mapped from, so worker processes share their pages.
+TABLE_DIRECTORY = os.getenv("MASTERMIND_SOLVER_TABLE_DIRECTORY", "./api/database/FeedbackTables")
@@ -0,0 +1,253 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from api.features.DifficultyMode.Configs import DifficultyModeConfig
+from api.services.MastermindSolver.Configs import MastermindSolverConfig as Config
+from api.services.MastermindSolver.Utils.FeedbackTable import FeedbackTable
+from api.services.MastermindSolver.Utils.FeedbackTableStore import FeedbackTableStore
+from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+import asyncio
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+"""
+Recommends the best next guess for a game in progress, using either an expected-entropy or a Knuth minimax strategy.
+
+Both strategies keep the candidate codes still consistent with the game's hints, then score possible guesses by how
+they would partition those candidates. Modes whose code space fits a full feedback table (EASY and NORMAL by default)
+look every hint up in a table and score every code as a guess. With a FeedbackTableStore, tables are saved to disk once
+and memory-mapped lazily per mode on first use; without one they are built in memory.
+Larger modes (HARD) filter their code space with the BatchHintEngine and score a bounded sample of guesses against a
+bounded sample of candidates. Modes too large to enumerate (IMPOSSIBLE) are not supported.
+"""
+class MastermindSolverService:
+    STRATEGIES = ("entropy", "minimax")
+
+    def __init__(self, strategy: str = Config.STRATEGY, maxTableCodeSpace: int = Config.MAX_TABLE_CODE_SPACE,
+                 sampleSize: int = Config.SAMPLE_SIZE, feedbackTableStore: FeedbackTableStore = None):
+        """
+        Instantiates a solver with no tables loaded yet.
+        :param: {String} strategy - "entropy" or "minimax".
+        :param: {Int} maxTableCodeSpace - Largest code space solved from a full feedback table.
+        :param: {Int} sampleSize - Guesses and candidates scored per suggestion for modes without a table.
+        :param: {FeedbackTableStore} feedbackTableStore - Where tables are saved and mapped from, or None to build them
+        in memory.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Invalid strategy: {strategy}. Expected 'entropy' or 'minimax'.")
+        self.strategy = strategy
+        self.maxTableCodeSpace = maxTableCodeSpace
+        self.sampleSize = sampleSize
+        self.feedbackTableStore = feedbackTableStore
+        self.feedbackTables = {}
+        self.codeSpaces = {}
+        self.openingGuesses = {}
+        self.lock = threading.Lock()
+        self.warmUpTask = None
+
+    async def start(self):
+        """
+        Makes sure the feedback tables of every configured difficulty mode exist, in the background. Called on
+        application startup.
+        :return: None.
+        """
+        self.warmUpTask = asyncio.create_task(asyncio.to_thread(self.warmUp))
+
+    def warmUp(self):
+        """
+        Saves the feedback table of every difficulty mode small enough for a table that is not on disk yet, leaving
+        them to be mapped on first use. Without a store, builds them and their opening guesses in memory instead.
+        :return: None.
+        """
+        for mode in DifficultyModeConfig.difficulty_modes.values():
+            codeSpaceKey = (mode["INPUT_LEN"], MastermindGameMVPConfigs.MIN_RAND_DIGIT, mode["MAX_RAND_DIGIT"])
+            if not self.hasFeedbackTable(*codeSpaceKey):
+                continue
+            if self.feedbackTableStore is None:
+                self.suggestGuess(*codeSpaceKey, guessHistory=[])
+            else:
+                with self.lock:
+                    self.feedbackTableStore.ensureSaved(*codeSpaceKey)
+
+    async def suggestGuessForGame(self, game) -> JSONResponse:
+        """
+        Recommends the next guess for a game in progress without blocking the event loop.
+        :param: {Mastermind} game - The game to solve.
+        :return: {JSONResponse} The suggestedGuess, the number of remainingCandidates, and the strategy used.
+        :raise: {HTTPException}:
+            - 400: If no game is in progress or the mode is too large to solve.
+            - 500: If an error occurs computing the suggestion.
+        """
+        if game.winningCombo is None:
+            raise HTTPException(status_code=400, detail="Enter a game before asking for a suggestion.")
+
+        try:
+            suggestion = await asyncio.to_thread(self.suggestGuess, game.inputLength, game.minRandomDigit,
+                                                 game.maxRandomDigit, list(game.guessHistory))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.exception("Error suggesting a guess.")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return JSONResponse(content=suggestion, status_code=200)
+
+    def suggestGuess(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int, guessHistory: list) -> dict:
+        """
+        Recommends the next guess given the hints received so far.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :param: {List} guessHistory - (guess, correctPositionAndNumber, correctNumbers) tuples of the game so far.
+        :return: {Dictionary} The suggestedGuess, the number of remainingCandidates, and the strategy used.
+        :raise: {ValueError}: If the mode is too large to solve or no code is consistent with the hints.
+        """
+        if self.hasFeedbackTable(inputLength, minRandomDigit, maxRandomDigit):
+            return self.__suggestFromTable(inputLength, minRandomDigit, maxRandomDigit, guessHistory)
+        return self.__suggestFromSample(inputLength, minRandomDigit, maxRandomDigit, guessHistory)
+
+    def hasFeedbackTable(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> bool:
+        """
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {Boolean} True if the mode is solved from a full feedback table.
+        """
+        return (maxRandomDigit - minRandomDigit + 1) ** inputLength <= self.maxTableCodeSpace
+
+    def getFeedbackTable(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> FeedbackTable:
+        """
+        Returns the mode's feedback table, mapping it from the store (or building it) on first use.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {FeedbackTable} The mode's feedback table.
+        """
+        codeSpaceKey = (inputLength, minRandomDigit, maxRandomDigit)
+        with self.lock:
+            if codeSpaceKey not in self.feedbackTables:
+                if self.feedbackTableStore is None:
+                    self.feedbackTables[codeSpaceKey] = FeedbackTable.build(*codeSpaceKey)
+                else:
+                    self.feedbackTables[codeSpaceKey] = self.feedbackTableStore.loadOrBuild(*codeSpaceKey)
+            return self.feedbackTables[codeSpaceKey]
+
+    def getCodeSpace(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> np.ndarray:
+        """
+        Returns every code of the mode, enumerating them on first use. Shared by every game, so it must not be modified.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {np.ndarray} (K, inputLength) digit matrix of the mode's code space.
+        :raise: {ValueError}: If the code space is too large to enumerate.
+        """
+        codeSpaceKey = (inputLength, minRandomDigit, maxRandomDigit)
+        with self.lock:
+            if codeSpaceKey not in self.codeSpaces:
+                self.codeSpaces[codeSpaceKey] = BatchHintEngine.generateCodeSpace(*codeSpaceKey)
+            return self.codeSpaces[codeSpaceKey]
+
+    def __suggestFromTable(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int,
+                           guessHistory: list) -> dict:
+        """
+        Filters the candidates and scores every code as a guess with the mode's feedback table.
+        :return: {Dictionary} The suggestion.
+        """
+        feedbackTable = self.getFeedbackTable(inputLength, minRandomDigit, maxRandomDigit)
+        codeSpaceKey = (inputLength, minRandomDigit, maxRandomDigit, self.strategy)
+        if not guessHistory and codeSpaceKey in self.openingGuesses:
+            return self.openingGuesses[codeSpaceKey]
+
+        isCandidate = np.ones(len(feedbackTable), dtype=bool)
+        for guess, exact, total in guessHistory:
+            isCandidate &= (feedbackTable.table[feedbackTable.indexOf(guess)]
+                            == FeedbackTable.encodeFeedback(exact, total, inputLength))
+        candidateIndices = np.flatnonzero(isCandidate)
+
+        if len(candidateIndices) <= 2:
+            guessIndex = self.__firstCandidate(candidateIndices)
+        else:
+            partitions = feedbackTable.table[:, candidateIndices]
+            guessIndex = int(np.argmax(self.__scoreGuesses(partitions, isCandidate, inputLength)))
+
+        suggestion = {
+            "suggestedGuess": BatchHintEngine.decodeCode(feedbackTable.codeSpace[guessIndex]),
+            "remainingCandidates": int(len(candidateIndices)),
+            "strategy": self.strategy
+        }
+        if not guessHistory:
+            self.openingGuesses[codeSpaceKey] = suggestion
+        return suggestion
+
+    def __suggestFromSample(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int,
+                            guessHistory: list) -> dict:
+        """
+        Filters the mode's code space by scoring it against each past guess, then scores a sample of candidate guesses
+        against a sample of candidates.
+        :return: {Dictionary} The suggestion.
+        """
+        candidates = self.getCodeSpace(inputLength, minRandomDigit, maxRandomDigit)
+        for guess, exact, total in guessHistory:
+            guessExact, guessTotal = BatchHintEngine.scoreGuesses([guess], candidates)
+            candidates = candidates[(guessExact[0] == exact) & (guessTotal[0] == total)]
+
+        if len(candidates) <= 2:
+            suggestedGuess = candidates[self.__firstCandidate(np.arange(len(candidates)))]
+        else:
+            randomGenerator = np.random.default_rng()
+            sample = candidates[randomGenerator.choice(len(candidates), min(self.sampleSize, len(candidates)),
+                                                       replace=False)]
+            exact, total = BatchHintEngine.scoreGuesses(sample, sample)
+            # Every sampled guess is itself a candidate.
+            isCandidate = np.ones(len(sample), dtype=bool)
+            scores = self.__scoreGuesses(FeedbackTable.encodeFeedback(exact, total, inputLength), isCandidate,
+                                         inputLength)
+            suggestedGuess = sample[int(np.argmax(scores))]
+
+        return {
+            "suggestedGuess": BatchHintEngine.decodeCode(suggestedGuess),
+            "remainingCandidates": int(len(candidates)),
+            "strategy": self.strategy
+        }
+
+    def __scoreGuesses(self, partitions: np.ndarray, isCandidate: np.ndarray, inputLength: int) -> np.ndarray:
+        """
+        Scores each guess by how it partitions the candidates; higher is better. Among equally good guesses, ones that
+        could themselves win are preferred, then the lowest index.
+        :param: {np.ndarray} partitions - (guesses, candidates) feedback matrix.
+        :param: {np.ndarray} isCandidate - Whether each guess is still a candidate.
+        :param: {Int} inputLength - Length of each code.
+        :return: {np.ndarray} A score per guess.
+        """
+        numberOfGuesses, numberOfCandidates = partitions.shape
+        numberOfFeedbacks = FeedbackTable.countFeedbacks(inputLength)
+        offsets = np.arange(numberOfGuesses, dtype=np.int64)[:, None] * numberOfFeedbacks
+        partitionSizes = np.bincount((partitions + offsets).ravel(),
+                                     minlength=numberOfGuesses * numberOfFeedbacks).reshape(numberOfGuesses,
+                                                                                             numberOfFeedbacks)
+        if self.strategy == "minimax":
+            scores = -partitionSizes.max(axis=1).astype(np.float64)
+        else:
+            probabilities = partitionSizes / numberOfCandidates
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = -np.nansum(probabilities * np.log2(probabilities), axis=1)
+        # Ties are broken by a bonus far smaller than any real difference in scores.
+        return scores + isCandidate * 1e-9
+
+    @staticmethod
+    def __firstCandidate(candidateIndices: np.ndarray) -> int:
+        """
+        :param: {np.ndarray} candidateIndices - Indices of the remaining candidates.
+        :return: {Int} The first remaining candidate.
+        :raise: {ValueError}: If no code is consistent with the hints.
+        """
+        if len(candidateIndices) == 0:
+            raise ValueError("No code is consistent with the hints received so far.")
+        return int(candidateIndices[0])
+
+
+# Process-wide solver shared by every game, so each mode's feedback table is mapped once per process.
+mastermindSolverService = MastermindSolverService(feedbackTableStore=FeedbackTableStore())
@@ -0,0 +1,89 @@
+from api.services.MastermindSolver.MastermindSolverService import MastermindSolverService
+from api.services.MastermindSolver.Utils.FeedbackTable import FeedbackTable
+from api.services.MastermindSolver.Utils.FeedbackTableStore import FeedbackTableStore
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+""" Testing that feedback tables are saved once, memory-mapped back, and rejected when they fail validation. """
+class FeedbackTableStoreTest(unittest.TestCase):
+    def setUp(self):
+        """ Arrange a store over a temporary directory and the EASY table. """
+        self.tableDirectory = tempfile.TemporaryDirectory()
+        self.store = FeedbackTableStore(self.tableDirectory.name)
+        self.easyTable = FeedbackTable.build(4, 0, 5)
+
+    def tearDown(self):
+        self.tableDirectory.cleanup()
+
+    def testSavedTableIsMemoryMapped(self):
+        """
+        A saved table loads back read-only and memory-mapped with the same contents.
+        """
+        # Arrange
+        self.store.save(self.easyTable)
+
+        # Act
+        loadedTable = self.store.load(4, 0, 5)
+
+        # Assert
+        self.assertIsInstance(loadedTable.table, np.memmap)
+        self.assertFalse(loadedTable.table.flags.writeable)
+        self.assertTrue(np.array_equal(loadedTable.table, self.easyTable.table))
+
+    def testCorruptedTableIsRebuilt(self):
+        """
+        A table whose checksum no longer matches is ignored and rebuilt.
+        """
+        # Arrange
+        self.store.save(self.easyTable)
+        path = self.store.getPath(4, 0, 5)
+        with open(path, "r+b") as tableFile:
+            tableFile.seek(-1, os.SEEK_END)
+            tableFile.write(b"\xff")
+
+        # Act
+        corruptedTable = self.store.load(4, 0, 5)
+        rebuiltTable = self.store.loadOrBuild(4, 0, 5)
+
+        # Assert
+        self.assertIsNone(corruptedTable)
+        self.assertTrue(np.array_equal(rebuiltTable.table, self.easyTable.table))
+
+    def testTableFromAnotherVersionIsIgnored(self):
+        """
+        A table saved by a different format version is not trusted.
+        """
+        # Arrange
+        self.store.save(self.easyTable)
+        sidecarPath = f"{self.store.getPath(4, 0, 5)}.json"
+        with open(sidecarPath, encoding="utf-8") as sidecarFile:
+            sidecar = json.load(sidecarFile)
+        sidecar["version"] = FeedbackTableStore.FORMAT_VERSION + 1
+        with open(sidecarPath, "w", encoding="utf-8") as sidecarFile:
+            json.dump(sidecar, sidecarFile)
+
+        # Act & Assert
+        self.assertIsNone(self.store.load(4, 0, 5))
+
+    def testSolverMapsTablesLazilyPerMode(self):
+        """
+        The solver only saves and maps the table of the mode it is asked about.
+        """
+        # Arrange
+        solver = MastermindSolverService(feedbackTableStore=self.store)
+
+        # Act
+        suggestion = solver.suggestGuess(4, 0, 5, [("0011", 1, 2)])
+
+        # Assert
+        self.assertEqual(os.listdir(self.tableDirectory.name).count(os.path.basename(self.store.getPath(4, 0, 5))), 1)
+        self.assertFalse(os.path.exists(self.store.getPath(4, 0, 7)))
+        self.assertIsInstance(solver.feedbackTables[(4, 0, 5)].table, np.memmap)
+        self.assertGreater(suggestion["remainingCandidates"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
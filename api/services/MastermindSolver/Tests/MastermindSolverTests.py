@@ -0,0 +1,119 @@
+from api.services.MastermindSolver.MastermindSolverService import MastermindSolverService
+from api.services.MastermindSolver.Utils.FeedbackTable import FeedbackTable
+from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from fastapi import HTTPException
+from unittest.mock import MagicMock
+import itertools
+import numpy as np
+import unittest
+
+""" Testing that the MastermindSolverService suggests guesses consistent with a game's hints and solves games. """
+class MastermindSolverTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """ Arrange a game instance to score guesses with. """
+        self.game = Mastermind(player=MagicMock())
+
+    def getHint(self, guess: str, winningCombo: str) -> tuple:
+        hint = self.game._Mastermind__getHint(guess, winningCombo)
+        return guess, hint["correctPositionAndNumber"], hint["correctNumbers"]
+
+    def playGame(self, solver: MastermindSolverService, winningCombo: str, maxRandomDigit: int) -> int:
+        guessHistory = []
+        while True:
+            suggestion = solver.suggestGuess(len(winningCombo), 0, maxRandomDigit, guessHistory)
+            guessHistory.append(self.getHint(suggestion["suggestedGuess"], winningCombo))
+            if suggestion["suggestedGuess"] == winningCombo:
+                return len(guessHistory)
+
+    def testSolvesEasyGamesWithBothStrategies(self):
+        """
+        Both strategies find EASY codes within the total rounds, in at most six guesses.
+        """
+        for strategy in MastermindSolverService.STRATEGIES:
+            # Arrange
+            solver = MastermindSolverService(strategy=strategy)
+
+            # Act
+            guessCounts = [self.playGame(solver, "".join(code), maxRandomDigit=5)
+                           for code in itertools.islice(itertools.product("012345", repeat=4), 0, 1296, 13)]
+
+            # Assert
+            self.assertLessEqual(max(guessCounts), 6, strategy)
+
+    def testRemainingCandidatesMatchBruteForce(self):
+        """
+        The remaining candidate count equals the number of codes consistent with every hint so far.
+        """
+        # Arrange
+        solver = MastermindSolverService()
+        guessHistory = [self.getHint("0123", "1537"), self.getHint("4455", "1537")]
+
+        # Act
+        suggestion = solver.suggestGuess(4, 0, 7, guessHistory)
+
+        # Assert
+        expectedCandidates = [
+            "".join(code) for code in itertools.product("01234567", repeat=4)
+            if all(self.getHint(guess, "".join(code)) == (guess, exact, total) for guess, exact, total in guessHistory)
+        ]
+        self.assertEqual(suggestion["remainingCandidates"], len(expectedCandidates))
+
+    def testSampledModeSuggestsAConsistentCode(self):
+        """
+        Modes without a feedback table suggest a code consistent with every hint so far.
+        """
+        # Arrange
+        solver = MastermindSolverService(maxTableCodeSpace=0, sampleSize=200)
+        guessHistory = [self.getHint("012345", "908172"), self.getHint("666777", "908172")]
+
+        # Act
+        suggestion = solver.suggestGuess(6, 0, 9, guessHistory)
+
+        # Assert
+        for guess, exact, total in guessHistory:
+            self.assertEqual(self.getHint(guess, suggestion["suggestedGuess"]), (guess, exact, total))
+        self.assertGreater(suggestion["remainingCandidates"], 0)
+
+    def testModesOverFifteenDigitsKeepEveryFeedbackDistinct(self):
+        """
+        Codes of 16 or more digits have more feedback values than fit in a byte, and none of them wrap onto another.
+        The solver still suggests a consistent code for such a mode.
+        """
+        # Arrange
+        solver = MastermindSolverService(maxTableCodeSpace=0, sampleSize=200)
+        winningCombo = "0110100110010110"
+        guessHistory = [self.getHint("0000000011111111", winningCombo), self.getHint("0101010101010101", winningCombo)]
+
+        # Act
+        feedbacks = {}
+        for inputLength in (15, 16, 20):
+            hints = np.array([(exact, total) for exact in range(inputLength + 1)
+                              for total in range(exact, inputLength + 1)], dtype=np.uint8)
+            feedbacks[inputLength] = FeedbackTable.encodeFeedback(hints[:, 0], hints[:, 1], inputLength)
+        suggestion = solver.suggestGuess(16, 0, 1, guessHistory)
+
+        # Assert
+        self.assertEqual(FeedbackTable.encodeFeedback(np.array([16]), np.array([16]), 16)[0], 288)
+        for inputLength, inputFeedbacks in feedbacks.items():
+            self.assertEqual(len(np.unique(inputFeedbacks)), len(inputFeedbacks), inputLength)
+        for guess, exact, total in guessHistory:
+            self.assertEqual(self.getHint(guess, suggestion["suggestedGuess"]), (guess, exact, total))
+
+    def testImpossibleModeIsRejected(self):
+        """
+        Code spaces too large to enumerate cannot be solved.
+        """
+        with self.assertRaises(ValueError):
+            MastermindSolverService().suggestGuess(10, 0, 9, [])
+
+    async def testSuggestionRequiresAGameInProgress(self):
+        """
+        Asking for a suggestion before entering a game is rejected.
+        """
+        with self.assertRaises(HTTPException) as context:
+            await MastermindSolverService().suggestGuessForGame(self.game)
+        self.assertEqual(context.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
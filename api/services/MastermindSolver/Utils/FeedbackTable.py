@@ -0,0 +1,86 @@
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+import numpy as np
+
+"""
+The precomputed hint of every (guess, code) pair of a difficulty mode's code space.
+
+Codes are indexed by their position in the lexicographic code space from BatchHintEngine.generateCodeSpace, and each
+hint is stored as a single feedback value, exact * (inputLength + 1) + total, so table[guessIndex, codeIndex] is the
+hint the guess would get if the code were the winning combination. Feedback values are one byte for codes of up to 15
+digits, and two bytes for longer codes, whose (inputLength + 1) ** 2 feedback values no longer fit in a byte.
+"""
+class FeedbackTable:
+    def __init__(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int, codeSpace: np.ndarray,
+                 table: np.ndarray):
+        """
+        Wraps an already computed table.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :param: {np.ndarray} codeSpace - (K, inputLength) digit matrix of every code.
+        :param: {np.ndarray} table - (K, K) feedback matrix of the mode's feedback dtype.
+        """
+        self.inputLength = inputLength
+        self.minRandomDigit = minRandomDigit
+        self.maxRandomDigit = maxRandomDigit
+        self.codeSpace = codeSpace
+        self.table = table
+
+    def __len__(self) -> int:
+        return self.codeSpace.shape[0]
+
+    @classmethod
+    def build(cls, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> "FeedbackTable":
+        """
+        Scores every code of the code space against every other with the BatchHintEngine.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {FeedbackTable} The computed table.
+        """
+        codeSpace = BatchHintEngine.generateCodeSpace(inputLength, minRandomDigit, maxRandomDigit)
+        exact, total = BatchHintEngine.scoreGuesses(codeSpace, codeSpace)
+        return cls(inputLength, minRandomDigit, maxRandomDigit, codeSpace,
+                   FeedbackTable.encodeFeedback(exact, total, inputLength))
+
+    @staticmethod
+    def encodeFeedback(exact, total, inputLength: int):
+        """
+        Packs hints into feedback values.
+        :param: {np.ndarray} exact - correctPositionAndNumber counts (or a single count).
+        :param: {np.ndarray} total - correctNumbers counts (or a single count).
+        :param: {Int} inputLength - Length of each code.
+        :return: {np.ndarray} Feedback values of the mode's feedback dtype (or a single int).
+        """
+        if isinstance(exact, np.ndarray):
+            dtype = FeedbackTable.getFeedbackDtype(inputLength)
+            return exact.astype(dtype) * dtype.type(inputLength + 1) + total.astype(dtype)
+        return exact * (inputLength + 1) + total
+
+    @staticmethod
+    def getFeedbackDtype(inputLength: int) -> np.dtype:
+        """
+        :param: {Int} inputLength - Length of each code.
+        :return: {np.dtype} The smallest unsigned integer type holding every feedback value.
+        """
+        return np.dtype(np.uint8) if FeedbackTable.countFeedbacks(inputLength) <= 256 else np.dtype(np.uint16)
+
+    @staticmethod
+    def countFeedbacks(inputLength: int) -> int:
+        """
+        :param: {Int} inputLength - Length of each code.
+        :return: {Int} The number of distinct feedback values.
+        """
+        return (inputLength + 1) ** 2
+
+    def indexOf(self, code: str) -> int:
+        """
+        Finds a code's row in the table.
+        :param: {String} code - A code of this table's mode.
+        :return: {Int} The code's index in the code space.
+        """
+        base = self.maxRandomDigit - self.minRandomDigit + 1
+        index = 0
+        for digit in code:
+            index = index * base + int(digit) - self.minRandomDigit
+        return index
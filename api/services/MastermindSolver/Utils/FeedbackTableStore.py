@@ -0,0 +1,150 @@
+from api.services.MastermindSolver.Configs import MastermindSolverConfig as Config
+from api.services.MastermindSolver.Utils.FeedbackTable import FeedbackTable
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+"""
+Saves feedback tables to disk once and loads them back memory-mapped, so every worker process shares the same page
+cache pages instead of building its own copy at boot.
+
+Each table is a versioned .npy file with a JSON sidecar holding its format version, code space, and SHA-256 checksum.
+A table is only used if its sidecar matches and the file's checksum is intact; anything else is rebuilt and saved again.
+Files are written to a temporary name and renamed into place, so concurrent workers never see a half-written table.
+"""
+class FeedbackTableStore:
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: str = Config.TABLE_DIRECTORY):
+        """
+        Instantiates a store over a directory, which is created on first save.
+        :param: {String} directory - Directory holding the table files.
+        """
+        self.directory = directory
+
+    def getPath(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> str:
+        """
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {String} Path of the mode's table file.
+        """
+        return os.path.join(self.directory, f"FeedbackTable-v{self.FORMAT_VERSION}-{inputLength}x{minRandomDigit}"
+                                            f"-{maxRandomDigit}.npy")
+
+    def load(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int):
+        """
+        Memory-maps the mode's saved table after validating its sidecar and checksum.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {FeedbackTable} The read-only, memory-mapped table, or None if it is missing or invalid.
+        """
+        path = self.getPath(inputLength, minRandomDigit, maxRandomDigit)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(f"{path}.json", encoding="utf-8") as sidecarFile:
+                sidecar = json.load(sidecarFile)
+            expectedSidecar = {"version": self.FORMAT_VERSION, "inputLength": inputLength,
+                               "minRandomDigit": minRandomDigit, "maxRandomDigit": maxRandomDigit}
+            if {key: sidecar.get(key) for key in expectedSidecar} != expectedSidecar:
+                logger.warning(f"Ignoring feedback table {path} saved for a different version or code space.")
+                return None
+            if self.__checksum(path) != sidecar.get("sha256"):
+                logger.warning(f"Ignoring feedback table {path} with a checksum mismatch.")
+                return None
+            table = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feedback table {path}: {e}")
+            return None
+
+        codeSpace = BatchHintEngine.generateCodeSpace(inputLength, minRandomDigit, maxRandomDigit)
+        if table.shape != (len(codeSpace), len(codeSpace)):
+            logger.warning(f"Ignoring feedback table {path} with shape {table.shape}.")
+            return None
+        return FeedbackTable(inputLength, minRandomDigit, maxRandomDigit, codeSpace, table)
+
+    def save(self, feedbackTable: FeedbackTable):
+        """
+        Atomically writes the table and its sidecar.
+        :param: {FeedbackTable} feedbackTable - The table to save.
+        :return: None.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.getPath(feedbackTable.inputLength, feedbackTable.minRandomDigit, feedbackTable.maxRandomDigit)
+        sidecar = {
+            "version": self.FORMAT_VERSION,
+            "inputLength": feedbackTable.inputLength,
+            "minRandomDigit": feedbackTable.minRandomDigit,
+            "maxRandomDigit": feedbackTable.maxRandomDigit
+        }
+
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fileDescriptor, "wb") as tableFile:
+                np.save(tableFile, np.ascontiguousarray(feedbackTable.table))
+                tableFile.flush()
+                os.fsync(tableFile.fileno())
+            sidecar["sha256"] = self.__checksum(temporaryPath)
+            # The sidecar goes first: a table without a matching sidecar is ignored, never trusted.
+            self.__writeAtomically(f"{path}.json", json.dumps(sidecar).encode("utf-8"))
+            os.replace(temporaryPath, path)
+        finally:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+
+    def loadOrBuild(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> FeedbackTable:
+        """
+        Memory-maps the mode's saved table, building and saving it first if it is missing or invalid.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {FeedbackTable} The memory-mapped table.
+        """
+        feedbackTable = self.load(inputLength, minRandomDigit, maxRandomDigit)
+        if feedbackTable is None:
+            self.save(FeedbackTable.build(inputLength, minRandomDigit, maxRandomDigit))
+            feedbackTable = self.load(inputLength, minRandomDigit, maxRandomDigit)
+        return feedbackTable
+
+    def ensureSaved(self, inputLength: int, minRandomDigit: int, maxRandomDigit: int):
+        """
+        Builds and saves the mode's table if no valid one is on disk, without keeping it mapped.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: None.
+        """
+        if self.load(inputLength, minRandomDigit, maxRandomDigit) is None:
+            self.save(FeedbackTable.build(inputLength, minRandomDigit, maxRandomDigit))
+
+    def __writeAtomically(self, path: str, content: bytes):
+        """
+        Writes a small file through a temporary file and a rename.
+        :param: {String} path - Destination path.
+        :param: {Bytes} content - File content.
+        :return: None.
+        """
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fileDescriptor, "wb") as temporaryFile:
+            temporaryFile.write(content)
+            temporaryFile.flush()
+            os.fsync(temporaryFile.fileno())
+        os.replace(temporaryPath, path)
+
+    @staticmethod
+    def __checksum(path: str) -> str:
+        """
+        :param: {String} path - Path of the file.
+        :return: {String} The file's SHA-256 hex digest.
+        """
+        with open(path, "rb") as checkedFile:
+            return hashlib.file_digest(checkedFile, "sha256").hexdigest()
@@ -1,16 +1,25 @@
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from api.clients.RandomDotOrgAPIClientRequest import RandomDotOrgAPIClientRequest
+from api.clients.RandomDigitEntropyPool import entropyPool
 from api.features.LevelUser.Services.LevelUserService import LevelUserService
 from api.features.PlayerStats.Services.PlayerStatsManagementService import PlayerStatsManagementService
 from api.services.PlayMastermindGameMVP.Configs import MastermindGameMVPConfigs as Config
 from api.services.PlayMastermindGameMVP.Utils import MastermindGameUtils
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+from api.services.PlayMastermindGameMVP.Utils.CandidateSpaceTracker import CandidateSpaceTracker
+from api.services.MastermindSolver.MastermindSolverService import mastermindSolverService
 from api.features.PlayerData.Services.PlayerDataManagement.PlayerDataManagementService import (
     PlayerDataManagementService)
 from api.features.DifficultyMode.Services.DifficultyModeService import DifficultyModeService
+from api.features.GameHistory.Services.GameHistoryService import GameHistoryService
+from api.features.FeatureFlags.Configs import FeatureFlagConfig
+from api.features.FeatureFlags.Services.FeatureFlagService import featureFlagService
+from datetime import datetime, timezone
+import asyncio
 import logging
-import traceback
-import collections
+import operator
+
+logger = logging.getLogger(__name__)
 
 """
 The Mastermind class encapsulates the core logic for the Mastermind game, providing central game controller methods 
@@ -25,9 +34,11 @@ class Mastermind:
         self.player = player
         self.levelingService = LevelUserService(self.player)
         self.playerStatsService = PlayerStatsManagementService(self.player)
-        self.randomDotOrgAPIClientRequest = RandomDotOrgAPIClientRequest()
+        self.entropyPool = entropyPool
         self.difficultyModeService = DifficultyModeService(self)
+        self.gameHistoryService = GameHistoryService()
 
+        self.mode = "NORMAL"
         self.roundCounter = Config.ROUND_COUNTER
         self.guessCount = Config.difficulty_modes["NORMAL"]["GUESS_COUNT"]
         self.inputLength = Config.difficulty_modes["NORMAL"]["INPUT_LEN"]
@@ -36,8 +47,16 @@ class Mastermind:
         self.minRandomDigit = Config.MIN_RAND_DIGIT
         self.maxRandomDigit = Config.difficulty_modes["NORMAL"]["MAX_RAND_DIGIT"]
         self.multiplier = Config.difficulty_modes["NORMAL"]["MULTIPLIER"]
+        self.guessPattern = MastermindGameUtils.MastermindGameUtils.getGuessPattern(self.inputLength,
+                                                                                    self.minRandomDigit,
+                                                                                    self.maxRandomDigit)
         self.baseScore = Config.BASE_SCORE
         self.winningCombo = None
+        self.guessHistory = []
+        self.roundHistory = []
+        self.startedAt = None
+        self.candidateSpaceTracker = None
+        self.isCandidateTrackingSkipped = False
         self.status = None
         self.gameScore = 0
 
@@ -52,6 +71,8 @@ class Mastermind:
         if mode != "NORMAL":
             await self.difficultyModeService.setDifficulty(mode)
         await self.setWinningCombo()
+        self.mode = mode
+        self.startedAt = self.__getTimestamp()
         successfulEntryMsg = JSONResponse(
             content="Player successfully entered game.",
             status_code=200
@@ -60,12 +81,11 @@ class Mastermind:
 
     async def setWinningCombo(self):
         """
-        Sets the game instance's winning combination to the generated winning combination.
+        Sets the game instance's winning combination by popping one from the prefetched entropy pool, so entering a
+        game does not wait on Random.org.
         :return: None.
-        :raise: {HTTPException}:
-            - 500: If an error occurs calling the Random.org API Client.
         """
-        self.winningCombo = await self.randomDotOrgAPIClientRequest.generateWinningCombo(
+        self.winningCombo = await self.entropyPool.popCode(
             inputLength=self.inputLength,
             minRandomDigit=self.minRandomDigit,
             maxRandomDigit=self.maxRandomDigit
@@ -80,10 +100,22 @@ class Mastermind:
             - 500: If an error occurs validating the guess.
             - ValueError: If the guess does not meet requirements.
         """
+        return JSONResponse(content=await self.playRound(guess))
+
+    async def playRound(self, guess: str) -> dict:
+        """
+        Plays the users guess as the next round, for any transport: submitGuess wraps the round's data in a
+        JSONResponse, and the game channel sends it over a WebSocket.
+        :param: {string} guess - A user's guess to be played against the winning combination.
+        :return: {Dictionary} The round's data for the frontend.
+        :raise: {HTTPException}
+            - 500: If an error occurs validating the guess.
+            - ValueError: If the guess does not meet requirements.
+        """
         try:
             guessValidation = self.__validateUserGuess(guess)
         except Exception as e:
-            logging.error(f"Error validating guess: {traceback.format_exc()}")
+            logger.exception("Error validating guess.")
             raise HTTPException(status_code=500, detail=str(e))
 
         if not guessValidation:
@@ -97,9 +129,17 @@ class Mastermind:
             hint = self.__getHint(guess, self.winningCombo)
             numOfCorrectNums = hint["correctNumbers"]
             numOfCorrectPositionsAndNums = hint["correctPositionAndNumber"]
+            self.guessHistory.append((guess, numOfCorrectPositionsAndNums, numOfCorrectNums))
+            self.roundHistory.append({
+                "roundNumber": self.roundCounter,
+                "guess": guess,
+                "correctPositionAndNumber": numOfCorrectPositionsAndNums,
+                "correctNumbers": numOfCorrectNums,
+                "guessedAt": self.__getTimestamp()
+            })
+            candidateSpace = await self.__pruneCandidateSpace(guess, numOfCorrectPositionsAndNums, numOfCorrectNums)
 
             if numOfCorrectPositionsAndNums == self.inputLength:
-                self.player.gamesWon += 1
                 await self.handleEndGame("won")
             elif isLastRound:
                 await self.handleEndGame("lost")
@@ -107,10 +147,10 @@ class Mastermind:
                 self.status = "stillPlaying"
 
         except Exception as e:
-            logging.error(f"Error submitting guess: {traceback.format_exc()}")
+            logger.exception("Error submitting guess.")
             raise HTTPException(status_code=400, detail=str(e))
 
-        roundData = JSONResponse(content={
+        return {
             "userId": self.player.userId,
             "status": self.status,
             "correctNumbers": str(numOfCorrectNums),
@@ -120,9 +160,9 @@ class Mastermind:
             "totalRounds": self.totalRounds,
             "isLastRound": isLastRound,
             "remainingGuesses": self.remainingGuesses,
-        })
-
-        return roundData
+            "remainingCandidates": candidateSpace["remainingCandidates"],
+            "informationGainedBits": candidateSpace["informationGainedBits"]
+        }
 
     def __getHint(self, guess: str, winningCombo: str) -> dict:
         """
@@ -134,25 +174,46 @@ class Mastermind:
             - correctPositionAndNumber {Int} - The number of digits correctly guessed in the exact positions.
             - correctNumbers {Int} - The total count of correct digits, regardless of position.
         """
-        correctPositionAndNumber = 0
+        # Counting each distinct digit with str.count and comparing positions with map keeps the work in C, so codes of
+        # up to 20 digits cost about as much as a 4-digit code did with Counters.
         correctNumbers = 0
-
-        countedNumsInWinningCombo = collections.Counter(winningCombo)
-        countedNumsInGuess = collections.Counter(guess)
-
-        for i in countedNumsInWinningCombo:
-            if i in countedNumsInGuess:
-                correctNumbers += min(countedNumsInWinningCombo[i], countedNumsInGuess[i])
-
-        for i in range(len(winningCombo)):
-            if winningCombo[i] == guess[i]:
-                correctPositionAndNumber += 1
+        for digit in set(winningCombo):
+            countInWinningCombo, countInGuess = winningCombo.count(digit), guess.count(digit)
+            correctNumbers += countInWinningCombo if countInWinningCombo < countInGuess else countInGuess
+        correctPositionAndNumber = sum(map(operator.eq, guess, winningCombo))
 
         return {
             "correctPositionAndNumber": correctPositionAndNumber,
             "correctNumbers": correctNumbers
         }
 
+    async def __pruneCandidateSpace(self, guess: str, correctPositionAndNumber: int, correctNumbers: int) -> dict:
+        """
+        Narrows the codes still consistent with every hint of this game, starting the tracking on the first guess.
+        :param: {String} guess - The player's current guess.
+        :param: {Int} correctPositionAndNumber - The guess's correctPositionAndNumber hint.
+        :param: {Int} correctNumbers - The guess's correctNumbers hint.
+        :return: {Dictionary} The remainingCandidates and informationGainedBits of the guess, both None for modes too
+        large to track or while candidate tracking is turned off.
+        """
+        if not featureFlagService.isEnabled(FeatureFlagConfig.CANDIDATE_TRACKING):
+            # A game that missed a hint can no longer be tracked correctly, even once the flag is turned back on.
+            self.candidateSpaceTracker = None
+            self.isCandidateTrackingSkipped = True
+            return {"remainingCandidates": None, "informationGainedBits": None}
+        if self.isCandidateTrackingSkipped:
+            return {"remainingCandidates": None, "informationGainedBits": None}
+        if self.candidateSpaceTracker is None:
+            codeSpaceSize = (self.maxRandomDigit - self.minRandomDigit + 1) ** self.inputLength
+            if codeSpaceSize > BatchHintEngine.MAX_CODE_SPACE_SIZE:
+                return {"remainingCandidates": None, "informationGainedBits": None}
+            codeSpace = await asyncio.to_thread(mastermindSolverService.getCodeSpace, self.inputLength,
+                                                self.minRandomDigit, self.maxRandomDigit)
+            self.candidateSpaceTracker = CandidateSpaceTracker(codeSpace)
+
+        return await asyncio.to_thread(self.candidateSpaceTracker.prune, guess, correctPositionAndNumber,
+                                       correctNumbers)
+
     def __updateRoundData(self):
         """
         Updates the round data after a guess is made by incrementing the round counter and decrementing the remaining guesses.
@@ -168,8 +229,7 @@ class Mastermind:
         :return: {Boolean} True if the guess is valid, False otherwise.
         """
         if self.player.userId:
-            if not MastermindGameUtils.MastermindGameUtils.isPassingRequirements(guess, self.inputLength,
-                                                                                 self.minRandomDigit, self.maxRandomDigit):
+            if self.guessPattern.fullmatch(guess) is None:
                 return False
             return True
 
@@ -185,11 +245,39 @@ class Mastermind:
                                                                     self.multiplier, self.roundCounter)
 
         try:
-            await self.playerStatsService.updateEndGameStats(self.gameScore)
+            await self.playerStatsService.updateEndGameStats(self.gameScore, status, self.mode)
         except Exception as e:
-            logging.error(f"Error updating end game stats: {traceback.format_exc()}")
+            logger.exception("Error updating end game stats.")
             raise HTTPException(status_code=500, detail=str(e))
 
+        self.__recordGameHistory()
+
+    def __recordGameHistory(self):
+        """
+        Queues the finished game with the guesses buffered during it to be written in the background, in one batched
+        write. The history is not part of the player's stats, so a failure is logged rather than failing the player's
+        last guess.
+        :return: None.
+        """
+        try:
+            self.gameHistoryService.recordGame({
+                "userId": self.player.userId,
+                "mode": self.mode,
+                "status": self.status,
+                "score": self.gameScore,
+                "roundsPlayed": self.roundCounter,
+                "totalRounds": self.totalRounds,
+                "winningCombo": self.winningCombo,
+                "startedAt": self.startedAt,
+                "endedAt": self.__getTimestamp()
+            }, self.roundHistory)
+        except Exception:
+            logger.exception("Error recording game history.")
+
+    @staticmethod
+    def __getTimestamp() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
     def resetGame(self):
         """
         Resets the game to its initial state for a fresh game.
@@ -200,5 +288,5 @@ class Mastermind:
         try:
             self.__init__(self.player)
         except Exception as e:
-            logging.error(f"Error resetting the game: {traceback.format_exc()}")
+            logger.exception("Error resetting the game.")
             raise HTTPException(status_code=400, detail=str(e))
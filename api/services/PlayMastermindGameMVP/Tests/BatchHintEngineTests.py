@@ -0,0 +1,92 @@
+from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+from unittest.mock import MagicMock, patch
+import random
+import unittest
+
+""" Testing that the batch hint engine scores (guess, code) pairs exactly like Mastermind.__getHint. """
+class BatchHintEngineTest(unittest.TestCase):
+    # (guess, winningCombo, correctPositionAndNumber, correctNumbers) from GetHintTests.
+    GET_HINT_CASES = [
+        ("1243", "1234", 2, 4),
+        ("3373", "1003", 1, 1),
+        ("0073", "1033", 2, 2),
+        ("1235", "1235", 4, 4),
+        ("0707", "1235", 0, 0),
+        ("2246", "0135", 0, 0),
+        ("0246", "0135", 1, 1),
+        ("2211", "0135", 0, 1),
+        ("0156", "0135", 2, 3)
+    ]
+
+    def setUp(self):
+        """ Arrange a game instance to compare against. """
+        self.game = Mastermind(player=MagicMock())
+
+    def getHint(self, guess: str, winningCombo: str) -> tuple:
+        hint = self.game._Mastermind__getHint(guess, winningCombo)
+        return hint["correctPositionAndNumber"], hint["correctNumbers"]
+
+    def testMatchesGetHintCases(self):
+        """
+        Every case in GetHintTests gets the same hint from the batch engine.
+        """
+        for guess, winningCombo, expectedExact, expectedTotal in self.GET_HINT_CASES:
+            # Act
+            exact, total = BatchHintEngine.scoreGuesses([guess], [winningCombo])
+
+            # Assert
+            self.assertEqual((int(exact[0, 0]), int(total[0, 0])), (expectedExact, expectedTotal), guess)
+
+    def testLongNumberSequence(self):
+        """
+        Test a long number sequence, as in GetHintTests.
+        """
+        # Act
+        exact, total = BatchHintEngine.scoreGuesses(["0135012341"], ["0135012341"])
+
+        # Assert
+        self.assertEqual((int(exact[0, 0]), int(total[0, 0])), (10, 10))
+
+    def testMatchesGetHintForEveryPairInChunks(self):
+        """
+        A random batch scored in many small chunks matches __getHint for every (guess, code) pair.
+        """
+        # Arrange
+        randomGenerator = random.Random(7)
+        guesses = ["".join(randomGenerator.choice("0123456789") for _ in range(6)) for _ in range(40)]
+        codes = ["".join(randomGenerator.choice("0123456789") for _ in range(6)) for _ in range(60)]
+
+        # Act
+        with patch.object(BatchHintEngine, "MAX_CHUNK_ELEMENTS", 1000):
+            exact, total = BatchHintEngine.scoreGuesses(guesses, codes)
+
+        # Assert
+        for guessIndex, guess in enumerate(guesses):
+            for codeIndex, code in enumerate(codes):
+                self.assertEqual((int(exact[guessIndex, codeIndex]), int(total[guessIndex, codeIndex])),
+                                 self.getHint(guess, code))
+
+    def testGenerateCodeSpace(self):
+        """
+        The code space of a mode holds every code in lexicographic order.
+        """
+        # Act
+        codeSpace = BatchHintEngine.generateCodeSpace(inputLength=4, minRandomDigit=0, maxRandomDigit=5)
+
+        # Assert
+        self.assertEqual(codeSpace.shape, (6 ** 4, 4))
+        self.assertEqual(BatchHintEngine.decodeCode(codeSpace[0]), "0000")
+        self.assertEqual(BatchHintEngine.decodeCode(codeSpace[7]), "0011")
+        self.assertEqual(BatchHintEngine.decodeCode(codeSpace[-1]), "5555")
+
+    def testRejectsMismatchedLengths(self):
+        """
+        Guesses and codes of different lengths cannot be scored against each other.
+        """
+        with self.assertRaises(ValueError):
+            BatchHintEngine.scoreGuesses(["1234"], ["12345"])
+
+
+if __name__ == "__main__":
+    unittest.main()
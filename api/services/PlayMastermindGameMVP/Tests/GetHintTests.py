@@ -1,4 +1,5 @@
 from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+import random
 import unittest
 from unittest.mock import MagicMock
 
@@ -189,6 +190,27 @@ class MastermindGetHintTest(unittest.TestCase):
         }
         self.assertEqual(result, expected_result)
 
+    def testGetHintOnLongCodes(self):
+        """
+        Codes of up to 20 digits are scored like a digit-by-digit count of matches.
+        """
+        # Arrange
+        generator = random.Random(20)
+        for _ in range(500):
+            inputLength = generator.randint(1, 20)
+            winningCombo = "".join(generator.choice("0123456789") for _ in range(inputLength))
+            guess = "".join(generator.choice("0123456789") for _ in range(inputLength))
+
+            # Act
+            result = self.game._Mastermind__getHint(guess, winningCombo)
+
+            # Assert
+            self.assertEqual(result, {
+                "correctPositionAndNumber": sum(guessDigit == comboDigit
+                                                for guessDigit, comboDigit in zip(guess, winningCombo)),
+                "correctNumbers": sum(min(guess.count(digit), winningCombo.count(digit)) for digit in "0123456789")
+            })
+
 
 if __name__ == "__main__":
     unittest.main()
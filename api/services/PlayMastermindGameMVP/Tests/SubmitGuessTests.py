@@ -1,7 +1,12 @@
 from api.services.PlayMastermindGameMVP.PlayMastermindGameService import Mastermind
+from api.services.PlayMastermindGameMVP.Utils.MastermindGameUtils import MastermindGameUtils
+from api.features.FeatureFlags.Configs import FeatureFlagConfig
+from api.features.FeatureFlags.Services.FeatureFlagService import featureFlagService
+from types import MappingProxyType
 import unittest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 import json
+import math
 
 """
 Tests the response object to the frontend by the API when submitting a guess.
@@ -16,6 +21,7 @@ class TestMastermindSubmitGuess(unittest.IsolatedAsyncioTestCase):
         self.game = Mastermind(player=self.mockPlayer)
         self.game.randomDotOrgAPIClientRequest = self.mockRandomDotOrgAPIClient
         self.game.playerStatsService = self.mockPlayerStatsService
+        self.game.gameHistoryService = MagicMock()
 
         # Arrange data
         self.game.winningCombo = "0115"
@@ -107,6 +113,98 @@ class TestMastermindSubmitGuess(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(str(context.exception), "{'ERROR': 'Guess does not meet requirements.'}")
 
+    async def testSubmitGuessReportsRemainingCandidates(self):
+        """
+        Tests that each guess reports the codes still consistent with every hint and the bits of information it gained
+        """
+        # Arrange
+        self.game.roundCounter = 0
+        self.game.remainingGuesses = 10
+        guesses = ["1234", "0011"]
+        expectedCandidates = 8 ** 4
+        remainingCandidates = []
+        informationGainedBits = []
+
+        # Act
+        for guess in guesses:
+            response = await self.game.submitGuess(guess)
+            parsedResponse = json.loads(response.body.decode("utf-8"))
+            remainingCandidates.append(parsedResponse["remainingCandidates"])
+            informationGainedBits.append(parsedResponse["informationGainedBits"])
+
+        # Assert
+        codes = [str(code).zfill(4) for code in range(10000) if max(str(code).zfill(4)) <= "7"]
+        for guess, candidateCount, bitsGained in zip(guesses, remainingCandidates, informationGainedBits):
+            winningHint = self.game._Mastermind__getHint(guess, self.game.winningCombo)
+            codes = [code for code in codes if self.game._Mastermind__getHint(guess, code) == winningHint]
+            assert candidateCount == len(codes)
+            assert abs(bitsGained - math.log2(expectedCandidates / len(codes))) < 0.001
+            expectedCandidates = len(codes)
+
+    async def testSubmitGuessDoesNotTrackImpossibleMode(self):
+        """
+        Tests that modes too large to track report no candidate counts
+        """
+        # Arrange
+        self.game.roundCounter = 0
+        self.game.remainingGuesses = 5
+        self.game.inputLength = 10
+        self.game.maxRandomDigit = 9
+        self.game.guessPattern = MastermindGameUtils.getGuessPattern(10, 0, 9)
+        self.game.winningCombo = "0123456789"
+
+        # Act
+        response = await self.game.submitGuess("9876543210")
+
+        # Assert
+        parsedResponse = json.loads(response.body.decode("utf-8"))
+        assert parsedResponse["remainingCandidates"] is None
+        assert parsedResponse["informationGainedBits"] is None
+
+    async def testSubmitGuessSkipsTrackingWhileFlagIsOff(self):
+        """
+        Tests that turning candidate tracking off stops it for the rest of the game, even once turned back on
+        """
+        # Arrange
+        self.game.roundCounter = 0
+        self.game.remainingGuesses = 10
+        flagsOff = MappingProxyType({FeatureFlagConfig.CANDIDATE_TRACKING: False})
+
+        # Act
+        with patch.object(featureFlagService, "flags", flagsOff):
+            skippedResponse = await self.game.submitGuess("1234")
+        response = await self.game.submitGuess("0011")
+
+        # Assert
+        for roundResponse in (skippedResponse, response):
+            parsedResponse = json.loads(roundResponse.body.decode("utf-8"))
+            assert parsedResponse["remainingCandidates"] is None
+            assert parsedResponse["informationGainedBits"] is None
+        assert self.game.candidateSpaceTracker is None
+
+    async def testFinishedGameIsRecordedOnce(self):
+        """
+        Tests that the guesses of a game are buffered and recorded together once the game ends
+        """
+        # Arrange
+        self.game.roundCounter = 0
+        self.game.remainingGuesses = 10
+
+        # Act
+        await self.game.submitGuess("1234")
+        recordedBeforeEnd = self.game.gameHistoryService.recordGame.call_count
+        await self.game.submitGuess("0115")
+
+        # Assert
+        assert recordedBeforeEnd == 0
+        self.game.gameHistoryService.recordGame.assert_called_once()
+        game, rounds = self.game.gameHistoryService.recordGame.call_args.args
+        assert game["userId"] == "testUserId1234"
+        assert game["status"] == "won"
+        assert game["roundsPlayed"] == 2
+        assert [(roundData["roundNumber"], roundData["guess"], roundData["correctPositionAndNumber"])
+                for roundData in rounds] == [(1, "1234", 0), (2, "0115", 4)]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,105 @@
+import numpy as np
+
+"""
+Scores many guesses against many codes at once, producing the same hints as Mastermind.__getHint.
+
+Codes are encoded as (N, inputLength) uint8 digit matrices. The exact count compares the matrices position by position,
+and the total count takes the element-wise minimum of each side's per-digit count matrix, mirroring the Counter logic of
+__getHint. Guesses are scored in chunks so the intermediate (guesses x codes x digits) arrays stay under
+MAX_CHUNK_ELEMENTS, whatever the batch size.
+"""
+class BatchHintEngine:
+    NUMBER_OF_DIGITS = 10
+    MAX_CHUNK_ELEMENTS = 1 << 24
+    MAX_CODE_SPACE_SIZE = 1_000_000
+
+    @staticmethod
+    def encodeCodes(codes) -> np.ndarray:
+        """
+        Encodes digit strings as a digit matrix.
+        :param: {List} codes - Digit strings of equal length, or an already encoded digit matrix.
+        :return: {np.ndarray} (N, inputLength) uint8 matrix of digits.
+        :raise: {ValueError}: If the codes are not equal-length digit strings.
+        """
+        if isinstance(codes, np.ndarray):
+            return codes.astype(np.uint8, copy=False)
+        if not codes:
+            raise ValueError("At least one code is required.")
+        inputLength = len(codes[0])
+        joinedCodes = "".join(codes)
+        if len(joinedCodes) != inputLength * len(codes) or not joinedCodes.isdigit():
+            raise ValueError("Codes must be digit strings of equal length.")
+        return (np.frombuffer(joinedCodes.encode("ascii"), dtype=np.uint8) - ord("0")).reshape(len(codes), inputLength)
+
+    @staticmethod
+    def decodeCode(encodedCode: np.ndarray) -> str:
+        """
+        Decodes one row of a digit matrix back into a digit string.
+        :param: {np.ndarray} encodedCode - (inputLength,) array of digits.
+        :return: {String} The code as a digit string.
+        """
+        return "".join(str(digit) for digit in encodedCode.tolist())
+
+    @staticmethod
+    def countDigits(encodedCodes: np.ndarray) -> np.ndarray:
+        """
+        Counts how often each digit appears in each code.
+        :param: {np.ndarray} encodedCodes - (N, inputLength) digit matrix.
+        :return: {np.ndarray} (N, 10) uint8 matrix of digit counts.
+        """
+        counts = np.zeros((encodedCodes.shape[0], BatchHintEngine.NUMBER_OF_DIGITS), dtype=np.uint8)
+        for position in range(encodedCodes.shape[1]):
+            counts[np.arange(encodedCodes.shape[0]), encodedCodes[:, position]] += 1
+        return counts
+
+    @staticmethod
+    def scoreGuesses(guesses, codes) -> tuple:
+        """
+        Scores every guess against every code.
+        :param: {List} guesses - N guesses, as digit strings or a digit matrix.
+        :param: {List} codes - M codes of the same length, as digit strings or a digit matrix.
+        :return: {Tuple} (exact, total), two (N, M) uint8 arrays holding the correctPositionAndNumber and
+        correctNumbers hints of each (guess, code) pair.
+        :raise: {ValueError}: If the guesses and codes have different lengths.
+        """
+        encodedGuesses = BatchHintEngine.encodeCodes(guesses)
+        encodedCodes = BatchHintEngine.encodeCodes(codes)
+        if encodedGuesses.shape[1] != encodedCodes.shape[1]:
+            raise ValueError("Guesses and codes must have the same length.")
+
+        guessCounts = BatchHintEngine.countDigits(encodedGuesses)
+        codeCounts = BatchHintEngine.countDigits(encodedCodes)
+        numberOfGuesses, numberOfCodes = encodedGuesses.shape[0], encodedCodes.shape[0]
+        exact = np.empty((numberOfGuesses, numberOfCodes), dtype=np.uint8)
+        total = np.empty((numberOfGuesses, numberOfCodes), dtype=np.uint8)
+
+        elementsPerGuess = numberOfCodes * max(encodedCodes.shape[1], BatchHintEngine.NUMBER_OF_DIGITS)
+        chunkSize = max(1, BatchHintEngine.MAX_CHUNK_ELEMENTS // elementsPerGuess)
+        for start in range(0, numberOfGuesses, chunkSize):
+            end = min(start + chunkSize, numberOfGuesses)
+            exact[start:end] = (encodedGuesses[start:end, None, :] == encodedCodes[None, :, :]).sum(axis=2)
+            total[start:end] = np.minimum(guessCounts[start:end, None, :], codeCounts[None, :, :]).sum(axis=2)
+
+        return exact, total
+
+    @staticmethod
+    def generateCodeSpace(inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> np.ndarray:
+        """
+        Enumerates every possible code of a difficulty mode in lexicographic order.
+        :param: {Int} inputLength - Length of each code.
+        :param: {Int} minRandomDigit - Smallest digit in a code.
+        :param: {Int} maxRandomDigit - Largest digit in a code.
+        :return: {np.ndarray} (base ** inputLength, inputLength) uint8 digit matrix.
+        :raise: {ValueError}: If the code space is larger than MAX_CODE_SPACE_SIZE.
+        """
+        base = maxRandomDigit - minRandomDigit + 1
+        codeSpaceSize = base ** inputLength
+        if codeSpaceSize > BatchHintEngine.MAX_CODE_SPACE_SIZE:
+            raise ValueError(f"Code space of {codeSpaceSize} codes is too large to enumerate.")
+
+        indices = np.arange(codeSpaceSize, dtype=np.int64)
+        codeSpace = np.empty((codeSpaceSize, inputLength), dtype=np.uint8)
+        for position in range(inputLength - 1, -1, -1):
+            codeSpace[:, position] = indices % base + minRandomDigit
+            indices //= base
+        return codeSpace
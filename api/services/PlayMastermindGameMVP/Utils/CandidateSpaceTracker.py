@@ -0,0 +1,54 @@
+from api.services.PlayMastermindGameMVP.Utils.BatchHintEngine import BatchHintEngine
+import math
+import numpy as np
+
+"""
+Tracks which codes of a game's code space are still consistent with the hints received so far.
+
+The candidates are kept as a packed bitset over the shared, lexicographic code space, one bit per code, and each hint
+only re-scores the codes that are still candidates. Per game that is:
+    - EASY (6^4 codes): 162 bytes.
+    - NORMAL (8^4 codes): 512 bytes.
+    - HARD (10^6 codes): 125 KB.
+Pruning briefly unpacks the bitset and scores the remaining candidates, which for the first HARD guess needs about
+30 MB of temporary arrays. IMPOSSIBLE (10^10 codes) is too large to track.
+"""
+class CandidateSpaceTracker:
+    def __init__(self, codeSpace: np.ndarray):
+        """
+        Starts with every code as a candidate.
+        :param: {np.ndarray} codeSpace - (K, inputLength) digit matrix of every code, shared between games.
+        """
+        self.codeSpace = codeSpace
+        self.candidateBits = np.packbits(np.ones(codeSpace.shape[0], dtype=bool))
+        self.remainingCandidates = codeSpace.shape[0]
+
+    def prune(self, guess: str, correctPositionAndNumber: int, correctNumbers: int) -> dict:
+        """
+        Removes every candidate that would not have produced the hint the guess received.
+        :param: {String} guess - The guess that was scored.
+        :param: {Int} correctPositionAndNumber - The guess's correctPositionAndNumber hint.
+        :param: {Int} correctNumbers - The guess's correctNumbers hint.
+        :return: {Dictionary} Dict containing:
+            - remainingCandidates {Int} - The number of codes still consistent with every hint.
+            - informationGainedBits {Float} - log2 of how many times smaller the candidate space became.
+        """
+        codeSpaceSize = self.codeSpace.shape[0]
+        if self.remainingCandidates == codeSpaceSize:
+            # Nothing pruned yet, so the whole code space is scored in place instead of being copied.
+            exact, total = BatchHintEngine.scoreGuesses([guess], self.codeSpace)
+            isCandidate = (exact[0] == correctPositionAndNumber) & (total[0] == correctNumbers)
+        else:
+            candidateIndices = np.flatnonzero(np.unpackbits(self.candidateBits, count=codeSpaceSize))
+            exact, total = BatchHintEngine.scoreGuesses([guess], self.codeSpace[candidateIndices])
+            isCandidate = np.zeros(codeSpaceSize, dtype=bool)
+            isCandidate[candidateIndices[(exact[0] == correctPositionAndNumber) & (total[0] == correctNumbers)]] = True
+        self.candidateBits = np.packbits(isCandidate)
+
+        previousCandidates, self.remainingCandidates = self.remainingCandidates, int(np.count_nonzero(isCandidate))
+        informationGainedBits = (math.log2(previousCandidates / self.remainingCandidates)
+                                 if self.remainingCandidates else 0.0)
+        return {
+            "remainingCandidates": self.remainingCandidates,
+            "informationGainedBits": round(informationGainedBits, 3)
+        }
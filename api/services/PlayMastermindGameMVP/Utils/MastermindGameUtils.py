@@ -1,3 +1,6 @@
+from functools import lru_cache
+import re
+
 """
 Utility class for Mastermind game-related helper functions.
 """
@@ -12,5 +15,22 @@ class MastermindGameUtils:
         @param {Int} maxRandomDigit - Maximum valid digit in the guess.
         @returns {bool} True if guess meets the criteria, False otherwise.
         """
-        return (len(userGuess) == inputLength and userGuess.isdigit and
-                all(minRandomDigit <= int(char) <= maxRandomDigit for char in userGuess))
+        return MastermindGameUtils.getGuessPattern(inputLength, minRandomDigit, maxRandomDigit).fullmatch(
+            userGuess) is not None
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def getGuessPattern(inputLength: int, minRandomDigit: int, maxRandomDigit: int) -> re.Pattern:
+        """
+        Compiles, once per difficulty mode, a pattern matching exactly the valid guesses. Only the ASCII digits in range
+        match, so other Unicode digits that int() would accept are rejected.
+        @param {Int} inputLength - Required length of the guess.
+        @param {Int} minRandomDigit - Minimum valid digit in the guess.
+        @param {Int} maxRandomDigit - Maximum valid digit in the guess.
+        @returns {re.Pattern} The compiled pattern, to be used with fullmatch.
+        @raises {ValueError} If the digit range is not within 0-9 or the length is not positive.
+        """
+        if not 0 <= minRandomDigit <= maxRandomDigit <= 9 or inputLength < 1:
+            raise ValueError(f"Invalid guess requirements: {inputLength} digits from {minRandomDigit} to "
+                             f"{maxRandomDigit}.")
+        return re.compile(f"[{minRandomDigit}-{maxRandomDigit}]{{{inputLength}}}", re.ASCII)
@@ -1,13 +1,14 @@
 import React from "react";
 import { useNavigate } from "react-router-dom";
 import './DifficultyMode.css';
+import sessionFetch from "../../utils/sessionFetch";
 
 const Difficulty = () => {
   const navigate = useNavigate();
 
   const handleDifficultySelection = async (mode) => {
     try {
-      const response = await fetch('http://127.0.0.1:5000/enter-game', {
+      const response = await sessionFetch('http://127.0.0.1:5000/enter-game', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -1,6 +1,7 @@
 import React, {useState, useEffect} from "react";
 import {useLocation, useNavigate} from "react-router-dom";
 import './GameOver.css';
+import sessionFetch from "../../utils/sessionFetch";
 
 const GameOver = () => {
     const navigate = useNavigate();
@@ -12,7 +13,7 @@ const GameOver = () => {
     useEffect(() => {
         const fetchPlayerData = async () => {
             try {
-                const response = await fetch(`http://127.0.0.1:5000/get-player-stats?userId=${userId}`, {
+                const response = await sessionFetch(`http://127.0.0.1:5000/get-player-stats?userId=${userId}`, {
                     method: 'GET',
                 });
                 const result = await response.json();
@@ -27,7 +28,7 @@ const GameOver = () => {
 
     const handleLogout = async () => {
         try {
-            await fetch("http://127.0.0.1:5000/reset", {
+            await sessionFetch("http://127.0.0.1:5000/reset", {
                 method: "POST",
             });
             console.log("Game and Player reset successfully.");
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import {useLocation, useNavigate} from "react-router-dom";
 import './Mastermind.css';
+import sessionFetch from "../../utils/sessionFetch";
 
 const Mastermind = () => {
   const location = useLocation();
@@ -21,7 +22,7 @@ const Mastermind = () => {
 
   const resetGame = async () => {
       try {
-          await fetch("http://127.0.0.1:5000/reset", {
+          await sessionFetch("http://127.0.0.1:5000/reset", {
               method: "POST",
           });
           console.log("Game and Player reset successfully.");
@@ -48,7 +49,7 @@ const Mastermind = () => {
 
   const handleGuess = async () => {
       try {
-          const response = await fetch('http://127.0.0.1:5000/submit-guess', {
+          const response = await sessionFetch('http://127.0.0.1:5000/submit-guess', {
               method: 'POST',
               headers: {
                   'Content-Type': 'application/json',
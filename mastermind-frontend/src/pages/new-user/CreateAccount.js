@@ -1,6 +1,7 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import './CreateAccount.css';
+import sessionFetch from "../../utils/sessionFetch";
 
 const CreateAccount = () => {
   const [username, setUsername] = useState('');
@@ -20,7 +21,7 @@ const CreateAccount = () => {
       }
 
       try {
-          const response = await fetch('http://127.0.0.1:5000/create-user', {
+          const response = await sessionFetch('http://127.0.0.1:5000/create-user', {
               method: 'POST',
               headers: {
                   'Content-Type': 'application/json',
@@ -1,6 +1,7 @@
 import React, {useState} from "react";
 import { useNavigate } from "react-router-dom";
 import './SignIn.css';
+import sessionFetch from "../../utils/sessionFetch";
 
 const SignIn = () => {
     const [username, setUsername] = useState('');
@@ -15,7 +16,7 @@ const SignIn = () => {
         }
 
         try {
-            const response = await fetch('http://127.0.0.1:5000/login', {
+            const response = await sessionFetch('http://127.0.0.1:5000/login', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
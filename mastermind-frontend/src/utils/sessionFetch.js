@@ -0,0 +1,22 @@
+const SESSION_HEADER = "X-Session-Id";
+const SESSION_STORAGE_KEY = "mastermindSessionId";
+
+// Wraps fetch so every request carries this tab's game session ID, and stores the ID the API hands back.
+const sessionFetch = async (url, options = {}) => {
+    const sessionId = sessionStorage.getItem(SESSION_STORAGE_KEY);
+    const headers = { ...(options.headers || {}) };
+    if (sessionId) {
+        headers[SESSION_HEADER] = sessionId;
+    }
+
+    const response = await fetch(url, { ...options, headers });
+
+    const returnedSessionId = response.headers.get(SESSION_HEADER);
+    if (returnedSessionId) {
+        sessionStorage.setItem(SESSION_STORAGE_KEY, returnedSessionId);
+    }
+
+    return response;
+};
+
+export default sessionFetch;